@@ -1,2 +1,8 @@
+from .atmosphere_table import AtmosphereTable
 from .environment import Environment
 from .environment_analysis import EnvironmentAnalysis
+from .forecast_cube import ForecastCube
+from .profile_cube import ProfileCube
+from .standard_atmosphere import StandardAtmosphere
+from .terrain import TerrainGrid
+from .weather_cache import WeatherCache
@@ -0,0 +1,315 @@
+"""
+Defines the AtmosphereTable class, which evaluates all the atmospheric
+quantities of an Environment at once. The quantities that are interpolated
+from arrays are stored as piecewise polynomials on a common altitude grid, so
+that a single interval search gives all of them, instead of one search for
+each quantity.
+"""
+
+from bisect import bisect_left
+
+import numpy as np
+
+
+def _polynomial_pieces(function):
+    """Returns the origins and coefficients of the polynomial pieces of a 1-D
+    Function with an array source and linear or cubic spline interpolation.
+    The first piece is used below the domain of the Function, the last one
+    above it, and the ones in between on each interval of its domain.
+
+    Parameters
+    ----------
+    function : Function
+        The Function whose pieces are returned.
+
+    Returns
+    -------
+    tuple
+        The origins of the pieces, with shape ``(m + 1,)``, and the
+        coefficients of their polynomials in powers of the distance to their
+        origins, with shape ``(m + 1, 4)``, where ``m`` is the number of
+        points of the Function.
+    """
+    x, y = function.x_array, function.y_array
+    origins = np.concatenate(([x[0]], x[:-1], [x[-1]]))
+    coefficients = np.zeros((len(x) + 1, 4))
+    if function.get_interpolation_method() == "linear":
+        coefficients[1:-1, 0] = y[:-1]
+        coefficients[1:-1, 1] = np.diff(y) / np.diff(x)
+    else:
+        coefficients[1:-1] = function._coeffs.T
+    if function.get_extrapolation_method() == "natural":
+        coefficients[0] = coefficients[1]
+        coefficients[-1] = coefficients[-2]
+        origins[-1] = origins[-2]
+    else:
+        coefficients[0, 0], coefficients[-1, 0] = y[0], y[-1]
+    return origins, coefficients
+
+
+def _is_piecewise_polynomial(function):
+    """Checks if a Function is a piecewise polynomial that can be stored in
+    the AtmosphereTable without changing its values."""
+    if callable(function.source) or function.__dom_dim__ != 1:
+        return False
+    if len(function.x_array) < 2:
+        return False
+    if function.get_extrapolation_method() not in ("constant", "natural"):
+        return False
+    interpolation = function.get_interpolation_method()
+    return interpolation == "linear" or (
+        interpolation == "spline" and len(function._coeffs) == 4
+    )
+
+
+def _standard_column(standard_atmosphere, function):
+    """Returns the position of a quantity in the states of a
+    StandardAtmosphere if a Function evaluates it, or None otherwise."""
+    source = function.source
+    if getattr(source, "__self__", None) is not standard_atmosphere:
+        return None
+    try:
+        return standard_atmosphere.columns.index(source.__name__)
+    except ValueError:
+        return None
+
+
+class AtmosphereTable:
+    """Evaluates all the atmospheric quantities of an Environment at one or
+    many altitudes with a single interval search.
+
+    The quantities given by Functions with an array source and linear or
+    cubic spline interpolation, such as the ones of soundings, forecasts and
+    reanalyses, are rewritten as cubic polynomials on each interval of a
+    common altitude grid, which is the union of the points of all of them.
+    Their values are the same as the ones of the original Functions, up to
+    rounding errors. Any other quantity, such as the ones given by callables,
+    is evaluated through its own Function, except for the ones of the
+    International Standard Atmosphere, which are all given by a single
+    evaluation of its closed-form model.
+
+    The table of an Environment is available through its
+    ``atmosphere_table`` attribute, which is rebuilt whenever any of the
+    Functions of the atmospheric quantities is replaced, for instance when a
+    new atmospheric model is set, a wind gust is added or another ensemble
+    member is selected.
+
+    Attributes
+    ----------
+    AtmosphereTable.columns : tuple
+        Names of the atmospheric quantities, in the order in which they are
+        returned.
+    AtmosphereTable.grid : numpy.ndarray
+        Common altitude grid of the quantities stored in the table, in meters
+        above sea level.
+
+    Examples
+    --------
+    >>> from rocketpy import Environment
+    >>> env = Environment()
+    >>> env.set_atmospheric_model(
+    ...     type="custom_atmosphere", wind_u=[(0, 5), (10000, 15)], wind_v=0
+    ... )
+    >>> env.atmosphere_table.columns[:3]
+    ('wind_velocity_x', 'wind_velocity_y', 'speed_of_sound')
+    >>> state = env.atmosphere_table.get_state(5000)
+    >>> [round(float(value), 2) for value in state[:3]]
+    [10.0, 0.0, 320.55]
+    >>> env.atmosphere_table.get_states([0, 5000]).shape
+    (2, 8)
+    """
+
+    columns = (
+        "wind_velocity_x",
+        "wind_velocity_y",
+        "speed_of_sound",
+        "density",
+        "gravity",
+        "pressure",
+        "temperature",
+        "dynamic_viscosity",
+    )
+
+    def __init__(self, environment):
+        """Builds the table of the atmospheric quantities of an Environment.
+
+        Parameters
+        ----------
+        environment : Environment
+            The Environment whose atmospheric quantities are evaluated.
+
+        Returns
+        -------
+        None
+        """
+        functions = [getattr(environment, name) for name in self.columns]
+        # Quantities of the International Standard Atmosphere are evaluated
+        # together, by a single call to its closed-form model
+        self._standard_atmosphere = getattr(environment, "standard_atmosphere", None)
+        standard_columns = (
+            {
+                position: _standard_column(self._standard_atmosphere, function)
+                for position, function in enumerate(functions)
+            }
+            if self._standard_atmosphere is not None
+            else {}
+        )
+        self._direct = [
+            (position, standard_columns.get(position), function)
+            for position, function in enumerate(functions)
+            if not _is_piecewise_polynomial(function)
+        ]
+        self._standard_positions = [
+            (position, column)
+            for position, column, _ in self._direct
+            if column is not None
+        ]
+        self._table_positions = [
+            position
+            for position, function in enumerate(functions)
+            if _is_piecewise_polynomial(function)
+        ]
+        pieces = [_polynomial_pieces(functions[i]) for i in self._table_positions]
+
+        if pieces:
+            grid = np.unique(
+                np.concatenate([functions[i].x_array for i in self._table_positions])
+            )
+        else:
+            grid = np.array([0.0])
+        self.grid = grid
+        # Row 0 is used below the grid, row i between grid[i - 1] and grid[i]
+        # and the last row above the grid
+        self._references = np.concatenate(([grid[0]], grid[:-1], [grid[-1]]))
+        midpoints = (grid[:-1] + grid[1:]) / 2
+        self._coefficients = np.zeros((len(grid) + 1, 4, len(pieces)))
+        for column, (origins, coefficients) in enumerate(pieces):
+            x = functions[self._table_positions[column]].x_array
+            indices = np.concatenate(
+                ([0], np.searchsorted(x, midpoints), [len(coefficients) - 1])
+            )
+            self._coefficients[:, :, column] = self.__shift(
+                coefficients[indices], self._references - origins[indices]
+            )
+
+        # Wind velocities are also looked up on their own, at the positions
+        # of the aerodynamic surfaces
+        self._wind = [
+            (
+                (
+                    self._table_positions.index(position)
+                    if position in self._table_positions
+                    else None
+                ),
+                functions[position],
+            )
+            for position in (0, 1)
+        ]
+        self._grid_list = grid.tolist()
+        self._reference_list = self._references.tolist()
+        self._rows = self._coefficients.tolist()
+
+    @staticmethod
+    def __shift(coefficients, shift):
+        """Rewrites cubic polynomials in powers of the distance to a new
+        origin, ``shift`` away from their previous origin."""
+        a0, a1, a2, a3 = coefficients.T
+        return np.column_stack(
+            [
+                a0 + shift * (a1 + shift * (a2 + shift * a3)),
+                a1 + shift * (2 * a2 + 3 * shift * a3),
+                a2 + 3 * shift * a3,
+                a3,
+            ]
+        )
+
+    def get_state(self, z):
+        """Evaluates the atmospheric quantities at a single altitude.
+
+        Parameters
+        ----------
+        z : float
+            Altitude above sea level, in meters.
+
+        Returns
+        -------
+        list
+            Values of the atmospheric quantities, in the order of the
+            ``columns`` attribute.
+        """
+        row = bisect_left(self._grid_list, z)
+        dx = z - self._reference_list[row]
+        c0, c1, c2, c3 = self._rows[row]
+        state = [
+            a0 + dx * (a1 + dx * (a2 + dx * a3))
+            for a0, a1, a2, a3 in zip(c0, c1, c2, c3)
+        ]
+        if self._standard_positions:
+            standard_state = self._standard_atmosphere.get_state(z)
+        for position, column, function in self._direct:
+            state.insert(
+                position,
+                (
+                    function.get_value_opt(z)
+                    if column is None
+                    else standard_state[column]
+                ),
+            )
+        return state
+
+    def get_wind_velocity(self, z):
+        """Evaluates only the wind velocity components at a single altitude.
+
+        Parameters
+        ----------
+        z : float
+            Altitude above sea level, in meters.
+
+        Returns
+        -------
+        list
+            Wind velocities in the x (East) and y (North) directions, in m/s.
+        """
+        row = bisect_left(self._grid_list, z)
+        dx = z - self._reference_list[row]
+        c0, c1, c2, c3 = self._rows[row]
+        return [
+            (
+                function.get_value_opt(z)
+                if i is None
+                else c0[i] + dx * (c1[i] + dx * (c2[i] + dx * c3[i]))
+            )
+            for i, function in self._wind
+        ]
+
+    def get_states(self, z):
+        """Evaluates the atmospheric quantities at many altitudes.
+
+        Parameters
+        ----------
+        z : array_like
+            Altitudes above sea level, in meters.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array with the values of the atmospheric quantities, whose last
+            axis follows the order of the ``columns`` attribute and whose
+            other axes follow the shape of ``z``.
+        """
+        z = np.asarray(z, dtype=float)
+        rows = np.searchsorted(self.grid, z)
+        dx = (z - self._references[rows])[..., np.newaxis]
+        c0, c1, c2, c3 = np.moveaxis(self._coefficients[rows], -2, 0)
+        states = np.empty(z.shape + (len(self.columns),))
+        states[..., self._table_positions] = c0 + dx * (c1 + dx * (c2 + dx * c3))
+        if self._standard_positions:
+            standard_states = self._standard_atmosphere.get_states(z)
+        for position, column, function in self._direct:
+            if column is None:
+                states[..., position] = np.reshape(
+                    [function.get_value_opt(value) for value in z.ravel()], z.shape
+                )
+            else:
+                states[..., position] = standard_states[..., column]
+        return states
@@ -2,7 +2,7 @@ import bisect
 import json
 import re
 import warnings
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 from datetime import datetime, timedelta, timezone
 
 import numpy as np
@@ -13,7 +13,13 @@ import requests
 from ..mathutils.function import Function, funcify_method
 from ..plots.environment_plots import _EnvironmentPlots
 from ..prints.environment_prints import _EnvironmentPrints
-from ..tools import exponential_backoff
+from ..tools import cartesian_to_geodesic, exponential_backoff
+from .atmosphere_table import AtmosphereTable
+from .forecast_cube import ForecastCube
+from .standard_atmosphere import StandardAtmosphere
+from .terrain import TerrainGrid
+from .weather_cache import cached_atmosphere
+from .weather_slab import export_slab, find_grid_indices, read_slab
 
 try:
     import netCDF4
@@ -39,6 +45,23 @@ def requires_netCDF4(func):
     return wrapped_func
 
 
+# Attributes that make up the atmosphere of an ensemble member
+_ENSEMBLE_ATMOSPHERE_ATTRIBUTES = (
+    "pressure",
+    "barometric_height",
+    "temperature",
+    "wind_direction",
+    "wind_heading",
+    "wind_speed",
+    "wind_velocity_x",
+    "wind_velocity_y",
+    "max_expected_height",
+    "density",
+    "speed_of_sound",
+    "dynamic_viscosity",
+)
+
+
 class Environment:
     """Keeps all environment information stored, such as wind and temperature
     conditions, as well as gravity.
@@ -92,6 +115,10 @@ class Environment:
         Two-dimensional Array containing the elevation information.
     Environment.topographic_profile_activated : bool
         True if the user already set a topographic profile. False otherwise.
+    Environment.terrain : TerrainGrid, None
+        Gridded topographic profile, which gives the elevation of the terrain
+        by bilinear interpolation. Used by the Flight class to detect the
+        impact against the terrain. None if no topographic profile was set.
     Environment.max_expected_height : float
         Maximum altitude in meters to keep weather data. The altitude must be
         above sea level (ASL). Especially useful for controlling plottings.
@@ -108,6 +135,11 @@ class Environment:
         ``Environment.load_international_standard_atmosphere`` has been called.
         Can be accessed as regular array, or called as a Function. See Function
         for more information.
+    Environment.standard_atmosphere : StandardAtmosphere, None
+        Closed-form International Standard Atmosphere, which evaluates the
+        profiles of the ``standard_atmosphere`` model without interpolation.
+        Only defined after ``Environment.load_international_standard_atmosphere``
+        has been called.
     Environment.pressure : Function
         Air pressure in Pa as a function of altitude. Can be accessed as regular
         array, or called as a Function. See Function for more information.
@@ -263,6 +295,24 @@ class Environment:
         Number of ensemble members. Only defined when using Ensembles.
     Environment.ensemble_member : int
         Current selected ensemble member. Only defined when using Ensembles.
+    Environment.ensemble_cache_size : int
+        Maximum number of ensemble members whose atmospheres are kept in
+        memory, so that they are activated again without being rebuilt.
+        Default is 100. Set to 0 to disable the cache.
+    Environment.atmosphere_table : AtmosphereTable
+        Table that evaluates the wind velocities, speed of sound, density,
+        gravity, pressure, temperature and dynamic viscosity at once. It is
+        rebuilt whenever any of these Functions is replaced.
+    Environment.forecast_cube : ForecastCube, None
+        Atmosphere that varies in time and space around the launch site, used
+        by the Flight class instead of the profiles at the launch site. Only
+        defined when a Forecast or Reanalysis is set with
+        ``time_varying=True``, otherwise None.
+    Environment.weather_cache : WeatherCache, None
+        On-disk cache of the atmospheres extracted from forecasts,
+        reanalyses, ensembles and soundings, so that setting the same
+        atmospheric model for the same date and location again does not
+        parse its source. Default is None, which disables the cache.
     """
 
     def __init__(
@@ -350,6 +400,18 @@ class Environment:
         self.air_gas_constant = 287.05287  # in J/K/Kg
         self.standard_g = 9.80665
 
+        # Maximum number of ensemble member atmospheres kept in memory
+        self.ensemble_cache_size = 100
+
+        # On-disk cache of the atmospheres extracted from weather files
+        self.weather_cache = None
+
+        # Closed-form International Standard Atmosphere, set when loaded
+        self.standard_atmosphere = None
+
+        # Gridded topographic profile, set by set_topographic_profile
+        self.terrain = None
+
         # Initialize launch site details
         self.elevation = elevation
         self.set_elevation(elevation)
@@ -411,6 +473,25 @@ class Environment:
 
         return None
 
+    def __setattr__(self, name, value):
+        # Replacing an atmospheric quantity invalidates the atmosphere table
+        if name in AtmosphereTable.columns:
+            self.__dict__.pop("_atmosphere_table", None)
+        # The forecast cube uses the gravity of the environment
+        if name == "gravity" and self.__dict__.get("forecast_cube") is not None:
+            self.forecast_cube.gravity = value
+        super().__setattr__(name, value)
+
+    @property
+    def atmosphere_table(self):
+        """AtmosphereTable with the atmospheric quantities of the Environment,
+        built the first time it is requested after any of them changes."""
+        try:
+            return self._atmosphere_table
+        except AttributeError:
+            self._atmosphere_table = AtmosphereTable(self)
+            return self._atmosphere_table
+
     def set_date(self, date, timezone="UTC"):
         """Set date and time of launch and update weather conditions if
         date dependent atmospheric model is used.
@@ -724,6 +805,9 @@ class Environment:
                 self.elev_lat_array = rootgrp.variables["lat"][:].tolist()
                 self.elev_array = rootgrp.variables["NASADEM_HGT"][:].tolist()
                 # crsArray = rootgrp.variables['crs'][:].tolist().
+                self.terrain = TerrainGrid(
+                    self.elev_lat_array, self.elev_lon_array, self.elev_array
+                )
                 self.topographic_profile_activated = True
 
                 print("Region covered by the Topographical file: ")
@@ -826,6 +910,46 @@ class Environment:
 
         return elevation
 
+    def get_terrain_elevation(self, x, y):
+        """Evaluates the elevation of the terrain at positions given relative
+        to the launch site, by a bilinear interpolation of the topographic
+        profile. If no topographic profile was set, the elevation of the
+        launch site is returned instead.
+
+        Parameters
+        ----------
+        x : float, array_like
+            Position in the x (East) direction, in meters from the launch
+            site.
+        y : float, array_like
+            Position in the y (North) direction, in meters from the launch
+            site.
+
+        Returns
+        -------
+        float, numpy.ndarray
+            Elevation of the terrain, in meters above sea level. An array with
+            the broadcast shape of the arguments is returned if any of them
+            is an array.
+
+        Raises
+        ------
+        ValueError
+            If any of the positions is outside of the topographic profile.
+        """
+        scalar = np.ndim(x) == 0 and np.ndim(y) == 0
+        if self.terrain is None:
+            if scalar:
+                return self.elevation
+            return np.full(np.broadcast(x, y).shape, float(self.elevation))
+
+        latitude, longitude = cartesian_to_geodesic(
+            x, y, self.latitude, self.longitude, self.earth_radius
+        )
+        if scalar:
+            return self.terrain.get_elevation(float(latitude), float(longitude))
+        return self.terrain.get_elevations(latitude, longitude)
+
     def set_atmospheric_model(
         self,
         type,
@@ -835,6 +959,7 @@ class Environment:
         temperature=None,
         wind_u=0,
         wind_v=0,
+        time_varying=False,
     ):
         """Defines an atmospheric model for the Environment. Supported
         functionality includes using data from the `International Standard
@@ -1078,13 +1203,28 @@ class Environment:
             m/s). Finally, a callable or function is also accepted. The function
             should take one argument, the height above sea level in meters and
             return a corresponding wind-v in m/s.
+        time_varying : bool, optional
+            Only used if type is ``Forecast`` or ``Reanalysis``. If True, the
+            fields of the file are also loaded on the times and grid points
+            around the launch, which are stored in the ``forecast_cube``
+            attribute, so that flights are simulated with the atmosphere
+            interpolated in time and space along their trajectories. The
+            profiles at the launch site and time are still set, and used
+            everywhere else. Default is False.
 
         Returns
         -------
         None
         """
+        if time_varying and type not in ("Forecast", "Reanalysis"):
+            raise ValueError(
+                "A time varying atmosphere is only available for the Forecast "
+                "and Reanalysis types."
+            )
+
         # Save atmospheric model type
         self.atmospheric_model_type = type
+        self.forecast_cube = None
 
         # Handle each case
         if type == "standard_atmosphere":
@@ -1126,7 +1266,7 @@ class Environment:
                         6 * (time_attempt.hour // 6),
                     )
                     try:
-                        self.process_forecast_reanalysis(file, dictionary)
+                        self.process_forecast_reanalysis(file, dictionary, time_varying)
                         success = True
                     except OSError:
                         attempt_count += 1
@@ -1161,7 +1301,7 @@ class Environment:
                         6 * (time_attempt.hour // 6),
                     )
                     try:
-                        self.process_forecast_reanalysis(file, dictionary)
+                        self.process_forecast_reanalysis(file, dictionary, time_varying)
                         success = True
                     except OSError:
                         attempt_count += 1
@@ -1196,7 +1336,7 @@ class Environment:
                         6 * (time_attempt.hour // 6),
                     )
                     try:
-                        self.process_forecast_reanalysis(file, dictionary)
+                        self.process_forecast_reanalysis(file, dictionary, time_varying)
                         success = True
                     except OSError:
                         attempt_count += 1
@@ -1231,7 +1371,7 @@ class Environment:
                         time_attempt.hour,
                     )
                     try:
-                        self.process_forecast_reanalysis(file, dictionary)
+                        self.process_forecast_reanalysis(file, dictionary, time_varying)
                         success = True
                     except OSError:
                         attempt_count += 1
@@ -1273,7 +1413,7 @@ class Environment:
                         "Please specify a dictionary or choose a default one such as ECMWF or NOAA."
                     )
                 # Process forecast or reanalysis
-                self.process_forecast_reanalysis(file, dictionary)
+                self.process_forecast_reanalysis(file, dictionary, time_varying)
             # Save dictionary and file
             self.atmospheric_model_file = file
             self.atmospheric_model_dict = dictionary
@@ -1748,6 +1888,7 @@ class Environment:
         self.time_array = time_array
         self.height = altitude_array
 
+    @cached_atmosphere
     def process_wyoming_sounding(self, file):
         """Import and process the upper air sounding data from `Wyoming
         Upper Air Soundings` database given by the url in file. Sets
@@ -1873,6 +2014,7 @@ class Environment:
 
         return None
 
+    @cached_atmosphere
     def process_noaaruc_sounding(self, file):
         """Import and process the upper air sounding data from `NOAA
         Ruc Soundings` database (https://rucsoundings.noaa.gov/) given as
@@ -2053,8 +2195,9 @@ class Environment:
         # Save maximum expected height
         self.max_expected_height = pressure_array[-1, 0]
 
+    @cached_atmosphere
     @requires_netCDF4
-    def process_forecast_reanalysis(self, file, dictionary):
+    def process_forecast_reanalysis(self, file, dictionary, time_varying=False):
         """Import and process atmospheric data from weather forecasts
         and reanalysis given as ``netCDF`` or ``OPeNDAP`` files.
         Sets pressure, temperature, wind-u and wind-v
@@ -2106,6 +2249,10 @@ class Environment:
                     "u_wind": "ugrdprs",
                     "v_wind": "vgrdprs",
                 }
+        time_varying : bool, optional
+            If True, the fields around the launch time and site are also
+            stored as a ForecastCube in the ``forecast_cube`` attribute.
+            Default is False.
 
         Returns
         -------
@@ -2130,10 +2277,8 @@ class Environment:
         # Read weather file
         weather_data = netCDF4.Dataset(file)
 
-        # Get time, latitude and longitude data from file
+        # Get time data from file
         time_array = weather_data.variables[dictionary["time"]]
-        lon_array = weather_data.variables[dictionary["longitude"]][:].tolist()
-        lat_array = weather_data.variables[dictionary["latitude"]][:].tolist()
 
         # Find time index
         time_index = netCDF4.date2index(
@@ -2168,56 +2313,15 @@ class Environment:
                 )
             )
 
-        # Find longitude index
-        # Determine if file uses -180 to 180 or 0 to 360
-        if lon_array[0] < 0 or lon_array[-1] < 0:
-            # Convert input to -180 - 180
-            lon = (
-                self.longitude if self.longitude < 180 else -180 + self.longitude % 180
-            )
-        else:
-            # Convert input to 0 - 360
-            lon = self.longitude % 360
-        # Check if reversed or sorted
-        if lon_array[0] < lon_array[-1]:
-            # Deal with sorted lon_array
-            lon_index = bisect.bisect(lon_array, lon)
-        else:
-            # Deal with reversed lon_array
-            lon_array.reverse()
-            lon_index = len(lon_array) - bisect.bisect_left(lon_array, lon)
-            lon_array.reverse()
-        # Take care of longitude value equal to maximum longitude in the grid
-        if lon_index == len(lon_array) and lon_array[lon_index - 1] == lon:
-            lon_index = lon_index - 1
-        # Check if longitude value is inside the grid
-        if lon_index == 0 or lon_index == len(lon_array):
-            raise ValueError(
-                "Longitude {:f} not inside region covered by file, which is from {:f} to {:f}.".format(
-                    lon, lon_array[0], lon_array[-1]
-                )
-            )
-
-        # Find latitude index
-        # Check if reversed or sorted
-        if lat_array[0] < lat_array[-1]:
-            # Deal with sorted lat_array
-            lat_index = bisect.bisect(lat_array, self.latitude)
-        else:
-            # Deal with reversed lat_array
-            lat_array.reverse()
-            lat_index = len(lat_array) - bisect.bisect_left(lat_array, self.latitude)
-            lat_array.reverse()
-        # Take care of latitude value equal to maximum longitude in the grid
-        if lat_index == len(lat_array) and lat_array[lat_index - 1] == self.latitude:
-            lat_index = lat_index - 1
-        # Check if latitude value is inside the grid
-        if lat_index == 0 or lat_index == len(lat_array):
-            raise ValueError(
-                "Latitude {:f} not inside region covered by file, which is from {:f} to {:f}.".format(
-                    self.latitude, lat_array[0], lat_array[-1]
-                )
-            )
+        # Find the grid points around the launch site
+        lat_array, lon_array, lat_index, lon_index, lon = find_grid_indices(
+            weather_data, dictionary, self.latitude, self.longitude
+        )
+        slab = {
+            "time": time_index,
+            "latitude": slice(lat_index - 1, lat_index + 1),
+            "longitude": slice(lon_index - 1, lon_index + 1),
+        }
 
         # Get pressure level data from file
         try:
@@ -2231,18 +2335,19 @@ class Environment:
 
         # Get geopotential data from file
         try:
-            geopotentials = weather_data.variables[dictionary["geopotential_height"]][
-                time_index, :, (lat_index - 1, lat_index), (lon_index - 1, lon_index)
-            ]
+            geopotentials = read_slab(
+                weather_data.variables[dictionary["geopotential_height"]],
+                dictionary,
+                slab,
+            )
         except:
             try:
                 geopotentials = (
-                    weather_data.variables[dictionary["geopotential"]][
-                        time_index,
-                        :,
-                        (lat_index - 1, lat_index),
-                        (lon_index - 1, lon_index),
-                    ]
+                    read_slab(
+                        weather_data.variables[dictionary["geopotential"]],
+                        dictionary,
+                        slab,
+                    )
                     / self.standard_g
                 )
             except:
@@ -2255,9 +2360,9 @@ class Environment:
 
         # Get temperature from file
         try:
-            temperatures = weather_data.variables[dictionary["temperature"]][
-                time_index, :, (lat_index - 1, lat_index), (lon_index - 1, lon_index)
-            ]
+            temperatures = read_slab(
+                weather_data.variables[dictionary["temperature"]], dictionary, slab
+            )
         except:
             raise ValueError(
                 "Unable to read temperature from file. Check file and dictionary."
@@ -2265,17 +2370,17 @@ class Environment:
 
         # Get wind data from file
         try:
-            wind_us = weather_data.variables[dictionary["u_wind"]][
-                time_index, :, (lat_index - 1, lat_index), (lon_index - 1, lon_index)
-            ]
+            wind_us = read_slab(
+                weather_data.variables[dictionary["u_wind"]], dictionary, slab
+            )
         except:
             raise ValueError(
                 "Unable to read wind-u component. Check file and dictionary."
             )
         try:
-            wind_vs = weather_data.variables[dictionary["v_wind"]][
-                time_index, :, (lat_index - 1, lat_index), (lon_index - 1, lon_index)
-            ]
+            wind_vs = read_slab(
+                weather_data.variables[dictionary["v_wind"]], dictionary, slab
+            )
         except:
             raise ValueError(
                 "Unable to read wind-v component. Check file and dictionary."
@@ -2410,9 +2515,11 @@ class Environment:
         # Get elevation data from file
         if dictionary["surface_geopotential_height"] is not None:
             try:
-                elevations = weather_data.variables[
-                    dictionary["surface_geopotential_height"]
-                ][time_index, (lat_index - 1, lat_index), (lon_index - 1, lon_index)]
+                elevations = read_slab(
+                    weather_data.variables[dictionary["surface_geopotential_height"]],
+                    dictionary,
+                    slab,
+                )
                 f_x1_y1 = elevations[0, 0]
                 f_x1_y2 = elevations[0, 1]
                 f_x2_y1 = elevations[1, 0]
@@ -2443,10 +2550,10 @@ class Environment:
             time_array.units,
             calendar="gregorian",
         ).hour
-        self.atmospheric_model_init_lat = lat_array[0]
-        self.atmospheric_model_end_lat = lat_array[-1]
-        self.atmospheric_model_init_lon = lon_array[0]
-        self.atmospheric_model_end_lon = lon_array[-1]
+        self.atmospheric_model_init_lat = float(lat_array[0])
+        self.atmospheric_model_end_lat = float(lat_array[-1])
+        self.atmospheric_model_init_lon = float(lon_array[0])
+        self.atmospheric_model_end_lon = float(lon_array[-1])
 
         # Save debugging data
         self.lat_array = lat_array
@@ -2461,11 +2568,121 @@ class Environment:
         self.time_array = time_array[:].tolist()
         self.height = height
 
+        if time_varying:
+            self.forecast_cube = self.__load_forecast_cube(
+                weather_data, dictionary, lat_index, lon_index, lon
+            )
+
         # Close weather data
         weather_data.close()
 
         return None
 
+    def __load_forecast_cube(
+        self, weather_data, dictionary, lat_index, lon_index, lon, duration=3600
+    ):
+        """Reads the fields of a forecast or reanalysis on the times and grid
+        points around the launch, with a single read of each variable.
+
+        Parameters
+        ----------
+        weather_data : netCDF4.Dataset
+            The open forecast or reanalysis dataset.
+        dictionary : dictionary
+            Dictionary with the names of the variables of the dataset.
+        lat_index, lon_index : int
+            Indices of the grid points right after the launch site in the
+            latitude and longitude arrays of the dataset.
+        lon : float
+            Longitude of the launch site, in the convention of the dataset.
+        duration : float, optional
+            Time after the launch, in seconds, that must be covered by the
+            loaded times. Default is 3600.
+
+        Returns
+        -------
+        ForecastCube
+            The fields around the launch time and site.
+        """
+        # Times bracketing the launch and the end of the flight
+        time_array = weather_data.variables[dictionary["time"]]
+        times = np.asarray(time_array[:], dtype=float)
+        unit_seconds = {"seconds": 1, "minutes": 60, "hours": 3600, "days": 86400}
+        unit = unit_seconds[time_array.units.split()[0].lower()]
+        launch_time = netCDF4.date2num(
+            self.datetime_date, time_array.units, calendar="gregorian"
+        )
+        first = max(np.searchsorted(times, launch_time, side="right") - 1, 0)
+        last = np.searchsorted(times, launch_time + duration / unit, side="left")
+        time_slice = slice(first, min(last, len(times) - 1) + 1)
+
+        # Grid points around the launch site, one beyond each neighbor
+        lat_array = weather_data.variables[dictionary["latitude"]]
+        lon_array = weather_data.variables[dictionary["longitude"]]
+        lat_slice = slice(max(lat_index - 2, 0), min(lat_index + 2, len(lat_array)))
+        lon_slice = slice(max(lon_index - 2, 0), min(lon_index + 2, len(lon_array)))
+        subcube = {"time": time_slice, "latitude": lat_slice, "longitude": lon_slice}
+        variables = weather_data.variables
+
+        try:
+            heights = read_slab(
+                variables[dictionary["geopotential_height"]], dictionary, subcube
+            )
+        except:
+            try:
+                heights = (
+                    read_slab(
+                        variables[dictionary["geopotential"]], dictionary, subcube
+                    )
+                    / self.standard_g
+                )
+            except:
+                raise ValueError(
+                    "Unable to read geopotential height"
+                    " nor geopotential from file. At least"
+                    " one of them is necessary. Check "
+                    " file and dictionary."
+                )
+        temperatures = read_slab(
+            variables[dictionary["temperature"]], dictionary, subcube
+        )
+        wind_us = read_slab(variables[dictionary["u_wind"]], dictionary, subcube)
+        wind_vs = read_slab(variables[dictionary["v_wind"]], dictionary, subcube)
+        levels = 100 * np.asarray(weather_data.variables[dictionary["level"]][:])
+
+        # Remove pressure levels with masked content
+        fields = np.ma.stack([heights, temperatures, wind_us, wind_vs])
+        complete_levels = ~np.ma.getmaskarray(fields).any(axis=(0, 1, 3, 4))
+        if not complete_levels.all():
+            warnings.warn(
+                "Some values were missing from this weather dataset, therefore, "
+                "certain pressure levels were removed."
+            )
+        heights, temperatures, wind_us, wind_vs = np.ma.getdata(fields)[
+            :, :, complete_levels
+        ]
+
+        # Convert geopotential height to geometric height
+        R = self.earth_radius
+        heights = R * heights / (R - heights)
+
+        return ForecastCube(
+            time=(times[time_slice] - launch_time) * unit,
+            northing=np.radians(np.asarray(lat_array[lat_slice], float) - self.latitude)
+            * R,
+            easting=np.radians(np.asarray(lon_array[lon_slice], float) - lon)
+            * R
+            * np.cos(np.radians(self.latitude)),
+            pressure_levels=levels[complete_levels],
+            height=heights,
+            temperature=temperatures,
+            wind_u=wind_us,
+            wind_v=wind_vs,
+            gravity=self.gravity,
+            air_gas_constant=self.air_gas_constant,
+        )
+
+    @cached_atmosphere
     @requires_netCDF4
     def process_ensemble(self, file, dictionary):
         """Import and process atmospheric data from weather ensembles
@@ -2542,10 +2759,8 @@ class Environment:
         # Read weather file
         weather_data = netCDF4.Dataset(file)
 
-        # Get time, latitude and longitude data from file
+        # Get time data from file
         time_array = weather_data.variables[dictionary["time"]]
-        lon_array = weather_data.variables[dictionary["longitude"]][:].tolist()
-        lat_array = weather_data.variables[dictionary["latitude"]][:].tolist()
 
         # Find time index
         time_index = netCDF4.date2index(
@@ -2580,56 +2795,15 @@ class Environment:
                 )
             )
 
-        # Find longitude index
-        # Determine if file uses -180 to 180 or 0 to 360
-        if lon_array[0] < 0 or lon_array[-1] < 0:
-            # Convert input to -180 - 180
-            lon = (
-                self.longitude if self.longitude < 180 else -180 + self.longitude % 180
-            )
-        else:
-            # Convert input to 0 - 360
-            lon = self.longitude % 360
-        # Check if reversed or sorted
-        if lon_array[0] < lon_array[-1]:
-            # Deal with sorted lon_array
-            lon_index = bisect.bisect(lon_array, lon)
-        else:
-            # Deal with reversed lon_array
-            lon_array.reverse()
-            lon_index = len(lon_array) - bisect.bisect_left(lon_array, lon)
-            lon_array.reverse()
-        # Take care of longitude value equal to maximum longitude in the grid
-        if lon_index == len(lon_array) and lon_array[lon_index - 1] == lon:
-            lon_index = lon_index - 1
-        # Check if longitude value is inside the grid
-        if lon_index == 0 or lon_index == len(lon_array):
-            raise ValueError(
-                "Longitude {:f} not inside region covered by file, which is from {:f} to {:f}.".format(
-                    lon, lon_array[0], lon_array[-1]
-                )
-            )
-
-        # Find latitude index
-        # Check if reversed or sorted
-        if lat_array[0] < lat_array[-1]:
-            # Deal with sorted lat_array
-            lat_index = bisect.bisect(lat_array, self.latitude)
-        else:
-            # Deal with reversed lat_array
-            lat_array.reverse()
-            lat_index = len(lat_array) - bisect.bisect_left(lat_array, self.latitude)
-            lat_array.reverse()
-        # Take care of latitude value equal to maximum longitude in the grid
-        if lat_index == len(lat_array) and lat_array[lat_index - 1] == self.latitude:
-            lat_index = lat_index - 1
-        # Check if latitude value is inside the grid
-        if lat_index == 0 or lat_index == len(lat_array):
-            raise ValueError(
-                "Latitude {:f} not inside region covered by file, which is from {:f} to {:f}.".format(
-                    self.latitude, lat_array[0], lat_array[-1]
-                )
-            )
+        # Find the grid points around the launch site
+        lat_array, lon_array, lat_index, lon_index, lon = find_grid_indices(
+            weather_data, dictionary, self.latitude, self.longitude
+        )
+        slab = {
+            "time": time_index,
+            "latitude": slice(lat_index - 1, lat_index + 1),
+            "longitude": slice(lon_index - 1, lon_index + 1),
+        }
 
         # Get ensemble data from file
         try:
@@ -2649,38 +2823,21 @@ class Environment:
                 "Unable to read pressure levels from file. Check file and dictionary."
             )
 
-        ##
-        inverse_dictionary = {v: k for k, v in dictionary.items()}
-        param_dictionary = {
-            "time": time_index,
-            "ensemble": range(num_members),
-            "level": range(len(levels)),
-            "latitude": (lat_index - 1, lat_index),
-            "longitude": (lon_index - 1, lon_index),
-        }
-        ##
-
         # Get geopotential data from file
         try:
-            dimensions = weather_data.variables[
-                dictionary["geopotential_height"]
-            ].dimensions[:]
-            params = tuple(
-                [param_dictionary[inverse_dictionary[dim]] for dim in dimensions]
-            )
-            geopotentials = weather_data.variables[dictionary["geopotential_height"]][
-                params
-            ]
+            geopotentials = read_slab(
+                weather_data.variables[dictionary["geopotential_height"]],
+                dictionary,
+                slab,
+            )
         except:
             try:
-                dimensions = weather_data.variables[
-                    dictionary["geopotential"]
-                ].dimensions[:]
-                params = tuple(
-                    [param_dictionary[inverse_dictionary[dim]] for dim in dimensions]
-                )
                 geopotentials = (
-                    weather_data.variables[dictionary["geopotential"]][params]
+                    read_slab(
+                        weather_data.variables[dictionary["geopotential"]],
+                        dictionary,
+                        slab,
+                    )
                     / self.standard_g
                 )
             except:
@@ -2693,7 +2850,9 @@ class Environment:
 
         # Get temperature from file
         try:
-            temperatures = weather_data.variables[dictionary["temperature"]][params]
+            temperatures = read_slab(
+                weather_data.variables[dictionary["temperature"]], dictionary, slab
+            )
         except:
             raise ValueError(
                 "Unable to read temperature from file. Check file and dictionary."
@@ -2701,13 +2860,17 @@ class Environment:
 
         # Get wind data from file
         try:
-            wind_us = weather_data.variables[dictionary["u_wind"]][params]
+            wind_us = read_slab(
+                weather_data.variables[dictionary["u_wind"]], dictionary, slab
+            )
         except:
             raise ValueError(
                 "Unable to read wind-u component. Check file and dictionary."
             )
         try:
-            wind_vs = weather_data.variables[dictionary["v_wind"]][params]
+            wind_vs = read_slab(
+                weather_data.variables[dictionary["v_wind"]], dictionary, slab
+            )
         except:
             raise ValueError(
                 "Unable to read wind-v component. Check file and dictionary."
@@ -2775,14 +2938,17 @@ class Environment:
         self.num_ensemble_members = num_members
 
         # Activate default ensemble
+        self._ensemble_atmospheres = OrderedDict()
         self.select_ensemble_member()
 
         # Get elevation data from file
         if dictionary["surface_geopotential_height"] is not None:
             try:
-                elevations = weather_data.variables[
-                    dictionary["surface_geopotential_height"]
-                ][time_index, (lat_index - 1, lat_index), (lon_index - 1, lon_index)]
+                elevations = read_slab(
+                    weather_data.variables[dictionary["surface_geopotential_height"]],
+                    dictionary,
+                    slab,
+                )
                 f_x1_y1 = elevations[0, 0]
                 f_x1_y2 = elevations[0, 1]
                 f_x2_y1 = elevations[1, 0]
@@ -2813,10 +2979,10 @@ class Environment:
             time_array.units,
             calendar="gregorian",
         ).hour
-        self.atmospheric_model_init_lat = lat_array[0]
-        self.atmospheric_model_end_lat = lat_array[-1]
-        self.atmospheric_model_init_lon = lon_array[0]
-        self.atmospheric_model_end_lon = lon_array[-1]
+        self.atmospheric_model_init_lat = float(lat_array[0])
+        self.atmospheric_model_end_lat = float(lat_array[-1])
+        self.atmospheric_model_init_lon = float(lon_array[0])
+        self.atmospheric_model_end_lon = float(lon_array[-1])
 
         # Save debugging data
         self.lat_array = lat_array
@@ -2841,6 +3007,12 @@ class Environment:
         read from the Environment instance will correspond to the desired
         ensemble member.
 
+        The atmosphere of each member is built the first time the member is
+        activated and then cached, so that activating it again only swaps the
+        atmospheric functions of the Environment. At most
+        ``Environment.ensemble_cache_size`` members are cached, discarding the
+        least recently activated ones.
+
         Parameters
         ---------
         member : int
@@ -2858,6 +3030,40 @@ class Environment:
                 )
             )
 
+        atmospheres = self._ensemble_atmospheres
+        atmosphere = atmospheres.get(member)
+        if atmosphere is not None:
+            atmospheres.move_to_end(member)
+            for attribute, value in atmosphere.items():
+                setattr(self, attribute, value)
+            self.ensemble_member = member
+            return None
+
+        self.__build_ensemble_member_atmosphere(member)
+
+        if self.ensemble_cache_size > 0:
+            atmospheres[member] = {
+                attribute: getattr(self, attribute)
+                for attribute in _ENSEMBLE_ATMOSPHERE_ATTRIBUTES
+            }
+            while len(atmospheres) > self.ensemble_cache_size:
+                atmospheres.popitem(last=False)
+
+        return None
+
+    def __build_ensemble_member_atmosphere(self, member):
+        """Builds the atmospheric functions of an ensemble member and sets
+        them as the atmosphere of the Environment.
+
+        Parameters
+        ---------
+        member : int
+            Ensemble member whose atmosphere is built. Starts from 0.
+
+        Returns
+        -------
+        None
+        """
         # Read ensemble member
         levels = self.level_ensemble[:]
         height = self.height_ensemble[member, :]
@@ -2968,111 +3174,51 @@ class Environment:
         -------
         None
         """
-        # Define international standard atmosphere layers
-        geopotential_height = [
-            -2e3,
-            0,
-            11e3,
-            20e3,
-            32e3,
-            47e3,
-            51e3,
-            71e3,
-            80e3,
-        ]  # in geopotential m
-        temperature = [
-            301.15,
-            288.15,
-            216.65,
-            216.65,
-            228.65,
-            270.65,
-            270.65,
-            214.65,
-            196.65,
-        ]  # in K
-        beta = [
-            -6.5e-3,
-            -6.5e-3,
-            0,
-            1e-3,
-            2.8e-3,
-            0,
-            -2.8e-3,
-            -2e-3,
-            0,
-        ]  # Temperature gradient in K/m
-        pressure = [
-            1.27774e5,
-            1.01325e5,
-            2.26320e4,
-            5.47487e3,
-            8.680164e2,
-            1.10906e2,
-            6.69384e1,
-            3.95639e0,
-            8.86272e-2,
-        ]  # in Pa
-
-        # Convert geopotential height to geometric height
-        ER = self.earth_radius
-        height = [ER * H / (ER - H) for H in geopotential_height]
+        # The profiles are evaluated in closed form, see StandardAtmosphere
+        self.standard_atmosphere = StandardAtmosphere(
+            earth_radius=self.earth_radius,
+            standard_g=self.standard_g,
+            air_gas_constant=self.air_gas_constant,
+        )
 
         # Save international standard atmosphere temperature profile
         self.temperature_ISA = Function(
-            np.column_stack([height, temperature]),
+            self.standard_atmosphere.temperature,
             inputs="Height Above Sea Level (m)",
             outputs="Temperature (K)",
-            interpolation="linear",
         )
 
-        # Get gravity and R
-        g = self.standard_g
-        R = self.air_gas_constant
-
-        # Create function to compute pressure at a given geometric height
-        def pressure_function(h):
-            # Convert geometric to geopotential height
-            H = ER * h / (ER + h)
-
-            # Check if height is within bounds, return extrapolated value if not
-            if H < -2000:
-                return pressure[0]
-            elif H > 80000:
-                return pressure[-1]
-
-            # Find layer that contains height h
-            layer = bisect.bisect(geopotential_height, H) - 1
-
-            # Retrieve layer base geopotential height, temp, beta and pressure
-            Hb = geopotential_height[layer]
-            Tb = temperature[layer]
-            Pb = pressure[layer]
-            B = beta[layer]
-
-            # Compute pressure
-            if B != 0:
-                P = Pb * (1 + (B / Tb) * (H - Hb)) ** (-g / (B * R))
-            else:
-                T = Tb + B * (H - Hb)
-                P = Pb * np.exp(-(H - Hb) * (g / (R * T)))
-
-            # Return answer
-            return P
-
         # Save international standard atmosphere pressure profile
         self.pressure_ISA = Function(
-            pressure_function,
+            self.standard_atmosphere.pressure,
             inputs="Height Above Sea Level (m)",
             outputs="Pressure (Pa)",
         )
 
-        # Discretize Function to speed up the trajectory simulation.
-        self.barometric_height_ISA = self.pressure_ISA.inverse_function().set_discrete(
-            pressure[-1], pressure[0], 100, extrapolation="constant"
+        # Save the inverse of the pressure profile
+        self.barometric_height_ISA = Function(
+            self.standard_atmosphere.barometric_height,
+            inputs="Pressure (Pa)",
+            outputs="Height Above Sea Level (m)",
+        )
+
+    def __is_standard_atmosphere(self, pressure=True):
+        """Checks if the temperature profile, and the pressure profile if
+        ``pressure`` is True, are the ones of the International Standard
+        Atmosphere."""
+        if self.standard_atmosphere is None:
+            return False
+        return self.temperature is self.temperature_ISA and (
+            not pressure or self.pressure is self.pressure_ISA
+        )
+
+    def __standard_atmosphere_profile(self, name):
+        """Returns a Function that evaluates one of the quantities of the
+        International Standard Atmosphere in closed form."""
+        return Function(
+            getattr(self.standard_atmosphere, name),
+            inputs="Height Above Sea Level (m)",
         )
-        self.barometric_height_ISA.set_inputs("Pressure (Pa)")
-        self.barometric_height_ISA.set_outputs("Height Above Sea Level (m)")
 
     def calculate_density_profile(self):
         """Compute the density of the atmosphere as a function of
@@ -3099,7 +3245,7 @@ class Environment:
         >>> env = Environment()
         >>> env.calculate_density_profile()
         >>> float(env.density(1000))
-        1.1116193933422585
+        1.1116596162653596
         """
         # Retrieve pressure P, gas constant R and temperature T
         P = self.pressure
@@ -3107,7 +3253,10 @@ class Environment:
         T = self.temperature
 
         # Compute density using P/RT
-        D = P / (R * T)
+        if self.__is_standard_atmosphere():
+            D = self.__standard_atmosphere_profile("density")
+        else:
+            D = P / (R * T)
 
         # Set new output for the calculated density
         D.set_outputs("Air Density (kg/m³)")
@@ -3133,7 +3282,10 @@ class Environment:
         G = 1.4
 
         # Compute speed of sound using sqrt(gamma*R*T)
-        a = (G * R * T) ** 0.5
+        if self.__is_standard_atmosphere(pressure=False):
+            a = self.__standard_atmosphere_profile("speed_of_sound")
+        else:
+            a = (G * R * T) ** 0.5
 
         # Set new output for the calculated speed of sound
         a.set_outputs("Speed of Sound (m/s)")
@@ -3160,7 +3312,10 @@ class Environment:
         S = 110.4  # K
 
         # Compute dynamic viscosity using u = B*T^(1.4)/(T+S) (See ISO2533)
-        u = (B * T ** (1.5)) / (T + S)
+        if self.__is_standard_atmosphere(pressure=False):
+            u = self.__standard_atmosphere_profile("dynamic_viscosity")
+        else:
+            u = (B * T ** (1.5)) / (T + S)
 
         # Set new output for the calculated density
         u.set_outputs("Dynamic Viscosity (Pa s)")
@@ -3188,7 +3343,15 @@ class Environment:
         Returns
         -------
         None
+
+        Notes
+        -----
+        If the atmosphere varies in time and space, the wind gust is also
+        added to the ``forecast_cube`` attribute.
         """
+        if self.forecast_cube is not None:
+            self.forecast_cube.add_wind_gust(wind_gust_x, wind_gust_y)
+
         # Recalculate wind_velocity_x and wind_velocity_y
         self.wind_velocity_x = self.wind_velocity_x + wind_gust_x
         self.wind_velocity_y = self.wind_velocity_y + wind_gust_y
@@ -3422,6 +3585,14 @@ class Environment:
                 "Height Above Sea Level (m) was not provided"
             )
 
+        # Profiles given by callables are sampled up to the maximum height
+        temperature_profile = self.temperature.get_source()
+        if callable(temperature_profile):
+            heights = np.linspace(0, self.max_expected_height, 100)
+            temperature_profile = np.column_stack(
+                [heights, [self.temperature.get_value_opt(h) for h in heights]]
+            )
+
         self.export_env_dictionary = {
             "gravity": self.gravity(self.elevation),
             "date": [
@@ -3441,7 +3612,7 @@ class Environment:
             "atmospheric_model_dict": atmospheric_model_dict,
             "atmospheric_model_pressure_profile": atmospheric_model_pressure_profile,
             "atmospheric_model_temperature_profile": ma.getdata(
-                self.temperature.get_source()
+                temperature_profile
             ).tolist(),
             "atmospheric_model_wind_velocity_x_profile": atmospheric_model_wind_velocity_x_profile,
             "atmospheric_model_wind_velocity_y_profile": atmospheric_model_wind_velocity_y_profile,
@@ -3465,6 +3636,50 @@ class Environment:
 
         return None
 
+    @requires_netCDF4
+    def export_weather_slab(self, filename):
+        """Exports the part of the ``netCDF`` or ``OPeNDAP`` file of the
+        Forecast, Reanalysis or Ensemble atmospheric model that is needed for
+        the launch date and site to a small local ``netCDF`` file. It holds
+        the times right before and after the one used, the four grid points
+        around the launch site, and all pressure levels and ensemble members,
+        so that it can be set as the atmospheric model of other Environments
+        with the same date and location, with the same type and dictionary.
+
+        Parameters
+        ----------
+        filename : string
+            The name of the ``netCDF`` file to be saved.
+
+        Returns
+        -------
+        None
+        """
+        if self.atmospheric_model_type not in ("Forecast", "Reanalysis", "Ensemble"):
+            raise ValueError(
+                "Only Forecast, Reanalysis and Ensemble atmospheric models can be "
+                "exported."
+            )
+        dictionary = self.atmospheric_model_dict
+
+        with netCDF4.Dataset(self.atmospheric_model_file) as weather_data:
+            time_array = weather_data.variables[dictionary["time"]]
+            time_index = netCDF4.date2index(
+                self.datetime_date, time_array, calendar="gregorian", select="nearest"
+            )
+            _, _, lat_index, lon_index, _ = find_grid_indices(
+                weather_data, dictionary, self.latitude, self.longitude
+            )
+            slab = {
+                "time": slice(max(time_index - 1, 0), time_index + 2),
+                "latitude": slice(lat_index - 1, lat_index + 1),
+                "longitude": slice(lon_index - 1, lon_index + 1),
+            }
+            with netCDF4.Dataset(filename, "w") as output:
+                export_slab(weather_data, dictionary, slab, output)
+
+        return None
+
     def set_earth_geometry(self, datum):
         """Sets the Earth geometry for the ``Environment`` class based on the
         datum provided.
@@ -3605,14 +3820,15 @@ class Environment:
     ):
         """Function which converts geodetic coordinates, i.e. lat/lon, to UTM
         projection coordinates. Can be used only for latitudes between -80.00°
-        and 84.00°
+        and 84.00°. Arrays of coordinates, such as whole trajectories or
+        dispersion clouds, are converted at once.
 
         Parameters
         ----------
-        lat : float
+        lat : float, array_like
             The latitude coordinates of the point of analysis, must be contained
             between -80.00° and 84.00°
-        lon : float
+        lon : float, array_like
             The longitude coordinates of the point of analysis, must be
             contained between -180.00° and 180.00°
         semi_major_axis : float
@@ -3640,34 +3856,29 @@ class Environment:
             Returns "S" for southern hemisphere and "N" for Northern hemisphere
         EW : string
             Returns "W" for western hemisphere and "E" for eastern hemisphere
+
+        Notes
+        -----
+        If any of the coordinates is an array, each of the returned values is
+        an array with the broadcast shape of the coordinates.
         """
 
+        scalar = np.ndim(lat) == 0 and np.ndim(lon) == 0
+        lat, lon = np.broadcast_arrays(
+            np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+        )
+
         # Calculate the central meridian of UTM zone
-        if lon != 0:
-            signal = lon / abs(lon)
-            if signal > 0:
-                aux = lon - 3
-                aux = aux * signal
-                div = aux // 6
-                lon_mc = div * 6 + 3
-                EW = "E"
-            else:
-                aux = lon + 3
-                aux = aux * signal
-                div = aux // 6
-                lon_mc = (div * 6 + 3) * signal
-                EW = "W"
-        else:
-            lon_mc = 3
-            EW = "W|E"
+        lon_mc = np.where(
+            lon > 0,
+            (lon - 3) // 6 * 6 + 3,
+            np.where(lon < 0, -((-(lon + 3)) // 6 * 6 + 3), 3),
+        )
+        EW = np.where(lon > 0, "E", np.where(lon < 0, "W", "W|E"))
 
         # Evaluate the hemisphere and determine the N coordinate at the Equator
-        if lat < 0:
-            N0 = 10000000
-            hemis = "S"
-        else:
-            N0 = 0
-            hemis = "N"
+        N0 = np.where(lat < 0, 10000000, 0)
+        hemis = np.where(lat < 0, "S", "N")
 
         # Convert the input lat and lon to radians
         lat = lat * np.pi / 180
@@ -3713,12 +3924,21 @@ class Environment:
         lon_mc = lon_mc * 180 / np.pi
 
         # Calculate the UTM zone number
-        utm_zone = int((lon_mc + 183) / 6)
+        utm_zone = ((lon_mc + 183) / 6).astype(int)
 
         # Calculate the UTM zone letter
-        letters = "CDEFGHJKLMNPQRSTUVWXX"
-        utm_letter = letters[int(80 + lat) >> 3]
+        letters = np.array(list("CDEFGHJKLMNPQRSTUVWXX"))
+        utm_letter = letters[(80 + lat).astype(int) >> 3]
 
+        if scalar:
+            return (
+                x[()],
+                y[()],
+                int(utm_zone),
+                str(utm_letter),
+                str(hemis),
+                str(EW),
+            )
         return x, y, utm_zone, utm_letter, hemis, EW
 
     @staticmethod
@@ -3727,18 +3947,18 @@ class Environment:
     ):
         """Function to convert UTM coordinates to geodesic coordinates
         (i.e. latitude and longitude). The latitude should be between -80°
-        and 84°
+        and 84°. Arrays of coordinates are converted at once.
 
         Parameters
         ----------
-        x : float
+        x : float, array_like
             East UTM coordinate in meters
-        y : float
+        y : float, array_like
             North UTM coordinate in meters
-        utm_zone : int
+        utm_zone : int, array_like
             The number of the UTM zone of the point of analysis, can vary
             between 1 and 60
-        hemis : string
+        hemis : string, array_like
             Equals to "S" for southern hemisphere and "N" for Northern
             hemisphere
         semi_major_axis : float
@@ -3752,14 +3972,13 @@ class Environment:
 
         Returns
         -------
-        lat : float
+        lat : float, numpy.ndarray
             latitude of the analyzed point
-        lon : float
+        lon : float, numpy.ndarray
             latitude of the analyzed point
         """
 
-        if hemis == "N":
-            y = y + 10000000
+        y = np.where(np.asarray(hemis) == "N", np.add(y, 10000000), y)
 
         # Calculate the Central Meridian from the UTM zone number
         central_meridian = utm_zone * 6 - 183  # degrees
@@ -3815,6 +4034,8 @@ class Environment:
         lat = lat * 180 / np.pi
         lon = lon * 180 / np.pi
 
+        if np.ndim(lat) == 0:
+            return lat[()], lon[()]
         return lat, lon
 
     @staticmethod
@@ -2,14 +2,17 @@ import bisect
 import copy
 import datetime
 import json
+import os
+import shutil
 from collections import defaultdict
 from functools import cached_property
 
 import netCDF4
 import numpy as np
 import pytz
+from cftime import num2pydate
 
-from ..mathutils.function import Function
+from ..mathutils.running_statistics import RunningMoments
 from ..plots.environment_analysis_plots import _EnvironmentAnalysisPlots
 from ..prints.environment_analysis_prints import _EnvironmentAnalysisPrints
 from ..tools import (
@@ -18,10 +21,29 @@ from ..tools import (
     geopotential_to_height_agl,
     geopotential_to_height_asl,
     import_optional_dependency,
-    time_num_to_date_string,
 )
 from ..units import convert_units
 from .environment import Environment
+from .profile_cube import ProfileCube
+
+_METADATA_FILENAME = "metadata.json"
+
+# Cached results that are updated with the new data by EnvironmentAnalysis.append,
+# all the other cached results are recomputed when next used
+_APPENDED_CACHES = {
+    "_EnvironmentAnalysis__parse_surface_data",
+    "_EnvironmentAnalysis__parse_pressure_level_data",
+    "_EnvironmentAnalysis__surface_statistics_by_hour",
+    "_EnvironmentAnalysis__process_surface_wind_data",
+    "converted_surface_data",
+    "converted_elevation",
+    "hours",
+    "days",
+    "temperature_by_hour",
+    "surface_10m_wind_speed_by_hour",
+    "surface_100m_wind_speed_by_hour",
+    "surface_wind_gust_by_hour",
+}
 
 # TODO: the average_wind_speed_profile_by_hour and similar methods could be more abstract than currently are
 
@@ -171,21 +193,7 @@ class EnvironmentAnalysis:
         self.preferred_timezone = timezone
         self.unit_system = unit_system
         self.max_expected_altitude = max_expected_altitude
-
-        # Check if extra requirements are installed
-        self.__check_requirements()
-
-        # Manage units and timezones
-        self.__init_data_parsing_units()
-        self.__find_preferred_timezone()
-        self.__localize_input_dates()
-
-        # Convert units
-        self.__set_unit_system(unit_system)
-
-        # Initialize plots and prints object
-        self.plots = _EnvironmentAnalysisPlots(self)
-        self.prints = _EnvironmentAnalysisPrints(self)
+        self.__initialize()
 
         # Processing forecast
         self.forecast = None
@@ -213,6 +221,31 @@ class EnvironmentAnalysis:
 
     # Private, auxiliary methods
 
+    def __initialize(self):
+        """Set up the units, timezone, plots and prints of the analysis from
+        its inputs.
+
+        Returns
+        -------
+        None
+        """
+        # Check if extra requirements are installed
+        self.__check_requirements()
+
+        # Manage units and timezones
+        self.__init_data_parsing_units()
+        self.__find_preferred_timezone()
+        self.__localize_input_dates()
+
+        # Convert units
+        self.__set_unit_system(self.unit_system)
+
+        # Initialize plots and prints object
+        self.plots = _EnvironmentAnalysisPlots(self)
+        self.prints = _EnvironmentAnalysisPrints(self)
+
+        return None
+
     def __check_requirements(self):
         """Check if extra requirements are installed. If not, print a message
         informing the user that some methods may not work and how to install
@@ -310,22 +343,26 @@ class EnvironmentAnalysis:
 
         return index
 
-    def __extract_surface_data_value(
-        self, surface_data, variable, indices, lon_array, lat_array
+    def __extract_data_values(
+        self, weather_data, variable, time_indices, indices, lon_array, lat_array
     ):
-        """Extract value from surface data netCDF4 file. Performs bilinear
-        interpolation along longitude and latitude.
+        """Extract the values of a variable at the selected times from a
+        netCDF4 file, with a single read of the four grid points around the
+        location for all the times. Performs bilinear interpolation along
+        longitude and latitude for all the times at once.
 
         Parameters
         ----------
-        surface_data : netCDF4.Dataset
-            Surface data netCDF4 file.
+        weather_data : netCDF4.Dataset
+            Surface or pressure level data netCDF4 file.
         variable : str
             Variable to be extracted from the file. Must be an existing variable
-            in the surface_data.
+            in the weather_data.
+        time_indices : numpy.ndarray
+            Indices of the selected times in the file, in ascending order.
         indices : tuple
-            Indices of the variable in the file. Must be given as a tuple
-            (time_index, lon_index, lat_index).
+            Indices of the grid point after the location. Must be given as a
+            tuple (lon_index, lat_index).
         lon_array : array
             Array of longitudes.
         lat_array : array
@@ -333,86 +370,85 @@ class EnvironmentAnalysis:
 
         Returns
         -------
-        value : float
-            Value of the variable at the given indices.
+        values : numpy.ma.MaskedArray
+            Values of the variable, with shape (time,) for surface data or
+            (time, level) for pressure level data.
         """
+        lon_index, lat_index = indices
+        variable_data = weather_data[variable]
 
-        time_index, lon_index, lat_index = indices
-        variable_data = surface_data[variable]
-
-        # Get values for variable on the four nearest points
-        z11 = variable_data[time_index, lon_index - 1, lat_index - 1]
-        z12 = variable_data[time_index, lon_index - 1, lat_index]
-        z21 = variable_data[time_index, lon_index, lat_index - 1]
-        z22 = variable_data[time_index, lon_index, lat_index]
+        # Read the four nearest points of all the selected times at once
+        first, last = time_indices[0], time_indices[-1] + 1
+        block = np.ma.asarray(
+            variable_data[
+                first:last,
+                ...,
+                lon_index - 1 : lon_index + 1,
+                lat_index - 1 : lat_index + 1,
+            ]
+        )[time_indices - first]
 
-        # Compute interpolated value on desired lat lon pair
-        value = bilinear_interpolation(
+        # Compute interpolated values on desired lat lon pair
+        return bilinear_interpolation(
             x=self.longitude,
             y=self.latitude,
             x1=lon_array[lon_index - 1],
             x2=lon_array[lon_index],
             y1=lat_array[lat_index - 1],
             y2=lat_array[lat_index],
-            z11=z11,
-            z12=z12,
-            z21=z21,
-            z22=z22,
+            z11=block[..., 0, 0],
+            z12=block[..., 0, 1],
+            z21=block[..., 1, 0],
+            z22=block[..., 1, 1],
         )
 
-        return value
-
-    def __extract_pressure_level_data_value(
-        self, pressure_level_data, variable, indices, lon_array, lat_array
-    ):
-        """Extract value from surface data netCDF4 file. Performs bilinear
-        interpolation along longitude and latitude.
+    def __select_times(self, time_num_array, excluded_times=()):
+        """Select the times of a weather file that are within the analysis
+        range of dates and hours.
 
         Parameters
         ----------
-        pressure_level_data : netCDF4.Dataset
-            Pressure level data netCDF4 file.
-        variable : str
-            Variable to be extracted from the file. Must be an existing variable
-            in the pressure_level_data.
-        indices : tuple
-            Indices of the variable in the file. Must be given as a tuple
-            (time_index, lon_index, lat_index).
-        lon_array : array
-            Array of longitudes.
-        lat_array : array
-            Array of latitudes.
+        time_num_array : netCDF4.Variable
+            Time variable of the weather file.
+        excluded_times : set, optional
+            Times that are not selected, as (date, hour) tuples of strings in
+            the preferred timezone, such as the times already parsed.
 
         Returns
         -------
-        value : float
-            Value of the variable at the given indices.
+        time_indices : numpy.ndarray
+            Indices of the selected times in the file.
+        date_strings : list of str
+            Date of each selected time, in the preferred timezone.
+        hour_strings : list of str
+            Hour of each selected time, in the preferred timezone.
         """
-
-        time_index, lon_index, lat_index = indices
-        variable_data = pressure_level_data[variable]
-
-        # Get values for variable on the four nearest points
-        z11 = variable_data[time_index, :, lon_index - 1, lat_index - 1]
-        z12 = variable_data[time_index, :, lon_index - 1, lat_index]
-        z21 = variable_data[time_index, :, lon_index, lat_index - 1]
-        z22 = variable_data[time_index, :, lon_index, lat_index]
-
-        # Compute interpolated value on desired lat lon pair
-        value_list_as_a_function_of_pressure_level = bilinear_interpolation(
-            x=self.longitude,
-            y=self.latitude,
-            x1=lon_array[lon_index - 1],
-            x2=lon_array[lon_index],
-            y1=lat_array[lat_index - 1],
-            y2=lat_array[lat_index],
-            z11=z11,
-            z12=z12,
-            z21=z21,
-            z22=z22,
+        date_times = np.atleast_1d(
+            num2pydate(time_num_array[:], time_num_array.units, calendar="gregorian")
         )
-
-        return value_list_as_a_function_of_pressure_level
+        time_indices, date_strings, hour_strings = [], [], []
+        for time_index, date_time_utc in enumerate(date_times):
+            date_time = date_time_utc.replace(tzinfo=pytz.UTC).astimezone(
+                self.preferred_timezone
+            )
+            # Check if date is within analysis range
+            if not (self.start_date <= date_time < self.end_date):
+                continue
+            if not (self.start_hour <= date_time.hour < self.end_hour):
+                continue
+            date_string = f"{date_time.year}.{date_time.month}.{date_time.day}"
+            hour_string = f"{date_time.hour}"
+            if (date_string, hour_string) in excluded_times:
+                continue
+            time_indices.append(time_index)
+            date_strings.append(date_string)
+            hour_strings.append(hour_string)
+        if not time_indices:
+            raise ValueError(
+                "The weather file has no data within the analysis range of "
+                "dates and hours."
+            )
+        return np.array(time_indices), date_strings, hour_strings
 
     def __check_coordinates_inside_grid(
         self, lon_index, lat_index, lon_array, lat_array
@@ -606,13 +642,37 @@ class EnvironmentAnalysis:
                 }
             }
 
+        Each variable is read from the file once for all the selected times,
+        into a contiguous (time, level) array of a ProfileCube, and the
+        Functions of each date and hour are only created when requested.
         The results will be cached, so that the parsing is only done once.
         """
-        dictionary = {}
+        lat0, lat1, lon0, lon1, cube = self.__read_pressure_level_file(
+            self.pressure_level_data_file
+        )
+        return (cube.to_dictionary(), lat0, lat1, lon0, lon1, cube)
+
+    def __read_pressure_level_file(self, filename, excluded_times=()):
+        """Read the profiles of the selected times of a pressure level weather
+        file into a ProfileCube.
+
+        Parameters
+        ----------
+        filename : str
+            Path to the netCDF file containing the pressure level data.
+        excluded_times : set, optional
+            Times that are not read, as (date, hour) tuples of strings.
+
+        Returns
+        -------
+        tuple
+            Initial and final latitudes and longitudes of the file grid, and
+            the ProfileCube, as (lat0, lat1, lon0, lon1, cube).
+        """
         # Setup dictionary used to read weather file
         pressure_level_file_dict = self.__init_pressure_level_dictionary()
         # Read weather file
-        pressure_level_data = netCDF4.Dataset(self.pressure_level_data_file)
+        pressure_level_data = netCDF4.Dataset(filename)
 
         # Get time, pressure levels, latitude and longitude data from file
         time_num_array = pressure_level_data.variables["time"]
@@ -632,133 +692,50 @@ class EnvironmentAnalysis:
         # Can't handle lat and lon out of grid
         self.__check_coordinates_inside_grid(lon_index, lat_index, lon_array, lat_array)
 
-        # Loop through time and save all values
-        for time_index, time_num in enumerate(time_num_array):
-            date_string, hour_string, date_time = time_num_to_date_string(
-                time_num,
-                time_num_array.units,
-                self.preferred_timezone,
-                calendar="gregorian",
-            )
-
-            # Check if date is within analysis range
-            if not (self.start_date <= date_time < self.end_date):
-                continue
-            if not (self.start_hour <= date_time.hour < self.end_hour):
-                continue
-            # Make sure keys exist
-            if date_string not in dictionary:
-                dictionary[date_string] = {}
-            if hour_string not in dictionary[date_string]:
-                dictionary[date_string][hour_string] = {}
-
-            # Extract data from weather file
-            indices = (time_index, lon_index, lat_index)
-
-            # Retrieve geopotential first and compute altitudes
-            geopotential_array = self.__extract_pressure_level_data_value(
-                pressure_level_data,
-                pressure_level_file_dict["geopotential"],
-                indices,
-                lon_array,
-                lat_array,
-            )
-            height_above_ground_level_array = geopotential_to_height_agl(
-                geopotential_array, self.original_elevation
-            )
-
-            # Loop through wind components and temperature, get value and convert to Function
-            for key, value in pressure_level_file_dict.items():
-                value_array = self.__extract_pressure_level_data_value(
-                    pressure_level_data, value, indices, lon_array, lat_array
-                )
-                variable_points_array = np.array(
-                    [height_above_ground_level_array, value_array]
-                ).T
-                variable_function = Function(
-                    variable_points_array,
-                    inputs="Height Above Ground Level (m)",
-                    outputs=key,
-                    extrapolation="constant",
+        # Select times and read each variable once for all of them
+        time_indices, date_strings, hour_strings = self.__select_times(
+            time_num_array, excluded_times
+        )
+        indices = (lon_index, lat_index)
+        fields = {
+            key: np.ma.getdata(
+                self.__extract_data_values(
+                    pressure_level_data,
+                    value,
+                    time_indices,
+                    indices,
+                    lon_array,
+                    lat_array,
                 )
-                dictionary[date_string][hour_string][key] = variable_function
-
-            # Create function for pressure levels
-            pressure_points_array = np.array(
-                [height_above_ground_level_array, pressure_level_array]
-            ).T
-            pressure_function = Function(
-                pressure_points_array,
-                inputs="Height Above Ground Level (m)",
-                outputs="Pressure (Pa)",
-                extrapolation="constant",
-            )
-            dictionary[date_string][hour_string]["pressure"] = pressure_function
-
-            # Create function for wind speed levels
-            wind_velocity_x_array = self.__extract_pressure_level_data_value(
-                pressure_level_data,
-                pressure_level_file_dict["wind_velocity_x"],
-                indices,
-                lon_array,
-                lat_array,
-            )
-            wind_velocity_y_array = self.__extract_pressure_level_data_value(
-                pressure_level_data,
-                pressure_level_file_dict["wind_velocity_y"],
-                indices,
-                lon_array,
-                lat_array,
-            )
-            wind_speed_array = np.sqrt(
-                np.square(wind_velocity_x_array) + np.square(wind_velocity_y_array)
             )
+            for key, value in pressure_level_file_dict.items()
+        }
 
-            wind_speed_points_array = np.array(
-                [height_above_ground_level_array, wind_speed_array]
-            ).T
-            wind_speed_function = Function(
-                wind_speed_points_array,
-                inputs="Height Above Ground Level (m)",
-                outputs="Wind Speed (m/s)",
-                extrapolation="constant",
-            )
-            dictionary[date_string][hour_string]["wind_speed"] = wind_speed_function
+        # Compute altitudes from geopotential
+        height_above_ground_level_array = geopotential_to_height_agl(
+            fields["geopotential"], self.original_elevation
+        )
 
-            # Create function for wind heading levels
-            wind_heading_array = (
-                np.arctan2(wind_velocity_x_array, wind_velocity_y_array)
-                * (180 / np.pi)
-                % 360
-            )
+        # Compute pressure, wind speed, wind heading and wind direction
+        fields["pressure"] = np.broadcast_to(
+            np.asarray(pressure_level_array[:], dtype=float),
+            fields["temperature"].shape,
+        )
+        fields["wind_speed"] = np.sqrt(
+            np.square(fields["wind_velocity_x"]) + np.square(fields["wind_velocity_y"])
+        )
+        fields["wind_heading"] = (
+            np.arctan2(fields["wind_velocity_x"], fields["wind_velocity_y"])
+            * (180 / np.pi)
+            % 360
+        )
+        fields["wind_direction"] = (fields["wind_heading"] - 180) % 360
 
-            wind_heading_points_array = np.array(
-                [height_above_ground_level_array, wind_heading_array]
-            ).T
-            wind_heading_function = Function(
-                wind_heading_points_array,
-                inputs="Height Above Ground Level (m)",
-                outputs="Wind Heading (Deg True)",
-                extrapolation="constant",
-            )
-            dictionary[date_string][hour_string]["wind_heading"] = wind_heading_function
-
-            # Create function for wind direction levels
-            wind_direction_array = (wind_heading_array - 180) % 360
-            wind_direction_points_array = np.array(
-                [height_above_ground_level_array, wind_direction_array]
-            ).T
-            wind_direction_function = Function(
-                wind_direction_points_array,
-                inputs="Height Above Ground Level (m)",
-                outputs="Wind Direction (Deg True)",
-                extrapolation="constant",
-            )
-            dictionary[date_string][hour_string][
-                "wind_direction"
-            ] = wind_direction_function
+        cube = ProfileCube(
+            date_strings, hour_strings, height_above_ground_level_array, fields
+        )
 
-        return (dictionary, lat0, lat1, lon0, lon1)
+        return (lat0, lat1, lon0, lon1, cube)
 
     @property
     def original_pressure_level_data(self):
@@ -793,6 +770,14 @@ class EnvironmentAnalysis:
         """
         return self.__parse_pressure_level_data[0]
 
+    @property
+    def pressure_level_cube(self):
+        """Return the original pressure level data as a ProfileCube, whose
+        (time, level) arrays hold the height above ground level and the
+        variables of all the dates and hours. Units are defined by the units
+        in the file."""
+        return self.__parse_pressure_level_data[5]
+
     @property
     def pressure_level_lat0(self):
         """Return the initial latitude of the pressure level data."""
@@ -849,12 +834,32 @@ class EnvironmentAnalysis:
                 ...
             }
         """
+        return self.__read_surface_file(self.surface_data_file)
+
+    def __read_surface_file(self, filename, excluded_times=()):
+        """Read the values of the selected times of a surface weather file
+        into a dictionary of dates and hours.
+
+        Parameters
+        ----------
+        filename : str
+            Path to the netCDF file containing the surface data.
+        excluded_times : set, optional
+            Times that are not read, as (date, hour) tuples of strings.
+
+        Returns
+        -------
+        tuple
+            The dictionary, the initial and final latitudes and longitudes of
+            the file grid and the surface elevation, as
+            (dictionary, lat0, lat1, lon0, lon1, elevation).
+        """
         # Setup dictionary used to read weather file
         dictionary = {}
         surface_file_dict = self.__init_surface_dictionary()
 
         # Read weather file
-        surface_data = netCDF4.Dataset(self.surface_data_file)
+        surface_data = netCDF4.Dataset(filename)
 
         # Get time, latitude and longitude data from file
         time_num_array = surface_data.variables["time"]
@@ -873,40 +878,28 @@ class EnvironmentAnalysis:
         # Can't handle lat and lon out of grid
         self.__check_coordinates_inside_grid(lon_index, lat_index, lon_array, lat_array)
 
-        # Loop through time and save all values
-        for time_index, time_num in enumerate(time_num_array):
-            date_string, hour_string, date_time = time_num_to_date_string(
-                time_num,
-                time_num_array.units,
-                self.preferred_timezone,
-                calendar="gregorian",
+        # Select times and read each variable once for all of them
+        time_indices, date_strings, hour_strings = self.__select_times(
+            time_num_array, excluded_times
+        )
+        indices = (lon_index, lat_index)
+        values = {
+            key: self.__extract_data_values(
+                surface_data, value, time_indices, indices, lon_array, lat_array
             )
-
-            # Check if date is within analysis range
-            if not (self.start_date <= date_time < self.end_date):
-                continue
-            if not (self.start_hour <= date_time.hour < self.end_hour):
-                continue
-
-            # Make sure keys exist
-            if date_string not in dictionary:
-                dictionary[date_string] = {}
-            if hour_string not in dictionary[date_string]:
-                dictionary[date_string][hour_string] = {}
-
-            # Extract data from weather file
-            indices = (time_index, lon_index, lat_index)
-            for key, value in surface_file_dict.items():
-                dictionary[date_string][hour_string][key] = (
-                    self.__extract_surface_data_value(
-                        surface_data, value, indices, lon_array, lat_array
-                    )
-                )
+            for key, value in surface_file_dict.items()
+        }
+        for index, (date_string, hour_string) in enumerate(
+            zip(date_strings, hour_strings)
+        ):
+            dictionary.setdefault(date_string, {})[hour_string] = {
+                key: value[index] for key, value in values.items()
+            }
 
         # Get elevation, time index does not matter, use last one
-        surface_geopotential = self.__extract_surface_data_value(
-            surface_data, "z", indices, lon_array, lat_array
-        )
+        surface_geopotential = self.__extract_data_values(
+            surface_data, "z", time_indices[-1:], indices, lon_array, lat_array
+        )[0]
         elevation = geopotential_to_height_asl(surface_geopotential)
 
         return (dictionary, lat0, lat1, lon0, lon1, elevation)
@@ -971,11 +964,10 @@ class EnvironmentAnalysis:
 
     @cached_property
     def converted_pressure_level_data(self):
-        """Convert pressure level data to desired unit system. This method will
-        loop through all the data (dates, hours and variables) and convert
-        the units of each variable. therefore, the performance of this method is
-        not optimal. However, this method is only called once and the results
-        are cached, so that the conversion is only done once.
+        """Convert pressure level data to desired unit system. The (time,
+        level) arrays of each variable are converted at once, and the Functions
+        of each date and hour are only created when requested. The results are
+        cached, so that the conversion is only done once.
 
         Returns
         -------
@@ -995,40 +987,19 @@ class EnvironmentAnalysis:
             "wind_velocity_y": self.unit_system["wind_speed"],
         }
 
-        # Make a deep copy of the dictionary
-        converted_dict = copy.deepcopy(self.original_pressure_level_data)
+        # Convert the arrays of all dates and hours at once
+        height_units = (self.current_units["height_ASL"], self.unit_system["length"])
+        units = {
+            key: (self.current_units[key], to_unit)
+            for key, to_unit in conversion_dict.items()
+        }
+        converted_cube = self.pressure_level_cube.convert(height_units, units)
 
-        # Loop through dates
-        for date in self.original_pressure_level_data:
-            # Loop through hours
-            for hour in self.original_pressure_level_data[date]:
-                # Loop through variables
-                for key, value in self.original_pressure_level_data[date][hour].items():
-                    # Skip geopotential x asl
-                    if key not in conversion_dict:
-                        continue
-                    # Convert x axis
-                    variable = convert_units(
-                        variable=value,
-                        from_unit=self.current_units["height_ASL"],
-                        to_unit=self.unit_system["length"],
-                        axis=0,
-                    )
-                    # Update current units
-                    self.updated_units["height_ASL"] = self.unit_system["length"]
-                    # Convert y axis
-                    variable = convert_units(
-                        variable=value,
-                        from_unit=self.current_units[key],
-                        to_unit=conversion_dict[key],
-                        axis=1,
-                    )
-                    # Update current units
-                    self.updated_units[key] = conversion_dict[key]
-                    # Save converted Function
-                    converted_dict[date][hour][key] = variable
+        # Update current units
+        self.updated_units["height_ASL"] = self.unit_system["length"]
+        self.updated_units.update(conversion_dict)
 
-        return converted_dict
+        return converted_cube.to_dictionary()
 
     @cached_property
     def converted_surface_data(self):
@@ -1044,6 +1015,22 @@ class EnvironmentAnalysis:
             Dictionary with the converted surface data. This dictionary has the
             same structure as the original_surface_data dictionary.
         """
+        return self.__convert_surface_data(self.original_surface_data)
+
+    def __convert_surface_data(self, surface_data):
+        """Convert a dictionary of surface data, with the structure of the
+        original_surface_data dictionary, to the desired unit system.
+
+        Parameters
+        ----------
+        surface_data : dictionary
+            Surface data in the units of the weather file.
+
+        Returns
+        -------
+        dictionary
+            Converted copy of the surface data.
+        """
         # Create conversion dict (key: from_unit, to_unit)
         conversion_dict = {
             "surface100m_wind_velocity_x": self.unit_system["wind_speed"],
@@ -1058,14 +1045,14 @@ class EnvironmentAnalysis:
         }
 
         # Make a deep copy of the dictionary
-        converted_dict = copy.deepcopy(self.original_surface_data)
+        converted_dict = copy.deepcopy(surface_data)
 
         # Loop through dates
-        for date in self.original_surface_data:
+        for date in surface_data:
             # Loop through hours
-            for hour in self.original_surface_data[date]:
+            for hour in surface_data[date]:
                 # Loop through variables
-                for key, value in self.original_surface_data[date][hour].items():
+                for key, value in surface_data[date][hour].items():
                     variable = convert_units(
                         variable=value,
                         from_unit=self.current_units[key],
@@ -1439,7 +1426,12 @@ class EnvironmentAnalysis:
         float
             Record maximum wind speed at surface+100m level.
         """
-        return np.max(self.surface_100m_wind_speed_list)
+        return max(
+            moments.maximum
+            for moments in self.__surface_statistics_by_hour[
+                "surface100m_wind_speed"
+            ].values()
+        )
 
     @property
     def record_min_surface_100m_wind_speed(self):
@@ -1452,7 +1444,12 @@ class EnvironmentAnalysis:
         float
             Record minimum wind speed at surface+100m level.
         """
-        return np.min(self.surface_100m_wind_speed_list)
+        return min(
+            moments.minimum
+            for moments in self.__surface_statistics_by_hour[
+                "surface100m_wind_speed"
+            ].values()
+        )
 
     @property
     def record_min_cloud_base_height(self):
@@ -1477,7 +1474,12 @@ class EnvironmentAnalysis:
         float
             Record maximum temperature.
         """
-        return np.max(self.temperature_list)
+        return max(
+            moments.maximum
+            for moments in self.__surface_statistics_by_hour[
+                "surface_temperature"
+            ].values()
+        )
 
     @property
     def record_min_temperature(self):
@@ -1489,7 +1491,12 @@ class EnvironmentAnalysis:
         float
             Record minimum temperature.
         """
-        return np.min(self.temperature_list)
+        return min(
+            moments.minimum
+            for moments in self.__surface_statistics_by_hour[
+                "surface_temperature"
+            ].values()
+        )
 
     @property
     def record_max_wind_gust(self):
@@ -1500,7 +1507,12 @@ class EnvironmentAnalysis:
         float
             Record maximum wind gust.
         """
-        return np.max(self.wind_gust_list)
+        return max(
+            moments.maximum
+            for moments in self.__surface_statistics_by_hour[
+                "surface_wind_gust"
+            ].values()
+        )
 
     @cached_property
     def record_max_surface_wind_speed(self):
@@ -1549,7 +1561,12 @@ class EnvironmentAnalysis:
         float
             Record maximum wind speed at surface+10m level.
         """
-        return np.max(self.surface_10m_wind_speed_list)
+        return max(
+            moments.maximum
+            for moments in self.__surface_statistics_by_hour[
+                "surface10m_wind_speed"
+            ].values()
+        )
 
     @property
     def record_min_surface_10m_wind_speed(self):
@@ -1562,7 +1579,12 @@ class EnvironmentAnalysis:
         float
             Record minimum wind speed at surface+10m level.
         """
-        return np.min(self.surface_10m_wind_speed_list)
+        return min(
+            moments.minimum
+            for moments in self.__surface_statistics_by_hour[
+                "surface10m_wind_speed"
+            ].values()
+        )
 
     # Surface level data - Average values
 
@@ -1722,6 +1744,71 @@ class EnvironmentAnalysis:
 
     # Surface level data - Dictionaries by hour
 
+    @cached_property
+    def __surface_statistics_by_hour(self):
+        """Mergeable accumulators of the surface temperature, wind speeds and
+        wind gust for each hour of the day, from which the averages, standard
+        deviations and records are computed. The accumulators are updated
+        with the new data when data is appended to the analysis.
+
+        Returns
+        -------
+        dictionary
+            Dictionary with a RunningMoments for each variable and hour. The
+            dictionary has the following structure:
+
+            .. code-block:: python
+
+                dictionary = {
+                    "surface_temperature": {
+                        hour1: RunningMoments,
+                        ...
+                        hourN: RunningMoments,
+                    },
+                    "surface10m_wind_speed": {...},
+                    "surface100m_wind_speed": {...},
+                    "surface_wind_gust": {...},
+                }
+        """
+        statistics = defaultdict(dict)
+        self.__update_surface_statistics(statistics, self.converted_surface_data)
+        return statistics
+
+    def __update_surface_statistics(self, statistics, surface_data):
+        """Add the values of converted surface data to the accumulators of
+        each variable and hour.
+
+        Parameters
+        ----------
+        statistics : dictionary
+            Accumulators, with the structure of the dictionary given by
+            ``__surface_statistics_by_hour``. Updated in place.
+        surface_data : dictionary
+            Surface data, with the structure of the converted_surface_data
+            dictionary.
+
+        Returns
+        -------
+        None
+        """
+        values = defaultdict(lambda: defaultdict(list))
+        for day_dict in surface_data.values():
+            for hour, hour_dict in day_dict.items():
+                for key in ["surface_temperature", "surface_wind_gust"]:
+                    values[key][hour].append(hour_dict[key])
+                for level in ["10m", "100m"]:
+                    values[f"surface{level}_wind_speed"][hour].append(
+                        (
+                            hour_dict[f"surface{level}_wind_velocity_x"] ** 2
+                            + hour_dict[f"surface{level}_wind_velocity_y"] ** 2
+                        )
+                        ** 0.5
+                    )
+        for key, values_by_hour in values.items():
+            for hour, hour_values in values_by_hour.items():
+                statistics[key].setdefault(hour, RunningMoments()).update(hour_values)
+        return None
+
     @cached_property
     def temperature_by_hour(self):
         """A dictionary containing the temperature for each hour and day in the
@@ -1783,8 +1870,10 @@ class EnvironmentAnalysis:
 
         """
         return {
-            hour: np.average(list(dates.values()))
-            for hour, dates in self.temperature_by_hour.items()
+            hour: moments.mean
+            for hour, moments in self.__surface_statistics_by_hour[
+                "surface_temperature"
+            ].items()
         }
 
     @cached_property
@@ -1810,8 +1899,10 @@ class EnvironmentAnalysis:
 
         """
         return {
-            hour: np.std(list(dates.values()))
-            for hour, dates in self.temperature_by_hour.items()
+            hour: moments.std
+            for hour, moments in self.__surface_statistics_by_hour[
+                "surface_temperature"
+            ].items()
         }
 
     @cached_property
@@ -1879,8 +1970,10 @@ class EnvironmentAnalysis:
 
         """
         return {
-            hour: np.average(list(dates.values()))
-            for hour, dates in self.surface_10m_wind_speed_by_hour.items()
+            hour: moments.mean
+            for hour, moments in self.__surface_statistics_by_hour[
+                "surface10m_wind_speed"
+            ].items()
         }
 
     @cached_property
@@ -1906,8 +1999,10 @@ class EnvironmentAnalysis:
 
         """
         return {
-            hour: np.std(list(dates.values()))
-            for hour, dates in self.surface_10m_wind_speed_by_hour.items()
+            hour: moments.std
+            for hour, moments in self.__surface_statistics_by_hour[
+                "surface10m_wind_speed"
+            ].items()
         }
 
     @cached_property
@@ -1975,8 +2070,10 @@ class EnvironmentAnalysis:
 
         """
         return {
-            hour: np.average(list(dates.values()))
-            for hour, dates in self.surface_100m_wind_speed_by_hour.items()
+            hour: moments.mean
+            for hour, moments in self.__surface_statistics_by_hour[
+                "surface100m_wind_speed"
+            ].items()
         }
 
     @cached_property
@@ -2003,8 +2100,10 @@ class EnvironmentAnalysis:
 
         """
         return {
-            hour: np.std(list(dates.values()))
-            for hour, dates in self.surface_100m_wind_speed_by_hour.items()
+            hour: moments.std
+            for hour, moments in self.__surface_statistics_by_hour[
+                "surface100m_wind_speed"
+            ].items()
         }
 
     @cached_property
@@ -2138,7 +2237,7 @@ class EnvironmentAnalysis:
         """The altitude range for the pressure level data. The minimum altitude
         is always 0, and the maximum altitude is the maximum altitude of the
         pressure level data, or the maximum expected altitude if it is set.
-        Units are kept as they are in the original data.
+        Units are converted to the preferred unit system.
 
         Returns
         -------
@@ -2148,12 +2247,12 @@ class EnvironmentAnalysis:
         """
         min_altitude = 0
         if self.max_expected_altitude == None:
-            max_altitudes = [
-                np.max(day_dict[hour]["wind_speed"].source[-1, 0])
-                for day_dict in self.original_pressure_level_data.values()
-                for hour in day_dict.keys()
-            ]
-            max_altitude = np.min(max_altitudes)
+            max_altitudes = np.max(self.pressure_level_cube.height, axis=1)
+            max_altitude = convert_units(
+                np.min(max_altitudes),
+                self.current_units["height_ASL"],
+                self.unit_system["length"],
+            )
         else:
             max_altitude = self.max_expected_altitude
         return min_altitude, max_altitude
@@ -2162,8 +2261,8 @@ class EnvironmentAnalysis:
     def altitude_list(self, points=200):
         """A list of altitudes, from 0 to the maximum altitude of the pressure
         level data, or the maximum expected altitude if it is set. The list is
-        cached so that the computation is only done once. Units are kept as they
-        are in the original data.
+        cached so that the computation is only done once. Units are converted
+        to the preferred unit system.
 
         Parameters
         ----------
@@ -2873,11 +2972,188 @@ class EnvironmentAnalysis:
 
         return None
 
+    def append(
+        self, surface_data_file=None, pressure_level_data_file=None, end_date=None
+    ):
+        """Append the data of new surface and pressure level weather files to
+        the analysis, such as the latest days of a reanalysis, without parsing
+        the previous files again.
+
+        Only the times of the new files that are within the analysis range of
+        dates and hours, and that are not already in the analysis, are read.
+        The dictionaries by hour and the accumulators from which the averages,
+        standard deviations and records by hour are computed are updated with
+        the new values only. The other results are recomputed from the data
+        in memory when next used.
+
+        Parameters
+        ----------
+        surface_data_file : str, optional
+            Path to the netCDF file containing the new surface data.
+        pressure_level_data_file : str, optional
+            Path to the netCDF file containing the new pressure level data.
+        end_date : datetime.datetime, optional
+            New end date and time of the analysis, after the last date of the
+            new files. If None, the end date of the analysis is kept.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        Extend the analysis of the previous years with the files of the last
+        week:
+
+        >>> env_analysis.append( # doctest: +SKIP
+        ...     surface_data_file="last_week_surface.nc",
+        ...     pressure_level_data_file="last_week_pressure_levels.nc",
+        ...     end_date=datetime.datetime(2024, 1, 8),
+        ... )
+        """
+        if end_date is not None:
+            if end_date.tzinfo is None:
+                end_date = self.preferred_timezone.localize(end_date)
+            self.end_date = end_date
+
+        if surface_data_file is not None:
+            self.__append_surface_data(surface_data_file)
+        if pressure_level_data_file is not None:
+            self.__append_pressure_level_data(pressure_level_data_file)
+
+        # Discard the cached results that were not updated
+        for name, attribute in vars(EnvironmentAnalysis).items():
+            if isinstance(attribute, cached_property) and name not in _APPENDED_CACHES:
+                self.__dict__.pop(name, None)
+        self.plots = _EnvironmentAnalysisPlots(self)
+
+        return None
+
+    def __append_surface_data(self, filename):
+        """Read the new times of a surface weather file and add them to the
+        surface data and to the cached results that depend on each time only.
+
+        Parameters
+        ----------
+        filename : str
+            Path to the netCDF file containing the new surface data.
+
+        Returns
+        -------
+        None
+        """
+        original_data = self.original_surface_data
+        parsed_times = {
+            (date, hour)
+            for date, day_dict in original_data.items()
+            for hour in day_dict
+        }
+        new_data = self.__read_surface_file(filename, parsed_times)[0]
+        for date, day_dict in new_data.items():
+            original_data.setdefault(date, {}).update(day_dict)
+
+        cache = self.__dict__
+        if "converted_surface_data" not in cache:
+            return None
+        new_data = self.__convert_surface_data(new_data)
+        for date, day_dict in new_data.items():
+            cache["converted_surface_data"].setdefault(date, {}).update(day_dict)
+
+        if "hours" in cache:
+            new_hours = {
+                int(hour) for day_dict in new_data.values() for hour in day_dict
+            }
+            cache["hours"] = sorted(set(cache["hours"]) | new_hours)
+        if "days" in cache:
+            cache["days"] += [day for day in new_data if day not in cache["days"]]
+
+        def wind_speed(hour_dict, level="10m"):
+            return (
+                hour_dict[f"surface{level}_wind_velocity_x"] ** 2
+                + hour_dict[f"surface{level}_wind_velocity_y"] ** 2
+            ) ** 0.5
+
+        def wind_direction(hour_dict):
+            vx = hour_dict["surface10m_wind_velocity_x"]
+            vy = hour_dict["surface10m_wind_velocity_y"]
+            return (180 + (np.arctan2(vy, vx) * 180 / np.pi)) % 360
+
+        # Dictionaries of values by hour and date
+        values_by_date = {
+            "temperature_by_hour": lambda hour_dict: hour_dict["surface_temperature"],
+            "surface_10m_wind_speed_by_hour": wind_speed,
+            "surface_100m_wind_speed_by_hour": lambda hour_dict: wind_speed(
+                hour_dict, "100m"
+            ),
+        }
+        for name, value in values_by_date.items():
+            if name in cache:
+                for date, day_dict in new_data.items():
+                    for hour, hour_dict in day_dict.items():
+                        cache[name][hour][date] = value(hour_dict)
+
+        # Lists of values by hour, sorted by hour
+        def append_by_hour(dictionary, value):
+            for day_dict in new_data.values():
+                for hour, hour_dict in day_dict.items():
+                    dictionary.setdefault(int(hour), []).append(value(hour_dict))
+            return dict(sorted(dictionary.items()))
+
+        wind_data = "_EnvironmentAnalysis__process_surface_wind_data"
+        if wind_data in cache:
+            speeds, directions = cache[wind_data]
+            cache[wind_data] = (
+                append_by_hour(speeds, wind_speed),
+                append_by_hour(directions, wind_direction),
+            )
+        if "surface_wind_gust_by_hour" in cache:
+            cache["surface_wind_gust_by_hour"] = append_by_hour(
+                cache["surface_wind_gust_by_hour"],
+                lambda hour_dict: hour_dict["surface_wind_gust"],
+            )
+
+        # Accumulators of the averages, standard deviations and records
+        statistics = "_EnvironmentAnalysis__surface_statistics_by_hour"
+        if statistics in cache:
+            self.__update_surface_statistics(cache[statistics], new_data)
+
+        return None
+
+    def __append_pressure_level_data(self, filename):
+        """Read the new times of a pressure level weather file and append
+        their profiles to the pressure level data.
+
+        Parameters
+        ----------
+        filename : str
+            Path to the netCDF file containing the new pressure level data.
+
+        Returns
+        -------
+        None
+        """
+        cube = self.pressure_level_cube
+        new_cube = self.__read_pressure_level_file(
+            filename, set(zip(cube.dates, cube.hours))
+        )[4]
+        cube = cube.concatenate(new_cube)
+        self.__dict__["_EnvironmentAnalysis__parse_pressure_level_data"] = (
+            cube.to_dictionary(),
+            *self.__parse_pressure_level_data[1:5],
+            cube,
+        )
+        return None
+
     @classmethod
-    def load(self, filename="env_analysis_dict"):
+    def load(cls, filename="env_analysis_dict"):
         """Load a previously saved Environment Analysis file.
         Example: EnvA = EnvironmentAnalysis.load("filename").
 
+        The parsed arrays are memory mapped, so that loading is fast and the
+        data is only read from disk when used. The weather files are not
+        needed. Files saved with ``jsonpickle`` by previous versions of
+        RocketPy are also loaded, which requires ``jsonpickle``.
+
         Parameters
         ----------
         filename : str, optional
@@ -2888,13 +3164,69 @@ class EnvironmentAnalysis:
         EnvironmentAnalysis object
 
         """
-        jsonpickle = import_optional_dependency("jsonpickle")
-        encoded_class = open(filename).read()
-        return jsonpickle.decode(encoded_class)
+        if not os.path.isdir(filename):
+            jsonpickle = import_optional_dependency("jsonpickle")
+            with open(filename) as file:
+                return jsonpickle.decode(file.read())
+
+        with open(os.path.join(filename, _METADATA_FILENAME)) as file:
+            metadata = json.load(file)
+
+        def read(name):
+            return np.load(os.path.join(filename, name + ".npy"), mmap_mode="r")
+
+        # Restore the inputs, without parsing the weather files
+        env_analysis = cls.__new__(cls)
+        for attribute, value in metadata["inputs"].items():
+            setattr(env_analysis, attribute, value)
+        for attribute in ["start_date", "end_date"]:
+            date = datetime.datetime.fromisoformat(metadata["inputs"][attribute])
+            setattr(env_analysis, attribute, date)
+
+        # Restore the parsed data as the cached results of the parsing
+        surface = metadata["surface"]
+        values = {
+            key: np.ma.array(read(f"surface_{key}"), mask=read(f"surface_{key}_mask"))
+            for key in surface["variables"]
+        }
+        dictionary = {}
+        for index, (date, hour) in enumerate(zip(surface["dates"], surface["hours"])):
+            dictionary.setdefault(date, {})[hour] = {
+                key: value[index] for key, value in values.items()
+            }
+        env_analysis.__dict__["_EnvironmentAnalysis__parse_surface_data"] = (
+            dictionary,
+            *surface["grid"],
+            surface["elevation"],
+        )
+
+        pressure_level = metadata["pressure_level"]
+        cube = ProfileCube(
+            pressure_level["dates"],
+            pressure_level["hours"],
+            read("pressure_level_height"),
+            {key: read(f"pressure_level_{key}") for key in pressure_level["fields"]},
+        )
+        env_analysis.__dict__["_EnvironmentAnalysis__parse_pressure_level_data"] = (
+            cube.to_dictionary(),
+            *pressure_level["grid"],
+            cube,
+        )
+
+        env_analysis.__initialize()
+        env_analysis.forecast = None
+
+        return env_analysis
 
     def save(self, filename="env_analysis_dict"):
         """Save the Environment Analysis object to a file so it can be used
-        later.
+        later, with ``EnvironmentAnalysis.load``.
+
+        The file is a directory with the inputs of the analysis in a small
+        ``metadata.json`` file and the parsed data of the weather files in
+        binary ``.npy`` files, one for each variable. The data is saved in the
+        units of the weather files, and converted to the unit system of the
+        analysis when loaded. The forecasts of the analysis are not saved.
 
         Parameters
         ----------
@@ -2905,11 +3237,83 @@ class EnvironmentAnalysis:
         -------
         None
         """
-        jsonpickle = import_optional_dependency("jsonpickle")
-        encoded_class = jsonpickle.encode(self)
-        file = open(filename, "w")
-        file.write(encoded_class)
-        file.close()
+        temporary = filename + ".tmp"
+        if os.path.isdir(temporary):
+            shutil.rmtree(temporary)
+        os.makedirs(temporary)
+
+        def write(name, array):
+            np.save(os.path.join(temporary, name + ".npy"), array)
+
+        # Surface data, as one (time,) array and mask for each variable
+        surface = {"dates": [], "hours": [], "variables": []}
+        values = defaultdict(list)
+        for date, day_dict in self.original_surface_data.items():
+            for hour, hour_dict in day_dict.items():
+                surface["dates"].append(date)
+                surface["hours"].append(hour)
+                for key, value in hour_dict.items():
+                    values[key].append(value)
+        for key, value in values.items():
+            mask = np.array([np.ma.is_masked(element) for element in value])
+            data = [
+                np.nan if masked else element for element, masked in zip(value, mask)
+            ]
+            write(f"surface_{key}", np.array(data, dtype=float))
+            write(f"surface_{key}_mask", mask)
+        surface["variables"] = list(values)
+        surface["grid"] = [
+            float(self.single_level_lat0),
+            float(self.single_level_lat1),
+            float(self.single_level_lon0),
+            float(self.single_level_lon1),
+        ]
+        surface["elevation"] = float(self.original_elevation)
+
+        # Pressure level data, as one (time, level) array for each variable
+        cube = self.pressure_level_cube
+        write("pressure_level_height", cube.height)
+        for key, value in cube.fields.items():
+            write(f"pressure_level_{key}", value)
+        pressure_level = {
+            "dates": cube.dates,
+            "hours": cube.hours,
+            "fields": list(cube.fields),
+            "grid": [
+                float(self.pressure_level_lat0),
+                float(self.pressure_level_lat1),
+                float(self.pressure_level_lon0),
+                float(self.pressure_level_lon1),
+            ],
+        }
+
+        metadata = {
+            "version": 1,
+            "inputs": {
+                "start_date": self.start_date.isoformat(),
+                "end_date": self.end_date.isoformat(),
+                "start_hour": self.start_hour,
+                "end_hour": self.end_hour,
+                "latitude": self.latitude,
+                "longitude": self.longitude,
+                "surface_data_file": self.surface_data_file,
+                "pressure_level_data_file": self.pressure_level_data_file,
+                "preferred_timezone": str(self.preferred_timezone),
+                "unit_system": self.unit_system_string,
+                "max_expected_altitude": self.max_expected_altitude,
+            },
+            "surface": surface,
+            "pressure_level": pressure_level,
+        }
+        with open(os.path.join(temporary, _METADATA_FILENAME), "w") as file:
+            json.dump(metadata, file)
+
+        # Replace any previous file only once the new one is complete
+        if os.path.isdir(filename):
+            shutil.rmtree(filename)
+        elif os.path.exists(filename):
+            os.remove(filename)
+        os.rename(temporary, filename)
         print("Your Environment Analysis file was saved, check it out: " + filename)
 
         return None
@@ -0,0 +1,394 @@
+"""
+Defines the ForecastCube class, an atmosphere that varies in time and space,
+given by the pressure level fields of a weather forecast or reanalysis on a
+small block of its grid around the launch site. Instead of a single vertical
+profile at the launch site and time, the atmospheric quantities are
+interpolated along the trajectory of the rocket.
+"""
+
+from bisect import bisect_right
+
+import numpy as np
+
+from ..mathutils.function import Function
+from .atmosphere_table import AtmosphereTable
+
+# Number of fields stored for each grid point: geometric height, temperature
+# and wind velocities in the x and y directions
+_FIELDS = 4
+
+
+def _axis_weights(grid, value):
+    """Returns the index of the lower neighbor of a value in an ascending
+    grid and the weight of the upper neighbor for a linear interpolation.
+    Values outside of the grid take the value at its closest end."""
+    index = min(max(bisect_right(grid, value), 1), len(grid) - 1)
+    lower, upper = grid[index - 1], grid[index]
+    weight = min(max((value - lower) / (upper - lower), 0.0), 1.0)
+    return index - 1, weight
+
+
+def _axis_weights_array(grid, values):
+    """Vectorized version of ``_axis_weights``."""
+    indices = np.clip(np.searchsorted(grid, values, side="right"), 1, len(grid) - 1)
+    lower, upper = grid[indices - 1], grid[indices]
+    weights = np.clip((values - lower) / (upper - lower), 0.0, 1.0)
+    return indices - 1, weights
+
+
+class ForecastCube:
+    """Atmosphere that varies in time and space, given by the geometric height,
+    temperature and wind velocities of a set of pressure levels on a regular
+    grid of times, northings and eastings around the launch site.
+
+    The atmospheric quantities at a time and position are obtained by a
+    trilinear interpolation of the vertical profiles of the neighboring grid
+    points in time, northing and easting, followed by a linear interpolation
+    in height, as done by ``Environment.process_forecast_reanalysis`` for a
+    single profile. Values outside of the grid take the values at its
+    boundary. The fields are stored in a single contiguous array, ordered so
+    that the profiles needed by one interpolation are close in memory.
+
+    The ForecastCube of an Environment is created by setting its atmospheric
+    model with ``time_varying=True``, and is then used by the Flight class.
+    The Environment keeps the gravity of its ForecastCube up to date and adds
+    its wind gusts to it, see ``Environment.add_wind_gust``.
+
+    Attributes
+    ----------
+    ForecastCube.time : numpy.ndarray
+        Times of the grid, in seconds after the launch.
+    ForecastCube.northing : numpy.ndarray
+        Northings of the grid, in meters from the launch site.
+    ForecastCube.easting : numpy.ndarray
+        Eastings of the grid, in meters from the launch site.
+    ForecastCube.pressure_levels : numpy.ndarray
+        Pressure levels, in Pa, in decreasing order.
+    ForecastCube.fields : numpy.ndarray
+        Array of shape (time, northing, easting, 4, level) with the geometric
+        height in meters above sea level, the temperature in K and the wind
+        velocities in the x (East) and y (North) directions in m/s.
+    ForecastCube.gravity : Function
+        Gravity acceleration as a function of the height above sea level.
+    ForecastCube.wind_gust_x : Function, None
+        Wind gust added to the wind velocity in the x (East) direction, as a
+        function of the height above sea level, or None if there is none.
+    ForecastCube.wind_gust_y : Function, None
+        Wind gust added to the wind velocity in the y (North) direction, as a
+        function of the height above sea level, or None if there is none.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from rocketpy import Function
+    >>> from rocketpy.environment.forecast_cube import ForecastCube
+    >>> shape = (2, 3, 2, 3)  # time, level, northing, easting
+    >>> height = np.broadcast_to([[[0.0]], [[1000.0]], [[2000.0]]], shape)
+    >>> wind_u = np.broadcast_to(np.array([0.0, 10.0]).reshape(2, 1, 1, 1), shape)
+    >>> cube = ForecastCube(
+    ...     time=[0, 3600],
+    ...     northing=[-1000, 1000],
+    ...     easting=[-1000, 0, 1000],
+    ...     pressure_levels=[100000, 90000, 80000],
+    ...     height=height,
+    ...     temperature=np.full(shape, 280.0),
+    ...     wind_u=wind_u,
+    ...     wind_v=np.zeros(shape),
+    ...     gravity=Function(9.81),
+    ... )
+    >>> cube.get_wind_velocity(1800, 0, 0, 500)
+    [5.0, 0.0]
+    >>> cube.get_state(1800, 0, 0, 500)[5]
+    95000.0
+    """
+
+    def __init__(
+        self,
+        time,
+        northing,
+        easting,
+        pressure_levels,
+        height,
+        temperature,
+        wind_u,
+        wind_v,
+        gravity,
+        air_gas_constant=287.05287,
+    ):
+        """Stores the fields of a forecast or reanalysis.
+
+        Parameters
+        ----------
+        time : array_like
+            Times of the grid, in seconds after the launch.
+        northing : array_like
+            Northings of the grid, in meters from the launch site.
+        easting : array_like
+            Eastings of the grid, in meters from the launch site.
+        pressure_levels : array_like
+            Pressure levels, in Pa.
+        height : array_like
+            Geometric height of the pressure levels, in meters above sea level,
+            with shape (time, level, northing, easting).
+        temperature : array_like
+            Temperature at the pressure levels, in K, with the same shape as
+            ``height``.
+        wind_u : array_like
+            Wind velocity in the x (East) direction at the pressure levels, in
+            m/s, with the same shape as ``height``.
+        wind_v : array_like
+            Wind velocity in the y (North) direction at the pressure levels, in
+            m/s, with the same shape as ``height``.
+        gravity : Function
+            Gravity acceleration as a function of the height above sea level.
+        air_gas_constant : float, optional
+            Specific gas constant of the air, in J/(kg K). Default is
+            287.05287.
+
+        Returns
+        -------
+        None
+        """
+        fields = np.stack(
+            [
+                np.asarray(field, dtype=float)
+                for field in (height, temperature, wind_u, wind_v)
+            ]
+        )
+        axes = [np.asarray(axis, dtype=float) for axis in (time, northing, easting)]
+        # Sort every axis in ascending order and the levels by height
+        for axis_number, axis in enumerate(axes):
+            order = np.argsort(axis)
+            axes[axis_number] = axis[order]
+            fields = np.take(fields, order, axis=axis_number + (axis_number > 0) + 1)
+        levels = np.asarray(pressure_levels, dtype=float)
+        order = np.argsort(-levels)
+        levels = levels[order]
+        fields = np.take(fields, order, axis=2)
+        # Single point axes are repeated, so that every axis has an interval
+        for axis_number, axis in enumerate(axes):
+            if len(axis) == 1:
+                axes[axis_number] = np.array([axis[0], axis[0] + 1])
+                fields = np.repeat(fields, 2, axis=axis_number + (axis_number > 0) + 1)
+
+        self.time, self.northing, self.easting = axes
+        self.pressure_levels = levels
+        # From (field, time, level, northing, easting) to
+        # (time, northing, easting, field, level)
+        self.fields = np.ascontiguousarray(fields.transpose(1, 3, 4, 0, 2))
+        self.gravity = gravity
+        self.air_gas_constant = air_gas_constant
+        self.wind_gust_x = None
+        self.wind_gust_y = None
+
+        self._time_list = self.time.tolist()
+        self._northing_list = self.northing.tolist()
+        self._easting_list = self.easting.tolist()
+        self._levels_list = levels.tolist()
+        self._profile_key = None
+        self._profile = None
+
+    def __profile(self, t, x, y):
+        """Interpolates the vertical profile at a time and horizontal position,
+        reusing the last one if they are the same."""
+        key = (t, x, y)
+        if key != self._profile_key:
+            i, wt = _axis_weights(self._time_list, t)
+            j, wy = _axis_weights(self._northing_list, y)
+            k, wx = _axis_weights(self._easting_list, x)
+            weights = np.array(
+                [
+                    a * b * c
+                    for a in (1 - wt, wt)
+                    for b in (1 - wy, wy)
+                    for c in (1 - wx, wx)
+                ]
+            )
+            corners = self.fields[i : i + 2, j : j + 2, k : k + 2].reshape(8, -1)
+            self._profile = (weights @ corners).reshape(_FIELDS, -1).tolist()
+            self._profile_key = key
+        return self._profile
+
+    def add_wind_gust(self, wind_gust_x, wind_gust_y):
+        """Adds functions of altitude to the wind velocities of the cube, in
+        order to simulate a wind gust.
+
+        Parameters
+        ----------
+        wind_gust_x : float, callable
+            Callable, function of altitude, which will be added to the
+            x velocity of the cube. If float is given, it will be considered
+            as a constant function in altitude.
+        wind_gust_y : float, callable
+            Callable, function of altitude, which will be added to the
+            y velocity of the cube. If float is given, it will be considered
+            as a constant function in altitude.
+
+        Returns
+        -------
+        None
+        """
+        wind_gust_x = Function(wind_gust_x, "Height (m)", "Wind Gust X (m/s)")
+        wind_gust_y = Function(wind_gust_y, "Height (m)", "Wind Gust Y (m/s)")
+        if self.wind_gust_x is not None:
+            wind_gust_x = self.wind_gust_x + wind_gust_x
+            wind_gust_y = self.wind_gust_y + wind_gust_y
+        self.wind_gust_x = wind_gust_x
+        self.wind_gust_y = wind_gust_y
+
+    def __add_wind_gust(self, wind_u, wind_v, z):
+        """Adds the wind gust of the cube, if any, to wind velocities at a
+        single altitude."""
+        if self.wind_gust_x is None:
+            return wind_u, wind_v
+        return (
+            wind_u + self.wind_gust_x.get_value_opt(z),
+            wind_v + self.wind_gust_y.get_value_opt(z),
+        )
+
+    def get_wind_velocity(self, t, x, y, z):
+        """Evaluates the wind velocity components at a single time and
+        position.
+
+        Parameters
+        ----------
+        t : float
+            Time after the launch, in seconds.
+        x : float
+            Position in the x (East) direction, in meters from the launch site.
+        y : float
+            Position in the y (North) direction, in meters from the launch
+            site.
+        z : float
+            Altitude above sea level, in meters.
+
+        Returns
+        -------
+        list
+            Wind velocities in the x (East) and y (North) directions, in m/s.
+        """
+        heights, _, wind_u, wind_v = self.__profile(t, x, y)
+        i, w = _axis_weights(heights, z)
+        return list(
+            self.__add_wind_gust(
+                wind_u[i] + w * (wind_u[i + 1] - wind_u[i]),
+                wind_v[i] + w * (wind_v[i + 1] - wind_v[i]),
+                z,
+            )
+        )
+
+    def get_state(self, t, x, y, z):
+        """Evaluates the atmospheric quantities at a single time and position.
+
+        Parameters
+        ----------
+        t : float
+            Time after the launch, in seconds.
+        x : float
+            Position in the x (East) direction, in meters from the launch site.
+        y : float
+            Position in the y (North) direction, in meters from the launch
+            site.
+        z : float
+            Altitude above sea level, in meters.
+
+        Returns
+        -------
+        list
+            Values of the atmospheric quantities, in the order of the
+            ``AtmosphereTable.columns`` attribute.
+        """
+        heights, temperatures, wind_u, wind_v = self.__profile(t, x, y)
+        i, w = _axis_weights(heights, z)
+        levels = self._levels_list
+        temperature = temperatures[i] + w * (temperatures[i + 1] - temperatures[i])
+        pressure = levels[i] + w * (levels[i + 1] - levels[i])
+        return [
+            *self.__add_wind_gust(
+                wind_u[i] + w * (wind_u[i + 1] - wind_u[i]),
+                wind_v[i] + w * (wind_v[i + 1] - wind_v[i]),
+                z,
+            ),
+            (1.4 * self.air_gas_constant * temperature) ** 0.5,
+            pressure / (self.air_gas_constant * temperature),
+            self.gravity.get_value_opt(z),
+            pressure,
+            temperature,
+            1.458e-6 * temperature**1.5 / (temperature + 110.4),
+        ]
+
+    def get_states(self, t, x, y, z):
+        """Evaluates the atmospheric quantities at many times and positions.
+
+        Parameters
+        ----------
+        t : array_like
+            Times after the launch, in seconds.
+        x : array_like
+            Positions in the x (East) direction, in meters from the launch
+            site.
+        y : array_like
+            Positions in the y (North) direction, in meters from the launch
+            site.
+        z : array_like
+            Altitudes above sea level, in meters.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array with the values of the atmospheric quantities, whose last
+            axis follows the order of the ``AtmosphereTable.columns``
+            attribute and whose other axes follow the broadcast shape of the
+            arguments.
+        """
+        t, x, y, z = np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (t, x, y, z))
+        )
+        shape = t.shape
+        t, x, y, z = (v.ravel() for v in (t, x, y, z))
+
+        # Trilinear interpolation of the vertical profiles
+        i, wt = _axis_weights_array(self.time, t)
+        j, wy = _axis_weights_array(self.northing, y)
+        k, wx = _axis_weights_array(self.easting, x)
+        profiles = np.zeros((len(t), _FIELDS, len(self.pressure_levels)))
+        for di, weight_t in ((0, 1 - wt), (1, wt)):
+            for dj, weight_y in ((0, 1 - wy), (1, wy)):
+                for dk, weight_x in ((0, 1 - wx), (1, wx)):
+                    weights = (weight_t * weight_y * weight_x)[:, None, None]
+                    profiles += weights * self.fields[i + di, j + dj, k + dk]
+
+        # Linear interpolation in height
+        heights = profiles[:, 0]
+        n = heights.shape[1]
+        upper = np.clip((heights <= z[:, None]).sum(axis=1), 1, n - 1)[:, None]
+        lower_height = np.take_along_axis(heights, upper - 1, axis=1)
+        upper_height = np.take_along_axis(heights, upper, axis=1)
+        w = np.clip((z[:, None] - lower_height) / (upper_height - lower_height), 0, 1)
+        lower_values = np.take_along_axis(profiles, upper[:, None] - 1, axis=2)[..., 0]
+        upper_values = np.take_along_axis(profiles, upper[:, None], axis=2)[..., 0]
+        _, temperature, wind_u, wind_v = (
+            lower_values + w * (upper_values - lower_values)
+        ).T
+        levels = self.pressure_levels
+        w = w[:, 0]
+        pressure = levels[upper[:, 0] - 1] + w * (
+            levels[upper[:, 0]] - levels[upper[:, 0] - 1]
+        )
+        if self.wind_gust_x is not None:
+            wind_u = wind_u + [self.wind_gust_x.get_value_opt(value) for value in z]
+            wind_v = wind_v + [self.wind_gust_y.get_value_opt(value) for value in z]
+
+        states = np.column_stack(
+            [
+                wind_u,
+                wind_v,
+                (1.4 * self.air_gas_constant * temperature) ** 0.5,
+                pressure / (self.air_gas_constant * temperature),
+                [self.gravity.get_value_opt(value) for value in z],
+                pressure,
+                temperature,
+                1.458e-6 * temperature**1.5 / (temperature + 110.4),
+            ]
+        )
+        return states.reshape(shape + (len(AtmosphereTable.columns),))
@@ -0,0 +1,284 @@
+"""
+Defines the ProfileCube class, which stores the vertical profiles parsed by
+the EnvironmentAnalysis class from a pressure level weather file as
+contiguous (time, level) arrays, and creates the Function of a profile only
+when it is requested.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from ..mathutils.function import Function
+from ..units import convert_units
+
+# Output label of the Function of each profile, by name of the profile
+PROFILE_OUTPUTS = {
+    "geopotential": "geopotential",
+    "wind_velocity_x": "wind_velocity_x",
+    "wind_velocity_y": "wind_velocity_y",
+    "temperature": "temperature",
+    "pressure": "Pressure (Pa)",
+    "wind_speed": "Wind Speed (m/s)",
+    "wind_heading": "Wind Heading (Deg True)",
+    "wind_direction": "Wind Direction (Deg True)",
+}
+
+
+class _LazyProfiles(Mapping):
+    """Read-only dictionary with the profiles of a single time of a
+    ProfileCube, whose Functions are created on first access."""
+
+    def __init__(self, cube, index):
+        self._cube = cube
+        self._index = index
+        self._functions = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._functions[name]
+        except KeyError:
+            function = self._cube.get_profile(self._index, name)
+            self._functions[name] = function
+            return function
+
+    def __iter__(self):
+        return iter(self._cube.fields)
+
+    def __len__(self):
+        return len(self._cube.fields)
+
+    def __repr__(self):
+        return f"{{{', '.join(repr(name) for name in self)}}}"
+
+
+class ProfileCube:
+    """Vertical profiles of the atmosphere at a location, for a sequence of
+    dates and hours, stored as contiguous arrays of shape (time, level).
+
+    The profile of a variable at a time is the Function of the variable with
+    respect to the height above ground level, which is created only when it is
+    requested, by ``ProfileCube.get_profile`` or through the dictionary given
+    by ``ProfileCube.to_dictionary``.
+
+    Attributes
+    ----------
+    ProfileCube.dates : list of str
+        Date of each time, as "year.month.day".
+    ProfileCube.hours : list of str
+        Hour of each time.
+    ProfileCube.height : numpy.ndarray
+        Height above ground level of each level at each time, with shape
+        (time, level).
+    ProfileCube.fields : dict
+        Array of shape (time, level) with the values of each variable, by
+        name of the variable.
+    ProfileCube.inputs : str
+        Input label of the profile Functions.
+    ProfileCube.outputs : dict
+        Output label of the profile Functions, by name of the variable.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from rocketpy.environment.profile_cube import ProfileCube
+    >>> cube = ProfileCube(
+    ...     dates=["2021.1.1", "2021.1.1"],
+    ...     hours=["6", "7"],
+    ...     height=[[0, 1000], [0, 1100]],
+    ...     fields={"temperature": [[290, 284], [291, 285]]},
+    ... )
+    >>> data = cube.to_dictionary()
+    >>> list(data["2021.1.1"])
+    ['6', '7']
+    >>> float(data["2021.1.1"]["7"]["temperature"](1100))
+    285.0
+    """
+
+    def __init__(
+        self,
+        dates,
+        hours,
+        height,
+        fields,
+        inputs="Height Above Ground Level (m)",
+        outputs=None,
+    ):
+        """Stores the profiles.
+
+        Parameters
+        ----------
+        dates : list of str
+            Date of each time, as "year.month.day".
+        hours : list of str
+            Hour of each time.
+        height : array_like
+            Height above ground level of each level at each time, with shape
+            (time, level).
+        fields : dict
+            Values of each variable, with shape (time, level), by name of the
+            variable.
+        inputs : str, optional
+            Input label of the profile Functions. Default is
+            "Height Above Ground Level (m)".
+        outputs : dict, optional
+            Output label of the profile Functions, by name of the variable.
+            Variables without label take the labels of ``PROFILE_OUTPUTS``,
+            or their names otherwise.
+
+        Returns
+        -------
+        None
+        """
+        self.dates = list(dates)
+        self.hours = list(hours)
+        self.height = np.ascontiguousarray(height, dtype=float)
+        self.fields = {
+            name: np.ascontiguousarray(values, dtype=float)
+            for name, values in fields.items()
+        }
+        for name, values in self.fields.items():
+            if values.shape != self.height.shape:
+                raise ValueError(
+                    f"The field '{name}' has shape {values.shape}, but the "
+                    f"height has shape {self.height.shape}."
+                )
+        if not len(self.dates) == len(self.hours) == len(self.height):
+            raise ValueError("There must be one date and one hour for each time.")
+        self.inputs = inputs
+        outputs = outputs or {}
+        self.outputs = {
+            name: outputs.get(name, PROFILE_OUTPUTS.get(name, name))
+            for name in self.fields
+        }
+
+    def __len__(self):
+        return len(self.height)
+
+    def __repr__(self):
+        return (
+            f"ProfileCube({len(self)} times, {self.height.shape[1]} levels, "
+            f"fields {list(self.fields)})"
+        )
+
+    def get_profile(self, index, name):
+        """Creates the Function of the profile of a variable at a time.
+
+        Parameters
+        ----------
+        index : int
+            Index of the time.
+        name : str
+            Name of the variable.
+
+        Returns
+        -------
+        Function
+            The variable as a Function of the height above ground level, with
+            constant extrapolation.
+        """
+        return Function(
+            np.column_stack((self.height[index], self.fields[name][index])),
+            inputs=self.inputs,
+            outputs=self.outputs[name],
+            extrapolation="constant",
+        )
+
+    def to_dictionary(self):
+        """Returns the profiles as a dictionary of dates, hours and variables,
+        whose Functions are created on first access.
+
+        Returns
+        -------
+        dict
+            Dictionary with the following structure:
+
+            .. code-block:: python
+
+                dictionary = {
+                    "date": {
+                        "hour": {
+                            "variable": Function,
+                            ...
+                        },
+                        ...
+                    },
+                    ...
+                }
+        """
+        dictionary = {}
+        for index, (date, hour) in enumerate(zip(self.dates, self.hours)):
+            dictionary.setdefault(date, {})[hour] = _LazyProfiles(self, index)
+        return dictionary
+
+    def concatenate(self, other):
+        """Returns a ProfileCube with the times of this cube followed by the
+        times of another one, with the same levels and variables.
+
+        Parameters
+        ----------
+        other : ProfileCube
+            Profiles to be appended.
+
+        Returns
+        -------
+        ProfileCube
+            The profiles of both cubes.
+        """
+        if other.height.shape[1:] != self.height.shape[1:]:
+            raise ValueError(
+                f"Cannot concatenate profiles with {other.height.shape[1]} "
+                f"levels to profiles with {self.height.shape[1]} levels."
+            )
+        if set(other.fields) != set(self.fields):
+            raise ValueError(
+                f"Cannot concatenate profiles with fields {list(other.fields)} "
+                f"to profiles with fields {list(self.fields)}."
+            )
+        return ProfileCube(
+            self.dates + other.dates,
+            self.hours + other.hours,
+            np.concatenate((self.height, other.height)),
+            {
+                name: np.concatenate((values, other.fields[name]))
+                for name, values in self.fields.items()
+            },
+            self.inputs,
+            self.outputs,
+        )
+
+    def convert(self, height_units, units):
+        """Returns a ProfileCube with the heights and variables converted to
+        other units, with the labels of the profile Functions renamed
+        accordingly.
+
+        Parameters
+        ----------
+        height_units : tuple of str
+            Units of the heights, as a (from_unit, to_unit) tuple.
+        units : dict
+            Units of the variables to be converted, as (from_unit, to_unit)
+            tuples, by name of the variable. Other variables are kept.
+
+        Returns
+        -------
+        ProfileCube
+            The converted profiles.
+        """
+        from_unit, to_unit = height_units
+        inputs = self.inputs
+        height = convert_units(self.height, from_unit, to_unit)
+        if from_unit != to_unit:
+            inputs = inputs.replace(from_unit, to_unit)
+
+        fields, outputs = {}, dict(self.outputs)
+        for name, values in self.fields.items():
+            if name not in units:
+                fields[name] = values
+                continue
+            from_unit, to_unit = units[name]
+            fields[name] = convert_units(values, from_unit, to_unit)
+            if from_unit != to_unit:
+                outputs[name] = outputs[name].replace(from_unit, to_unit)
+
+        return ProfileCube(self.dates, self.hours, height, fields, inputs, outputs)
@@ -0,0 +1,269 @@
+"""
+Defines the StandardAtmosphere class, a closed-form implementation of the
+International Standard Atmosphere defined by ISO 2533, which evaluates the
+temperature, pressure, density, speed of sound and dynamic viscosity at single
+altitudes or at arrays of altitudes, without any interpolation.
+"""
+
+from bisect import bisect_right
+from math import exp
+
+import numpy as np
+
+# Layers of the International Standard Atmosphere, from -2 km to 80 km of
+# geopotential height
+_LAYER_HEIGHTS = (-2e3, 0, 11e3, 20e3, 32e3, 47e3, 51e3, 71e3, 80e3)  # in m
+_LAYER_TEMPERATURES = (
+    301.15,
+    288.15,
+    216.65,
+    216.65,
+    228.65,
+    270.65,
+    270.65,
+    214.65,
+    196.65,
+)  # in K
+_LAYER_LAPSE_RATES = (
+    -6.5e-3,
+    -6.5e-3,
+    0,
+    1e-3,
+    2.8e-3,
+    0,
+    -2.8e-3,
+    -2e-3,
+    0,
+)  # in K/m
+_LAYER_PRESSURES = (
+    1.27774e5,
+    1.01325e5,
+    2.26320e4,
+    5.47487e3,
+    8.680164e2,
+    1.10906e2,
+    6.69384e1,
+    3.95639e0,
+    8.86272e-2,
+)  # in Pa
+
+
+class StandardAtmosphere:
+    """International Standard Atmosphere defined by ISO 2533, ranging from
+    -2 km to 80 km of geopotential height. Outside of this range, the values
+    at its closest end are used.
+
+    In each layer the temperature varies linearly with the geopotential
+    height, and the pressure follows from the hydrostatic equation, either as
+    a power law or, in isothermal layers, as an exponential. Both are written
+    as ``P = Pb * (T / Tb) ** n * exp(-k * (H - Hb))``, where ``n`` is zero in
+    isothermal layers and ``k`` is zero in the others, so that the layers of
+    many altitudes are evaluated at once, without branching.
+
+    Every method accepts either a single altitude, returning a float, or an
+    array of altitudes, returning an array of the same shape.
+
+    Attributes
+    ----------
+    StandardAtmosphere.columns : tuple
+        Names of the quantities returned by the ``get_state`` and
+        ``get_states`` methods, in order.
+    StandardAtmosphere.earth_radius : float
+        Earth radius used to convert between geometric and geopotential
+        heights, in meters.
+
+    Examples
+    --------
+    >>> from rocketpy.environment.standard_atmosphere import StandardAtmosphere
+    >>> isa = StandardAtmosphere()
+    >>> isa.pressure(0), isa.temperature(0)
+    (101325.0, 288.15)
+    >>> round(isa.density(0), 4)
+    1.225
+    >>> isa.pressure([0, 11019, 100000]).round(1).tolist()
+    [101325.0, 22632.1, 0.1]
+    >>> round(isa.barometric_height(22632.0))
+    11019
+    """
+
+    columns = (
+        "speed_of_sound",
+        "density",
+        "pressure",
+        "temperature",
+        "dynamic_viscosity",
+    )
+
+    def __init__(
+        self, earth_radius=6.3781e6, standard_g=9.80665, air_gas_constant=287.05287
+    ):
+        """Sets the constants of the atmosphere.
+
+        Parameters
+        ----------
+        earth_radius : float, optional
+            Earth radius used to convert between geometric and geopotential
+            heights, in meters. Default is 6.3781e6.
+        standard_g : float, optional
+            Standard gravity acceleration, in m/s². Default is 9.80665.
+        air_gas_constant : float, optional
+            Specific gas constant of the air, in J/(kg K). Default is
+            287.05287.
+
+        Returns
+        -------
+        None
+        """
+        self.earth_radius = earth_radius
+        self.standard_g = standard_g
+        self.air_gas_constant = air_gas_constant
+
+        g, R = standard_g, air_gas_constant
+        self._heights = np.array(_LAYER_HEIGHTS)
+        self._temperatures = np.array(_LAYER_TEMPERATURES)
+        self._lapse_rates = np.array(_LAYER_LAPSE_RATES)
+        self._pressures = np.array(_LAYER_PRESSURES)
+        isothermal = self._lapse_rates == 0
+        # Exponents of the power laws and coefficients of the exponentials
+        self._exponents = np.where(
+            isothermal, 0, -g / (R * np.where(isothermal, 1, self._lapse_rates))
+        )
+        self._decays = np.where(isothermal, g / (R * self._temperatures), 0)
+        self._layers = list(
+            zip(
+                _LAYER_HEIGHTS,
+                _LAYER_TEMPERATURES,
+                _LAYER_LAPSE_RATES,
+                _LAYER_PRESSURES,
+                self._exponents.tolist(),
+                self._decays.tolist(),
+            )
+        )
+
+    def __temperature_pressure(self, h):
+        """Returns the temperature and pressure at a geometric height, or at
+        an array of geometric heights."""
+        ER = self.earth_radius
+        if np.ndim(h) == 0:
+            H = min(max(ER * h / (ER + h), _LAYER_HEIGHTS[0]), _LAYER_HEIGHTS[-1])
+            layer = min(bisect_right(_LAYER_HEIGHTS, H), len(_LAYER_HEIGHTS)) - 1
+            Hb, Tb, B, Pb, n, k = self._layers[layer]
+            T = Tb + B * (H - Hb)
+            return T, Pb * (T / Tb) ** n * exp(-k * (H - Hb))
+
+        h = np.asarray(h, dtype=float)
+        H = np.clip(ER * h / (ER + h), _LAYER_HEIGHTS[0], _LAYER_HEIGHTS[-1])
+        layer = np.searchsorted(self._heights, H, side="right") - 1
+        dH = H - self._heights[layer]
+        Tb = self._temperatures[layer]
+        T = Tb + self._lapse_rates[layer] * dH
+        P = (
+            self._pressures[layer]
+            * (T / Tb) ** self._exponents[layer]
+            * np.exp(-self._decays[layer] * dH)
+        )
+        return T, P
+
+    def temperature(self, h):
+        """Temperature, in K, at a geometric height above sea level, in m."""
+        return self.__temperature_pressure(h)[0]
+
+    def pressure(self, h):
+        """Pressure, in Pa, at a geometric height above sea level, in m."""
+        return self.__temperature_pressure(h)[1]
+
+    def density(self, h):
+        """Density, in kg/m³, at a geometric height above sea level, in m."""
+        T, P = self.__temperature_pressure(h)
+        return P / (self.air_gas_constant * T)
+
+    def speed_of_sound(self, h):
+        """Speed of sound, in m/s, at a geometric height above sea level, in
+        m."""
+        T = self.__temperature_pressure(h)[0]
+        return (1.4 * self.air_gas_constant * T) ** 0.5
+
+    def dynamic_viscosity(self, h):
+        """Dynamic viscosity, in Pa s, at a geometric height above sea level,
+        in m."""
+        T = self.__temperature_pressure(h)[0]
+        return 1.458e-6 * T**1.5 / (T + 110.4)
+
+    def barometric_height(self, pressure):
+        """Geometric height above sea level, in m, at which the pressure, in
+        Pa, is found. Pressures outside of the range of the atmosphere give
+        the heights at its closest end."""
+        pressure = np.asarray(pressure, dtype=float)
+        P = np.clip(pressure, _LAYER_PRESSURES[-1], _LAYER_PRESSURES[0])
+        # Layer pressures decrease with height
+        layer = (
+            len(_LAYER_PRESSURES)
+            - 1
+            - np.searchsorted(self._pressures[::-1], P, side="left")
+        )
+        Hb, Tb = self._heights[layer], self._temperatures[layer]
+        B, Pb = self._lapse_rates[layer], self._pressures[layer]
+        isothermal = B == 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            H = np.where(
+                isothermal,
+                Hb - np.log(P / Pb) * self.air_gas_constant * Tb / self.standard_g,
+                Hb + Tb * ((P / Pb) ** (1 / self._exponents[layer]) - 1) / B,
+            )
+        h = self.earth_radius * H / (self.earth_radius - H)
+        return float(h) if h.ndim == 0 else h
+
+    def get_state(self, h):
+        """Evaluates the quantities of the ``columns`` attribute at a single
+        geometric height above sea level, in m.
+
+        Parameters
+        ----------
+        h : float
+            Geometric height above sea level, in m.
+
+        Returns
+        -------
+        list
+            Values of the speed of sound, density, pressure, temperature and
+            dynamic viscosity, in SI units.
+        """
+        T, P = self.__temperature_pressure(h)
+        R = self.air_gas_constant
+        return [
+            (1.4 * R * T) ** 0.5,
+            P / (R * T),
+            P,
+            T,
+            1.458e-6 * T**1.5 / (T + 110.4),
+        ]
+
+    def get_states(self, h):
+        """Evaluates the quantities of the ``columns`` attribute at many
+        geometric heights above sea level.
+
+        Parameters
+        ----------
+        h : array_like
+            Geometric heights above sea level, in m.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array whose last axis holds the speed of sound, density, pressure,
+            temperature and dynamic viscosity, in SI units, and whose other
+            axes follow the shape of ``h``.
+        """
+        h = np.asarray(h, dtype=float)
+        T, P = self.__temperature_pressure(h.reshape(-1))
+        R = self.air_gas_constant
+        states = np.column_stack(
+            [
+                (1.4 * R * T) ** 0.5,
+                P / (R * T),
+                P,
+                T,
+                1.458e-6 * T**1.5 / (T + 110.4),
+            ]
+        )
+        return states.reshape(h.shape + (len(self.columns),))
@@ -0,0 +1,190 @@
+"""
+Defines the TerrainGrid class, which stores a topographic raster, such as the
+ones of the NASADEM, as a regular grid of latitudes and longitudes and answers
+elevation queries by bilinear interpolation, either for single points or for
+arrays of points at once.
+"""
+
+from bisect import bisect_right
+
+import numpy as np
+
+
+class TerrainGrid:
+    """Elevation of the terrain on a regular grid of latitudes and longitudes.
+
+    The elevation at any point inside the grid is given by a bilinear
+    interpolation of the elevations of the four grid points around it. The
+    axes are stored in ascending order, whatever the order of the raster, so
+    that the grid cell of a point is found by a single binary search in each
+    axis, and many points are located at once by ``numpy.searchsorted``.
+
+    The TerrainGrid of an Environment is created by
+    ``Environment.set_topographic_profile``, and is then used by the Flight
+    class to detect the impact against the terrain.
+
+    Attributes
+    ----------
+    TerrainGrid.latitude : numpy.ndarray
+        Latitudes of the grid, in degrees, in ascending order.
+    TerrainGrid.longitude : numpy.ndarray
+        Longitudes of the grid, in degrees, in ascending order.
+    TerrainGrid.elevation : numpy.ndarray
+        Elevations of the grid points, in meters above sea level, with shape
+        (latitude, longitude).
+
+    Examples
+    --------
+    >>> from rocketpy.environment.terrain import TerrainGrid
+    >>> terrain = TerrainGrid(
+    ...     latitude=[46.0, 45.0],
+    ...     longitude=[8.0, 9.0],
+    ...     elevation=[[1000, 2000], [0, 1000]],
+    ... )
+    >>> terrain.get_elevation(45.5, 8.5)
+    1000.0
+    >>> terrain.get_elevations([45.0, 45.25], [8.0, 8.5]).tolist()
+    [0.0, 750.0]
+    """
+
+    def __init__(self, latitude, longitude, elevation):
+        """Stores a topographic raster.
+
+        Parameters
+        ----------
+        latitude : array_like
+            Latitudes of the raster, in degrees, in ascending or descending
+            order.
+        longitude : array_like
+            Longitudes of the raster, in degrees, in ascending or descending
+            order, either from -180 to 180 or from 0 to 360.
+        elevation : array_like
+            Elevations of the raster, in meters above sea level, with shape
+            (latitude, longitude). Masked values are taken as zero.
+
+        Returns
+        -------
+        None
+        """
+        latitude = np.asarray(latitude, dtype=float)
+        longitude = np.asarray(longitude, dtype=float)
+        elevation = np.ma.filled(np.ma.asarray(elevation, dtype=float), 0.0)
+        if elevation.shape != (len(latitude), len(longitude)):
+            raise ValueError(
+                "The elevation must have shape (latitude, longitude), "
+                f"{(len(latitude), len(longitude))}, not {elevation.shape}."
+            )
+        if len(latitude) < 2 or len(longitude) < 2:
+            raise ValueError("The grid must have at least two points in each axis.")
+        if latitude[0] > latitude[-1]:
+            latitude, elevation = latitude[::-1], elevation[::-1]
+        if longitude[0] > longitude[-1]:
+            longitude, elevation = longitude[::-1], elevation[:, ::-1]
+
+        self.latitude = latitude
+        self.longitude = longitude
+        self.elevation = np.ascontiguousarray(elevation)
+        self._negative_longitudes = longitude[0] < 0
+        self._latitude_list = latitude.tolist()
+        self._longitude_list = longitude.tolist()
+
+    def __repr__(self):
+        return (
+            f"TerrainGrid(latitude from {self.latitude[0]:f} to "
+            f"{self.latitude[-1]:f}, longitude from {self.longitude[0]:f} to "
+            f"{self.longitude[-1]:f})"
+        )
+
+    def __convert_longitude(self, longitude):
+        """Converts longitudes to the convention of the grid, either from -180
+        to 180 or from 0 to 360."""
+        if self._negative_longitudes:
+            return np.where(longitude < 180, longitude, -180 + longitude % 180)
+        return longitude % 360
+
+    @staticmethod
+    def __out_of_grid(name, value, grid):
+        return ValueError(
+            "{:s} {:f} not inside region covered by file, which is from {:f} to {:f}.".format(
+                name, value, grid[0], grid[-1]
+            )
+        )
+
+    def get_elevation(self, latitude, longitude):
+        """Evaluates the elevation of the terrain at a single point.
+
+        Parameters
+        ----------
+        latitude : float
+            Latitude of the point, in degrees.
+        longitude : float
+            Longitude of the point, in degrees.
+
+        Returns
+        -------
+        float
+            Elevation of the terrain, in meters above sea level.
+
+        Raises
+        ------
+        ValueError
+            If the point is outside of the grid.
+        """
+        longitude = float(self.__convert_longitude(longitude))
+        lats, lons = self._latitude_list, self._longitude_list
+        if not lats[0] <= latitude <= lats[-1]:
+            raise self.__out_of_grid("Latitude", latitude, lats)
+        if not lons[0] <= longitude <= lons[-1]:
+            raise self.__out_of_grid("Longitude", longitude, lons)
+        i = min(bisect_right(lats, latitude), len(lats) - 1)
+        j = min(bisect_right(lons, longitude), len(lons) - 1)
+        u = (latitude - lats[i - 1]) / (lats[i] - lats[i - 1])
+        v = (longitude - lons[j - 1]) / (lons[j] - lons[j - 1])
+        z = self.elevation
+        return float(
+            (1 - u) * ((1 - v) * z[i - 1, j - 1] + v * z[i - 1, j])
+            + u * ((1 - v) * z[i, j - 1] + v * z[i, j])
+        )
+
+    def get_elevations(self, latitude, longitude):
+        """Evaluates the elevation of the terrain at many points at once.
+
+        Parameters
+        ----------
+        latitude : array_like
+            Latitudes of the points, in degrees.
+        longitude : array_like
+            Longitudes of the points, in degrees.
+
+        Returns
+        -------
+        numpy.ndarray
+            Elevations of the terrain, in meters above sea level, with the
+            broadcast shape of the arguments.
+
+        Raises
+        ------
+        ValueError
+            If any of the points is outside of the grid.
+        """
+        latitude, longitude = np.broadcast_arrays(
+            np.asarray(latitude, dtype=float), np.asarray(longitude, dtype=float)
+        )
+        longitude = self.__convert_longitude(longitude)
+        for name, values, grid in (
+            ("Latitude", latitude, self.latitude),
+            ("Longitude", longitude, self.longitude),
+        ):
+            outside = (values < grid[0]) | (values > grid[-1]) | np.isnan(values)
+            if np.any(outside):
+                raise self.__out_of_grid(name, values[outside][0], grid)
+
+        lats, lons = self.latitude, self.longitude
+        i = np.minimum(np.searchsorted(lats, latitude, side="right"), len(lats) - 1)
+        j = np.minimum(np.searchsorted(lons, longitude, side="right"), len(lons) - 1)
+        u = (latitude - lats[i - 1]) / (lats[i] - lats[i - 1])
+        v = (longitude - lons[j - 1]) / (lons[j] - lons[j - 1])
+        z = self.elevation
+        return (1 - u) * ((1 - v) * z[i - 1, j - 1] + v * z[i - 1, j]) + u * (
+            (1 - v) * z[i, j - 1] + v * z[i, j]
+        )
@@ -0,0 +1,247 @@
+"""
+Defines the WeatherCache class, an on-disk cache of the atmospheres extracted
+from weather files by the Environment class. Reading and parsing a forecast,
+reanalysis, ensemble or sounding is much slower than loading the profiles it
+results in, so that configuring the same launch site and date many times, for
+instance across the processes of a batch of simulations, only parses each
+source once.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+# Version of the format of the cached atmospheres, part of every key so that
+# entries written by incompatible versions are never loaded
+_FORMAT_VERSION = 1
+_SUFFIX = ".pkl"
+_MISSING = object()
+
+
+def _file_identity(file):
+    """Identifies a weather source: local files by their absolute path,
+    modification time and size, and anything else, such as URLs, by itself."""
+    try:
+        stat = os.stat(file)
+    except (OSError, TypeError, ValueError):
+        return str(file)
+    return [os.path.abspath(file), stat.st_mtime_ns, stat.st_size]
+
+
+class WeatherCache:
+    """On-disk cache of the atmospheres extracted from weather files.
+
+    Each entry holds the attributes set on an Environment by one of its
+    ``process_*`` methods, such as the pressure, temperature and wind
+    Functions, the elevation and the information about the weather model,
+    stored in a file named after a hash of the method, the source file, the
+    other arguments of the method, and the date and location of the launch.
+    Local files are identified by their path, modification time and size, so
+    that an entry is not used once its file changes.
+
+    Entries are written atomically, so the cache can be shared by several
+    processes. Once the total size of the entries exceeds ``max_size``, the
+    least recently used ones are deleted.
+
+    The cache is used by an Environment once it is assigned to its
+    ``weather_cache`` attribute. Entries are stored with ``pickle``, therefore
+    only use cache directories that are trusted.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> from rocketpy import Environment
+    >>> from rocketpy.environment.weather_cache import WeatherCache
+    >>> env = Environment(date=(2019, 8, 10, 21), latitude=-23.36, longitude=-48.01)
+    >>> env.weather_cache = WeatherCache(tempfile.mkdtemp())
+    >>> env.set_atmospheric_model(
+    ...     type="Ensemble",
+    ...     file="data/weather/LASC2019_TATUI_reanalysis_ensemble.nc",
+    ...     dictionary="ECMWF",
+    ... )
+    >>> len(env.weather_cache)
+    1
+    """
+
+    def __init__(self, path, max_size=2**28):
+        """Opens a cache, whose directory is created if it does not exist.
+
+        Parameters
+        ----------
+        path : str, Path
+            Path of the directory of the cache.
+        max_size : int, optional
+            Maximum total size of the entries, in bytes. Default is 2**28,
+            that is 256 MiB.
+
+        Returns
+        -------
+        None
+        """
+        self.path = os.fspath(path)
+        self.max_size = max_size
+        os.makedirs(self.path, exist_ok=True)
+
+    def __len__(self):
+        """Number of entries in the cache."""
+        return len(self.__entries())
+
+    def __repr__(self):
+        return f"WeatherCache('{self.path}')"
+
+    def __entries(self):
+        """Paths of the entries of the cache."""
+        return [
+            os.path.join(self.path, name)
+            for name in os.listdir(self.path)
+            if name.endswith(_SUFFIX)
+        ]
+
+    @staticmethod
+    def key(*parts):
+        """Returns the key of an entry, which is the SHA-256 hash of its
+        parts.
+
+        Parameters
+        ----------
+        *parts
+            Values that identify the entry. Values that can not be converted
+            to JSON are represented by their strings.
+
+        Returns
+        -------
+        str
+            The hexadecimal digest of the hash.
+        """
+        text = json.dumps([_FORMAT_VERSION, *parts], default=str, sort_keys=True)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Reads an entry, marking it as the most recently used one.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry, as returned by ``WeatherCache.key``.
+
+        Returns
+        -------
+        dict, None
+            The attributes of the entry, or None if it is not in the cache or
+            can not be read.
+        """
+        entry = os.path.join(self.path, key + _SUFFIX)
+        try:
+            with open(entry, "rb") as file:
+                attributes = pickle.load(file)
+            os.utime(entry)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return attributes
+
+    def put(self, key, attributes):
+        """Writes an entry and then deletes the least recently used entries
+        until the total size of the cache is at most ``max_size``.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry, as returned by ``WeatherCache.key``.
+        attributes : dict
+            The attributes to be stored.
+
+        Returns
+        -------
+        None
+        """
+        descriptor, temporary_entry = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as file:
+            pickle.dump(attributes, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_entry, os.path.join(self.path, key + _SUFFIX))
+        self.evict()
+
+    def evict(self):
+        """Deletes the least recently used entries until the total size of
+        the cache is at most ``max_size``.
+
+        Returns
+        -------
+        None
+        """
+        entries = []
+        for entry in self.__entries():
+            try:
+                stat = os.stat(entry)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+        entries.sort()
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(entry)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def clear(self):
+        """Deletes all the entries of the cache.
+
+        Returns
+        -------
+        None
+        """
+        for entry in self.__entries():
+            try:
+                os.remove(entry)
+            except FileNotFoundError:
+                pass
+
+
+def cached_atmosphere(method):
+    """Decorates a method of the Environment class that processes a weather
+    source, given as its first argument, so that the attributes it sets are
+    stored in and loaded from the ``weather_cache`` of the Environment, if it
+    has one."""
+
+    @functools.wraps(method)
+    def wrapper(environment, file, *args, **kwargs):
+        cache = environment.weather_cache
+        if cache is None:
+            return method(environment, file, *args, **kwargs)
+
+        key = cache.key(
+            method.__name__,
+            _file_identity(file),
+            args,
+            kwargs,
+            environment.datetime_date,
+            environment.latitude,
+            environment.longitude,
+            environment.earth_radius,
+        )
+        attributes = cache.get(key)
+        if attributes is not None:
+            for name, value in attributes.items():
+                setattr(environment, name, value)
+            return None
+
+        previous_attributes = dict(environment.__dict__)
+        result = method(environment, file, *args, **kwargs)
+        cache.put(
+            key,
+            {
+                name: value
+                for name, value in environment.__dict__.items()
+                if name != "_atmosphere_table"
+                and previous_attributes.get(name, _MISSING) is not value
+            },
+        )
+        return result
+
+    return wrapper
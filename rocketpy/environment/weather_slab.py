@@ -0,0 +1,191 @@
+"""
+Defines the functions that read the parts of forecast, reanalysis and ensemble
+datasets needed by the Environment class. Only the hyperslab around the launch
+time and site is requested from the dataset, as a single contiguous read of
+each variable, which matters most for ``OPeNDAP`` datasets, where every read
+is a request to a remote server.
+"""
+
+import numpy as np
+
+# Roles of the dimensions of the variables whose dimensions are not named
+# after the dictionary, by number of dimensions, in the usual order of
+# forecast, reanalysis and ensemble datasets
+_POSITIONAL_ROLES = {
+    3: ("time", "latitude", "longitude"),
+    4: ("time", "level", "latitude", "longitude"),
+    5: ("ensemble", "time", "level", "latitude", "longitude"),
+}
+
+
+def find_bracket_index(coordinates, value, name):
+    """Finds the grid point right after a value in an ascending or descending
+    coordinate array, so that the value lies between the points ``index - 1``
+    and ``index``.
+
+    Parameters
+    ----------
+    coordinates : array_like
+        Coordinates of the grid, sorted in ascending or descending order.
+    value : float
+        The value to be bracketed.
+    name : str
+        Name of the coordinate, used in the error message.
+
+    Returns
+    -------
+    int
+        The index of the grid point right after the value.
+
+    Raises
+    ------
+    ValueError
+        If the value is outside of the grid.
+
+    Examples
+    --------
+    >>> from rocketpy.environment.weather_slab import find_bracket_index
+    >>> find_bracket_index([-20, -20.5, -21, -21.5], -20.7, "Latitude")
+    2
+    >>> find_bracket_index([10, 11, 12], 12, "Longitude")
+    2
+    """
+    coordinates = np.asarray(coordinates)
+    size = len(coordinates)
+    if coordinates[0] < coordinates[-1]:
+        index = int(np.searchsorted(coordinates, value, side="right"))
+    else:
+        index = size - int(np.searchsorted(coordinates[::-1], value, side="left"))
+    # Take care of a value equal to the last coordinate of the grid
+    if index == size and coordinates[index - 1] == value:
+        index -= 1
+    if index == 0 or index == size:
+        raise ValueError(
+            "{:s} {:f} not inside region covered by file, which is from {:f} to {:f}.".format(
+                name, value, coordinates[0], coordinates[-1]
+            )
+        )
+    return index
+
+
+def find_grid_indices(weather_data, dictionary, latitude, longitude):
+    """Finds the grid points around a location in a dataset.
+
+    Parameters
+    ----------
+    weather_data : netCDF4.Dataset
+        The open dataset.
+    dictionary : dict
+        Dictionary with the names of the variables of the dataset.
+    latitude : float
+        Latitude of the location, in degrees.
+    longitude : float
+        Longitude of the location, in degrees, from -180 to 360.
+
+    Returns
+    -------
+    tuple
+        The latitude and longitude arrays of the dataset, the indices of the
+        grid points right after the location in each of them, as returned by
+        ``find_bracket_index``, and the longitude of the location in the
+        convention of the dataset, either from -180 to 180 or from 0 to 360.
+    """
+    lat_array = np.asarray(weather_data.variables[dictionary["latitude"]][:], float)
+    lon_array = np.asarray(weather_data.variables[dictionary["longitude"]][:], float)
+
+    # Determine if file uses -180 to 180 or 0 to 360
+    if lon_array[0] < 0 or lon_array[-1] < 0:
+        lon = longitude if longitude < 180 else -180 + longitude % 180
+    else:
+        lon = longitude % 360
+
+    lon_index = find_bracket_index(lon_array, lon, "Longitude")
+    lat_index = find_bracket_index(lat_array, latitude, "Latitude")
+    return lat_array, lon_array, lat_index, lon_index, lon
+
+
+def read_slab(variable, dictionary, indices):
+    """Reads a hyperslab of a variable with a single read, selecting each of
+    its dimensions by the role of the dimension in the dictionary. If the
+    dimensions of the variable are not named after the dictionary, their
+    roles are given by their position instead, in the order (ensemble,)
+    (time,) (level,) latitude, longitude.
+
+    Parameters
+    ----------
+    variable : netCDF4.Variable
+        The variable to be read.
+    dictionary : dict
+        Dictionary with the names of the variables of the dataset, whose
+        coordinate variables have the names of the dimensions.
+    indices : dict
+        Index or slice of each role of the dictionary, such as "time",
+        "level", "latitude", "longitude" or "ensemble". Dimensions whose role
+        is not given are read entirely.
+
+    Returns
+    -------
+    numpy.ma.MaskedArray
+        The values of the hyperslab.
+
+    Raises
+    ------
+    ValueError
+        If a dimension of the variable is not in the dictionary and the
+        number of dimensions of the variable has no positional roles.
+    """
+    roles = {name: role for role, name in dictionary.items()}
+    dimensions = variable.dimensions
+    if all(dimension in roles for dimension in dimensions):
+        dimension_roles = [roles[dimension] for dimension in dimensions]
+    elif len(dimensions) in _POSITIONAL_ROLES:
+        dimension_roles = _POSITIONAL_ROLES[len(dimensions)]
+    else:
+        raise ValueError(
+            f"The dimensions {dimensions} of variable '{variable.name}' are not "
+            "in the dictionary."
+        )
+    return variable[tuple(indices.get(role, slice(None)) for role in dimension_roles)]
+
+
+def export_slab(weather_data, dictionary, indices, output):
+    """Copies the hyperslab of the variables of a dictionary to another
+    dataset, keeping their names, dimensions and attributes, so that it can
+    be read with the same dictionary.
+
+    Parameters
+    ----------
+    weather_data : netCDF4.Dataset
+        The open dataset to be read.
+    dictionary : dict
+        Dictionary with the names of the variables of the dataset.
+    indices : dict
+        Slice of each role of the dictionary, see ``read_slab``.
+    output : netCDF4.Dataset
+        The dataset to be written, open in write mode.
+
+    Returns
+    -------
+    None
+    """
+    for name in dictionary.values():
+        if name is None or name not in weather_data.variables:
+            continue
+        variable = weather_data.variables[name]
+        values = read_slab(variable, dictionary, indices)
+        for dimension, size in zip(variable.dimensions, values.shape):
+            if dimension not in output.dimensions:
+                output.createDimension(dimension, size)
+        attributes = {
+            attribute: variable.getncattr(attribute)
+            for attribute in variable.ncattrs()
+            if attribute != "_FillValue"
+        }
+        copy = output.createVariable(
+            name,
+            variable.dtype,
+            variable.dimensions,
+            fill_value=getattr(variable, "_FillValue", None),
+        )
+        copy.setncatts(attributes)
+        copy[:] = values
@@ -16,6 +16,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 from scipy import integrate, linalg, optimize
 
+from .shared_array import SharedArray
+
 # Numpy 1.x compatibility,
 # TODO: remove these lines when all dependencies support numpy>=2.0.0
 if np.lib.NumpyVersion(np.__version__) >= "2.0.0b1":
@@ -32,6 +34,13 @@ INTERPOLATION_TYPES = {
     "shepard": 4,
 }
 EXTRAPOLATION_TYPES = {"zero": 0, "natural": 1, "constant": 2}
+# Attributes computed only when first needed by spline and akima Functions
+LAZY_INTERPOLATION_ATTRIBUTES = (
+    "_coeffs",
+    "_interpolation_func",
+    "__spline_coefficients__",
+    "__akima_coefficients__",
+)
 
 
 class Function:
@@ -74,7 +83,8 @@ class Function:
 
             - string: Path to a CSV file. The file is read and converted into an
             ndarray. The file can optionally contain a single header line, see
-            notes below for more information.
+            notes below for more information. Paths to ``.npy`` files, such as
+            the ones created by ``Function.savenpy``, are memory mapped instead.
 
             - Function: Copies the source of the provided Function object,
             creating a new Function with adjusted inputs and outputs.
@@ -190,6 +200,8 @@ class Function:
 
             - string: Path to a CSV file. The file is read and converted into an
             ndarray. The file can optionally contain a single header line.
+            Paths to ``.npy`` files, such as the ones created by
+            ``Function.savenpy``, are memory mapped instead.
 
             - Function: Copies the source of the provided Function object,
             creating a new Function with adjusted inputs and outputs.
@@ -228,32 +240,109 @@ class Function:
             if self.__inputs__ is None:
                 self.__inputs__ = list(parameters)
 
+            self.source = source
+
         # Handle ndarray source
         else:
-            # Evaluate dimension
-            self.__dom_dim__ = source.shape[1] - 1
-
-            # set x and y. If Function is 2D, also set z
-            if self.__dom_dim__ == 1:
+            # 1-D sources must be sorted by their input column
+            if source.shape[1] == 2 and np.any(np.diff(source[:, 0]) < 0):
                 source = source[source[:, 0].argsort()]
-                self.x_array = source[:, 0]
-                self.x_initial, self.x_final = self.x_array[0], self.x_array[-1]
-                self.y_array = source[:, 1]
-                self.y_initial, self.y_final = self.y_array[0], self.y_array[-1]
-                self.get_value_opt = self.__get_value_opt_1d
-            elif self.__dom_dim__ > 1:
-                self.x_array = source[:, 0]
-                self.x_initial, self.x_final = self.x_array[0], self.x_array[-1]
-                self.y_array = source[:, 1]
-                self.y_initial, self.y_final = self.y_array[0], self.y_array[-1]
-                self.z_array = source[:, 2]
-                self.z_initial, self.z_final = self.z_array[0], self.z_array[-1]
-                self.get_value_opt = self.__get_value_opt_nd
+            self.__set_array_source(source)
+
+        return self
+
+    def __set_array_source(self, source):
+        """Sets an already validated and sorted ndarray as the source of the
+        Function, along with its data arrays, interpolation and extrapolation.
+
+        Parameters
+        ----------
+        source : np.ndarray
+            Source array in the form [[x1, x2 ..., xn, y], ...].
+        """
+        # Evaluate dimension
+        self.__dom_dim__ = source.shape[1] - 1
+
+        # set x and y. If Function is 2D, also set z
+        if self.__dom_dim__ == 1:
+            self.x_array = source[:, 0]
+            self.x_initial, self.x_final = self.x_array[0], self.x_array[-1]
+            self.y_array = source[:, 1]
+            self.y_initial, self.y_final = self.y_array[0], self.y_array[-1]
+            self.get_value_opt = self.__get_value_opt_1d
+        elif self.__dom_dim__ > 1:
+            self.x_array = source[:, 0]
+            self.x_initial, self.x_final = self.x_array[0], self.x_array[-1]
+            self.y_array = source[:, 1]
+            self.y_initial, self.y_final = self.y_array[0], self.y_array[-1]
+            self.z_array = source[:, 2]
+            self.z_initial, self.z_final = self.z_array[0], self.z_array[-1]
+            self.get_value_opt = self.__get_value_opt_nd
 
         self.source = source
+        self._monotonicity = None
         self.set_interpolation(self.__interpolation__)
         self.set_extrapolation(self.__extrapolation__)
-        return self
+
+    @classmethod
+    def from_trusted_array(
+        cls,
+        source,
+        inputs=None,
+        outputs=None,
+        interpolation=None,
+        extrapolation=None,
+        title=None,
+    ):
+        """Creates a Function from an array whose format is already known to
+        be valid, such as the arrays produced internally by RocketPy. Unlike
+        ``Function.__init__``, the source is neither validated, copied nor
+        sorted, which makes the construction of large Functions much faster.
+
+        Parameters
+        ----------
+        source : np.ndarray
+            Float array in the form [[x1, x2 ..., xn, y], ...]. For 1-D
+            Functions, its first column must be sorted in increasing order.
+        inputs : string, sequence of strings, optional
+            The name of the inputs of the function. See ``Function.__init__``.
+        outputs : string, sequence of strings, optional
+            The name of the outputs of the function. See ``Function.__init__``.
+        interpolation : string, optional
+            Interpolation method. See ``Function.__init__``.
+        extrapolation : string, optional
+            Extrapolation method. See ``Function.__init__``.
+        title : string, optional
+            Title to be displayed in the plots' figures.
+
+        Returns
+        -------
+        Function
+            The Function defined by the given source.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from rocketpy import Function
+        >>> time = np.linspace(0, 10, 11)
+        >>> f = Function.from_trusted_array(
+        ...     np.column_stack((time, time**2)), interpolation="linear"
+        ... )
+        >>> f(2.5)
+        np.float64(6.5)
+        """
+        func = cls.__new__(cls)
+        func.__inputs__ = inputs
+        func.__outputs__ = outputs
+        func.__interpolation__ = interpolation
+        func.__extrapolation__ = extrapolation
+        func.title = title
+        func.__img_dim__ = 1
+        func.__set_array_source(source)
+        func.set_inputs(inputs)
+        func.set_outputs(outputs)
+        func.set_title(title)
+        return func
 
     @cached_property
     def min(self):
@@ -294,9 +383,77 @@ class Function:
         """
         if not callable(self.source):
             self.__interpolation__ = self.__validate_interpolation(method)
+            if self.__interpolation__ in ("spline", "akima"):
+                # Coefficients are computed only when first needed
+                for attribute in LAZY_INTERPOLATION_ATTRIBUTES:
+                    self.__dict__.pop(attribute, None)
+            else:
+                self.__update_interpolation_coefficients(self.__interpolation__)
+                self.__set_interpolation_func()
+            self._derivative_coeffs = {}
+        return self
+
+    def __getattr__(self, name):
+        """Computes the spline or akima interpolation coefficients of the
+        Function, as well as its interpolation function, the first time they
+        are requested. This method is only called when ``name`` is not found
+        through the usual attribute lookup, thus it adds no overhead to the
+        evaluation of the Function once the coefficients are computed.
+
+        Parameters
+        ----------
+        name : str
+            Name of the requested attribute.
+
+        Returns
+        -------
+        value : Any
+            The value of the requested attribute.
+        """
+        if name in LAZY_INTERPOLATION_ATTRIBUTES and self.__dict__.get(
+            "__interpolation__"
+        ) in ("spline", "akima"):
             self.__update_interpolation_coefficients(self.__interpolation__)
             self.__set_interpolation_func()
-        return self
+            if name in self.__dict__:
+                return self.__dict__[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def __getstate__(self):
+        """Returns the state of the Function to be pickled. The interpolation,
+        extrapolation and evaluation functions are not pickled, since they are
+        rebuilt when the Function is unpickled.
+
+        Returns
+        -------
+        state : dict
+            The attributes of the Function.
+        """
+        state = self.__dict__.copy()
+        state.pop("_interpolation_func", None)
+        state.pop("_extrapolation_func", None)
+        if not callable(self.source):
+            state.pop("get_value_opt", None)
+        return state
+
+    def __setstate__(self, state):
+        """Restores the state of a pickled Function, rebuilding its
+        interpolation, extrapolation and evaluation functions.
+
+        Parameters
+        ----------
+        state : dict
+            The attributes of the Function, as returned by ``__getstate__``.
+        """
+        self.__dict__.update(state)
+        if not callable(self.source):
+            self.set_get_value_opt()
+            # Spline and akima functions without coefficients remain lazy
+            if "_coeffs" in state:
+                self.__set_interpolation_func()
+            self.__set_extrapolation_func()
 
     def __update_interpolation_coefficients(self, method):
         """Update interpolation coefficients for the given method."""
@@ -372,7 +529,7 @@ class Function:
 
             self._interpolation_func = akima_interpolation
 
-        elif interpolation == 3:  # spline
+        elif interpolation == 3 and len(self._coeffs) == 4:  # cubic spline
 
             def spline_interpolation(x, x_min, x_max, x_data, y_data, coeffs):
                 x_interval = bisect_left(x_data, x)
@@ -383,6 +540,17 @@ class Function:
 
             self._interpolation_func = spline_interpolation
 
+        elif interpolation == 3:  # piecewise polynomial of any other degree
+
+            def spline_interpolation(x, x_min, x_max, x_data, y_data, coeffs):
+                x_interval = bisect_left(x_data, x)
+                x_interval = max(x_interval, 1)
+                a = coeffs[:, x_interval - 1]
+                x = x - x_data[x_interval - 1]
+                return self.__horner(a, x)
+
+            self._interpolation_func = spline_interpolation
+
         elif interpolation == 4:  # shepard does not use interpolation function
             self._interpolation_func = None
 
@@ -433,7 +601,7 @@ class Function:
                     else:
                         a = coeffs[:, -1]
                         x = x - x_data[-2]
-                    return a[3] * x**3 + a[2] * x**2 + a[1] * x + a[0]
+                    return self.__horner(a, x)
 
             self._extrapolation_func = natural_extrapolation
         elif extrapolation == 2:  # constant
@@ -1564,23 +1732,23 @@ class Function:
         x, y = self.x_array, self.y_array
         m_dim = len(x)
         h = np.diff(x)
+        slopes = np.diff(y) / h
         # Initialize the matrix
         banded_matrix = np.zeros((3, m_dim))
         banded_matrix[1, 0] = banded_matrix[1, m_dim - 1] = 1
         # Construct the Ab banded matrix and B vector
-        vector_b = [0]
+        vector_b = np.zeros(m_dim)
         banded_matrix[2, :-2] = h[:-1]
         banded_matrix[1, 1:-1] = 2 * (h[:-1] + h[1:])
         banded_matrix[0, 2:] = h[1:]
-        vector_b.extend(3 * ((y[2:] - y[1:-1]) / h[1:] - (y[1:-1] - y[:-2]) / h[:-1]))
-        vector_b.append(0)
+        vector_b[1:-1] = 3 * np.diff(slopes)
         # Solve the system for c coefficients
         c = linalg.solve_banded(
             (1, 1), banded_matrix, vector_b, overwrite_ab=True, overwrite_b=True
         )
         # Calculate other coefficients
-        b = (y[1:] - y[:-1]) / h - h * (2 * c[:-1] + c[1:]) / 3
-        d = (c[1:] - c[:-1]) / (3 * h)
+        b = slopes - h * (2 * c[:-1] + c[1:]) / 3
+        d = np.diff(c) / (3 * h)
         # Store coefficients
         self.__spline_coefficients__ = np.vstack([y[:-1], b, c[:-1], d])
 
@@ -1588,31 +1756,26 @@ class Function:
         """Calculate akima spline coefficients that fit the data exactly"""
         # Get x and y values for all supplied points
         x, y = self.x_array, self.y_array
+        h = np.diff(x)
+        slopes = np.diff(y) / h
         # Estimate derivatives at each point
-        d = [0] * len(x)
-        d[0] = (y[1] - y[0]) / (x[1] - x[0])
-        d[-1] = (y[-1] - y[-2]) / (x[-1] - x[-2])
-        for i in range(1, len(x) - 1):
-            w1, w2 = (x[i] - x[i - 1]), (x[i + 1] - x[i])
-            d1, d2 = ((y[i] - y[i - 1]) / w1), ((y[i + 1] - y[i]) / w2)
-            d[i] = (w1 * d2 + w2 * d1) / (w1 + w2)
-        # Calculate coefficients for each interval with system already solved
-        coeffs = [0] * 4 * (len(x) - 1)
-        for i in range(len(x) - 1):
-            xl, xr = x[i], x[i + 1]
-            yl, yr = y[i], y[i + 1]
-            dl, dr = d[i], d[i + 1]
-            matrix = np.array(
-                [
-                    [1, xl, xl**2, xl**3],
-                    [1, xr, xr**2, xr**3],
-                    [0, 1, 2 * xl, 3 * xl**2],
-                    [0, 1, 2 * xr, 3 * xr**2],
-                ]
-            )
-            result = np.array([yl, yr, dl, dr]).T
-            coeffs[4 * i : 4 * i + 4] = np.linalg.solve(matrix, result)
-        self.__akima_coefficients__ = coeffs
+        d = np.empty(len(x))
+        d[0], d[-1] = slopes[0], slopes[-1]
+        w1, w2 = h[:-1], h[1:]
+        d[1:-1] = (w1 * slopes[1:] + w2 * slopes[:-1]) / (w1 + w2)
+        # Hermite cubic of each interval, in powers of (x - x_left)
+        dl, dr = d[:-1], d[1:]
+        local_coeffs = np.vstack(
+            [
+                y[:-1],
+                dl,
+                (3 * slopes - 2 * dl - dr) / h,
+                (dl + dr - 2 * slopes) / h**2,
+            ]
+        )
+        # Expand the polynomials in powers of x, interleaved by interval
+        coeffs = self.__shift_polynomials(local_coeffs, -x[:-1])
+        self.__akima_coefficients__ = coeffs.T.ravel()
 
     def __interpolate_shepard__(self, args):
         """Calculates the shepard interpolation from the given arguments.
@@ -2296,8 +2459,8 @@ class Function:
             If True, forces the definite integral to be evaluated numerically.
             The current numerical method used is scipy.integrate.quad.
             If False, try to calculate using interpolation information.
-            Currently, only available for spline and linear interpolation. If
-            unavailable, calculate numerically anyways.
+            Currently, only available for spline, akima and linear
+            interpolation. If unavailable, calculate numerically anyways.
 
         Returns
         -------
@@ -2309,87 +2472,17 @@ class Function:
         if integration_sign == -1:
             a, b = b, a
         # Different implementations depending on interpolation
-        if self.__interpolation__ == "spline" and numerical is False:
-            x_data = self.x_array
-            y_data = self.y_array
-            coeffs = self.__spline_coefficients__
+        if (
+            self.__interpolation__ in ("spline", "akima")
+            and self.__dom_dim__ == 1
+            and numerical is False
+        ):
             ans = 0
-            # Check to see if interval starts before point data
-            if a < x_data[0]:
-                if self.__extrapolation__ == "constant":
-                    ans += y_data[0] * (min(x_data[0], b) - a)
-                elif self.__extrapolation__ == "natural":
-                    c = coeffs[:, 0]
-                    sub_b = a - x_data[0]
-                    sub_a = min(b, x_data[0]) - x_data[0]
-                    ans += (
-                        (c[3] * sub_a**4) / 4
-                        + (c[2] * sub_a**3 / 3)
-                        + (c[1] * sub_a**2 / 2)
-                        + c[0] * sub_a
-                    )
-                    ans -= (
-                        (c[3] * sub_b**4) / 4
-                        + (c[2] * sub_b**3 / 3)
-                        + (c[1] * sub_b**2 / 2)
-                        + c[0] * sub_b
-                    )
-                else:
-                    # self.__extrapolation__ = 'zero'
-                    pass
-
-            # Integrate in subintervals between xs of given data up to b
-            i = max(np.searchsorted(x_data, a, side="left") - 1, 0)
-            while i < len(x_data) - 1 and x_data[i] < b:
-                if x_data[i] <= a <= x_data[i + 1] and x_data[i] <= b <= x_data[i + 1]:
-                    sub_a = a - x_data[i]
-                    sub_b = b - x_data[i]
-                elif x_data[i] <= a <= x_data[i + 1]:
-                    sub_a = a - x_data[i]
-                    sub_b = x_data[i + 1] - x_data[i]
-                elif b <= x_data[i + 1]:
-                    sub_a = 0
-                    sub_b = b - x_data[i]
-                else:
-                    sub_a = 0
-                    sub_b = x_data[i + 1] - x_data[i]
-                c = coeffs[:, i]
-                ans += (
-                    (c[3] * sub_b**4) / 4
-                    + (c[2] * sub_b**3 / 3)
-                    + (c[1] * sub_b**2 / 2)
-                    + c[0] * sub_b
-                )
-                ans -= (
-                    (c[3] * sub_a**4) / 4
-                    + (c[2] * sub_a**3 / 3)
-                    + (c[1] * sub_a**2 / 2)
-                    + c[0] * sub_a
-                )
-                i += 1
-            # Check to see if interval ends after point data
-            if b > x_data[-1]:
-                if self.__extrapolation__ == "constant":
-                    ans += y_data[-1] * (b - max(x_data[-1], a))
-                elif self.__extrapolation__ == "natural":
-                    c = coeffs[:, -1]
-                    sub_a = max(x_data[-1], a) - x_data[-2]
-                    sub_b = b - x_data[-2]
-                    ans -= (
-                        (c[3] * sub_a**4) / 4
-                        + (c[2] * sub_a**3 / 3)
-                        + (c[1] * sub_a**2 / 2)
-                        + c[0] * sub_a
-                    )
-                    ans += (
-                        (c[3] * sub_b**4) / 4
-                        + (c[2] * sub_b**3 / 3)
-                        + (c[1] * sub_b**2 / 2)
-                        + c[0] * sub_b
-                    )
-                else:
-                    # self.__extrapolation__ = 'zero'
-                    pass
+            if a < b:
+                # Sum the exact integrals of each polynomial piece
+                knots, pieces = self.__piecewise_polynomial_between(a, b)
+                antiderivatives = self.__integrate_polynomials(pieces)
+                ans = np.sum(self.__horner(antiderivatives, np.diff(knots)))
         elif self.__interpolation__ == "linear" and numerical is False:
             # Integrate from a to b using np.trapezoid
             x_data = self.x_array
@@ -2432,7 +2525,17 @@ class Function:
         -------
         ans : float
             Evaluated derivative.
-        """
+
+        Notes
+        -----
+        1-D Functions defined by a list of points and interpolated by linear,
+        akima or spline methods are differentiated exactly, by evaluating the
+        derivative of their interpolating polynomials. In this case, dx is not
+        used. At the data points, the polynomial of the interval on the left is
+        used, as it is done when evaluating the Function.
+        """
+        if order in (1, 2) and self.__has_piecewise_polynomial():
+            return self.__differentiate_piecewise_polynomial(x, order)
         if order == 1:
             return (self.get_value_opt(x + dx) - self.get_value_opt(x - dx)) / (2 * dx)
         elif order == 2:
@@ -2466,7 +2569,15 @@ class Function:
         References
         ----------
         [1] https://mdolab.engin.umich.edu/wiki/guide-complex-step-derivative-approximation
+
+        Notes
+        -----
+        1-D Functions defined by a list of points and interpolated by linear,
+        akima or spline methods are differentiated exactly, as described in
+        ``Function.differentiate``, without complex evaluations.
         """
+        if order == 1 and self.__has_piecewise_polynomial():
+            return self.__differentiate_piecewise_polynomial(x, order)
         if order == 1:
             return float(self.get_value_opt(x + dx * 1j).imag / dx)
         else:
@@ -2474,6 +2585,43 @@ class Function:
                 "Only 1st order derivatives are supported yet. " "Set order=1."
             )
 
+    def __differentiate_piecewise_polynomial(self, x, order):
+        """Evaluates the exact derivative of a piecewise polynomial Function at
+        a single point. The coefficients of the derivative are computed once
+        and cached as nested lists, so that each call only requires an interval
+        search and a short polynomial evaluation.
+
+        Parameters
+        ----------
+        x : float
+            Point at which to differentiate.
+        order : int
+            Order of differentiation.
+
+        Returns
+        -------
+        float
+            Evaluated derivative.
+        """
+        try:
+            coeffs = self._derivative_coeffs[order]
+        except KeyError:
+            coeffs = self.__piecewise_polynomial()
+            for _ in range(order):
+                coeffs = self.__differentiate_polynomials(coeffs)
+            coeffs = coeffs.T.tolist()
+            self._derivative_coeffs[order] = coeffs
+
+        x_data = self.x_array
+        if self.x_initial <= x <= self.x_final:
+            interval = max(bisect_left(x_data, x), 1) - 1
+        elif self.__extrapolation__ == "natural":
+            interval = 0 if x < self.x_initial else len(coeffs) - 1
+        else:
+            # Constant and zero extrapolations have null derivatives
+            return 0.0
+        return float(self.__horner(coeffs[interval], x - x_data[interval]))
+
     def identity_function(self):
         """Returns a Function object that correspond to the identity mapping,
         i.e. f(x) = x.
@@ -2512,24 +2660,33 @@ class Function:
         -------
         result : Function
             A Function object which gives the derivative of self.
+
+        Notes
+        -----
+        The derivative of a 1-D Function interpolated by linear, akima or spline
+        methods is exact: it is defined by the same data points and its
+        interpolating polynomials are the derivatives of the original ones.
         """
+        inputs = self.__inputs__[:]
+        outputs = f"d({self.__outputs__[0]})/d({inputs[0]})"
+        # Piecewise polynomials are differentiated exactly
+        if self.__has_piecewise_polynomial():
+            coeffs = self.__differentiate_polynomials(self.__piecewise_polynomial())
+            return self.__from_piecewise_polynomial(
+                self.x_array, coeffs, outputs, self.__extrapolation__
+            )
         # Check if Function object source is array
         if isinstance(self.source, np.ndarray):
             # Operate on grid values
             ys = np.diff(self.y_array) / np.diff(self.x_array)
             xs = self.source[:-1, 0] + np.diff(self.x_array) / 2
             source = np.column_stack((xs, ys))
-            # Retrieve inputs, outputs and interpolation
-            inputs = self.__inputs__[:]
-            outputs = f"d({self.__outputs__[0]})/d({inputs[0]})"
         else:
 
             def source_function(x):
                 return self.differentiate(x)
 
             source = source_function
-            inputs = self.__inputs__[:]
-            outputs = f"d({self.__outputs__[0]})/d({inputs[0]})"
 
         # Create new Function object
         return Function(
@@ -2553,13 +2710,35 @@ class Function:
         datapoints : int, optional
             The number of points in which the integral will be evaluated for
             plotting it, which draws lines between each evaluated point.
-            The default value is 100.
+            The default value is 100. Not used if the integral is exact.
 
         Returns
         -------
         result : Function
             The integral of the Function object.
-        """
+
+        Notes
+        -----
+        The integral of a 1-D Function interpolated by linear, akima or spline
+        methods is exact: it is defined by the data points inside the interval
+        and its interpolating polynomials are the antiderivatives of the
+        original ones.
+        """
+        if self.__has_piecewise_polynomial():
+            lower = self.x_initial if lower is None else lower
+            upper = self.x_final if upper is None else upper
+        if self.__has_piecewise_polynomial() and lower < upper:
+            knots, pieces = self.__piecewise_polynomial_between(lower, upper)
+            antiderivatives = self.__integrate_polynomials(pieces)
+            # Accumulate the integral of the previous pieces
+            piece_integrals = self.__horner(antiderivatives, np.diff(knots))
+            antiderivatives[0] = np.concatenate(([0], np.cumsum(piece_integrals[:-1])))
+            return self.__from_piecewise_polynomial(
+                knots,
+                antiderivatives,
+                outputs=[o + " Integral" for o in self.__outputs__],
+                extrapolation="constant",
+            )
         if isinstance(self.source, np.ndarray):
             lower = self.source[0, 0] if lower is None else lower
             upper = self.source[-1, 0] if upper is None else upper
@@ -2624,13 +2803,13 @@ class Function:
         >>> f.isbijective() == True
         True
         >>> f.is_strictly_bijective() == True
-        np.True_
+        True
 
         >>> f = Function([[-1, 1], [0, 0], [1, 1], [2, 4]])
         >>> f.isbijective()
         False
         >>> f.is_strictly_bijective()
-        np.False_
+        False
 
         A Function which is not "strictly" bijective, but is bijective, can be
         constructed as x^2 defined at -1, 0 and 2.
@@ -2639,20 +2818,42 @@ class Function:
         >>> f.isbijective()
         True
         >>> f.is_strictly_bijective()
-        np.False_
+        False
         """
         if isinstance(self.source, np.ndarray):
             # Assuming domain is sorted, range must also be
-            y_data = self.y_array
-            # Both ascending and descending order means Function is bijective
-            y_data_diff = np.diff(y_data)
-            return np.all(y_data_diff >= 0) or np.all(y_data_diff <= 0)
+            return self.__monotonicity() != 0
         else:
             raise TypeError(
                 "Only Functions whose source is a list of points can be "
                 "checked for bijectivity."
             )
 
+    def __monotonicity(self):
+        """Classifies the monotonicity of the data points of a list based
+        Function. The result is computed once and cached in the Function.
+
+        Returns
+        -------
+        int
+            2 if y_array is strictly increasing, -2 if it is strictly
+            decreasing, 1 if it is non-decreasing, -1 if it is non-increasing
+            and 0 otherwise.
+        """
+        if self._monotonicity is None:
+            y_data_diff = np.diff(self.y_array)
+            if np.all(y_data_diff > 0):
+                self._monotonicity = 2
+            elif np.all(y_data_diff < 0):
+                self._monotonicity = -2
+            elif np.all(y_data_diff >= 0):
+                self._monotonicity = 1
+            elif np.all(y_data_diff <= 0):
+                self._monotonicity = -1
+            else:
+                self._monotonicity = 0
+        return self._monotonicity
+
     def inverse_function(self, approx_func=None, tol=1e-4):
         """
         Returns the inverse of the Function. The inverse function of F is a
@@ -2683,15 +2884,29 @@ class Function:
         -------
         result : Function
             A Function whose domain and range have been inverted.
+
+        Notes
+        -----
+        The inverse of a Function given by a strictly monotonic list of points
+        is also given by a list of points, with no root finding involved. For
+        linear interpolation, the axes are swapped and the inverse is exact. For
+        akima and spline interpolation, each interval is first refined with
+        points evaluated from the interpolation, so that the inverse follows the
+        interpolated curve and not only the original data points.
         """
         if isinstance(self.source, np.ndarray):
-            if self.is_strictly_bijective():
-                # Swap the columns
-                source = np.flip(self.source, axis=1)
-            else:
+            if not self.is_strictly_bijective():
                 raise ValueError(
                     "Function is not bijective, so it does not have an inverse."
                 )
+            if abs(self.__monotonicity()) == 2 and self.__interpolation__ in (
+                "akima",
+                "spline",
+            ):
+                source = self.__refined_inverse_source()
+            else:
+                # Swap the columns
+                source = np.flip(self.source, axis=1)
         else:
             if approx_func is not None:
 
@@ -2712,14 +2927,45 @@ class Function:
             extrapolation=self.__extrapolation__,
         )
 
+    def __refined_inverse_source(self, samples_per_interval=4):
+        """Returns the sorted source of the inverse of a strictly monotonic
+        list based Function, refined by evaluating the interpolation inside
+        each interval. Falls back to the swapped data points if the refined
+        points are not strictly monotonic, which may happen when the
+        interpolation overshoots the data.
+
+        Parameters
+        ----------
+        samples_per_interval : int, optional
+            Number of sub-intervals in which each interval is divided.
+
+        Returns
+        -------
+        np.ndarray
+            Source of the inverse Function, sorted by its input column.
+        """
+        x_data = self.x_array
+        fractions = np.arange(samples_per_interval) / samples_per_interval
+        steps = np.outer(np.diff(x_data), fractions)
+        coeffs = self.__piecewise_polynomial()[:, :, np.newaxis]
+        x_refined = np.append((x_data[:-1, np.newaxis] + steps).ravel(), x_data[-1])
+        y_refined = np.append(self.__horner(coeffs, steps).ravel(), self.y_array[-1])
+
+        y_refined_diff = np.diff(y_refined)
+        if not (np.all(y_refined_diff > 0) or np.all(y_refined_diff < 0)):
+            y_refined, x_refined = self.y_array, x_data
+        source = np.column_stack((y_refined, x_refined))
+        return source if y_refined[0] < y_refined[-1] else source[::-1]
+
     def find_input(self, val, start, tol=1e-4):
         """
         Finds the optimal input for a given output.
 
         Parameters
         ----------
-        val : int, float
-            The value of the output.
+        val : int, float, list, np.ndarray
+            The value of the output. A sequence of values is only supported for
+            strictly monotonic list based Functions, see notes below.
         start : int, float
             Initial guess of the output.
         tol : int, float
@@ -2727,15 +2973,101 @@ class Function:
 
         Returns
         -------
-        result : ndarray
+        result : float, ndarray
             The value of the input which gives the output closest to val.
-        """
+
+        Notes
+        -----
+        If the Function is 1-D, given by a strictly monotonic list of points and
+        interpolated by linear, akima or spline methods, the inputs are found
+        for all values at once, without using ``start``: each value is
+        bracketed by a data interval through a vectorized search, and the
+        interpolating polynomial of that interval is solved by safeguarded
+        Newton iterations. Values out of the range of the data points are
+        still found by root finding, starting at ``start``.
+        """
+        if self.__has_piecewise_polynomial() and abs(self.__monotonicity()) == 2:
+            return self.__find_input_monotonic(val, start, tol)
         return optimize.root(
             lambda x: self.get_value(x)[0] - val,
             start,
             tol=tol,
         ).x[0]
 
+    def __find_input_monotonic(self, val, start, tol, max_iterations=100):
+        """Finds the inputs which give the outputs val of a strictly monotonic
+        piecewise polynomial Function. See ``Function.find_input``.
+
+        Parameters
+        ----------
+        val : int, float, list, np.ndarray
+            The value(s) of the output.
+        start : int, float
+            Initial guess of the output, only used for values out of range.
+        tol : int, float
+            Tolerance for termination, relative to the interval widths.
+        max_iterations : int, optional
+            Maximum number of Newton iterations.
+
+        Returns
+        -------
+        result : float, ndarray
+            The inputs which give the outputs val.
+        """
+        x_data, y_data = self.x_array, self.y_array
+        values = np.asarray(val, dtype=np.float64)
+        is_scalar = values.ndim == 0
+        values = np.atleast_1d(values)
+        result = np.empty(values.shape)
+
+        # Values out of the data range depend on extrapolation
+        direction = 1 if y_data[-1] > y_data[0] else -1
+        y_min, y_max = sorted((y_data[0], y_data[-1]))
+        out_of_range = (values < y_min) | (values > y_max)
+        for i in np.flatnonzero(out_of_range):
+            result[i] = optimize.root(
+                lambda x, value=values[i]: self.get_value_opt(x[0]) - value,
+                start,
+                tol=tol,
+            ).x[0]
+
+        # Bracket each value by a data interval
+        in_range = ~out_of_range
+        targets = values[in_range]
+        if direction == 1:
+            intervals = np.searchsorted(y_data, targets, side="left") - 1
+        else:
+            intervals = len(y_data) - np.searchsorted(
+                y_data[::-1], targets, side="right"
+            )
+            intervals -= 1
+        intervals = np.clip(intervals, 0, len(x_data) - 2)
+        coeffs = self.__piecewise_polynomial()[:, intervals]
+        derivative_coeffs = self.__differentiate_polynomials(coeffs)
+        width = np.diff(x_data)[intervals]
+
+        # Safeguarded Newton iterations on the local polynomials
+        lower, upper = np.zeros(len(targets)), width.copy()
+        delta_y = y_data[intervals + 1] - y_data[intervals]
+        s = width * (targets - y_data[intervals]) / delta_y
+        for _ in range(max_iterations):
+            residual = direction * (self.__horner(coeffs, s) - targets)
+            lower = np.where(residual < 0, s, lower)
+            upper = np.where(residual < 0, upper, s)
+            slope = direction * self.__horner(derivative_coeffs, s)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton = s - residual / slope
+            bisection = (lower + upper) / 2
+            inside = (newton >= lower) & (newton <= upper)
+            s_next = np.where(inside, newton, bisection)
+            converged = np.abs(s_next - s) <= tol * width
+            s = s_next
+            if np.all(converged):
+                break
+        result[in_range] = x_data[intervals] + s
+
+        return result[0] if is_scalar else result
+
     def average(self, lower, upper):
         """
         Returns the average of the function.
@@ -2915,10 +3247,297 @@ class Function:
             file.write(header_line + newline)
             np.savetxt(file, data_points, fmt=fmt, delimiter=delimiter, newline=newline)
 
+    def savenpy(self, filename, lower=None, upper=None, samples=None):
+        """Save a Function object to a binary ``.npy`` file, which is the binary
+        counterpart of ``Function.savetxt``. The names of the inputs and outputs
+        are stored as the fields of the saved array, as long as they are unique.
+
+        Loading the file with ``Function(filename)`` maps it into memory, which
+        is much faster than parsing a text file. Furthermore, Functions loaded
+        this way are pickled as a reference to the file instead of a copy of
+        their data.
+
+        Parameters
+        ----------
+        filename : str, Path
+            The name of the file to be saved. The ``.npy`` extension is added
+            if not present.
+        lower : float or int, optional
+            The lower bound of the range for which data is to be generated.
+            This is required if the source is a callable function.
+        upper : float or int, optional
+            The upper bound of the range for which data is to be generated.
+            This is required if the source is a callable function.
+        samples : int, optional
+            The number of sample points to generate within the specified range.
+            This is required if the source is a callable function.
+
+        Raises
+        ------
+        ValueError
+            Raised if `lower`, `upper`, and `samples` are not provided when
+            the source is a callable function.
+
+        Examples
+        --------
+        >>> import os, tempfile
+        >>> from rocketpy import Function
+        >>> f = Function([(0, 0), (1, 1), (2, 4)], "Time (s)", "Height (m)")
+        >>> filename = os.path.join(tempfile.mkdtemp(), "height.npy")
+        >>> f.savenpy(filename)
+        >>> g = Function(filename)
+        >>> g
+        'Function from R1 to R1 : (Time (s)) → (Height (m))'
+        >>> g.y_array.tolist()
+        [0.0, 1.0, 4.0]
+        """
+        if callable(self.source):
+            if lower is None or upper is None or samples is None:
+                raise ValueError(
+                    "If the source is a callable, lower, upper and samples"
+                    + " must be provided."
+                )
+            x = np.linspace(lower, upper, samples)
+            data_points = np.column_stack((x, self.source(x)))
+        else:
+            data_points = self.source
+            if lower and upper and samples:
+                data_points = self.set_discrete(
+                    lower, upper, samples, mutate_self=False
+                ).source
+
+        data_points = np.ascontiguousarray(data_points, dtype=np.float64)
+        names = self.__inputs__ + self.__outputs__
+        if len(set(names)) == len(names) == data_points.shape[1]:
+            data_points = data_points.view([(name, np.float64) for name in names])
+            data_points = data_points.reshape(-1)
+        np.save(filename, data_points, allow_pickle=False)
+
+    def __load_npy(self, filename):
+        """Memory maps the source array saved in a ``.npy`` file, setting the
+        inputs and outputs from its field names if they are not given."""
+        source = SharedArray.load(filename)
+        names = source.dtype.names
+        if names is not None:
+            source = source.view(np.float64).reshape(len(source), len(names))
+            if self.__inputs__ is None:
+                self.__inputs__ = list(names[:-1])
+            if self.__outputs__ is None:
+                self.__outputs__ = [names[-1]]
+        return source
+
+    def to_shared_memory(self):
+        """Moves the source and the interpolation coefficients of the Function
+        into shared memory, so that pickling the Function, for instance to send
+        it to other processes, transmits a handle to its data instead of a copy
+        of it. The Function is modified in place.
+
+        Returns
+        -------
+        self : Function
+
+        Notes
+        -----
+        The shared memory is released once the Function and its copies in the
+        current process are garbage collected, thus the Function must be kept
+        alive while other processes may unpickle it.
+
+        Examples
+        --------
+        >>> import pickle
+        >>> import numpy as np
+        >>> from rocketpy import Function
+        >>> x = np.linspace(0, 10, 100_000)
+        >>> f = Function(np.column_stack((x, x**2))).to_shared_memory()
+        >>> len(pickle.dumps(f)) < 10_000
+        True
+        >>> float(pickle.loads(pickle.dumps(f))(2.5))
+        6.25
+        """
+        if callable(self.source):
+            return self
+        self.__set_array_source(SharedArray.from_array(self.source))
+        if self.__interpolation__ in ("polynomial", "spline", "akima"):
+            self.__update_interpolation_coefficients(self.__interpolation__)
+            coeffs = SharedArray.from_array(self._coeffs)
+            for attribute in (
+                "__polynomial_coefficients__",
+                "__spline_coefficients__",
+                "__akima_coefficients__",
+            ):
+                if self.__dict__.get(attribute) is self._coeffs:
+                    self.__dict__[attribute] = coeffs
+            self._coeffs = coeffs
+            self.__set_interpolation_func()
+        return self
+
     @staticmethod
     def __is_single_element_array(var):
         return isinstance(var, np.ndarray) and var.size == 1
 
+    @staticmethod
+    def __horner(coeffs, x):
+        """Evaluates the polynomial sum(coeffs[j] * x**j) using Horner's
+        scheme. The coefficients are given in ascending order of power and
+        may also be 2-D arrays, one column per polynomial."""
+        result = coeffs[-1]
+        for coeff in coeffs[-2::-1]:
+            result = result * x + coeff
+        return result
+
+    @staticmethod
+    def __shift_polynomials(coeffs, delta):
+        """Re-expands local polynomials around a shifted origin, i.e. returns
+        the coefficients of q(s) = p(s + delta) for each column of coeffs.
+
+        Parameters
+        ----------
+        coeffs : np.ndarray
+            Array of shape (k, m) with the coefficients of m polynomials of
+            degree k - 1, in ascending order of power.
+        delta : float, np.ndarray
+            Shift of the origin of each polynomial.
+
+        Returns
+        -------
+        np.ndarray
+            The shifted coefficients, with the same shape as coeffs.
+        """
+        shifted = np.array(coeffs, dtype=np.float64)
+        degree = shifted.shape[0] - 1
+        # Taylor shift through repeated synthetic division
+        for i in range(degree):
+            for j in range(degree - 1, i - 1, -1):
+                shifted[j] += delta * shifted[j + 1]
+        return shifted
+
+    @staticmethod
+    def __differentiate_polynomials(coeffs):
+        """Returns the coefficients of the derivatives of the polynomials
+        whose coefficients, in ascending order of power, are the columns of
+        coeffs."""
+        if len(coeffs) == 1:
+            return np.zeros_like(coeffs)
+        powers = np.arange(1, len(coeffs))[:, np.newaxis]
+        return powers * coeffs[1:]
+
+    @staticmethod
+    def __integrate_polynomials(coeffs):
+        """Returns the coefficients of the antiderivatives, null at the origin,
+        of the polynomials whose coefficients, in ascending order of power, are
+        the columns of coeffs."""
+        powers = np.arange(1, len(coeffs) + 1)[:, np.newaxis]
+        return np.vstack([np.zeros(coeffs.shape[1]), coeffs / powers])
+
+    def __piecewise_polynomial(self):
+        """Returns the local piecewise polynomial representation of a 1-D
+        Function interpolated by linear, akima or spline methods.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (k, n - 1), in which column i holds the coefficients,
+            in ascending order of power, of the polynomial in (x - x_i) that
+            describes the Function between x_i and x_(i+1).
+        """
+        x, y = self.x_array, self.y_array
+        if self.__interpolation__ == "linear":
+            return np.vstack([y[:-1], np.diff(y) / np.diff(x)])
+        if self.__interpolation__ == "spline":
+            return self.__spline_coefficients__
+        # akima coefficients are global, expand them around the left knots
+        a_0, a_1, a_2, a_3 = np.reshape(self.__akima_coefficients__, (-1, 4)).T
+        return self.__shift_polynomials(np.vstack([a_0, a_1, a_2, a_3]), x[:-1])
+
+    def __piecewise_polynomial_between(self, lower, upper):
+        """Returns the local piecewise polynomial representation of a 1-D
+        Function restricted to the interval [lower, upper]. Extrapolation
+        regions are included as additional pieces, according to the
+        extrapolation method of the Function.
+
+        Parameters
+        ----------
+        lower : float
+            Lower limit of the representation.
+        upper : float
+            Upper limit of the representation. Must be larger than lower.
+
+        Returns
+        -------
+        knots : np.ndarray
+            Breakpoints of the pieces, starting at lower and ending at upper.
+        coeffs : np.ndarray
+            Coefficients of the pieces, as in ``Function.__piecewise_polynomial``.
+        """
+        x_data, y_data = self.x_array, self.y_array
+        coeffs = self.__piecewise_polynomial()
+        inner = x_data[(x_data > lower) & (x_data < upper)]
+        knots = np.concatenate(([lower], inner, [upper]))
+
+        # Locate the data interval of each piece and shift it to its left knot
+        middle = (knots[:-1] + knots[1:]) / 2
+        intervals = np.clip(np.searchsorted(x_data, middle) - 1, 0, len(x_data) - 2)
+        pieces = self.__shift_polynomials(
+            coeffs[:, intervals], knots[:-1] - x_data[intervals]
+        )
+
+        # Overwrite the pieces that lie in the extrapolation regions
+        for outside, edge in ((middle < x_data[0], 0), (middle > x_data[-1], -1)):
+            if not np.any(outside) or self.__extrapolation__ == "natural":
+                continue
+            pieces[:, outside] = 0
+            if self.__extrapolation__ == "constant":
+                pieces[0, outside] = y_data[edge]
+        return knots, pieces
+
+    def __from_piecewise_polynomial(self, knots, coeffs, outputs, extrapolation):
+        """Creates a 1-D Function which evaluates exactly the given piecewise
+        polynomial. The result uses spline interpolation, with its coefficient
+        table replaced by coeffs.
+
+        Parameters
+        ----------
+        knots : np.ndarray
+            Breakpoints of the pieces.
+        coeffs : np.ndarray
+            Coefficients of the pieces, as in ``Function.__piecewise_polynomial``.
+        outputs : string, sequence of strings
+            Outputs of the new Function.
+        extrapolation : string
+            Extrapolation method of the new Function.
+
+        Returns
+        -------
+        Function
+            The piecewise polynomial Function.
+        """
+        if len(coeffs) < 4:
+            padding = np.zeros((4 - len(coeffs), coeffs.shape[1]))
+            coeffs = np.vstack([coeffs, padding])
+        # Knot values are taken from the left, as it is done when evaluating
+        values = np.concatenate(([coeffs[0, 0]], self.__horner(coeffs, np.diff(knots))))
+        func = Function.from_trusted_array(
+            np.column_stack((knots, values)),
+            inputs=self.__inputs__[:],
+            outputs=outputs,
+            interpolation="spline",
+            extrapolation=extrapolation,
+        )
+        func.__spline_coefficients__ = coeffs
+        func._coeffs = coeffs
+        func.__set_interpolation_func()
+        func.__set_extrapolation_func()
+        return func
+
+    def __has_piecewise_polynomial(self):
+        """Checks whether the Function is a 1-D list of points interpolated by
+        a piecewise polynomial (linear, akima or spline)."""
+        return (
+            isinstance(self.source, np.ndarray)
+            and self.__dom_dim__ == 1
+            and self.__interpolation__ in ("linear", "akima", "spline")
+        )
+
     # Input validators
     def __validate_source(self, source):
         """Used to validate the source parameter for creating a Function object.
@@ -2944,6 +3563,18 @@ class Function:
         if isinstance(source, Function):
             return source.get_source()
 
+        if isinstance(source, (str, Path)) and Path(source).suffix == ".npy":
+            source = self.__load_npy(source)
+
+        if isinstance(source, SharedArray):
+            # Shared and memory mapped arrays are used without being copied
+            if source.ndim != 2 or source.dtype != np.float64:
+                raise ValueError(
+                    "Source must be a 2D float array in the form "
+                    "[[x1, x2 ..., xn, y], ...]."
+                )
+            return source
+
         if isinstance(source, (str, Path)):
             # Read csv or txt files and create a numpy array
             try:
@@ -0,0 +1,326 @@
+"""
+Defines running statistics, accumulators of the moments, covariances and
+quantiles of a stream of values. The accumulators are updated as the values
+arrive, without keeping them in memory, and accumulators of different streams
+or processes can be merged into one.
+"""
+
+import math
+
+import numpy as np
+from scipy import stats
+
+
+class RunningMoments:
+    """Running count, mean, variance and extremes of a stream of values,
+    updated with Welford's algorithm. Batches of values and other accumulators
+    are merged with the parallel algorithm of Chan et al.
+
+    Examples
+    --------
+    >>> from rocketpy.mathutils.running_statistics import RunningMoments
+    >>> moments = RunningMoments()
+    >>> for value in [1.0, 2.0, 3.0]:
+    ...     moments.update(value)
+    >>> other = RunningMoments()
+    >>> other.update([4.0, 5.0])
+    >>> moments.merge(other)
+    >>> moments.count, moments.mean, moments.variance
+    (5, 3.0, 2.0)
+    >>> moments.minimum, moments.maximum
+    (1.0, 5.0)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.sum_of_squares = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def update(self, values):
+        """Adds a value, or an array of values, to the stream.
+
+        Parameters
+        ----------
+        values : float, array_like
+            Value or values to be added.
+
+        Returns
+        -------
+        None
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 0:
+            self.count += 1
+            delta = float(values) - self.mean
+            self.mean += delta / self.count
+            self.sum_of_squares += delta * (float(values) - self.mean)
+            self.minimum = min(self.minimum, float(values))
+            self.maximum = max(self.maximum, float(values))
+        elif values.size:
+            batch = RunningMoments()
+            batch.count = values.size
+            batch.mean = float(np.mean(values))
+            batch.sum_of_squares = float(np.sum((values - batch.mean) ** 2))
+            batch.minimum = float(np.min(values))
+            batch.maximum = float(np.max(values))
+            self.merge(batch)
+
+    def merge(self, other):
+        """Merges the values of another accumulator into this one.
+
+        Parameters
+        ----------
+        other : RunningMoments
+            Accumulator to be merged.
+
+        Returns
+        -------
+        None
+        """
+        count = self.count + other.count
+        if count == 0:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.sum_of_squares += (
+            other.sum_of_squares + delta**2 * self.count * other.count / count
+        )
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def variance(self):
+        """Population variance of the values."""
+        return self.sum_of_squares / self.count if self.count else math.nan
+
+    @property
+    def std(self):
+        """Population standard deviation of the values."""
+        return math.sqrt(self.variance)
+
+
+class RunningCovariance:
+    """Running mean vector and covariance matrix of a stream of vectors, such
+    as the impact points used to draw the dispersion ellipses.
+
+    Parameters
+    ----------
+    dimension : int
+        Number of components of the vectors. Default is 2.
+    """
+
+    def __init__(self, dimension=2):
+        self.count = 0
+        self.mean = np.zeros(dimension)
+        self.comoments = np.zeros((dimension, dimension))
+
+    def update(self, vectors):
+        """Adds a vector, or an array of vectors with one vector per row, to
+        the stream.
+
+        Parameters
+        ----------
+        vectors : array_like
+            Vector or vectors to be added.
+
+        Returns
+        -------
+        None
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=float))
+        if not vectors.size:
+            return
+        batch = RunningCovariance(vectors.shape[1])
+        batch.count = len(vectors)
+        batch.mean = vectors.mean(axis=0)
+        deviations = vectors - batch.mean
+        batch.comoments = deviations.T @ deviations
+        self.merge(batch)
+
+    def merge(self, other):
+        """Merges the vectors of another accumulator into this one.
+
+        Parameters
+        ----------
+        other : RunningCovariance
+            Accumulator to be merged.
+
+        Returns
+        -------
+        None
+        """
+        count = self.count + other.count
+        if count == 0:
+            return
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / count
+        self.comoments = (
+            self.comoments
+            + other.comoments
+            + np.outer(delta, delta) * self.count * other.count / count
+        )
+        self.count = count
+
+    @property
+    def covariance(self):
+        """Population covariance matrix of the vectors."""
+        if not self.count:
+            return np.full_like(self.comoments, np.nan)
+        return self.comoments / self.count
+
+
+class QuantileSketch:
+    """Mergeable sketch of the distribution of a stream of values, from which
+    quantiles are estimated in constant memory. It is a KLL sketch: values are
+    kept in levels of compactors, and a full level keeps only every other one
+    of its sorted values, each with twice the weight, in the level above. The
+    rank error of the estimated quantiles decreases with the capacity.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Number of values kept in the top level. The sketch keeps about three
+        times this many values, and quantiles are exact until more than this
+        many values are added. Default is 1000.
+    seed : int, optional
+        Seed of the random choices of which values are kept.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from rocketpy.mathutils.running_statistics import QuantileSketch
+    >>> sketch = QuantileSketch(seed=1)
+    >>> sketch.update(np.arange(100000.0))
+    >>> bool(abs(sketch.quantile(0.5) - 50000) < 2000)
+    True
+    """
+
+    _RATIO = 2 / 3
+
+    def __init__(self, capacity=1000, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.levels = [[]]
+        # Each compaction of a level shifts ranks by at most its weight
+        self.rank_error_variance = 0.0
+        self._random_number_generator = np.random.default_rng(seed)
+
+    def _level_capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.capacity * self._RATIO**depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) >= self._level_capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                values = sorted(self.levels[level])
+                offset, end = self._random_number_generator.integers(2, size=2)
+                # An odd value out, either the smallest or the largest one,
+                # stays in its level, so that no weight is lost
+                kept = []
+                if len(values) % 2:
+                    kept = [values.pop(-1 if end else 0)]
+                self.levels[level + 1].extend(values[offset::2])
+                self.levels[level] = kept
+                self.rank_error_variance += 4.0**level
+            level += 1
+
+    def update(self, values):
+        """Adds a value, or an array of values, to the stream.
+
+        Parameters
+        ----------
+        values : float, array_like
+            Value or values to be added.
+
+        Returns
+        -------
+        None
+        """
+        values = np.atleast_1d(np.asarray(values, dtype=float)).tolist()
+        for start in range(0, len(values), self.capacity):
+            batch = values[start : start + self.capacity]
+            self.levels[0].extend(batch)
+            self.count += len(batch)
+            self._compress()
+
+    def merge(self, other):
+        """Merges the values of another sketch into this one.
+
+        Parameters
+        ----------
+        other : QuantileSketch
+            Sketch to be merged.
+
+        Returns
+        -------
+        None
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, values in enumerate(other.levels):
+            self.levels[level].extend(values)
+        self.count += other.count
+        self.rank_error_variance += other.rank_error_variance
+        self._compress()
+
+    def quantile(self, q):
+        """Estimates quantiles of the values.
+
+        Parameters
+        ----------
+        q : float, array_like
+            Quantile or quantiles to be estimated, between 0 and 1.
+
+        Returns
+        -------
+        float, numpy.ndarray
+            Estimated quantiles, linearly interpolated between the values kept
+            by the sketch, each of which stands at the middle of its weight.
+            NaN if the sketch is empty.
+        """
+        values = np.concatenate([np.asarray(values) for values in self.levels])
+        weights = np.concatenate(
+            [
+                np.full(len(values), 2.0**level)
+                for level, values in enumerate(self.levels)
+            ]
+        )
+        if not len(values):
+            return np.full(np.shape(q), np.nan)[()]
+        order = np.argsort(values)
+        weights = weights[order]
+        centers = np.cumsum(weights) - weights / 2
+        return np.interp(np.asarray(q) * self.count, centers, values[order])[()]
+
+    def quantile_confidence_interval(self, q, confidence=0.95):
+        """Estimates a distribution free confidence interval of a quantile,
+        from the order statistics whose ranks bound the binomial count of
+        values below the quantile. The interval is widened by the rank error
+        of the sketch.
+
+        Parameters
+        ----------
+        q : float
+            Quantile, between 0 and 1.
+        confidence : float, optional
+            Confidence level of the interval. Default is 0.95.
+
+        Returns
+        -------
+        tuple[float, float]
+            Lower and upper bounds of the interval.
+        """
+        if not self.count:
+            return (math.nan, math.nan)
+        z = stats.norm.ppf(0.5 + confidence / 2)
+        half_width = z * math.sqrt(
+            q * (1 - q) / self.count + self.rank_error_variance / self.count**2
+        )
+        lower, upper = self.quantile([max(q - half_width, 0), min(q + half_width, 1)])
+        return (float(lower), float(upper))
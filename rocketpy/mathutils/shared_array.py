@@ -0,0 +1,196 @@
+"""The mathutils/shared_array.py module contains the SharedArray class, a numpy
+array whose data lives outside of the Python heap, either in a shared memory
+block or in a memory mapped ``.npy`` file. Such arrays are pickled as a small
+handle to their storage instead of as a copy of their data, which allows large
+tables, such as the ones of the Function class, to be shared between processes
+without being copied.
+"""
+
+import os
+import sys
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Storages already attached in the current process, indexed by their handle
+_ATTACHED_STORAGES = weakref.WeakValueDictionary()
+
+
+class _Storage:
+    """Keeps a shared memory block or a memory mapped file alive while any
+    array uses it. Shared memory blocks are unlinked once the storage that
+    created them is garbage collected, while they are only closed after the
+    last array that uses their memory is deallocated."""
+
+    def __init__(self, handle, base, shared_memory_block=None, owner=False):
+        self.handle = handle
+        self.base = base
+        self.address = base.__array_interface__["data"][0]
+        self.shared_memory_block = shared_memory_block
+        self.owner = owner
+
+    def contains(self, array):
+        """Checks whether the data of the array lies inside this storage."""
+        address = array.__array_interface__["data"][0]
+        return self.address <= address < self.address + max(self.base.nbytes, 1)
+
+    def __del__(self):
+        if self.owner:
+            self.shared_memory_block.unlink()
+
+
+def _map_shared_memory(block):
+    """Returns a byte array over the memory of a shared memory block. The
+    block is only closed once no array refers to its memory, that is, when
+    the buffer of the byte array, which every view of it refers to, is
+    released."""
+    array = np.frombuffer(memoryview(block.buf), dtype=np.uint8)
+    finalizer = weakref.finalize(array.base, block.close)
+    # Arrays may still use the memory when the interpreter exits
+    finalizer.atexit = False
+    return array
+
+
+def _attach_shared_memory(name):
+    """Attaches to an existing shared memory block. Child processes share the
+    resource tracker of their parent, which already tracks the block, so it
+    must not be tracked again."""
+    if sys.version_info >= (3, 13):  # pragma: no cover
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def _attach_storage(handle):
+    """Returns the storage identified by the handle, attaching to it only if
+    it is not yet attached in the current process."""
+    storage = _ATTACHED_STORAGES.get(handle)
+    if storage is None:
+        kind, name = handle[:2]
+        if kind == "shared_memory":
+            block = _attach_shared_memory(name)
+            storage = _Storage(handle, _map_shared_memory(block))
+        else:
+            base = np.memmap(name, dtype=np.uint8, mode="r")
+            storage = _Storage(handle, base)
+        _ATTACHED_STORAGES[handle] = storage
+    return storage
+
+
+def _rebuild_shared_array(handle, shape, dtype, offset, strides):
+    """Rebuilds a SharedArray from its handle. Used when unpickling."""
+    return SharedArray._from_storage(
+        _attach_storage(handle), shape, dtype, offset, strides
+    )
+
+
+class SharedArray(np.ndarray):
+    """Numpy array backed by a shared memory block or by a memory mapped
+    ``.npy`` file. Apart from how they are pickled, SharedArrays behave like
+    any other numpy array. Views of a SharedArray are also SharedArrays that
+    point to the same storage, while the results of computations involving
+    them are ordinary numpy arrays.
+
+    When pickled, only the name of the shared memory block or the path of the
+    file is serialized, together with the position of the data inside of it.
+    Unpickling attaches to the same storage, so that no data is copied.
+
+    Notes
+    -----
+    Shared memory blocks are released once every SharedArray that uses them
+    in the process that created them is garbage collected. Hence, the
+    original arrays must be kept alive while other processes attach to them.
+
+    Memory mapped arrays are read-only, and the mapped file must not be
+    modified while they are in use.
+
+    Examples
+    --------
+    >>> import pickle
+    >>> import numpy as np
+    >>> from rocketpy.mathutils.shared_array import SharedArray
+    >>> array = SharedArray.from_array(np.arange(6.0).reshape(3, 2))
+    >>> column = pickle.loads(pickle.dumps(array[:, 1]))
+    >>> column.tolist()
+    [1.0, 3.0, 5.0]
+    >>> len(pickle.dumps(array[:, 1])) < len(pickle.dumps(np.arange(1000.0)))
+    True
+    """
+
+    def __array_finalize__(self, obj):
+        self._storage = getattr(obj, "_storage", None)
+
+    def __array_wrap__(self, array, context=None, return_scalar=False):
+        array = array.view(np.ndarray)
+        return array[()] if return_scalar else array
+
+    def __reduce__(self):
+        if self._storage is None or not self._storage.contains(self):
+            return np.array(self).__reduce__()
+        offset = self.__array_interface__["data"][0] - self._storage.address
+        return (
+            _rebuild_shared_array,
+            (self._storage.handle, self.shape, self.dtype, offset, self.strides),
+        )
+
+    def __reduce_ex__(self, protocol):
+        return self.__reduce__()
+
+    @classmethod
+    def _from_storage(cls, storage, shape, dtype, offset, strides=None):
+        array = np.ndarray(
+            shape, dtype, buffer=storage.base, offset=offset, strides=strides
+        ).view(cls)
+        array._storage = storage
+        return array
+
+    @classmethod
+    def from_array(cls, array):
+        """Copies an array into a new shared memory block.
+
+        Parameters
+        ----------
+        array : array_like
+            Array to be copied into shared memory.
+
+        Returns
+        -------
+        SharedArray
+            Array with the same shape, type and contents of the given one,
+            whose data lives in shared memory.
+        """
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        storage = _Storage(
+            ("shared_memory", block.name),
+            _map_shared_memory(block),
+            shared_memory_block=block,
+            owner=True,
+        )
+        _ATTACHED_STORAGES[storage.handle] = storage
+        shared = cls._from_storage(storage, array.shape, array.dtype, 0)
+        shared[...] = array
+        return shared
+
+    @classmethod
+    def load(cls, filename):
+        """Maps the array stored in a ``.npy`` file into memory. Data is only
+        read from the disk when it is accessed.
+
+        Parameters
+        ----------
+        filename : str, Path
+            Path to a ``.npy`` file, such as the ones created by ``numpy.save``.
+
+        Returns
+        -------
+        SharedArray
+            Read-only array mapped from the file.
+        """
+        filename = os.path.abspath(filename)
+        mapped = np.load(filename, mmap_mode="r", allow_pickle=False)
+        # The modification time tells apart different versions of the file
+        storage = _attach_storage(("file", filename, os.stat(filename).st_mtime_ns))
+        return cls._from_storage(
+            storage, mapped.shape, mapped.dtype, mapped.offset, mapped.strides
+        )
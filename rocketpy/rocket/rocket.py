@@ -1,4 +1,5 @@
 import warnings
+from copy import copy
 
 import numpy as np
 
@@ -21,7 +22,152 @@ from rocketpy.rocket.components import Components
 from rocketpy.rocket.parachute import Parachute
 from rocketpy.tools import parallel_axis_theorem_from_com
 
+_INERTIAS_WITHOUT_MOTOR = tuple(
+    f"I_{axes}_without_motor" for axes in ("11", "22", "33", "12", "13", "23")
+)
+_DRY_INERTIAS = tuple(f"dry_I_{axes}" for axes in ("11", "22", "33", "12", "13", "23"))
+_INERTIAS = tuple(f"I_{axes}" for axes in ("11", "22", "33", "12", "13", "23"))
+
+# Methods that evaluate the derived quantities of the rocket, mapped to the
+# attributes they evaluate and to the attributes these directly depend on
+_EVALUATIONS = {
+    "_evaluate_area": (("area",), ("radius",)),
+    "evaluate_dry_mass": (("dry_mass",), ("mass", "motor")),
+    "evaluate_total_mass": (("total_mass",), ("mass", "motor")),
+    "evaluate_center_of_dry_mass": (
+        ("center_of_dry_mass_position",),
+        (
+            "center_of_mass_without_motor",
+            "mass",
+            "motor",
+            "motor_center_of_dry_mass_position",
+            "dry_mass",
+        ),
+    ),
+    "evaluate_nozzle_to_cdm": (
+        ("nozzle_to_cdm",),
+        ("nozzle_position", "center_of_dry_mass_position"),
+    ),
+    "evaluate_center_of_mass": (
+        ("center_of_mass",),
+        (
+            "center_of_mass_without_motor",
+            "mass",
+            "motor",
+            "motor_center_of_mass_position",
+            "total_mass",
+        ),
+    ),
+    "evaluate_dry_inertias": (
+        _DRY_INERTIAS,
+        (
+            *_INERTIAS_WITHOUT_MOTOR,
+            "center_of_mass_without_motor",
+            "mass",
+            "motor",
+            "motor_center_of_dry_mass_position",
+            "center_of_dry_mass_position",
+        ),
+    ),
+    "evaluate_inertias": (
+        _INERTIAS,
+        (
+            *_DRY_INERTIAS,
+            "motor",
+            "dry_mass",
+            "center_of_mass",
+            "center_of_dry_mass_position",
+            "center_of_propellant_position",
+        ),
+    ),
+    "evaluate_reduced_mass": (("reduced_mass",), ("motor", "dry_mass")),
+    "evaluate_thrust_to_weight": (("thrust_to_weight",), ("motor", "total_mass")),
+    "evaluate_center_of_pressure": (
+        ("total_lift_coeff_der", "cp_position"),
+        ("aerodynamic_surfaces", "radius"),
+    ),
+    # The stability margin reads the center of mass and of pressure whenever
+    # it is evaluated, so it never needs to be evaluated again
+    "evaluate_stability_margin": (("stability_margin",), ()),
+    "evaluate_static_margin": (
+        ("static_margin",),
+        ("center_of_mass", "cp_position", "radius", "motor"),
+    ),
+    "evaluate_com_to_cdm_function": (
+        ("com_to_cdm_function",),
+        (
+            "center_of_propellant_position",
+            "center_of_dry_mass_position",
+            "motor",
+            "total_mass",
+        ),
+    ),
+    "evaluate_nozzle_gyration_tensor": (
+        ("nozzle_gyration_tensor",),
+        ("motor", "nozzle_to_cdm"),
+    ),
+}
+
+
+def _find_dependents(evaluations):
+    """Maps each attribute to all the derived attributes that depend on it,
+    directly or through other derived attributes."""
+    direct_dependents = {}
+    for outputs, dependencies in evaluations.values():
+        for dependency in dependencies:
+            direct_dependents.setdefault(dependency, set()).update(outputs)
+
+    dependents = {}
+    for attribute in direct_dependents:
+        found = set()
+        pending = [attribute]
+        while pending:
+            for dependent in direct_dependents.get(pending.pop(), ()):
+                if dependent not in found:
+                    found.add(dependent)
+                    pending.append(dependent)
+        dependents[attribute] = frozenset(found)
+    return dependents
+
+
+_DEPENDENTS = _find_dependents(_EVALUATIONS)
+
+# Derived Functions that are updated in place when evaluated again, so that
+# references to them remain valid after the rocket changes
+_UPDATED_IN_PLACE = frozenset(("total_lift_coeff_der", "cp_position", "static_margin"))
+
+
+class _DerivedAttribute:
+    """Attribute of the Rocket that is only evaluated when it is first
+    accessed. Once evaluated, its value is stored in the instance dictionary,
+    which takes precedence over this descriptor, until an attribute it depends
+    on changes."""
+
+    def __init__(self, name, method):
+        self.name = name
+        self.method = method
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        getattr(instance, self.method)()
+        try:
+            return instance.__dict__[self.name]
+        except KeyError as e:
+            raise AttributeError(
+                f"'{owner.__name__}' object has no attribute '{self.name}'"
+            ) from e
+
 
+def _add_derived_attributes(cls):
+    """Class decorator that adds the derived attributes of the rocket."""
+    for method, (outputs, _) in _EVALUATIONS.items():
+        for output in outputs:
+            setattr(cls, output, _DerivedAttribute(output, method))
+    return cls
+
+
+@_add_derived_attributes
 class Rocket:
     """Keeps rocket information.
 
@@ -261,6 +407,9 @@ class Rocket:
         -------
         None
         """
+        # Derived Functions waiting to be evaluated again, see _invalidate
+        self._outdated_functions = {}
+
         # Define coordinate system orientation
         self.coordinate_system_orientation = coordinate_system_orientation
         if coordinate_system_orientation == "tail_to_nose":
@@ -286,7 +435,6 @@ class Rocket:
         # Define rocket geometrical parameters in SI units
         self.center_of_mass_without_motor = center_of_mass_without_motor
         self.radius = radius
-        self.area = np.pi * self.radius**2
 
         # Eccentricity data initialization
         self.cp_eccentricity_x = 0
@@ -307,25 +455,6 @@ class Rocket:
         self.aerodynamic_surfaces = Components()
         self.rail_buttons = Components()
 
-        self.cp_position = Function(
-            lambda mach: 0,
-            inputs="Mach Number",
-            outputs="Center of Pressure Position (m)",
-        )
-        self.total_lift_coeff_der = Function(
-            lambda mach: 0,
-            inputs="Mach Number",
-            outputs="Total Lift Coefficient Derivative",
-        )
-        self.static_margin = Function(
-            lambda time: 0, inputs="Time (s)", outputs="Static Margin (c)"
-        )
-        self.stability_margin = Function(
-            lambda mach, time: 0,
-            inputs=["Mach", "Time (s)"],
-            outputs="Stability Margin (c)",
-        )
-
         # Define aerodynamic drag coefficients
         self.power_off_drag = Function(
             power_off_drag,
@@ -346,24 +475,9 @@ class Rocket:
         # self.motors = Components()  # currently unused, only 1 motor is supported
         self.add_motor(motor=EmptyMotor(), position=0)
 
-        # Important dynamic inertial quantities
-        self.center_of_mass = None
-        self.reduced_mass = None
-        self.total_mass = None
-        self.dry_mass = None
-
-        # calculate dynamic inertial quantities
-        self.evaluate_dry_mass()
-        self.evaluate_total_mass()
-        self.evaluate_center_of_dry_mass()
-        self.evaluate_center_of_mass()
-        self.evaluate_reduced_mass()
-        self.evaluate_thrust_to_weight()
-
-        # Evaluate stability (even though no aerodynamic surfaces are present yet)
-        self.evaluate_center_of_pressure()
-        self.evaluate_stability_margin()
-        self.evaluate_static_margin()
+        # The inertial and aerodynamic quantities, such as the total mass, the
+        # center of mass and the stability margin, are evaluated when first
+        # accessed, and evaluated again once any input they depend on changes
 
         # Initialize plots and prints object
         self.prints = _RocketPrints(self)
@@ -384,6 +498,105 @@ class Rocket:
         """A list with all the tails currently added to the rocket"""
         return self.aerodynamic_surfaces.get_by_type(Tail)
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in _DEPENDENTS:
+            self._invalidate(name)
+
+    def __copy__(self):
+        """Returns a copy of the rocket that shares its motor, aerodynamic
+        surfaces and evaluated quantities, but whose inputs and lists of
+        components can be changed without affecting the original rocket."""
+        rocket = object.__new__(type(self))
+        rocket.__dict__.update(self.__dict__)
+        for name in ("aerodynamic_surfaces", "rail_buttons"):
+            components = Components()
+            for component, position in getattr(self, name):
+                components.add(component, position)
+            rocket.__dict__[name] = components
+        rocket.parachutes = list(self.parachutes)
+        rocket._controllers = list(self._controllers)
+        rocket.air_brakes = list(self.air_brakes)
+        # The copy updates its own Functions in place
+        rocket._outdated_functions = {}
+        for name in ("total_lift_coeff_der", "cp_position"):
+            if name in rocket.__dict__:
+                rocket.__dict__[name] = copy(rocket.__dict__[name])
+        # The margins refer to the rocket that evaluated them
+        rocket.__dict__.pop("stability_margin", None)
+        rocket.__dict__.pop("static_margin", None)
+        rocket.prints = _RocketPrints(rocket)
+        rocket.plots = _RocketPlots(rocket)
+        return rocket
+
+    def _invalidate(self, *names):
+        """Discards the evaluated quantities that depend on the given
+        attributes, so that they are evaluated again when next accessed. Must
+        be called whenever an input of the rocket is changed in place, such as
+        the list of aerodynamic surfaces.
+
+        The Functions that are updated in place, such as the center of pressure
+        position, are kept aside instead. Until they are evaluated again,
+        calling them evaluates the rocket's quantity again, so that references
+        to them taken before the change remain valid."""
+        for name in names:
+            for dependent in _DEPENDENTS.get(name, ()):
+                value = self.__dict__.pop(dependent, None)
+                if value is not None and dependent in _UPDATED_IN_PLACE:
+                    self._outdated_functions[dependent] = value
+                    value.set_source(self.__evaluate_on_call(dependent))
+
+    def __evaluate_on_call(self, name):
+        """Returns a source for the outdated Function ``name`` that evaluates
+        it again the first time it is called."""
+
+        def source(x):
+            return getattr(self, name).get_value_opt(x)
+
+        return source
+
+    def _update_function(self, name, function):
+        """Sets the derived Function ``name`` of the rocket. If a previous
+        version of it is outdated, it is updated in place to match the given
+        Function, and kept as the rocket's attribute.
+
+        Parameters
+        ----------
+        name : str
+            Name of the attribute of the rocket.
+        function : Function
+            The newly evaluated Function.
+
+        Returns
+        -------
+        Function
+            The Function set as the attribute of the rocket.
+        """
+        previous = self._outdated_functions.pop(name, None)
+        if previous is not None:
+            previous.set_source(function)
+            if not callable(function.source):
+                previous.set_interpolation(function.get_interpolation_method())
+                previous.set_extrapolation(function.get_extrapolation_method())
+            previous.set_inputs(function.get_inputs())
+            previous.set_outputs(function.get_outputs())
+            previous.set_title(function.title)
+            function = previous
+        setattr(self, name, function)
+        return function
+
+    def _evaluate_all(self):
+        """Evaluates all the quantities of the rocket that are not evaluated
+        yet."""
+        for method, (outputs, _) in _EVALUATIONS.items():
+            if any(output not in self.__dict__ for output in outputs):
+                getattr(self, method)()
+
+    def _evaluate_area(self):
+        """Evaluates the rocket's largest frontal area, in squared meters."""
+        self.area = np.pi * self.radius**2
+        return self.area
+
     def evaluate_total_mass(self):
         """Calculates and returns the rocket's total mass. The total
         mass is defined as the sum of the motor mass with propellant and the
@@ -522,24 +735,33 @@ class Rocket:
             See :doc:`Positions and Coordinate Systems </user/positions>`
             for more information.
         """
-        # Re-Initialize total lift coefficient derivative and center of pressure position
-        self.total_lift_coeff_der.set_source(lambda mach: 0)
-        self.cp_position.set_source(lambda mach: 0)
+        # Initialize total lift coefficient derivative and center of pressure position
+        total_lift_coeff_der = Function(
+            lambda mach: 0,
+            inputs="Mach Number",
+            outputs="Total Lift Coefficient Derivative",
+        )
+        cp_position = Function(
+            lambda mach: 0,
+            inputs="Mach Number",
+            outputs="Center of Pressure Position (m)",
+        )
 
         # Calculate total lift coefficient derivative and center of pressure
         if len(self.aerodynamic_surfaces) > 0:
             for aero_surface, position in self.aerodynamic_surfaces:
                 # ref_factor corrects lift for different reference areas
                 ref_factor = (aero_surface.rocket_radius / self.radius) ** 2
-                self.total_lift_coeff_der += ref_factor * aero_surface.clalpha
-                self.cp_position += (
+                total_lift_coeff_der += ref_factor * aero_surface.clalpha
+                cp_position += (
                     ref_factor
                     * aero_surface.clalpha
                     * (position - self._csys * aero_surface.cpz)
                 )
-            self.cp_position /= self.total_lift_coeff_der
+            cp_position /= total_lift_coeff_der
 
-        return self.cp_position
+        self._update_function("total_lift_coeff_der", total_lift_coeff_der)
+        return self._update_function("cp_position", cp_position)
 
     def evaluate_stability_margin(self):
         """Calculates the stability margin of the rocket as a function of mach
@@ -553,7 +775,7 @@ class Rocket:
             the center of pressure and the center of mass, divided by the
             rocket's diameter.
         """
-        self.stability_margin.set_source(
+        self.stability_margin = Function(
             lambda mach, time: (
                 (
                     self.center_of_mass.get_value_opt(time)
@@ -561,7 +783,9 @@ class Rocket:
                 )
                 / (2 * self.radius)
             )
-            * self._csys
+            * self._csys,
+            inputs=["Mach", "Time (s)"],
+            outputs="Stability Margin (c)",
         )
         return self.stability_margin
 
@@ -575,23 +799,23 @@ class Rocket:
             Static margin is defined as the distance between the center of
             pressure and the center of mass, divided by the rocket's diameter.
         """
-        # Calculate static margin
-        self.static_margin.set_source(
+        # Calculate static margin, changing its sign if coordinate system is
+        # upside down
+        static_margin = Function(
             lambda time: (
-                self.center_of_mass.get_value_opt(time)
-                - self.cp_position.get_value_opt(0)
+                (
+                    self.center_of_mass.get_value_opt(time)
+                    - self.cp_position.get_value_opt(0)
+                )
+                / (2 * self.radius)
             )
-            / (2 * self.radius)
+            * self._csys,
+            inputs="Time (s)",
+            outputs="Static Margin (c)",
+            title="Static Margin",
         )
-        # Change sign if coordinate system is upside down
-        self.static_margin *= self._csys
-        self.static_margin.set_inputs("Time (s)")
-        self.static_margin.set_outputs("Static Margin (c)")
-        self.static_margin.set_title("Static Margin")
-        self.static_margin.set_discrete(
-            lower=0, upper=self.motor.burn_out_time, samples=200
-        )
-        return self.static_margin
+        static_margin.set_discrete(lower=0, upper=self.motor.burn_out_time, samples=200)
+        return self._update_function("static_margin", static_margin)
 
     def evaluate_dry_inertias(self):
         """Calculates and returns the rocket's dry inertias relative to
@@ -895,6 +1119,12 @@ class Rocket:
                 "Only one motor per rocket is currently supported. "
                 + "Overwriting previous motor."
             )
+        self._set_motor(motor, position)
+
+    def _set_motor(self, motor, position):
+        """Sets the motor of the rocket and the positions of its reference
+        points in the rocket coordinate system, without evaluating the
+        quantities that depend on them. See ``add_motor``."""
         self.motor = motor
         self.motor_position = position
         _ = self._csys * self.motor._csys
@@ -909,20 +1139,6 @@ class Rocket:
         )
         self.nozzle_position = self.motor.nozzle_position * _ + self.motor_position
         self.total_mass_flow_rate = self.motor.total_mass_flow_rate
-        self.evaluate_dry_mass()
-        self.evaluate_total_mass()
-        self.evaluate_center_of_dry_mass()
-        self.evaluate_nozzle_to_cdm()
-        self.evaluate_center_of_mass()
-        self.evaluate_dry_inertias()
-        self.evaluate_inertias()
-        self.evaluate_reduced_mass()
-        self.evaluate_thrust_to_weight()
-        self.evaluate_center_of_pressure()
-        self.evaluate_stability_margin()
-        self.evaluate_static_margin()
-        self.evaluate_com_to_cdm_function()
-        self.evaluate_nozzle_gyration_tensor()
 
     def add_surfaces(self, surfaces, positions):
         """Adds one or more aerodynamic surfaces to the rocket. The aerodynamic
@@ -959,9 +1175,7 @@ class Rocket:
         except TypeError:
             self.aerodynamic_surfaces.add(surfaces, positions)
 
-        self.evaluate_center_of_pressure()
-        self.evaluate_stability_margin()
-        self.evaluate_static_margin()
+        self._invalidate("aerodynamic_surfaces")
 
     def _add_controllers(self, controllers):
         """Adds a controller to the rocket.
@@ -1,3 +1,4 @@
+from .columnar_store import ColumnarStore
 from .flight import Flight
 from .flight_data_importer import FlightDataImporter
 from .monte_carlo import MonteCarlo
@@ -0,0 +1,485 @@
+"""
+Defines the ColumnarStore class, a chunked columnar storage of rows of values,
+such as the inputs, outputs and errors of a Monte Carlo simulation. Compared to
+files with one JSON object per line, columns of numbers are stored in binary,
+read without parsing and memory mapped, so that millions of rows can be loaded
+quickly.
+"""
+
+import json
+import os
+import shutil
+from collections.abc import Sequence
+
+import numpy as np
+
+from rocketpy._encoders import RocketPyEncoder
+from rocketpy.mathutils.shared_array import SharedArray
+
+_INDEX_FILENAME = "index.json"
+_CHUNK_PREFIX = "chunk_"
+
+
+def _is_bool(value):
+    return isinstance(value, (bool, np.bool_))
+
+
+def _is_integer(value):
+    return isinstance(value, (int, np.integer)) and not _is_bool(value)
+
+
+def _is_number(value):
+    return _is_integer(value) or isinstance(value, (float, np.floating))
+
+
+def _to_column(values):
+    """Converts the values of a column of a chunk into arrays that can be
+    saved to ``.npy`` files, returning the arrays and the kind of the column.
+    Values that are neither all numbers nor all booleans are stored as JSON
+    texts, encoded in UTF-8 and concatenated into a single array of bytes,
+    with a second array with the offset of each text."""
+    if all(_is_bool(value) for value in values):
+        return [np.array(values, dtype=bool)], "bool"
+    if all(_is_integer(value) for value in values):
+        try:
+            return [np.array(values, dtype=np.int64)], "int"
+        except OverflowError:
+            pass
+    elif all(value is None or _is_number(value) for value in values):
+        kind = "float" if None not in values else "nullable_float"
+        return [np.array(values, dtype=float)], kind
+    encoded = [
+        json.dumps(value, cls=RocketPyEncoder).encode("utf-8") for value in values
+    ]
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    offsets = np.cumsum([0] + [len(text) for text in encoded], dtype=np.int64)
+    return [data, offsets], "json"
+
+
+class _JsonColumn:
+    """Column of JSON values of a chunk, decoded only when accessed."""
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return json.loads(self.data[start:end].tobytes())
+
+    def tolist(self):
+        """Decodes all the values of the column."""
+        return [self[index] for index in range(len(self))]
+
+
+def _to_values(column, kind):
+    """Converts a column of a chunk back into a list of Python values."""
+    values = column.tolist()
+    if kind == "nullable_float":
+        return [None if value != value else value for value in values]
+    return values
+
+
+def _to_value(column, kind, index):
+    """Converts a value of a column of a chunk back into a Python value."""
+    if kind == "json":
+        return column[index]
+    value = column[index].item()
+    if kind == "nullable_float" and value != value:
+        return None
+    return value
+
+
+class _Rows(Sequence):
+    """Read-only sequence of the committed rows of a ColumnarStore. The rows
+    are only decoded when accessed, reading from each column the values of
+    the accessed rows only."""
+
+    def __init__(self, store):
+        self._store = store
+        self._chunks = store.chunks
+        self._indexes = [store._read_index(chunk) for chunk in self._chunks]
+        self._ends = np.cumsum([index["rows"] for index in self._indexes])
+        self._columns = {}
+
+    def _chunk_columns(self, position):
+        if position not in self._columns:
+            chunk, index = self._chunks[position], self._indexes[position]
+            self._columns[position] = [
+                self._store._read_column(chunk, column, kind)
+                for column, kind in enumerate(index["kinds"])
+            ]
+        return self._columns[position]
+
+    def __len__(self):
+        return int(self._ends[-1]) if len(self._ends) else 0
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[index] for index in range(*item.indices(len(self)))]
+        length = len(self)
+        if item < 0:
+            item += length
+        if not 0 <= item < length:
+            raise IndexError("row index out of range")
+        position = int(np.searchsorted(self._ends, item, side="right"))
+        row = item - (self._ends[position - 1] if position else 0)
+        index = self._indexes[position]
+        return {
+            name: _to_value(column, kind, row)
+            for name, kind, column in zip(
+                index["columns"], index["kinds"], self._chunk_columns(position)
+            )
+        }
+
+    def __iter__(self):
+        for position, index in enumerate(self._indexes):
+            values = [
+                _to_values(column, kind)
+                for column, kind in zip(self._chunk_columns(position), index["kinds"])
+            ]
+            for row in zip(*values):
+                yield dict(zip(index["columns"], row))
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return f"<rows of {self._store!r}: {len(self)} rows>"
+
+
+class ColumnarStore:
+    """Chunked columnar store of rows of values, each row being a dictionary.
+
+    The store is a directory with one subdirectory per chunk of rows. Each
+    chunk holds one ``.npy`` file per column and an ``index.json`` file with
+    the names and kinds of its columns and its number of rows. Columns of
+    booleans, integers and floats are stored as binary arrays, while any other
+    values are stored as JSON texts, in an array of bytes with a second
+    ``.offsets.npy`` file with the offset of each value.
+
+    Rows are buffered in memory and committed as a new chunk once
+    ``chunk_size`` rows are buffered, or when the store is flushed or closed.
+    Chunks are written to a temporary directory that is then renamed, so that a
+    crash never leaves a partially written chunk behind: only the rows buffered
+    since the last commit are lost.
+
+    The store can also be written to as a text file with one JSON object per
+    line, through its ``write`` method, which allows it to replace the text
+    logs of the MonteCarlo class.
+
+    Examples
+    --------
+    >>> import tempfile, os
+    >>> from rocketpy.simulation.columnar_store import ColumnarStore
+    >>> path = os.path.join(tempfile.mkdtemp(), "example.outputs")
+    >>> with ColumnarStore(path, chunk_size=2) as store:
+    ...     for i in range(3):
+    ...         store.append({"apogee": 1000.0 + i, "events": [i]})
+    >>> store = ColumnarStore(path)
+    >>> len(store), store.columns
+    (3, ['apogee', 'events'])
+    >>> store.column("apogee").tolist()
+    [1000.0, 1001.0, 1002.0]
+    >>> store.rows()[2]
+    {'apogee': 1002.0, 'events': [2]}
+    """
+
+    def __init__(self, path, chunk_size=1000):
+        """Opens a store, which is created once the first chunk is committed.
+
+        Parameters
+        ----------
+        path : str, Path
+            Path of the directory of the store.
+        chunk_size : int, optional
+            Number of rows of each chunk. Default is 1000.
+
+        Returns
+        -------
+        None
+        """
+        self.path = os.fspath(path)
+        self.chunk_size = chunk_size
+        self._buffer = []
+        self._partial_line = ""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        """Number of committed rows."""
+        return sum(self._read_index(chunk)["rows"] for chunk in self.chunks)
+
+    def __repr__(self):
+        return f"ColumnarStore('{self.path}')"
+
+    @property
+    def chunks(self):
+        """Sorted list of the paths of the committed chunks."""
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(
+            os.path.join(self.path, name)
+            for name in os.listdir(self.path)
+            if name.startswith(_CHUNK_PREFIX) and not name.endswith(".tmp")
+        )
+
+    @property
+    def columns(self):
+        """Names of the columns of the committed rows, in the order in which
+        they first appear."""
+        columns = {}
+        for chunk in self.chunks:
+            columns.update(dict.fromkeys(self._read_index(chunk)["columns"]))
+        return list(columns)
+
+    @staticmethod
+    def _read_index(chunk):
+        with open(os.path.join(chunk, _INDEX_FILENAME), encoding="utf-8") as file:
+            return json.load(file)
+
+    @staticmethod
+    def _read_array(chunk, position):
+        return SharedArray.load(os.path.join(chunk, f"{position}.npy"))
+
+    @classmethod
+    def _read_column(cls, chunk, position, kind):
+        if kind == "json":
+            return _JsonColumn(
+                cls._read_array(chunk, position),
+                cls._read_array(chunk, f"{position}.offsets"),
+            )
+        return cls._read_array(chunk, position)
+
+    def append(self, row):
+        """Appends a row to the store. The row is kept in memory until it is
+        committed, when its values are converted, so it must not be modified
+        afterwards.
+
+        Parameters
+        ----------
+        row : dict
+            Dictionary with the values of the row, indexed by column name.
+            Values that are not numbers or booleans are encoded as JSON, with
+            the ``RocketPyEncoder``.
+
+        Returns
+        -------
+        None
+        """
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def write(self, text):
+        """Appends the rows of a text with one JSON object per line. Lines
+        may be split across several calls.
+
+        Parameters
+        ----------
+        text : str
+            Text with one JSON object per line.
+
+        Returns
+        -------
+        None
+        """
+        lines = (self._partial_line + text).split("\n")
+        self._partial_line = lines.pop()
+        for line in lines:
+            if line.strip():
+                self.append(json.loads(line))
+
+    def flush(self):
+        """Commits the buffered rows as a new chunk.
+
+        Returns
+        -------
+        None
+        """
+        if not self._buffer:
+            return
+        columns = list({key: None for row in self._buffer for key in row})
+        chunk_numbers = [
+            int(os.path.basename(chunk)[len(_CHUNK_PREFIX) :]) for chunk in self.chunks
+        ]
+        chunk = os.path.join(
+            self.path, f"{_CHUNK_PREFIX}{max(chunk_numbers, default=-1) + 1:08d}"
+        )
+        temporary_chunk = chunk + ".tmp"
+        shutil.rmtree(temporary_chunk, ignore_errors=True)
+        os.makedirs(temporary_chunk)
+
+        kinds = []
+        for position, column in enumerate(columns):
+            arrays, kind = _to_column([row.get(column) for row in self._buffer])
+            for name, array in zip([f"{position}", f"{position}.offsets"], arrays):
+                np.save(os.path.join(temporary_chunk, f"{name}.npy"), array)
+            kinds.append(kind)
+        index = {"rows": len(self._buffer), "columns": columns, "kinds": kinds}
+        with open(
+            os.path.join(temporary_chunk, _INDEX_FILENAME), "w", encoding="utf-8"
+        ) as file:
+            json.dump(index, file)
+
+        os.rename(temporary_chunk, chunk)
+        self._buffer = []
+
+    def close(self):
+        """Commits the buffered rows, including a last line written without
+        a line break.
+
+        Returns
+        -------
+        None
+        """
+        self.write("\n")
+        self.flush()
+
+    def clear(self):
+        """Deletes all the rows of the store, including the buffered ones.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        OSError
+            If the files of the store cannot be deleted. On Windows, this
+            happens while arrays read from the store still map its files, so
+            they must be released before the store is cleared.
+        """
+        self._buffer = []
+        self._partial_line = ""
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+
+    def column(self, name):
+        """Reads a column of the committed rows. Numeric columns are memory
+        mapped, and are only copied if the store has more than one chunk.
+
+        Parameters
+        ----------
+        name : str
+            Name of the column.
+
+        Returns
+        -------
+        numpy.ndarray, list
+            Array with the values of numeric columns, in which missing values
+            are NaN, or list with the values of any other column, in which
+            missing values are None.
+        """
+        pieces = []
+        for chunk in self.chunks:
+            index = self._read_index(chunk)
+            if name not in index["columns"]:
+                pieces.append((np.full(index["rows"], np.nan), "nullable_float"))
+                continue
+            position = index["columns"].index(name)
+            kind = index["kinds"][position]
+            pieces.append((self._read_column(chunk, position, kind), kind))
+
+        if any(kind == "json" for _, kind in pieces):
+            return [
+                value for array, kind in pieces for value in _to_values(array, kind)
+            ]
+        if len(pieces) == 1:
+            return pieces[0][0]
+        if not pieces:
+            return np.array([])
+        return np.concatenate([array for array, _ in pieces])
+
+    def rows(self, lazy=False):
+        """Reads all the committed rows.
+
+        Parameters
+        ----------
+        lazy : bool, optional
+            If True, returns a read-only sequence whose rows are only decoded
+            when accessed, instead of a list. Default is False.
+
+        Returns
+        -------
+        list[dict], collections.abc.Sequence
+            The dictionaries of the rows. Columns missing from the chunk of a
+            row are missing from its dictionary, while null values of the
+            columns of the chunk are None.
+        """
+        rows = _Rows(self)
+        return rows if lazy else list(rows)
+
+    def compact(self):
+        """Merges all the committed chunks into a single chunk, so that
+        columns are read directly from memory mapped files.
+
+        Returns
+        -------
+        None
+        """
+        if len(self.chunks) < 2:
+            return
+        compacted = ColumnarStore(self.path + ".compact.tmp", chunk_size=np.inf)
+        compacted.clear()
+        for row in self.rows():
+            compacted.append(row)
+        compacted.flush()
+        replaced_path = self.path + ".replaced.tmp"
+        os.rename(self.path, replaced_path)
+        os.rename(compacted.path, self.path)
+        shutil.rmtree(replaced_path)
+
+    @classmethod
+    def from_text(cls, text_file, path, chunk_size=1000):
+        """Converts a text file with one JSON object per line, such as the
+        logs written by the MonteCarlo class, into a store. Any existing store
+        in the given path is replaced.
+
+        Parameters
+        ----------
+        text_file : str, Path
+            Path of the text file.
+        path : str, Path
+            Path of the directory of the store.
+        chunk_size : int, optional
+            Number of rows of each chunk. Default is 1000.
+
+        Returns
+        -------
+        ColumnarStore
+            The store with the rows of the text file.
+        """
+        store = cls(path, chunk_size)
+        store.clear()
+        with open(text_file, encoding="utf-8") as file:
+            for line in file:
+                store.write(line)
+        store.close()
+        return store
+
+    def to_text(self, text_file):
+        """Writes the committed rows to a text file with one JSON object per
+        line.
+
+        Parameters
+        ----------
+        text_file : str, Path
+            Path of the text file.
+
+        Returns
+        -------
+        None
+        """
+        with open(text_file, "w", encoding="utf-8") as file:
+            for row in self.rows():
+                file.write(json.dumps(row, cls=RocketPyEncoder) + "\n")
@@ -2,17 +2,20 @@ import math
 import warnings
 from copy import deepcopy
 from functools import cached_property
+from time import time
 
 import numpy as np
 import simplekml
 from scipy import integrate
 
+from ..environment.atmosphere_table import AtmosphereTable
 from ..mathutils.function import Function, funcify_method
 from ..mathutils.vector_matrix import Matrix, Vector
 from ..plots.flight_plots import _FlightPlots
 from ..prints.flight_prints import _FlightPrints
 from ..tools import (
     calculate_cubic_hermite_coefficients,
+    cartesian_to_geodesic,
     find_closest,
     find_root_linear_interpolation,
     find_roots_cubic_function,
@@ -65,6 +68,11 @@ class Flight:
         being simulated, not time taken to run simulation.
     Flight.max_time_step : int, float
         Maximum time step to use during numerical integration in seconds.
+    Flight.max_wall_time : int, float, None
+        Maximum wall clock time allowed to run the simulation, in seconds.
+    Flight.max_function_evaluations : int, None
+        Maximum number of evaluations of the equations of motion allowed
+        during the simulation.
     Flight.min_time_step : int, float
         Minimum time step to use during numerical integration in seconds.
     Flight.rtol : int, float
@@ -179,7 +187,11 @@ class Flight:
         it impacts ground.
     Flight.impact_state : array
         State vector u corresponding to state when the rocket
-        impacts the ground.
+        impacts the ground. If the environment has a topographic profile,
+        the ground follows the terrain, shifted so that the launch site
+        lies at the elevation of the environment. Otherwise, and outside of
+        the topographic profile, the ground is flat, at the elevation of the
+        environment.
     Flight.parachute_events : array
         List that stores parachute events triggered during flight.
     Flight.function_evaluations : array
@@ -503,6 +515,8 @@ class Flight:
         verbose=False,
         name="Flight",
         equations_of_motion="standard",
+        max_wall_time=None,
+        max_function_evaluations=None,
     ):
         """Run a trajectory simulation.
 
@@ -578,10 +592,27 @@ class Flight:
             more restricted set of equations of motion that only works for
             solid propulsion rockets. Such equations were used in RocketPy v0
             and are kept here for backwards compatibility.
+        max_wall_time : int, float, optional
+            Maximum wall clock time, in seconds, that the simulation may take.
+            Unlike ``max_time``, it refers to the time taken to run the
+            simulation. If exceeded, a TimeoutError is raised. Default is None,
+            which sets no limit.
+        max_function_evaluations : int, optional
+            Maximum number of evaluations of the equations of motion that the
+            simulation may take, summed over all flight phases. If exceeded, a
+            RuntimeError is raised. Default is None, which sets no limit.
 
         Returns
         -------
         None
+
+        Raises
+        ------
+        TimeoutError
+            If the simulation takes longer than ``max_wall_time``.
+        RuntimeError
+            If the simulation takes more than ``max_function_evaluations``
+            evaluations of the equations of motion.
         """
         # Save arguments
         self.env = environment
@@ -602,6 +633,8 @@ class Flight:
         self.terminate_on_apogee = terminate_on_apogee
         self.name = name
         self.equations_of_motion = equations_of_motion
+        self.max_wall_time = max_wall_time
+        self.max_function_evaluations = max_function_evaluations
 
         # Controller initialization
         self.__init_controllers()
@@ -637,6 +670,8 @@ class Flight:
 
     def __simulate(self, verbose):
         """Simulate the flight trajectory."""
+        self.__start_wall_time = time()
+        self.__total_function_evaluations = 0
         for phase_index, phase in self.time_iterator(self.flight_phases):
             # Determine maximum time for this flight phase
             phase.time_bound = self.flight_phases[phase_index + 1].t
@@ -755,6 +790,7 @@ class Flight:
                     # Update time and state
                     self.t = phase.solver.t
                     self.y_sol = phase.solver.y
+                    self.__check_budget()
                     if verbose:
                         print(f"Current Simulation Time: {self.t:3.4f} s", end="\r")
 
@@ -866,16 +902,23 @@ class Flight:
                             phase.time_nodes.add_node(self.t, [], [])
                             phase.solver.status = "finished"
                     # Check for impact event
-                    if self.y_sol[2] < self.env.elevation:
-                        # Check exactly when it happened using root finding
+                    ground = self.__ground_elevation(self.y_sol[0], self.y_sol[1])
+                    if self.y_sol[2] < ground:
+                        # Check exactly when it happened using root finding,
+                        # with the terrain taken as linear in time over the step
+                        previous_ground = self.__ground_elevation(
+                            self.solution[-2][1], self.solution[-2][2]
+                        )
+                        step_size = float(phase.solver.step_size)
+                        ground_rate = (ground - previous_ground) / step_size
                         # Cubic Hermite interpolation (ax**3 + bx**2 + cx + d)
                         a, b, c, d = calculate_cubic_hermite_coefficients(
                             x0=0,  # t0
-                            x1=float(phase.solver.step_size),  # t1 - t0
-                            y0=float(self.solution[-2][3] - self.env.elevation),  # z0
-                            yp0=float(self.solution[-2][6]),  # vz0
-                            y1=float(self.solution[-1][3] - self.env.elevation),  # z1
-                            yp1=float(self.solution[-1][6]),  # vz1
+                            x1=step_size,  # t1 - t0
+                            y0=float(self.solution[-2][3] - previous_ground),  # z0
+                            yp0=float(self.solution[-2][6] - ground_rate),  # vz0
+                            y1=float(self.solution[-1][3] - ground),  # z1
+                            yp1=float(self.solution[-1][6] - ground_rate),  # vz1
                         )
                         # Find roots
                         t_roots = find_roots_cubic_function(a, b, c, d)
@@ -1117,6 +1160,30 @@ class Flight:
                 self.t_initial, self.initial_solution[1:], post_processing=True
             )
 
+    def __check_budget(self):
+        """Raises an error if the simulation has exceeded its wall clock time
+        or its number of function evaluations, see ``max_wall_time`` and
+        ``max_function_evaluations``."""
+        self.__total_function_evaluations += (
+            self.function_evaluations[-1] - self.function_evaluations[-2]
+        )
+        if (
+            self.max_function_evaluations is not None
+            and self.__total_function_evaluations > self.max_function_evaluations
+        ):
+            raise RuntimeError(
+                f"Flight simulation exceeded {self.max_function_evaluations} "
+                f"function evaluations at t = {self.t:.4f} s."
+            )
+        if (
+            self.max_wall_time is not None
+            and time() - self.__start_wall_time > self.max_wall_time
+        ):
+            raise TimeoutError(
+                f"Flight simulation exceeded {self.max_wall_time} s of wall "
+                f"time at t = {self.t:.4f} s."
+            )
+
     def __init_solver_monitors(self):
         # Initialize solver monitors
         self.function_evaluations = []
@@ -1129,6 +1196,17 @@ class Flight:
         self.t = self.solution[-1][0]
         self.y_sol = self.solution[-1][1:]
 
+        # The terrain is shifted so that the launch site lies at the elevation
+        # of the environment
+        self.__terrain_offset = 0
+        if self.env.terrain is not None:
+            try:
+                self.__terrain_offset = (
+                    self.env.elevation - self.env.get_terrain_elevation(0, 0)
+                )
+            except ValueError:  # launch site outside of the topographic profile
+                pass
+
     def __init_equations_of_motion(self):
         """Initialize equations of motion."""
         if self.equations_of_motion == "solid_propulsion":
@@ -1210,6 +1288,33 @@ class Flight:
 
         return -wind_u * np.cos(heading_rad) + wind_v * np.sin(heading_rad)
 
+    def __atmospheric_state(self, t, x, y, z):
+        """Returns the wind velocities, speed of sound, density and gravity
+        at a time and position, from the forecast cube of the environment if it
+        has one, or from its profiles otherwise."""
+        if self.env.forecast_cube is None:
+            return self.env.atmosphere_table.get_state(z)[:5]
+        return self.env.forecast_cube.get_state(t, x, y, z)[:5]
+
+    def __wind_velocity(self, t, x, y, z):
+        """Returns the wind velocities at a time and position, from the
+        forecast cube of the environment if it has one, or from its profiles
+        otherwise."""
+        if self.env.forecast_cube is None:
+            return self.env.atmosphere_table.get_wind_velocity(z)
+        return self.env.forecast_cube.get_wind_velocity(t, x, y, z)
+
+    def __ground_elevation(self, x, y):
+        """Returns the elevation of the ground at a position, from the
+        topographic profile of the environment if it has one and the position
+        is inside of it, or the elevation of the launch site otherwise."""
+        if self.env.terrain is None:
+            return self.env.elevation
+        try:
+            return self.env.get_terrain_elevation(x, y) + self.__terrain_offset
+        except ValueError:  # outside of the topographic profile
+            return self.env.elevation
+
     def udot_rail1(self, t, u, post_processing=False):
         """Calculates derivative of u state vector with respect to time
         when rocket is flying in 1 DOF motion in the rail.
@@ -1239,24 +1344,24 @@ class Flight:
         # Mass
         M = self.rocket.total_mass.get_value_opt(t)
 
+        # Get atmospheric conditions
+        wind_velocity_x, wind_velocity_y, speed_of_sound, rho, gravity = (
+            self.__atmospheric_state(t, x, y, z)
+        )
+
         # Get freestream speed
         free_stream_speed = (
-            (self.env.wind_velocity_x.get_value_opt(z) - vx) ** 2
-            + (self.env.wind_velocity_y.get_value_opt(z) - vy) ** 2
-            + (vz) ** 2
+            (wind_velocity_x - vx) ** 2 + (wind_velocity_y - vy) ** 2 + (vz) ** 2
         ) ** 0.5
-        free_stream_mach = free_stream_speed / self.env.speed_of_sound.get_value_opt(z)
+        free_stream_mach = free_stream_speed / speed_of_sound
         drag_coeff = self.rocket.power_on_drag.get_value_opt(free_stream_mach)
 
         # Calculate Forces
         thrust = self.rocket.motor.thrust.get_value_opt(t)
-        rho = self.env.density.get_value_opt(z)
         R3 = -0.5 * rho * (free_stream_speed**2) * self.rocket.area * (drag_coeff)
 
         # Calculate Linear acceleration
-        a3 = (R3 + thrust) / M - (
-            e0**2 - e1**2 - e2**2 + e3**2
-        ) * self.env.gravity.get_value_opt(z)
+        a3 = (R3 + thrust) / M - (e0**2 - e1**2 - e2**2 + e3**2) * gravity
         if a3 > 0:
             ax = 2 * (e1 * e3 + e0 * e2) * a3
             ay = 2 * (e2 * e3 - e0 * e1) * a3
@@ -1383,13 +1488,14 @@ class Flight:
         K = [[a11, a12, a13], [a21, a22, a23], [a31, a32, a33]]
 
         # Calculate Forces and Moments
-        # Get freestream speed
-        wind_velocity_x = self.env.wind_velocity_x.get_value_opt(z)
-        wind_velocity_y = self.env.wind_velocity_y.get_value_opt(z)
+        # Get atmospheric conditions and freestream speed
+        wind_velocity_x, wind_velocity_y, speed_of_sound, rho, gravity = (
+            self.__atmospheric_state(t, x, y, z)
+        )
         free_stream_speed = (
             (wind_velocity_x - vx) ** 2 + (wind_velocity_y - vy) ** 2 + (vz) ** 2
         ) ** 0.5
-        free_stream_mach = free_stream_speed / self.env.speed_of_sound.get_value_opt(z)
+        free_stream_mach = free_stream_speed / speed_of_sound
 
         # Determine aerodynamics forces
         # Determine Drag Force
@@ -1397,7 +1503,6 @@ class Flight:
             drag_coeff = self.rocket.power_on_drag.get_value_opt(free_stream_mach)
         else:
             drag_coeff = self.rocket.power_off_drag.get_value_opt(free_stream_mach)
-        rho = self.env.density.get_value_opt(z)
         R3 = -0.5 * rho * (free_stream_speed**2) * self.rocket.area * drag_coeff
         for air_brakes in self.rocket.air_brakes:
             if air_brakes.deployment_level > 0:
@@ -1435,8 +1540,7 @@ class Flight:
             comp_vz_b = vz_b
             # Wind velocity at component
             comp_z = z + comp_cp
-            comp_wind_vx = self.env.wind_velocity_x.get_value_opt(comp_z)
-            comp_wind_vy = self.env.wind_velocity_y.get_value_opt(comp_z)
+            comp_wind_vx, comp_wind_vy = self.__wind_velocity(t, x, y, comp_z)
             # Component freestream velocity in body frame
             comp_wind_vx_b = a11 * comp_wind_vx + a21 * comp_wind_vy
             comp_wind_vy_b = a12 * comp_wind_vx + a22 * comp_wind_vy
@@ -1535,7 +1639,7 @@ class Flight:
             (R3 - b * Mt * (alpha2 - omega1 * omega3) + thrust) / M,
         ]
         ax, ay, az = np.dot(K, L)
-        az -= self.env.gravity.get_value_opt(z)  # Include gravity
+        az -= gravity  # Include gravity
 
         # Create u_dot
         u_dot = [
@@ -1625,12 +1729,11 @@ class Flight:
         R1, R2, R3, M1, M2, M3 = 0, 0, 0, 0, 0, 0
 
         ## Drag force
-        rho = self.env.density.get_value_opt(z)
-        wind_velocity_x = self.env.wind_velocity_x.get_value_opt(z)
-        wind_velocity_y = self.env.wind_velocity_y.get_value_opt(z)
+        wind_velocity_x, wind_velocity_y, speed_of_sound, rho, gravity = (
+            self.__atmospheric_state(t, x, y, z)
+        )
         wind_velocity = Vector([wind_velocity_x, wind_velocity_y, 0])
         free_stream_speed = abs((wind_velocity - Vector(v)))
-        speed_of_sound = self.env.speed_of_sound.get_value_opt(z)
         free_stream_mach = free_stream_speed / speed_of_sound
 
         if t < self.rocket.motor.burn_out_time:
@@ -1668,8 +1771,7 @@ class Flight:
             comp_vb = vB + (w ^ comp_cp)
             # Wind velocity at component altitude
             comp_z = z + (K @ comp_cp).z
-            comp_wind_vx = self.env.wind_velocity_x.get_value_opt(comp_z)
-            comp_wind_vy = self.env.wind_velocity_y.get_value_opt(comp_z)
+            comp_wind_vx, comp_wind_vy = self.__wind_velocity(t, x, y, comp_z)
             # Component freestream velocity in body frame
             comp_wind_vb = Kt @ Vector([comp_wind_vx, comp_wind_vy, 0])
             comp_stream_velocity = comp_wind_vb - comp_vb
@@ -1736,7 +1838,7 @@ class Flight:
         )
         M3 += self.rocket.cp_eccentricity_x * R2 - self.rocket.cp_eccentricity_y * R1
 
-        weightB = Kt @ Vector([0, 0, -total_mass * self.env.gravity.get_value_opt(z)])
+        weightB = Kt @ Vector([0, 0, -total_mass * gravity])
         T00 = total_mass * r_CM
         T03 = 2 * total_mass_dot * (r_NOZ - r_CM) - 2 * total_mass * r_CM_dot
         T04 = (
@@ -1802,12 +1904,12 @@ class Flight:
 
         """
         # Get relevant state data
-        z, vx, vy, vz = u[2:6]
+        x, y, z, vx, vy, vz = u[:6]
 
         # Get atmospheric data
-        rho = self.env.density.get_value_opt(z)
-        wind_velocity_x = self.env.wind_velocity_x.get_value_opt(z)
-        wind_velocity_y = self.env.wind_velocity_y.get_value_opt(z)
+        wind_velocity_x, wind_velocity_y, _, rho, _ = self.__atmospheric_state(
+            t, x, y, z
+        )
 
         # Get Parachute data
         cd_s = self.parachute_cd_s
@@ -1915,17 +2017,17 @@ class Flight:
     @funcify_method("Time (s)", "X (m)", "spline", "constant")
     def x(self):
         """Rocket x position as a Function of time."""
-        return self.solution_array[:, [0, 1]]
+        return Function.from_trusted_array(self.solution_array[:, [0, 1]])
 
     @funcify_method("Time (s)", "Y (m)", "spline", "constant")
     def y(self):
         """Rocket y position as a Function of time."""
-        return self.solution_array[:, [0, 2]]
+        return Function.from_trusted_array(self.solution_array[:, [0, 2]])
 
     @funcify_method("Time (s)", "Z (m)", "spline", "constant")
     def z(self):
         """Rocket z position as a Function of time."""
-        return self.solution_array[:, [0, 3]]
+        return Function.from_trusted_array(self.solution_array[:, [0, 3]])
 
     @funcify_method("Time (s)", "Altitude AGL (m)", "spline", "constant")
     def altitude(self):
@@ -1935,102 +2037,102 @@ class Flight:
     @funcify_method("Time (s)", "Vx (m/s)", "spline", "zero")
     def vx(self):
         """Rocket x velocity as a Function of time."""
-        return self.solution_array[:, [0, 4]]
+        return Function.from_trusted_array(self.solution_array[:, [0, 4]])
 
     @funcify_method("Time (s)", "Vy (m/s)", "spline", "zero")
     def vy(self):
         """Rocket y velocity as a Function of time."""
-        return self.solution_array[:, [0, 5]]
+        return Function.from_trusted_array(self.solution_array[:, [0, 5]])
 
     @funcify_method("Time (s)", "Vz (m/s)", "spline", "zero")
     def vz(self):
         """Rocket z velocity as a Function of time."""
-        return self.solution_array[:, [0, 6]]
+        return Function.from_trusted_array(self.solution_array[:, [0, 6]])
 
     @funcify_method("Time (s)", "e0", "spline", "constant")
     def e0(self):
         """Rocket quaternion e0 as a Function of time."""
-        return self.solution_array[:, [0, 7]]
+        return Function.from_trusted_array(self.solution_array[:, [0, 7]])
 
     @funcify_method("Time (s)", "e1", "spline", "constant")
     def e1(self):
         """Rocket quaternion e1 as a Function of time."""
-        return self.solution_array[:, [0, 8]]
+        return Function.from_trusted_array(self.solution_array[:, [0, 8]])
 
     @funcify_method("Time (s)", "e2", "spline", "constant")
     def e2(self):
         """Rocket quaternion e2 as a Function of time."""
-        return self.solution_array[:, [0, 9]]
+        return Function.from_trusted_array(self.solution_array[:, [0, 9]])
 
     @funcify_method("Time (s)", "e3", "spline", "constant")
     def e3(self):
         """Rocket quaternion e3 as a Function of time."""
-        return self.solution_array[:, [0, 10]]
+        return Function.from_trusted_array(self.solution_array[:, [0, 10]])
 
     @funcify_method("Time (s)", "ω1 (rad/s)", "spline", "zero")
     def w1(self):
         """Rocket angular velocity ω1 as a Function of time."""
-        return self.solution_array[:, [0, 11]]
+        return Function.from_trusted_array(self.solution_array[:, [0, 11]])
 
     @funcify_method("Time (s)", "ω2 (rad/s)", "spline", "zero")
     def w2(self):
         """Rocket angular velocity ω2 as a Function of time."""
-        return self.solution_array[:, [0, 12]]
+        return Function.from_trusted_array(self.solution_array[:, [0, 12]])
 
     @funcify_method("Time (s)", "ω3 (rad/s)", "spline", "zero")
     def w3(self):
         """Rocket angular velocity ω3 as a Function of time."""
-        return self.solution_array[:, [0, 13]]
+        return Function.from_trusted_array(self.solution_array[:, [0, 13]])
 
     # Process second type of outputs - accelerations components
     @funcify_method("Time (s)", "Ax (m/s²)", "spline", "zero")
     def ax(self):
         """Rocket x acceleration as a Function of time."""
-        return self.__evaluate_post_process[:, [0, 1]]
+        return Function.from_trusted_array(self.__evaluate_post_process[:, [0, 1]])
 
     @funcify_method("Time (s)", "Ay (m/s²)", "spline", "zero")
     def ay(self):
         """Rocket y acceleration as a Function of time."""
-        return self.__evaluate_post_process[:, [0, 2]]
+        return Function.from_trusted_array(self.__evaluate_post_process[:, [0, 2]])
 
     @funcify_method("Time (s)", "Az (m/s²)", "spline", "zero")
     def az(self):
         """Rocket z acceleration as a Function of time."""
-        return self.__evaluate_post_process[:, [0, 3]]
+        return Function.from_trusted_array(self.__evaluate_post_process[:, [0, 3]])
 
     @funcify_method("Time (s)", "α1 (rad/s²)", "spline", "zero")
     def alpha1(self):
         """Rocket angular acceleration α1 as a Function of time."""
-        return self.__evaluate_post_process[:, [0, 4]]
+        return Function.from_trusted_array(self.__evaluate_post_process[:, [0, 4]])
 
     @funcify_method("Time (s)", "α2 (rad/s²)", "spline", "zero")
     def alpha2(self):
         """Rocket angular acceleration α2 as a Function of time."""
-        return self.__evaluate_post_process[:, [0, 5]]
+        return Function.from_trusted_array(self.__evaluate_post_process[:, [0, 5]])
 
     @funcify_method("Time (s)", "α3 (rad/s²)", "spline", "zero")
     def alpha3(self):
         """Rocket angular acceleration α3 as a Function of time."""
-        return self.__evaluate_post_process[:, [0, 6]]
+        return Function.from_trusted_array(self.__evaluate_post_process[:, [0, 6]])
 
     # Process third type of outputs - Temporary values
     @funcify_method("Time (s)", "R1 (N)", "spline", "zero")
     def R1(self):
         """Aerodynamic force along the first axis that is perpendicular to the
         rocket's axis of symmetry as a Function of time."""
-        return self.__evaluate_post_process[:, [0, 7]]
+        return Function.from_trusted_array(self.__evaluate_post_process[:, [0, 7]])
 
     @funcify_method("Time (s)", "R2 (N)", "spline", "zero")
     def R2(self):
         """Aerodynamic force along the second axis that is perpendicular to the
         rocket's axis of symmetry as a Function of time."""
-        return self.__evaluate_post_process[:, [0, 8]]
+        return Function.from_trusted_array(self.__evaluate_post_process[:, [0, 8]])
 
     @funcify_method("Time (s)", "R3 (N)", "spline", "zero")
     def R3(self):
         """Aerodynamic force along the rocket's axis of symmetry as a
         Function of time."""
-        return self.__evaluate_post_process[:, [0, 9]]
+        return Function.from_trusted_array(self.__evaluate_post_process[:, [0, 9]])
 
     @funcify_method("Time (s)", "M1 (Nm)", "spline", "zero")
     def M1(self):
@@ -2038,51 +2140,63 @@ class Flight:
         perpendicular to the rocket's axis of symmetry as a Function of
         time.
         """
-        return self.__evaluate_post_process[:, [0, 10]]
+        return Function.from_trusted_array(self.__evaluate_post_process[:, [0, 10]])
 
     @funcify_method("Time (s)", "M2 (Nm)", "spline", "zero")
     def M2(self):
         """Aerodynamic bending moment in the same direction as the axis that is
         perpendicular to the rocket's axis of symmetry as a Function
         of time."""
-        return self.__evaluate_post_process[:, [0, 11]]
+        return Function.from_trusted_array(self.__evaluate_post_process[:, [0, 11]])
 
     @funcify_method("Time (s)", "M3 (Nm)", "spline", "zero")
     def M3(self):
         """Aerodynamic bending moment in the same direction as the rocket's
         axis of symmetry as a Function of time."""
-        return self.__evaluate_post_process[:, [0, 12]]
+        return Function.from_trusted_array(self.__evaluate_post_process[:, [0, 12]])
+
+    def __atmosphere_along_trajectory(self, name):
+        """Returns the (time, value) pairs of an atmospheric quantity along
+        the trajectory, from the forecast cube of the environment if it has
+        one, or from its profiles otherwise."""
+        if self.env.forecast_cube is None:
+            function = getattr(self.env, name)
+            return [(t, function.get_value_opt(z)) for t, z in self.z]
+        solution = np.array(self.solution)
+        states = self.env.forecast_cube.get_states(*solution[:, :4].T)
+        column = AtmosphereTable.columns.index(name)
+        return np.column_stack([solution[:, 0], states[:, column]])
 
     @funcify_method("Time (s)", "Pressure (Pa)", "spline", "constant")
     def pressure(self):
         """Air pressure felt by the rocket as a Function of time."""
-        return [(t, self.env.pressure.get_value_opt(z)) for t, z in self.z]
+        return self.__atmosphere_along_trajectory("pressure")
 
     @funcify_method("Time (s)", "Density (kg/m³)", "spline", "constant")
     def density(self):
         """Air density felt by the rocket as a Function of time."""
-        return [(t, self.env.density.get_value_opt(z)) for t, z in self.z]
+        return self.__atmosphere_along_trajectory("density")
 
     @funcify_method("Time (s)", "Dynamic Viscosity (Pa s)", "spline", "constant")
     def dynamic_viscosity(self):
         """Air dynamic viscosity felt by the rocket as a Function of
         time."""
-        return [(t, self.env.dynamic_viscosity.get_value_opt(z)) for t, z in self.z]
+        return self.__atmosphere_along_trajectory("dynamic_viscosity")
 
     @funcify_method("Time (s)", "Speed of Sound (m/s)", "spline", "constant")
     def speed_of_sound(self):
         """Speed of sound in the air felt by the rocket as a Function of time."""
-        return [(t, self.env.speed_of_sound.get_value_opt(z)) for t, z in self.z]
+        return self.__atmosphere_along_trajectory("speed_of_sound")
 
     @funcify_method("Time (s)", "Wind Velocity X (East) (m/s)", "spline", "constant")
     def wind_velocity_x(self):
         """Wind velocity in the X direction (east) as a Function of time."""
-        return [(t, self.env.wind_velocity_x.get_value_opt(z)) for t, z in self.z]
+        return self.__atmosphere_along_trajectory("wind_velocity_x")
 
     @funcify_method("Time (s)", "Wind Velocity Y (North) (m/s)", "spline", "constant")
     def wind_velocity_y(self):
         """Wind velocity in the y direction (north) as a Function of time."""
-        return [(t, self.env.wind_velocity_y.get_value_opt(z)) for t, z in self.z]
+        return self.__atmosphere_along_trajectory("wind_velocity_y")
 
     # Process fourth type of output - values calculated from previous outputs
 
@@ -2651,46 +2765,31 @@ class Flight:
         bearing = (2 * np.pi - np.arctan2(-x, y)) * (180 / np.pi)
         return np.column_stack((self.time, bearing))
 
+    @cached_property
+    def __geodesic_trajectory(self):
+        """Latitude and longitude coordinates of the rocket at each time step,
+        in degrees, from the inverted haversine equation."""
+        return cartesian_to_geodesic(
+            self.x[:, 1],
+            self.y[:, 1],
+            self.env.latitude,
+            self.env.longitude,
+            self.env.earth_radius,
+        )
+
     @funcify_method("Time (s)", "Latitude (°)", "linear", "constant")
     def latitude(self):
         """Rocket latitude coordinate, in degrees, as a Function of
         time.
         """
-        lat1 = np.deg2rad(self.env.latitude)  # Launch lat point converted to radians
-
-        # Applies the haversine equation to find final lat/lon coordinates
-        latitude = np.rad2deg(
-            np.arcsin(
-                np.sin(lat1) * np.cos(self.drift[:, 1] / self.env.earth_radius)
-                + np.cos(lat1)
-                * np.sin(self.drift[:, 1] / self.env.earth_radius)
-                * np.cos(np.deg2rad(self.bearing[:, 1]))
-            )
-        )
-        return np.column_stack((self.time, latitude))
+        return np.column_stack((self.time, self.__geodesic_trajectory[0]))
 
-    # TODO: haversine should be defined in tools.py so we just invoke it in here.
     @funcify_method("Time (s)", "Longitude (°)", "linear", "constant")
     def longitude(self):
         """Rocket longitude coordinate, in degrees, as a Function of
         time.
         """
-        lat1 = np.deg2rad(self.env.latitude)  # Launch lat point converted to radians
-        lon1 = np.deg2rad(self.env.longitude)  # Launch lon point converted to radians
-
-        # Applies the haversine equation to find final lat/lon coordinates
-        longitude = np.rad2deg(
-            lon1
-            + np.arctan2(
-                np.sin(np.deg2rad(self.bearing[:, 1]))
-                * np.sin(self.drift[:, 1] / self.env.earth_radius)
-                * np.cos(lat1),
-                np.cos(self.drift[:, 1] / self.env.earth_radius)
-                - np.sin(lat1) * np.sin(np.deg2rad(self.latitude[:, 1])),
-            )
-        )
-
-        return np.column_stack((self.time, longitude))
+        return np.column_stack((self.time, self.__geodesic_trajectory[1]))
 
     def get_controller_observed_variables(self):
         """Retrieve the observed variables related to air brakes from the
@@ -3099,28 +3198,26 @@ class Flight:
             # In this mode the elevation data will be the Above Ground Level
             # elevation. Only works properly if the ground level is similar to
             # a plane, i.e. it might not work well if the terrain has mountains
-            coords = [
-                (
-                    self.longitude.get_value_opt(t),
-                    self.latitude.get_value_opt(t),
-                    self.altitude.get_value_opt(t),
+            coords = list(
+                zip(
+                    self.longitude.get_value(time_points).tolist(),
+                    self.latitude.get_value(time_points).tolist(),
+                    self.altitude.get_value(time_points).tolist(),
                 )
-                for t in time_points
-            ]
+            )
             trajectory.coords = coords
             trajectory.altitudemode = simplekml.AltitudeMode.relativetoground
         else:  # altitude_mode == 'absolute'
             # In this case the elevation data will be the Above Sea Level elevation
             # Ensure you use the correct value on self.env.elevation, otherwise
             # the trajectory path can be offset from ground
-            coords = [
-                (
-                    self.longitude.get_value_opt(t),
-                    self.latitude.get_value_opt(t),
-                    self.z.get_value_opt(t),
+            coords = list(
+                zip(
+                    self.longitude.get_value(time_points).tolist(),
+                    self.latitude.get_value(time_points).tolist(),
+                    self.z.get_value(time_points).tolist(),
                 )
-                for t in time_points
-            ]
+            )
             trajectory.coords = coords
             trajectory.altitudemode = simplekml.AltitudeMode.absolute
         # Modify style of trajectory linestring
@@ -2,18 +2,23 @@
 Monte Carlo Simulation Module for RocketPy
 
 This module defines the `MonteCarlo` class, which is used to perform Monte Carlo
-simulations of rocket flights. The Monte Carlo simulation is a powerful tool for 
-understanding the variability and uncertainty in the performance of rocket flights 
+simulations of rocket flights. The Monte Carlo simulation is a powerful tool for
+understanding the variability and uncertainty in the performance of rocket flights
 by running multiple simulations with varied input parameters.
 
 Notes
 -----
-This module is still under active development, and some features or attributes may 
-change in future versions. Users are encouraged to check for updates and read the 
+This module is still under active development, and some features or attributes may
+change in future versions. Users are encouraged to check for updates and read the
 latest documentation.
 """
 
 import json
+import multiprocessing
+import os
+import pickle
+import signal
+import sys
 import warnings
 from time import process_time, time
 
@@ -23,7 +28,14 @@ import simplekml
 from rocketpy._encoders import RocketPyEncoder
 from rocketpy.plots.monte_carlo_plots import _MonteCarloPlots
 from rocketpy.prints.monte_carlo_prints import _MonteCarloPrints
+from rocketpy.simulation.columnar_store import ColumnarStore
 from rocketpy.simulation.flight import Flight
+from rocketpy.simulation.monte_carlo_statistics import MonteCarloStatistics
+from rocketpy.stochastic.sampling import (
+    get_sampling_design,
+    iteration_seed_sequence,
+    sample_models,
+)
 from rocketpy.tools import (
     generate_monte_carlo_ellipses,
     generate_monte_carlo_ellipses_coordinates,
@@ -31,6 +43,10 @@ from rocketpy.tools import (
 
 # TODO: Create evolution plots to analyze convergence
 
+# Stochastic objects and export list of each worker process of a parallel
+# Monte Carlo simulation, set once when the worker is started
+_worker_arguments = None
+
 
 class MonteCarlo:
     """Class to run a Monte Carlo simulation of a rocket flight.
@@ -49,11 +65,15 @@ class MonteCarlo:
     export_list : list
         The list of variables to export at each simulation.
     inputs_log : list
-        List of dictionaries with the inputs used in each simulation.
+        List of dictionaries with the inputs used in each simulation. Logs
+        saved in the columnar format are loaded as read-only sequences, whose
+        dictionaries are only decoded when accessed.
     outputs_log : list
         List of dictionaries with the outputs of each simulation.
     errors_log : list
         List of dictionaries with the errors of each simulation.
+    number_of_failures : int
+        Number of failed iterations of the simulation.
     num_of_loaded_sims : int
         Number of simulations loaded from output_file currently being used.
     results : dict
@@ -63,6 +83,10 @@ class MonteCarlo:
     processed_results : dict
         Dictionary with the mean and standard deviation of each parameter
         available in the results.
+    statistics : MonteCarloStatistics
+        Streaming statistics of the results, such as their means, standard
+        deviations, quantiles and the covariance of the impact points. They
+        are updated as each simulation completes.
     prints : _MonteCarloPrints
         Object with methods to print information about the Monte Carlo simulation.
         Use help(MonteCarlo.prints) for more information.
@@ -71,6 +95,14 @@ class MonteCarlo:
         Use help(MonteCarlo.plots) for more information.
     number_of_simulations : int
         Number of simulations to be run.
+    seed : int
+        Master seed of the simulation. The random inputs of each iteration are
+        drawn from a generator seeded with this seed and the iteration index.
+    sampler : str, callable
+        Sampling design of the random inputs of the simulation.
+    log_format : str
+        Format of the files with the inputs, outputs and errors of the
+        simulation, either "txt" or "columnar".
     total_wall_time : float
         The total elapsed real-world time from the start to the end of the
         simulation, including all waiting times and delays.
@@ -79,7 +111,17 @@ class MonteCarlo:
         spent waiting for I/O operations or other processes to complete.
     """
 
-    def __init__(self, filename, environment, rocket, flight, export_list=None):
+    def __init__(
+        self,
+        filename,
+        environment,
+        rocket,
+        flight,
+        export_list=None,
+        seed=None,
+        sampler="random",
+        log_format="txt",
+    ):
         """
         Initialize a MonteCarlo object.
 
@@ -102,6 +144,44 @@ class MonteCarlo:
             `out_of_rail_stability_margin`, `out_of_rail_time`,
             `out_of_rail_velocity`, `max_mach_number`, `frontal_surface_wind`,
             `lateral_surface_wind`. Default is None.
+        seed : int, optional
+            Master seed of the simulation. The random inputs of the i-th
+            iteration are drawn from a numpy random Generator seeded with the
+            i-th child of ``numpy.random.SeedSequence(seed)``, so that any
+            iteration can be reproduced exactly from the seed and its index,
+            regardless of the number of simulations, of the order in which
+            iterations are run or of how many processes run them. Resuming a
+            simulation with ``append=True`` therefore gives the same inputs as
+            a single run, except for the "latin_hypercube" and "stratified"
+            samplers, whose designs depend on the number of simulations. The
+            global ``numpy.random`` state, used for instance by the parachute
+            noise, is reseeded at each iteration from a child of the seed
+            sequence of the iteration. If None, a random seed is generated and
+            stored in the ``seed`` attribute. Default is None.
+        sampler : str, callable, optional
+            Sampling design of the random inputs. Either "random", for
+            pseudo-random inputs, or a design that spreads the inputs more
+            evenly, so that the results converge with fewer simulations:
+            "sobol", "halton", "latin_hypercube" or "stratified". A single
+            design spans the inputs of the environment, rocket and flight. See
+            ``StochasticModel.sample`` for the details. Default is "random".
+        log_format : str, optional
+            Format of the files in which the inputs, outputs and errors of the
+            simulation are saved. Options are:
+
+            - "txt": text files named ``filename.inputs.txt``,
+              ``filename.outputs.txt`` and ``filename.errors.txt``, with one
+              JSON object per line.
+            - "columnar": directories named ``filename.inputs``,
+              ``filename.outputs`` and ``filename.errors``, with the columnar
+              binary format of the ``ColumnarStore`` class. The results are
+              then loaded as memory mapped arrays, which is much faster for
+              large simulations. Rows are saved in chunks of 1000 iterations,
+              so a crash loses at most the iterations of the last chunk.
+
+            Files of both formats can be imported regardless of this option,
+            and text files can be converted with ``ColumnarStore.from_text``.
+            Default is "txt".
 
         Returns
         -------
@@ -117,13 +197,21 @@ class MonteCarlo:
         self.environment = environment
         self.rocket = rocket
         self.flight = flight
+        self.seed = np.random.SeedSequence(seed).entropy
+        get_sampling_design(sampler)
+        self.sampler = sampler
+        if log_format not in ("txt", "columnar"):
+            raise ValueError("log_format must be either 'txt' or 'columnar'.")
+        self.log_format = log_format
         self.export_list = []
         self.inputs_log = []
         self.outputs_log = []
         self.errors_log = []
+        self.number_of_failures = 0
         self.num_of_loaded_sims = 0
         self.results = {}
         self.processed_results = {}
+        self.statistics = MonteCarloStatistics()
         self.prints = _MonteCarloPrints(self)
         self.plots = _MonteCarloPlots(self)
         self._inputs_dict = {}
@@ -134,19 +222,29 @@ class MonteCarlo:
         try:
             self.import_inputs()
         except FileNotFoundError:
-            self._input_file = f"{filename}.inputs.txt"
+            self._input_file = self.__log_path(filename, "inputs")
 
         try:
             self.import_outputs()
         except FileNotFoundError:
-            self._output_file = f"{filename}.outputs.txt"
+            self._output_file = self.__log_path(filename, "outputs")
 
         try:
             self.import_errors()
         except FileNotFoundError:
-            self._error_file = f"{filename}.errors.txt"
+            self._error_file = self.__log_path(filename, "errors")
 
-    def simulate(self, number_of_simulations, append=False):
+    def simulate(
+        self,
+        number_of_simulations,
+        append=False,
+        n_workers=None,
+        stop_condition=None,
+        max_wall_time=None,
+        max_function_evaluations=None,
+        retries=0,
+        on_error="skip",
+    ):
         """
         Runs the Monte Carlo simulation and saves all data.
 
@@ -157,11 +255,47 @@ class MonteCarlo:
         append : bool, optional
             If True, the results will be appended to the existing files. If
             False, the files will be overwritten. Default is False.
+        n_workers : int, optional
+            Number of processes used to run the simulations. If None or 1, the
+            simulations are run sequentially in the current process. Otherwise,
+            they are distributed among a pool of ``n_workers`` processes, while
+            the current process writes their results to the files in the same
+            order as the iterations. Default is None.
+        stop_condition : callable, optional
+            Function that receives the ``statistics`` attribute after each
+            completed simulation and returns True to stop the simulation
+            before ``number_of_simulations`` is reached, for instance once the
+            results have converged. See ``quantile_convergence`` in the
+            ``rocketpy.simulation.monte_carlo_statistics`` module for a ready
+            made condition. Default is None, which runs all the simulations.
+        max_wall_time : int, float, optional
+            Maximum wall clock time, in seconds, of the flight simulation of
+            each iteration, see the ``max_wall_time`` argument of the Flight
+            class. Default is None, which sets no limit.
+        max_function_evaluations : int, optional
+            Maximum number of function evaluations of the flight simulation of
+            each iteration, see the ``max_function_evaluations`` argument of
+            the Flight class. Default is None, which sets no limit.
+        retries : int, optional
+            Number of times that a failed iteration is run again, with the same
+            inputs and seed, before it is considered failed. Retrying only
+            helps with failures that do not depend on the inputs, such as wall
+            clock timeouts of an overloaded machine. Default is 0.
+        on_error : str, optional
+            What to do once an iteration has failed. If "skip", the error is
+            saved to the error file and the simulation continues with the next
+            iteration. If "raise", the error is saved and the simulation stops
+            by raising it. Default is "skip".
 
         Returns
         -------
         None
 
+        Raises
+        ------
+        ValueError
+            If ``n_workers``, ``retries`` or ``on_error`` are not valid.
+
         Notes
         -----
         If you need to stop the simulations after starting them, you can
@@ -170,51 +304,125 @@ class MonteCarlo:
         the simulation by running the ``simulate`` method again with the
         same number of simulations and setting `append=True`.
 
+        Each failed iteration is saved as a row of the error file with the
+        iteration index, the master seed, the number of attempts, the error
+        message and the inputs of the iteration, so that it can be reproduced.
+        The number of failed iterations is kept in the ``number_of_failures``
+        attribute. If the simulation is interrupted, the iteration that was
+        running is saved to the error file as well, with a
+        ``KeyboardInterrupt`` error message.
+
+        When running in parallel, each worker process receives its own copy of
+        the stochastic objects and of the sampled inputs only once, when it is
+        started. Since the random inputs of all iterations are drawn before
+        any of them is run, see the ``seed`` argument of the class, the results
+        do not depend on the number of workers. Workers are forked on Linux,
+        while the default start method of the platform is used elsewhere, in
+        which case the stochastic objects must be picklable.
+
+        The ``statistics`` attribute is updated after each completed
+        simulation, including the ones loaded from the files when appending.
+        Once the stop condition is met, the simulations that the worker
+        processes may have started in advance are discarded.
+
+        Examples
+        --------
+        Run up to 10000 simulations, stopping once the 99th percentile of the
+        distance between the impact point and the launch site is known to
+        within 50 meters:
+
+        >>> from rocketpy.simulation.monte_carlo_statistics import (
+        ...     quantile_convergence,
+        ... )  # doctest: +SKIP
+        >>> monte_carlo.simulate(
+        ...     10000, stop_condition=quantile_convergence("impact_radius", 0.99, 50)
+        ... )  # doctest: +SKIP
+
         Important
         ---------
         If you use `append=False` and the files already exist, they will be
         overwritten. Make sure to save the files with the results before
         running the simulation again with `append=False`.
         """
+        parallel = n_workers is not None and n_workers != 1
+        if parallel and (not isinstance(n_workers, int) or n_workers < 1):
+            raise ValueError("n_workers must be a positive integer.")
+        if not isinstance(retries, int) or retries < 0:
+            raise ValueError("retries must be a non-negative integer.")
+        if on_error not in ("skip", "raise"):
+            raise ValueError('on_error must be either "skip" or "raise".')
+
+        if not append:
+            # Arrays read from columnar logs map their files, which can only
+            # be deleted once the logs of the previous simulation are released
+            self.inputs_log, self.outputs_log, self.errors_log = [], [], []
+            self.results, self.processed_results = {}, {}
+
         # Create data files for inputs, outputs and error logging
-        open_mode = "a" if append else "w"
-        input_file = open(self._input_file, open_mode, encoding="utf-8")
-        output_file = open(self._output_file, open_mode, encoding="utf-8")
-        error_file = open(self._error_file, open_mode, encoding="utf-8")
+        input_file = self.__open_log(self.__log_path(self.filename, "inputs"), append)
+        output_file = self.__open_log(self.__log_path(self.filename, "outputs"), append)
+        error_file = self.__open_log(self.__log_path(self.filename, "errors"), append)
 
         # initialize counters
         self.number_of_simulations = number_of_simulations
         self.__iteration_count = self.num_of_loaded_sims if append else 0
         self.__start_time = time()
         self.__start_cpu_time = process_time()
+        self.__stop_condition = stop_condition
+        self.__stopped = False
+        self.__running_iteration = None
+        self.__iteration_options = {
+            "max_wall_time": max_wall_time,
+            "max_function_evaluations": max_function_evaluations,
+            "retries": retries,
+        }
+        self.__on_error = on_error
+        self.number_of_failures = len(self.errors_log) if append else 0
+        if not append:
+            self.statistics = MonteCarloStatistics()
+        self.__input_samples = _sample_inputs(
+            self.environment,
+            self.rocket,
+            self.flight,
+            self.seed,
+            number_of_simulations,
+            self.sampler,
+        )
 
         # Begin display
         print("Starting Monte Carlo analysis", end="\r")
 
         try:
-            while self.__iteration_count < self.number_of_simulations:
-                self.__run_single_simulation(input_file, output_file)
+            if parallel:
+                self.__run_parallel_simulations(
+                    n_workers, input_file, output_file, error_file
+                )
+            while (
+                self.__iteration_count < self.number_of_simulations
+                and not self.__stop_condition_met()
+            ):
+                self.__run_single_simulation(input_file, output_file, error_file)
         except KeyboardInterrupt:
             print("Keyboard Interrupt, files saved.")
-            error_file.write(json.dumps(self._inputs_dict, cls=RocketPyEncoder) + "\n")
+            self.__export_interruption(error_file)
             self.__close_files(input_file, output_file, error_file)
-        except Exception as error:
-            print(f"Error on iteration {self.__iteration_count}: {error}")
-            error_file.write(json.dumps(self._inputs_dict, cls=RocketPyEncoder) + "\n")
+        except Exception:
             self.__close_files(input_file, output_file, error_file)
-            raise error
+            raise
         finally:
             self.total_cpu_time = process_time() - self.__start_cpu_time
             self.total_wall_time = time() - self.__start_time
+            for stochastic_object in (self.environment, self.rocket, self.flight):
+                stochastic_object._use_sample(None)
 
         self.__terminate_simulation(input_file, output_file, error_file)
 
     # Auxiliary methods
 
-    def __run_single_simulation(self, input_file, output_file):
+    def __run_single_simulation(self, input_file, output_file, error_file):
         """
-        Runs a single simulation and saves the inputs and outputs to the
-        respective files.
+        Runs a single simulation and saves the inputs and outputs, or the
+        error, to the respective files.
 
         Parameters
         ----------
@@ -222,39 +430,36 @@ class MonteCarlo:
             The file object to write the inputs.
         output_file : str
             The file object to write the outputs.
+        error_file : str
+            The file object to write the errors.
 
         Returns
         -------
         None
         """
         self.__iteration_count += 1
-
-        monte_carlo_flight = Flight(
-            rocket=self.rocket.create_object(),
-            environment=self.environment.create_object(),
-            rail_length=self.flight._randomize_rail_length(),
-            inclination=self.flight._randomize_inclination(),
-            heading=self.flight._randomize_heading(),
-            initial_solution=self.flight.initial_solution,
-            terminate_on_apogee=self.flight.terminate_on_apogee,
-        )
-
-        self._inputs_dict = dict(
-            item
-            for d in [
-                self.environment.last_rnd_dict,
-                self.rocket.last_rnd_dict,
-                self.flight.last_rnd_dict,
-            ]
-            for item in d.items()
-        )
-
-        self.__export_flight_data(
-            flight=monte_carlo_flight,
-            inputs_dict=self._inputs_dict,
-            input_file=input_file,
-            output_file=output_file,
+        self.__running_iteration = self.__iteration_count - 1
+
+        self._inputs_dict, results, error, exception = _run_iteration(
+            self.environment,
+            self.rocket,
+            self.flight,
+            self.export_list,
+            self.seed,
+            self.__input_samples,
+            self.__running_iteration,
+            **self.__iteration_options,
         )
+        self.__running_iteration = None
+        if error is None:
+            self.__export_flight_data(
+                results=results,
+                inputs_dict=self._inputs_dict,
+                input_file=input_file,
+                output_file=output_file,
+            )
+        else:
+            self.__export_error(error, error_file, exception)
 
         average_time = (process_time() - self.__start_cpu_time) / self.__iteration_count
         estimated_time = int(
@@ -268,6 +473,151 @@ class MonteCarlo:
             flush=True,
         )
 
+    def __run_parallel_simulations(
+        self, n_workers, input_file, output_file, error_file
+    ):
+        """
+        Runs the remaining simulations in a pool of worker processes. The
+        results are written to the files by the current process only, in the
+        order of the iterations.
+
+        The stochastic objects, the export list, the master seed and the
+        sampled inputs of all iterations are passed to the workers through the
+        ``initargs`` of the pool, so each worker receives its own copy of them
+        once, instead of with every iteration. Workers are forked on Linux
+        only, since forking a process that uses threads is unsafe on macOS,
+        and the default start method of the platform is used elsewhere.
+
+        Parameters
+        ----------
+        n_workers : int
+            Number of worker processes.
+        input_file : str
+            The file object to write the inputs.
+        output_file : str
+            The file object to write the outputs.
+        error_file : str
+            The file object to write the errors.
+
+        Returns
+        -------
+        None
+        """
+        if sys.platform == "linux":
+            context = multiprocessing.get_context("fork")
+        else:  # pragma: no cover
+            context = multiprocessing.get_context()
+
+        first_iteration = self.__iteration_count
+        with context.Pool(
+            n_workers,
+            initializer=_initialize_worker,
+            initargs=(
+                self.environment,
+                self.rocket,
+                self.flight,
+                self.export_list,
+                self.seed,
+                self.__input_samples,
+                self.__iteration_options,
+            ),
+        ) as pool:
+            iterations = pool.imap(
+                _run_worker_simulation,
+                range(first_iteration, self.number_of_simulations),
+            )
+            # The iterations are written in order, so the next one to be
+            # written is the one considered running if the simulation is
+            # interrupted
+            self.__running_iteration = first_iteration
+            for inputs, outputs, error, exception in iterations:
+                self.__iteration_count += 1
+                self.__running_iteration = None
+                if error is None:
+                    self.__write_row(input_file, inputs)
+                    outputs = json.loads(outputs)
+                    self.__write_row(output_file, outputs)
+                    self.statistics.update(outputs)
+                else:
+                    self.__export_error(json.loads(error), error_file, exception)
+                if self.__iteration_count < self.number_of_simulations:
+                    self.__running_iteration = self.__iteration_count
+
+                average_time = (time() - self.__start_time) / (
+                    self.__iteration_count - first_iteration
+                )
+                estimated_time = int(
+                    (self.number_of_simulations - self.__iteration_count) * average_time
+                )
+                self.__reprint(
+                    f"Current iteration: {self.__iteration_count:06d} | "
+                    f"Average Time per Iteration: {average_time:.3f} s | "
+                    f"Estimated time left: {estimated_time} s",
+                    end="\r",
+                    flush=True,
+                )
+                if self.__stop_condition_met():
+                    break
+
+    def __stop_condition_met(self):
+        """Checks the stop condition of the simulation, printing a message
+        when it is met."""
+        if self.__stopped:
+            return True
+        if self.__stop_condition is None or not self.__stop_condition(self.statistics):
+            return False
+        self.__reprint(
+            f"Stop condition met after {self.__iteration_count} iterations.",
+            flush=True,
+        )
+        self.__stopped = True
+        return True
+
+    def __log_path(self, filename, log_name):
+        """Returns the path of the inputs, outputs or errors log, according to
+        the log format."""
+        if self.log_format == "columnar":
+            return f"{filename}.{log_name}"
+        return f"{filename}.{log_name}.txt"
+
+    def __open_log(self, path, append):
+        """Opens a log for writing, either as a text file or as a
+        ColumnarStore, see ``__write_row``. Unless appending, the existing
+        contents of the log are discarded."""
+        if self.log_format == "columnar":
+            store = ColumnarStore(path)
+            if not append:
+                store.clear()
+            # An empty store is still a valid log
+            os.makedirs(path, exist_ok=True)
+            return store
+        return open(path, "a" if append else "w", encoding="utf-8")
+
+    @staticmethod
+    def __write_row(log, row):
+        """Writes a row to a log opened by ``__open_log``. The row is either a
+        dictionary or its JSON encoding. Dictionaries are appended directly to
+        a ColumnarStore, while they are encoded as a JSON line in text files.
+        """
+        if isinstance(log, ColumnarStore):
+            log.append(json.loads(row) if isinstance(row, str) else row)
+        elif isinstance(row, str):
+            log.write(row + "\n")
+        else:
+            log.write(json.dumps(row, cls=RocketPyEncoder) + "\n")
+
+    def __find_log(self, filepath, log_name):
+        """Returns the path of an existing log, looking first for the log
+        named after the filepath in the current log format, then in the other
+        format, and finally for the filepath itself."""
+        candidates = [f"{filepath}.{log_name}.txt", f"{filepath}.{log_name}"]
+        if self.log_format == "columnar":
+            candidates.reverse()
+        for path in [*candidates, filepath]:
+            if os.path.exists(path):
+                return path
+        raise FileNotFoundError(f"No {log_name} file found for '{filepath}'.")
+
     def __close_files(self, input_file, output_file, error_file):
         """
         Closes all the files.
@@ -307,7 +657,8 @@ class MonteCarlo:
         None
         """
         final_string = (
-            f"Completed {self.__iteration_count} iterations. Total CPU time: "
+            f"Completed {self.__iteration_count} iterations, "
+            f"{self.number_of_failures} of which failed. Total CPU time: "
             f"{process_time() - self.__start_cpu_time:.1f} s. Total wall time: "
             f"{time() - self.__start_time:.1f} s\n"
         )
@@ -317,16 +668,18 @@ class MonteCarlo:
         # close files to guarantee saving
         self.__close_files(input_file, output_file, error_file)
 
-        # resave the files on self and calculate post simulation attributes
-        self.input_file = f"{self.filename}.inputs.txt"
-        self.output_file = f"{self.filename}.outputs.txt"
-        self.error_file = f"{self.filename}.errors.txt"
+        # resave the files on self and calculate post simulation attributes,
+        # keeping the statistics updated during the simulation
+        self.input_file = self.__log_path(self.filename, "inputs")
+        self._output_file = self.__log_path(self.filename, "outputs")
+        self.__load_outputs(rebuild_statistics=False)
+        self.error_file = self.__log_path(self.filename, "errors")
 
         print(f"Results saved to {self._output_file}")
 
     def __export_flight_data(
         self,
-        flight,
+        results,
         inputs_dict,
         input_file,
         output_file,
@@ -336,8 +689,9 @@ class MonteCarlo:
 
         Parameters
         ----------
-        flight : Flight
-            The Flight object containing the flight data.
+        results : dict
+            Dictionary containing the outputs of the simulation, indexed by
+            the names in the export list.
         inputs_dict : dict
             Dictionary containing the inputs used in the simulation.
         input_file : str
@@ -349,13 +703,77 @@ class MonteCarlo:
         -------
         None
         """
-        results = {
-            export_item: getattr(flight, export_item)
-            for export_item in self.export_list
-        }
+        self.__write_row(input_file, inputs_dict)
+        self.__write_row(output_file, results)
+        self.statistics.update(results)
+
+    def __export_error(self, error, error_file, exception=None):
+        """
+        Exports the record of a failed iteration to the error file and counts
+        the failure. If the simulation was set to stop on errors, the error is
+        then raised.
+
+        Parameters
+        ----------
+        error : dict
+            Record of the failed iteration, as returned by ``_run_iteration``.
+        error_file : str
+            The file object to write the errors.
+        exception : Exception, optional
+            The exception raised by the last attempt of the iteration, set as
+            the cause of the raised error. Default is None.
+
+        Returns
+        -------
+        None
+        """
+        self.__write_row(error_file, error)
+        self.number_of_failures += 1
+        self.__reprint(
+            f"Error on iteration {error['iteration'] + 1} after "
+            f"{error['attempts']} attempt(s): {error['error']}"
+        )
+        if self.__on_error == "raise":
+            raise RuntimeError(
+                f"Monte Carlo iteration {error['iteration']} failed with "
+                f"{error['error']}"
+            ) from exception
 
-        input_file.write(json.dumps(inputs_dict, cls=RocketPyEncoder) + "\n")
-        output_file.write(json.dumps(results, cls=RocketPyEncoder) + "\n")
+    def __export_interruption(self, error_file):
+        """
+        Exports the record of the iteration that was running when the
+        simulation was interrupted to the error file, if any, and counts it
+        as a failure.
+
+        Parameters
+        ----------
+        error_file : str
+            The file object to write the errors.
+
+        Returns
+        -------
+        None
+        """
+        if self.__running_iteration is None:
+            return
+        self.__write_row(
+            error_file,
+            {
+                "iteration": self.__running_iteration,
+                "seed": self.seed,
+                "attempts": 1,
+                "error": "KeyboardInterrupt",
+                "inputs": _iteration_inputs(
+                    self.environment,
+                    self.rocket,
+                    self.flight,
+                    self.__input_samples,
+                    self.__running_iteration,
+                ),
+            },
+        )
+        self.number_of_failures += 1
+        self.__running_iteration = None
 
     def __check_export_list(self, export_list):
         """
@@ -533,10 +951,16 @@ class MonteCarlo:
         None
         """
         self._output_file = value
+        self.__load_outputs()
+
+    def __load_outputs(self, rebuild_statistics=True):
+        """Sets outputs_log, num_of_loaded_sims, results and processed_results
+        from the output file. See ``set_processed_results`` for the
+        ``rebuild_statistics`` argument."""
         self.set_outputs_log()
         self.set_num_of_loaded_sims()
         self.set_results()
-        self.set_processed_results()
+        self.set_processed_results(rebuild_statistics)
 
     @property
     def error_file(self):
@@ -570,6 +994,9 @@ class MonteCarlo:
         -------
         None
         """
+        if os.path.isdir(self.input_file):
+            self.inputs_log = ColumnarStore(self.input_file).rows(lazy=True)
+            return
         self.inputs_log = []
         with open(self.input_file, mode="r", encoding="utf-8") as rows:
             for line in rows:
@@ -583,6 +1010,9 @@ class MonteCarlo:
         -------
         None
         """
+        if os.path.isdir(self.output_file):
+            self.outputs_log = ColumnarStore(self.output_file).rows(lazy=True)
+            return
         self.outputs_log = []
         with open(self.output_file, mode="r", encoding="utf-8") as rows:
             for line in rows:
@@ -596,6 +1026,9 @@ class MonteCarlo:
         -------
         None
         """
+        if os.path.isdir(self.error_file):
+            self.errors_log = ColumnarStore(self.error_file).rows(lazy=True)
+            return
         self.errors_log = []
         with open(self.error_file, mode="r", encoding="utf-8") as errors:
             for line in errors:
@@ -610,6 +1043,9 @@ class MonteCarlo:
         -------
         None
         """
+        if os.path.isdir(self.output_file):
+            self.num_of_loaded_sims = len(ColumnarStore(self.output_file))
+            return
         with open(self.output_file, mode="r", encoding="utf-8") as outputs:
             self.num_of_loaded_sims = sum(1 for _ in outputs)
 
@@ -626,10 +1062,17 @@ class MonteCarlo:
                     'max_speed': [100, 101, 102, ...],
                 }
 
+        If the outputs are saved in the columnar format, the numeric results
+        are memory mapped numpy arrays instead of lists.
+
         Returns
         -------
         None
         """
+        if os.path.isdir(self.output_file):
+            store = ColumnarStore(self.output_file)
+            self.results = {name: store.column(name) for name in store.columns}
+            return
         self.results = {}
         for result in self.outputs_log:
             for key, value in result.items():
@@ -638,21 +1081,59 @@ class MonteCarlo:
                 else:
                     self.results[key] = [value]
 
-    def set_processed_results(self):
+    def set_processed_results(self, rebuild_statistics=True):
         """
         Creates a dictionary with the mean and standard deviation of each
-        parameter available in the results.
+        parameter available in the results, taken from the ``statistics``
+        attribute for the numeric ones.
+
+        Parameters
+        ----------
+        rebuild_statistics : bool, optional
+            If True, the ``statistics`` attribute is rebuilt from the results,
+            as when they are imported. At the end of a simulation, the
+            statistics updated as each iteration completed are kept instead.
+            Default is True.
 
         Returns
         -------
         None
         """
+        if rebuild_statistics:
+            self.statistics = MonteCarloStatistics()
+            self.statistics.update_batch(self.results)
         self.processed_results = {}
         for result, values in self.results.items():
-            mean = np.mean(values)
-            stdev = np.std(values)
+            if result in self.statistics.moments:
+                mean = self.statistics.mean(result)
+                stdev = self.statistics.std(result)
+            else:
+                mean = np.mean(values)
+                stdev = np.std(values)
             self.processed_results[result] = (mean, stdev)
 
+    def get_impact_terrain_elevation(self):
+        """Evaluates the elevation of the terrain at all the impact points of
+        the results at once, from the topographic profile of the environment,
+        see ``Environment.get_terrain_elevation``.
+
+        Returns
+        -------
+        numpy.ndarray
+            Elevation of the terrain at each impact point, in meters above sea
+            level, in the order of the results. If the environment has no
+            topographic profile, the elevation of the launch site is given.
+
+        Raises
+        ------
+        KeyError
+            If the impact points are not in the results.
+        """
+        return self.environment.object.get_terrain_elevation(
+            np.asarray(self.results["x_impact"], dtype=float),
+            np.asarray(self.results["y_impact"], dtype=float),
+        )
+
     # Import methods
 
     def import_outputs(self, filename=None):
@@ -677,12 +1158,7 @@ class MonteCarlo:
         """
         filepath = filename if filename else self.filename
 
-        try:
-            with open(f"{filepath}.outputs.txt", "r+", encoding="utf-8"):
-                self.output_file = f"{filepath}.outputs.txt"
-        except FileNotFoundError:
-            with open(filepath, "r+", encoding="utf-8"):
-                self.output_file = filepath
+        self.output_file = self.__find_log(filepath, "outputs")
 
         print(
             f"A total of {self.num_of_loaded_sims} simulations results were "
@@ -705,12 +1181,7 @@ class MonteCarlo:
         """
         filepath = filename if filename else self.filename
 
-        try:
-            with open(f"{filepath}.inputs.txt", "r+", encoding="utf-8"):
-                self.input_file = f"{filepath}.inputs.txt"
-        except FileNotFoundError:
-            with open(filepath, "r+", encoding="utf-8"):
-                self.input_file = filepath
+        self.input_file = self.__find_log(filepath, "inputs")
 
         print(f"The following input file was imported: {self.input_file}")
 
@@ -730,12 +1201,7 @@ class MonteCarlo:
         """
         filepath = filename if filename else self.filename
 
-        try:
-            with open(f"{filepath}.errors.txt", "r+", encoding="utf-8"):
-                self.error_file = f"{filepath}.errors.txt"
-        except FileNotFoundError:
-            with open(filepath, "r+", encoding="utf-8"):
-                self.error_file = filepath
+        self.error_file = self.__find_log(filepath, "errors")
         print(f"The following error file was imported: {self.error_file}")
 
     def import_results(self, filename=None):
@@ -831,11 +1297,11 @@ class MonteCarlo:
 
         for i in range(len(outputs)):
             if (type == "all" and i < 3) or (type == "impact"):
-                ellipse_name = "Impact \u03C3" + str(i + 1)
+                ellipse_name = "Impact \u03c3" + str(i + 1)
             elif type == "all" and i >= 3:
-                ellipse_name = "Apogee \u03C3" + str(i - 2)
+                ellipse_name = "Apogee \u03c3" + str(i - 2)
             else:
-                ellipse_name = "Apogee \u03C3" + str(i + 1)
+                ellipse_name = "Apogee \u03c3" + str(i + 1)
 
             mult_ell = kml.newmultigeometry(name=ellipse_name)
             mult_ell.newpolygon(
@@ -874,3 +1340,281 @@ class MonteCarlo:
         self.info()
         self.plots.ellipses()
         self.plots.all()
+
+
+def _sample_inputs(
+    environment, rocket, flight, seed, number_of_simulations, sampler="random"
+):
+    """Draws the random inputs of all iterations of a Monte Carlo simulation
+    before any of them is run. The inputs of each iteration do not depend on
+    the number of simulations, see ``sample_models``.
+
+    Parameters
+    ----------
+    environment : StochasticEnvironment
+        The stochastic environment object to be iterated over.
+    rocket : StochasticRocket
+        The stochastic rocket object to be iterated over.
+    flight : StochasticFlight
+        The stochastic flight object to be iterated over.
+    seed : int
+        Master seed of the Monte Carlo simulation.
+    number_of_simulations : int
+        Number of iterations of the simulation.
+    sampler : str, callable, optional
+        Sampling design of the inputs. Default is "random".
+
+    Returns
+    -------
+    tuple
+        The samples of the environment, rocket and flight inputs.
+    """
+    stochastic_objects = (environment, rocket, flight)
+    for stochastic_object in stochastic_objects:
+        stochastic_object._use_sample(None)
+    return tuple(
+        sample_models(stochastic_objects, number_of_simulations, sampler, seed)
+    )
+
+
+def _create_flight(
+    environment,
+    rocket,
+    flight,
+    seed,
+    iteration,
+    samples,
+    max_wall_time=None,
+    max_function_evaluations=None,
+):
+    """Creates and simulates a Flight from randomly generated rocket,
+    environment and flight parameters.
+
+    Parameters
+    ----------
+    environment : StochasticEnvironment
+        The stochastic environment object to be iterated over.
+    rocket : StochasticRocket
+        The stochastic rocket object to be iterated over.
+    flight : StochasticFlight
+        The stochastic flight object to be iterated over.
+    seed : int
+        Master seed of the Monte Carlo simulation.
+    iteration : int
+        Index of the iteration, starting from zero.
+    samples : tuple
+        The samples of the environment, rocket and flight inputs, as returned
+        by ``_sample_inputs``. The iteration index selects the inputs used.
+    max_wall_time : int, float, optional
+        Maximum wall clock time of the flight simulation. Default is None.
+    max_function_evaluations : int, optional
+        Maximum number of function evaluations of the flight simulation.
+        Default is None.
+
+    Returns
+    -------
+    Flight
+        The simulated Flight.
+    """
+    for stochastic_object, object_samples in zip(
+        (environment, rocket, flight), samples
+    ):
+        stochastic_object._use_sample(object_samples, iteration)
+    # Objects outside of the stochastic models, such as the parachute noise,
+    # draw from the global random state. It is seeded with a child of the seed
+    # sequence of the iteration, whose own state seeds the sampled inputs, and
+    # restored afterwards, so that the random state of the caller is kept
+    random_state = np.random.get_state()
+    np.random.seed(
+        iteration_seed_sequence(seed, iteration).spawn(1)[0].generate_state(4)
+    )
+    try:
+        return Flight(
+            rocket=rocket.create_object(),
+            environment=environment.create_object(),
+            rail_length=flight._randomize_rail_length(),
+            inclination=flight._randomize_inclination(),
+            heading=flight._randomize_heading(),
+            initial_solution=flight.initial_solution,
+            terminate_on_apogee=flight.terminate_on_apogee,
+            max_wall_time=max_wall_time,
+            max_function_evaluations=max_function_evaluations,
+        )
+    finally:
+        np.random.set_state(random_state)
+
+
+def _last_inputs_dict(environment, rocket, flight):
+    """Merges the last randomly generated inputs of the stochastic objects
+    into a single dictionary."""
+    return dict(
+        item
+        for d in [
+            environment.last_rnd_dict,
+            rocket.last_rnd_dict,
+            flight.last_rnd_dict,
+        ]
+        for item in d.items()
+    )
+
+
+def _iteration_inputs(environment, rocket, flight, samples, iteration):
+    """Creates the rocket and environment of an iteration, without simulating
+    its flight, and returns the inputs of the iteration.
+
+    Parameters
+    ----------
+    environment : StochasticEnvironment
+        The stochastic environment object to be iterated over.
+    rocket : StochasticRocket
+        The stochastic rocket object to be iterated over.
+    flight : StochasticFlight
+        The stochastic flight object to be iterated over.
+    samples : tuple
+        The samples of the environment, rocket and flight inputs, as returned
+        by ``_sample_inputs``.
+    iteration : int
+        Index of the iteration, starting from zero.
+
+    Returns
+    -------
+    dict
+        The inputs of the iteration, see ``_last_inputs_dict``.
+    """
+    for stochastic_object, object_samples in zip(
+        (environment, rocket, flight), samples
+    ):
+        stochastic_object._use_sample(object_samples, iteration)
+    rocket.create_object()
+    environment.create_object()
+    next(flight.dict_generator())
+    return _last_inputs_dict(environment, rocket, flight)
+
+
+def _run_iteration(
+    environment,
+    rocket,
+    flight,
+    export_list,
+    seed,
+    samples,
+    iteration,
+    max_wall_time=None,
+    max_function_evaluations=None,
+    retries=0,
+):
+    """Runs an iteration of a Monte Carlo simulation, running it again with
+    the same inputs and seed up to ``retries`` times if it fails. Since every
+    attempt is the same simulation, retrying only helps with failures that do
+    not depend on the inputs, such as wall clock timeouts of an overloaded
+    machine, while deterministic failures are repeated by each attempt.
+
+    Parameters
+    ----------
+    environment : StochasticEnvironment
+        The stochastic environment object to be iterated over.
+    rocket : StochasticRocket
+        The stochastic rocket object to be iterated over.
+    flight : StochasticFlight
+        The stochastic flight object to be iterated over.
+    export_list : list
+        Names of the Flight attributes exported as outputs.
+    seed : int
+        Master seed of the Monte Carlo simulation.
+    samples : tuple
+        The samples of the environment, rocket and flight inputs, as returned
+        by ``_sample_inputs``.
+    iteration : int
+        Index of the iteration, starting from zero.
+    max_wall_time : int, float, optional
+        Maximum wall clock time of the flight simulation. Default is None.
+    max_function_evaluations : int, optional
+        Maximum number of function evaluations of the flight simulation.
+        Default is None.
+    retries : int, optional
+        Number of times that a failed iteration is run again. Default is 0.
+
+    Returns
+    -------
+    tuple
+        The inputs of the iteration, the dictionary with its outputs, the
+        record of its error and the exception raised by its last attempt. The
+        outputs are None if the iteration failed, while the error record and
+        the exception are None if it succeeded. The record holds the
+        iteration index, the master seed, the number of attempts, the error
+        message and the inputs of the iteration.
+    """
+    for attempt in range(1, retries + 2):
+        try:
+            monte_carlo_flight = _create_flight(
+                environment,
+                rocket,
+                flight,
+                seed,
+                iteration,
+                samples,
+                max_wall_time,
+                max_function_evaluations,
+            )
+            results = {
+                export_item: getattr(monte_carlo_flight, export_item)
+                for export_item in export_list
+            }
+            exception = None
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            results, exception = None, error
+        inputs = _last_inputs_dict(environment, rocket, flight)
+        if exception is None:
+            return inputs, results, None, None
+    record = {
+        "iteration": iteration,
+        "seed": seed,
+        "attempts": attempt,
+        "error": f"{type(exception).__name__}: {exception}",
+        "inputs": inputs,
+    }
+    return inputs, None, record, exception
+
+
+def _initialize_worker(*arguments):
+    """Stores the stochastic objects, export list, seed, input samples and
+    iteration options in a worker process of a parallel Monte Carlo
+    simulation. Keyboard interrupts are left to be handled by the main
+    process."""
+    global _worker_arguments  # pylint: disable=global-statement
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_arguments = arguments
+
+
+def _run_worker_simulation(iteration):
+    """Runs a single simulation in a worker process.
+
+    Parameters
+    ----------
+    iteration : int
+        Index of the iteration being run.
+
+    Returns
+    -------
+    tuple
+        The JSON encoded inputs, outputs and error record of the simulation,
+        followed by the exception raised by its last attempt, see
+        ``_run_iteration``. Either the outputs or the error record are None.
+        The exception is None as well if it can not be sent to the main
+        process.
+    """
+    environment, rocket, flight, export_list, seed, samples, options = _worker_arguments
+    inputs, results, error, exception = _run_iteration(
+        environment, rocket, flight, export_list, seed, samples, iteration, **options
+    )
+    try:
+        pickle.dumps(exception)
+    except Exception:  # pylint: disable=broad-exception-caught
+        exception = None
+    return (
+        *(
+            None if value is None else json.dumps(value, cls=RocketPyEncoder)
+            for value in (inputs, results, error)
+        ),
+        exception,
+    )
@@ -0,0 +1,215 @@
+"""
+Defines streaming statistics of the results of a Monte Carlo simulation. The
+accumulators, defined in ``rocketpy.mathutils.running_statistics``, are updated
+as each iteration completes, without keeping the results in memory, and
+accumulators of different runs or processes can be merged into one.
+"""
+
+import numpy as np
+
+from rocketpy.mathutils.running_statistics import (
+    QuantileSketch,
+    RunningCovariance,
+    RunningMoments,
+)
+
+
+class MonteCarloStatistics:
+    """Streaming statistics of the outputs of a Monte Carlo simulation.
+
+    For each numeric output, such as the apogee, the running mean and
+    standard deviation and a quantile sketch are kept. The joint covariances
+    of the impact and apogee points are kept for the dispersion ellipses, and
+    the distance between the impact point and the origin is tracked as the
+    ``impact_radius`` output.
+
+    Attributes
+    ----------
+    MonteCarloStatistics.moments : dict[str, RunningMoments]
+        Running moments of each numeric output.
+    MonteCarloStatistics.sketches : dict[str, QuantileSketch]
+        Quantile sketches of each numeric output.
+    MonteCarloStatistics.covariances : dict[tuple, RunningCovariance]
+        Running covariances of the pairs of outputs in ``COVARIANCE_PAIRS``.
+    MonteCarloStatistics.count : int
+        Number of outputs added.
+    """
+
+    COVARIANCE_PAIRS = (("x_impact", "y_impact"), ("apogee_x", "apogee_y"))
+
+    def __init__(self, capacity=1000, seed=None):
+        """Initializes empty statistics.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Capacity of the quantile sketches, see ``QuantileSketch``.
+            Default is 1000.
+        seed : int, optional
+            Seed of the quantile sketches.
+
+        Returns
+        -------
+        None
+        """
+        self.capacity = capacity
+        self._seed = np.random.SeedSequence(seed)
+        self.count = 0
+        self.moments = {}
+        self.sketches = {}
+        self.covariances = {}
+
+    def _accumulators(self, name):
+        if name not in self.moments:
+            self.moments[name] = RunningMoments()
+            self.sketches[name] = QuantileSketch(self.capacity, self._seed.spawn(1)[0])
+        return self.moments[name], self.sketches[name]
+
+    @staticmethod
+    def _numeric_columns(results):
+        """Returns the results that are columns of numbers, with NaN for the
+        values that are missing."""
+        columns = {}
+        for name, values in results.items():
+            try:
+                array = np.asarray(
+                    [np.nan if value is None else value for value in values],
+                    dtype=float,
+                )
+            except (TypeError, ValueError):
+                continue
+            if array.ndim == 1:
+                columns[name] = array
+        if "x_impact" in columns and "y_impact" in columns:
+            columns["impact_radius"] = np.hypot(
+                columns["x_impact"], columns["y_impact"]
+            )
+        return columns
+
+    def update(self, outputs):
+        """Adds the outputs of one iteration.
+
+        Parameters
+        ----------
+        outputs : dict
+            Dictionary with the outputs of the iteration, as saved in the
+            outputs log. Outputs that are not numbers are ignored, as are
+            missing and non finite values.
+
+        Returns
+        -------
+        None
+        """
+        self.update_batch({name: [value] for name, value in outputs.items()})
+
+    def update_batch(self, results):
+        """Adds the outputs of several iterations.
+
+        Parameters
+        ----------
+        results : dict
+            Dictionary with the lists or arrays of outputs of the iterations,
+            in the format of the ``results`` attribute of MonteCarlo.
+
+        Returns
+        -------
+        None
+        """
+        columns = self._numeric_columns(results)
+        for name, values in columns.items():
+            values = values[np.isfinite(values)]
+            for accumulator in self._accumulators(name):
+                accumulator.update(values)
+        for pair in self.COVARIANCE_PAIRS:
+            if all(name in columns for name in pair):
+                vectors = np.column_stack([columns[name] for name in pair])
+                vectors = vectors[np.isfinite(vectors).all(axis=1)]
+                covariance = self.covariances.setdefault(pair, RunningCovariance())
+                covariance.update(vectors)
+        self.count += max((len(values) for values in results.values()), default=0)
+
+    def merge(self, other):
+        """Merges the statistics of another run into this one.
+
+        Parameters
+        ----------
+        other : MonteCarloStatistics
+            Statistics to be merged.
+
+        Returns
+        -------
+        None
+        """
+        for name, moments in other.moments.items():
+            own_moments, own_sketch = self._accumulators(name)
+            own_moments.merge(moments)
+            own_sketch.merge(other.sketches[name])
+        for pair, covariance in other.covariances.items():
+            self.covariances.setdefault(pair, RunningCovariance()).merge(covariance)
+        self.count += other.count
+
+    def mean(self, name):
+        """Running mean of an output."""
+        return self.moments[name].mean
+
+    def std(self, name):
+        """Running population standard deviation of an output."""
+        return self.moments[name].std
+
+    def quantile(self, name, q):
+        """Estimated quantile of an output, see ``QuantileSketch.quantile``."""
+        return self.sketches[name].quantile(q)
+
+    def quantile_confidence_interval(self, name, q, confidence=0.95):
+        """Confidence interval of a quantile of an output, see
+        ``QuantileSketch.quantile_confidence_interval``."""
+        return self.sketches[name].quantile_confidence_interval(q, confidence)
+
+    def covariance(self, pair=("x_impact", "y_impact")):
+        """Running covariance matrix of a pair of outputs."""
+        return self.covariances[pair].covariance
+
+
+def quantile_convergence(name, q, max_width, confidence=0.95, min_simulations=100):
+    """Creates a stopping condition for ``MonteCarlo.simulate``, met once the
+    confidence interval of a quantile of an output is narrow enough.
+
+    Parameters
+    ----------
+    name : str
+        Name of the output, such as "apogee" or "impact_radius".
+    q : float
+        Quantile, between 0 and 1. For instance, 0.99 for the 99th
+        percentile.
+    max_width : float
+        Maximum width of the confidence interval, in the units of the output.
+    confidence : float, optional
+        Confidence level of the interval. Default is 0.95.
+    min_simulations : int, optional
+        Minimum number of simulations before the condition can be met.
+        Default is 100.
+
+    Returns
+    -------
+    callable
+        Function that receives the MonteCarloStatistics of the simulation and
+        returns whether it has converged.
+
+    Examples
+    --------
+    Stop once the 99th percentile of the distance between the impact point and
+    the launch site is known to within 50 m:
+
+    >>> from rocketpy.simulation.monte_carlo_statistics import (
+    ...     quantile_convergence,
+    ... )
+    >>> stop_condition = quantile_convergence("impact_radius", 0.99, 50)
+    """
+
+    def stop_condition(statistics):
+        if statistics.count < min_simulations or name not in statistics.sketches:
+            return False
+        lower, upper = statistics.quantile_confidence_interval(name, q, confidence)
+        return upper - lower < max_width
+
+    return stop_condition
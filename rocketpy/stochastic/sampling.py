@@ -0,0 +1,308 @@
+"""
+Defines the sampling designs used to draw the random input arguments of the
+stochastic models. Besides plain pseudo-random sampling, quasi-Monte Carlo
+sequences and Latin hypercube designs spread the samples more evenly over the
+input space, which makes the statistics of a Monte Carlo simulation converge
+with fewer simulations.
+
+The designs are generated in the unit hypercube, with one dimension for each
+random input argument, and mapped to the distribution of each argument through
+its inverse cumulative distribution function.
+"""
+
+import numpy as np
+from scipy import stats
+
+
+def _sobol_design(n, dimensions, seed):
+    """Scrambled Sobol' sequence. Its balance properties are best when ``n``
+    is a power of 2."""
+    from scipy.stats import qmc  # pylint: disable=import-outside-toplevel
+
+    return qmc.Sobol(dimensions, scramble=True, seed=seed).random(n)
+
+
+def _halton_design(n, dimensions, seed):
+    """Scrambled Halton sequence."""
+    from scipy.stats import qmc  # pylint: disable=import-outside-toplevel
+
+    return qmc.Halton(dimensions, scramble=True, seed=seed).random(n)
+
+
+def _latin_hypercube_design(n, dimensions, seed):
+    """Latin hypercube design. Each of the ``n`` strata of equal probability
+    of each dimension has one point at a random position inside of it."""
+    from scipy.stats import qmc  # pylint: disable=import-outside-toplevel
+
+    return qmc.LatinHypercube(dimensions, scramble=True, seed=seed).random(n)
+
+
+def _stratified_design(n, dimensions, seed):
+    """Stratified design. Each of the ``n`` strata of equal probability of
+    each dimension has one point at its center, and the strata of different
+    dimensions are paired at random."""
+    generator = np.random.default_rng(seed)
+    centers = (np.arange(n) + 0.5) / n
+    return np.column_stack([generator.permutation(centers) for _ in range(dimensions)])
+
+
+SAMPLING_DESIGNS = {
+    "sobol": _sobol_design,
+    "halton": _halton_design,
+    "latin_hypercube": _latin_hypercube_design,
+    "stratified": _stratified_design,
+}
+
+
+def get_sampling_design(sampler):
+    """Returns the function that generates the sampling design.
+
+    Parameters
+    ----------
+    sampler : str, callable
+        Either "random", for pseudo-random sampling, one of "sobol", "halton",
+        "latin_hypercube" or "stratified", or a function with the signature
+        ``sampler(n, dimensions, seed)`` that returns an array of shape
+        ``(n, dimensions)`` with values in the open interval (0, 1).
+
+    Returns
+    -------
+    callable, None
+        The function that generates the design, or None for pseudo-random
+        sampling.
+
+    Raises
+    ------
+    ValueError
+        If the sampler is not recognized.
+    """
+    if callable(sampler):
+        return sampler
+    if sampler == "random":
+        return None
+    try:
+        return SAMPLING_DESIGNS[sampler]
+    except KeyError as e:
+        raise ValueError(
+            f"Sampler '{sampler}' not found, please use one of the following: "
+            + ", ".join(f'"{name}"' for name in ["random", *SAMPLING_DESIGNS])
+            + ", or a function that returns the sampling design."
+        ) from e
+
+
+class _DesignGenerator(np.random.Generator):
+    """Random Generator whose vectorized draws are taken from the columns of a
+    sampling design in the unit hypercube, mapped through the inverse
+    cumulative distribution functions of the distributions. Each draw uses the
+    next column of the design. Every distribution of ``get_distribution`` has
+    its inverse cumulative distribution function defined here, while scalar
+    draws come from the pseudo-random bit generator.
+
+    If no design is given, the draws only count the number of columns that
+    would be used, returning the medians of the distributions.
+    """
+
+    def __init__(self, bit_generator, design=None):
+        super().__init__(bit_generator)
+        self.design = design
+        self.dimensions = 0
+
+    def _next_column(self, size):
+        if self.design is None:
+            column = np.full(size, 0.5)
+        else:
+            column = self.design[:, self.dimensions]
+        self.dimensions += 1
+        # The inverse distribution functions diverge at 0 and 1
+        return np.clip(column, np.finfo(float).tiny, 1 - np.finfo(float).epsneg)
+
+    def _location_scale(self, distribution, loc, scale, size):
+        # Scaling the standard distribution also handles null scales
+        return loc + scale * distribution.ppf(self._next_column(size))
+
+    def normal(self, loc=0.0, scale=1.0, size=None):
+        if size is None:
+            return super().normal(loc, scale)
+        return self._location_scale(stats.norm, loc, scale, size)
+
+    def uniform(self, low=0.0, high=1.0, size=None):
+        if size is None:
+            return super().uniform(low, high)
+        return low + (high - low) * self._next_column(size)
+
+    def binomial(self, n, p, size=None):
+        if size is None:
+            return super().binomial(n, p)
+        return stats.binom.ppf(self._next_column(size), n, p).astype(np.int64)
+
+    def chisquare(self, df, size=None):
+        if size is None:
+            return super().chisquare(df)
+        return stats.chi2.ppf(self._next_column(size), df)
+
+    def exponential(self, scale=1.0, size=None):
+        if size is None:
+            return super().exponential(scale)
+        return scale * stats.expon.ppf(self._next_column(size))
+
+    def gamma(self, shape, scale=1.0, size=None):
+        if size is None:
+            return super().gamma(shape, scale)
+        return stats.gamma.ppf(self._next_column(size), shape, scale=scale)
+
+    def gumbel(self, loc=0.0, scale=1.0, size=None):
+        if size is None:
+            return super().gumbel(loc, scale)
+        return self._location_scale(stats.gumbel_r, loc, scale, size)
+
+    def laplace(self, loc=0.0, scale=1.0, size=None):
+        if size is None:
+            return super().laplace(loc, scale)
+        return self._location_scale(stats.laplace, loc, scale, size)
+
+    def logistic(self, loc=0.0, scale=1.0, size=None):
+        if size is None:
+            return super().logistic(loc, scale)
+        return self._location_scale(stats.logistic, loc, scale, size)
+
+    def poisson(self, lam=1.0, size=None):
+        if size is None:
+            return super().poisson(lam)
+        return stats.poisson.ppf(self._next_column(size), lam).astype(np.int64)
+
+    def wald(self, mean, scale, size=None):
+        if size is None:
+            return super().wald(mean, scale)
+        # numpy's scale is the shape parameter of the inverse Gaussian
+        return stats.invgauss.ppf(self._next_column(size), mean / scale, scale=scale)
+
+    def integers(self, low, high=None, size=None, dtype=np.int64, endpoint=False):
+        if size is None:
+            return super().integers(low, high, dtype=dtype, endpoint=endpoint)
+        if high is None:
+            low, high = 0, low
+        if endpoint:
+            high += 1
+        values = low + np.floor((high - low) * self._next_column(size))
+        return np.minimum(values, high - 1).astype(dtype)
+
+
+def iteration_seed_sequence(seed, iteration):
+    """Returns the seed sequence of an iteration of a simulation, which is the
+    ``iteration``-th child of ``numpy.random.SeedSequence(seed).spawn``,
+    created without spawning the previous children.
+
+    Parameters
+    ----------
+    seed : int, numpy.random.SeedSequence
+        Master seed of the simulation.
+    iteration : int
+        Index of the iteration, starting from zero.
+
+    Returns
+    -------
+    numpy.random.SeedSequence
+        The seed sequence of the iteration.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return np.random.SeedSequence(
+        seed.entropy,
+        spawn_key=(*seed.spawn_key, iteration),
+        pool_size=seed.pool_size,
+    )
+
+
+def _sample_iterations(models, n, seed):
+    """Draws the random values of each iteration from its own generator,
+    seeded with ``iteration_seed_sequence(seed, iteration)``, so that the
+    values of an iteration do not depend on the number of iterations."""
+    iteration_samples = []
+    for iteration in range(n):
+        generator = np.random.default_rng(iteration_seed_sequence(seed, iteration))
+        for model in models:
+            model.set_random_number_generator(generator)
+        iteration_samples.append([model._sample(1) for model in models])
+    if not iteration_samples:
+        return [model._sample(0) for model in models]
+    return _concatenate_samples(iteration_samples)
+
+
+def _concatenate_samples(samples):
+    """Concatenates the samples of consecutive iterations. The samples are
+    arrays, or dictionaries and lists that hold them, as the ones of the
+    rocket components."""
+    first = samples[0]
+    if isinstance(first, dict):
+        return {
+            key: _concatenate_samples([item[key] for item in samples]) for key in first
+        }
+    if isinstance(first, list):
+        return [_concatenate_samples(items) for items in zip(*samples)]
+    return np.concatenate(samples)
+
+
+def sample_models(models, n, sampler="random", seed=None):
+    """Draws ``n`` random values of each input argument of the given
+    stochastic models. When a sampling design is used, a single design spans
+    the input arguments of all models, so that their joint samples are evenly
+    spread.
+
+    When the values are pseudo-random and the seed is an integer or a
+    SeedSequence, the values of the i-th iteration are drawn from a generator
+    seeded with ``iteration_seed_sequence(seed, i)``. They are the same for any
+    ``n`` greater than i, so that any iteration can be reproduced from the seed
+    and its index alone. The Sobol' and Halton designs are sequences, whose
+    first points also do not depend on ``n``, while the Latin hypercube and
+    stratified designs are built for exactly ``n`` points.
+
+    Parameters
+    ----------
+    models : list[StochasticModel]
+        The stochastic models to be sampled.
+    n : int
+        Number of values to be drawn for each input argument.
+    sampler : str, callable, optional
+        The sampling design, see ``get_sampling_design``. Default is "random".
+    seed : int, numpy.random.SeedSequence, numpy.random.Generator, None
+        Seed of the random values, also used to scramble the designs. If a
+        Generator is given, the pseudo-random values of all iterations are
+        drawn from it at once. If None, pseudo-random values are drawn from
+        the random generators of the models, and designs are seeded from the
+        global random state.
+
+    Returns
+    -------
+    list[dict]
+        The samples of each model, as returned by ``StochasticModel.sample``.
+    """
+    design_function = get_sampling_design(sampler)
+    previous_generators = [model._random_number_generator for model in models]
+    try:
+        if design_function is None:
+            if isinstance(seed, (int, np.integer, np.random.SeedSequence)):
+                return _sample_iterations(models, n, seed)
+            if seed is not None:
+                generator = np.random.default_rng(seed)
+                for model in models:
+                    model.set_random_number_generator(generator)
+            return [model._sample(n) for model in models]
+
+        if seed is None:
+            seed = np.random.randint(2**32, dtype=np.int64)
+        generator = np.random.default_rng(seed)
+        # A first pass counts the dimensions of the design
+        counter = _DesignGenerator(generator.bit_generator)
+        for model in models:
+            model.set_random_number_generator(counter)
+            model._sample(n)
+        design = np.empty((n, 0))
+        if counter.dimensions:
+            design = np.asarray(design_function(n, counter.dimensions, generator))
+        design_generator = _DesignGenerator(generator.bit_generator, design)
+        for model in models:
+            model.set_random_number_generator(design_generator)
+        return [model._sample(n) for model in models]
+    finally:
+        for model, previous_generator in zip(models, previous_generators):
+            model.set_random_number_generator(previous_generator)
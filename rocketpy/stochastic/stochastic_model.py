@@ -10,6 +10,10 @@ import numpy as np
 from rocketpy.mathutils.function import Function
 
 from ..tools import get_distribution
+from .sampling import sample_models
+
+# Distributions whose only parameter is their mean
+_ONE_PARAMETER_DISTRIBUTIONS = ("chisquare", "exponential", "poisson")
 
 # TODO: Stop using assert in production code. Use exceptions instead.
 # TODO: Each validation method should have a test case.
@@ -40,6 +44,12 @@ class StochasticModel:
         "ensemble_member",
     ]
 
+    # Generator of the random values. If None, the global random state is used
+    _random_number_generator = None
+    # Samples drawn by the sample method that are replayed by dict_generator
+    _sample_columns = None
+    _sample_index = None
+
     def __init__(self, object, **kwargs):
         """
         Initialize the StochasticModel class with validated input arguments.
@@ -442,6 +452,143 @@ class StochasticModel:
                         "the first item"
                     )
 
+    def set_random_number_generator(self, seed):
+        """Sets the random number generator from which the random input
+        arguments are drawn. Reusing the same seed reproduces the same
+        sequence of random input arguments.
+
+        Parameters
+        ----------
+        seed : int, numpy.random.SeedSequence, numpy.random.Generator, None
+            Seed of the generator, in any form accepted by
+            ``numpy.random.default_rng``. If a Generator is given, it is used
+            directly. If None, the random values are drawn from the global
+            random state of the ``numpy.random`` and ``random`` modules, which
+            is the default.
+
+        Returns
+        -------
+        None
+        """
+        if seed is None:
+            self._random_number_generator = None
+        else:
+            self._random_number_generator = np.random.default_rng(seed)
+
+    def _randomize_tuple(self, value, size=None):
+        """Draws a random value from a tuple in the format (nominal value,
+        standard deviation, distribution function). If ``size`` is given, an
+        array with ``size`` random values is returned instead. The only
+        parameter of the chisquare, exponential and poisson distributions is
+        their mean, which is set to the nominal value, so their standard
+        deviation is not used."""
+        generator = self._random_number_generator
+        name = value[-1].__name__
+        if generator is None:
+            distribution_function = value[-1]
+        else:
+            # The distribution functions have the same name in numpy Generators
+            distribution_function = getattr(generator, name)
+        if name in _ONE_PARAMETER_DISTRIBUTIONS:
+            arguments = (value[0],)
+        else:
+            arguments = (value[0], value[1])
+        if size is None:
+            return distribution_function(*arguments)
+        return distribution_function(*arguments, size=size)
+
+    def _randomize_list(self, value, size=None):
+        """Randomly chooses one of the items of a list, if it is not empty. If
+        ``size`` is given, an array with ``size`` choices is returned instead.
+        """
+        generator = self._random_number_generator
+        if size is None:
+            if not value:
+                return value
+            if generator is None:
+                return choice(value)
+            return value[generator.integers(len(value))]
+
+        column = np.empty(size, dtype=object)
+        if not value:
+            column.fill(value)
+            return column
+        if len(value) == 1:
+            indices = np.zeros(size, dtype=int)
+        elif generator is None:
+            indices = np.random.randint(len(value), size=size)
+        else:
+            indices = generator.integers(len(value), size=size)
+        if all(isinstance(item, (int, float)) for item in value):
+            return np.array(value)[indices]
+        for i, index in enumerate(indices):
+            column[i] = value[index]
+        return column
+
+    def sample(self, n, sampler="random"):
+        """Draws ``n`` random values of each input argument at once, with a
+        single call to the distribution function of each argument. The values
+        follow the same rules as the ones generated by ``dict_generator``.
+
+        Parameters
+        ----------
+        n : int
+            Number of values to be drawn for each input argument.
+        sampler : str, callable, optional
+            The sampling design. Options are:
+
+            - "random": pseudo-random values. This is the default.
+            - "sobol": scrambled Sobol' sequence, best used when ``n`` is a
+              power of 2.
+            - "halton": scrambled Halton sequence.
+            - "latin_hypercube": Latin hypercube design, with one value at a
+              random position inside each of the ``n`` equally probable
+              intervals of each argument.
+            - "stratified": one value at the center of each of the ``n``
+              equally probable intervals of each argument, with the intervals
+              of different arguments paired at random.
+            - a function with the signature ``sampler(n, dimensions, seed)``
+              that returns a design of shape ``(n, dimensions)`` in the unit
+              hypercube.
+
+            The designs are mapped to the distribution of each argument through
+            its inverse cumulative distribution function, and list arguments
+            are split into intervals of equal probability for each item. The
+            designs are scrambled with the random number generator of the
+            model, see ``set_random_number_generator``.
+
+        Returns
+        -------
+        dict
+            Dictionary whose keys are the names of the input arguments and
+            whose values are arrays with their ``n`` random values. The i-th
+            values of all arrays make up the i-th set of input arguments.
+
+        See also
+        --------
+        StochasticModel.dict_generator
+        """
+        return sample_models([self], n, sampler, self._random_number_generator)[0]
+
+    def _sample(self, n):
+        """Draws ``n`` random values of each input argument from the random
+        number generator of the model. See ``sample``."""
+        samples = {}
+        for arg, value in self.__dict__.items():
+            if isinstance(value, tuple):
+                samples[arg] = np.asarray(self._randomize_tuple(value, n))
+            elif isinstance(value, list):
+                samples[arg] = self._randomize_list(value, n)
+        return samples
+
+    def _use_sample(self, samples, index=None):
+        """Makes ``dict_generator`` yield the input arguments of the given
+        index of the samples, as returned by ``sample``, instead of drawing new
+        random values. If ``samples`` is None, random values are drawn again.
+        """
+        self._sample_columns = samples
+        self._sample_index = index
+
     def dict_generator(self):
         """
         Generate a dictionary with randomly generated input arguments.
@@ -459,13 +606,22 @@ class StochasticModel:
             a. If the attribute is a tuple, the value is generated using the\
                 distribution function specified in the tuple.
             b. If the attribute is a list, the value is randomly chosen from the list.
+        2. If the model is replaying the values drawn by the ``sample`` method,
+        the values of the current sample are used instead.
         """
         generated_dict = {}
-        for arg, value in self.__dict__.items():
-            if isinstance(value, tuple):
-                generated_dict[arg] = value[-1](value[0], value[1])
-            elif isinstance(value, list):
-                generated_dict[arg] = choice(value) if value else value
+        if self._sample_columns is not None:
+            for arg, column in self._sample_columns.items():
+                value = column[self._sample_index]
+                generated_dict[arg] = (
+                    value.item() if isinstance(value, np.generic) else value
+                )
+        else:
+            for arg, value in self.__dict__.items():
+                if isinstance(value, tuple):
+                    generated_dict[arg] = self._randomize_tuple(value)
+                elif isinstance(value, list):
+                    generated_dict[arg] = self._randomize_list(value)
         self.last_rnd_dict = generated_dict
         yield generated_dict
 
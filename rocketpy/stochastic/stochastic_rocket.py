@@ -1,8 +1,11 @@
 """Defines the StochasticRocket class."""
 
 import warnings
-from random import choice
+from copy import copy
 
+import numpy as np
+
+from rocketpy.mathutils.function import Function
 from rocketpy.motors.motor import EmptyMotor, GenericMotor, Motor
 from rocketpy.motors.solid_motor import SolidMotor
 from rocketpy.rocket.aero_surface import (
@@ -29,6 +32,82 @@ from .stochastic_model import StochasticModel
 from .stochastic_parachute import StochasticParachute
 from .stochastic_solid_motor import StochasticSolidMotor
 
+# Input arguments of the Rocket class drawn by the StochasticRocket
+_ROCKET_ARGUMENTS = (
+    "radius",
+    "mass",
+    "I_11_without_motor",
+    "I_22_without_motor",
+    "I_33_without_motor",
+    "I_12_without_motor",
+    "I_13_without_motor",
+    "I_23_without_motor",
+    "power_off_drag",
+    "power_on_drag",
+    "power_off_drag_factor",
+    "power_on_drag_factor",
+    "center_of_mass_without_motor",
+    "coordinate_system_orientation",
+)
+# Input arguments stored as attributes of the Rocket with the same name
+_ROCKET_ATTRIBUTES = (
+    "radius",
+    "mass",
+    "I_11_without_motor",
+    "I_22_without_motor",
+    "I_33_without_motor",
+    "I_12_without_motor",
+    "I_13_without_motor",
+    "I_23_without_motor",
+    "center_of_mass_without_motor",
+)
+_DRAG_OUTPUTS = {
+    "power_off_drag": "Drag Coefficient with Power Off",
+    "power_on_drag": "Drag Coefficient with Power On",
+}
+
+
+def _same_value(first, second):
+    """Checks whether two input arguments are the same. Numbers and strings
+    are compared by value, while any other objects, such as Functions, are
+    compared by identity."""
+    if first is second:
+        return True
+    scalar_types = (bool, int, float, str, np.number)
+    return (
+        isinstance(first, scalar_types)
+        and isinstance(second, scalar_types)
+        and first == second
+    )
+
+
+def _create_component(stochastic_component, template=None):
+    """Creates the object of a stochastic component from newly drawn input
+    arguments. If the arguments are the same as the ones of the template,
+    given as a tuple with the arguments and the object created from them, the
+    object of the template is returned instead."""
+    generated_dict = next(stochastic_component.dict_generator())
+    if (
+        template is not None
+        and generated_dict.keys() == template[0].keys()
+        and all(
+            _same_value(value, template[0][arg])
+            for arg, value in generated_dict.items()
+        )
+    ):
+        return template[1]
+    # The drawn arguments are replayed, so that they are not drawn again
+    columns = stochastic_component._sample_columns
+    index = stochastic_component._sample_index
+    stochastic_component._use_sample(
+        {arg: [value] for arg, value in generated_dict.items()}, 0
+    )
+    try:
+        return stochastic_component.create_object()
+    finally:
+        stochastic_component._use_sample(columns, index)
+
+
 # TODO: Private methods of this class should be double underscored
 
 
@@ -84,6 +163,9 @@ class StochasticRocket(StochasticModel):
         can not be a randomized.
     """
 
+    # Template of the rockets created by create_object
+    _template = None
+
     def __init__(
         self,
         rocket,
@@ -194,6 +276,7 @@ class StochasticRocket(StochasticModel):
             elif isinstance(motor, GenericMotor):
                 motor = StochasticGenericMotor(generic_motor=motor)
         self.motors.add(motor, self._validate_position(motor, position))
+        self._template = None
 
     def _add_surfaces(self, surfaces, positions, type, stochastic_type, error_message):
         """Adds a stochastic aerodynamic surface to the stochastic rocket. If
@@ -222,6 +305,7 @@ class StochasticRocket(StochasticModel):
         self.aerodynamic_surfaces.add(
             surfaces, self._validate_position(surfaces, positions)
         )
+        self._template = None
 
     def add_nose(self, nose, position=None):
         """Adds a stochastic nose cone to the stochastic rocket.
@@ -446,12 +530,102 @@ class StochasticRocket(StochasticModel):
 
             return get_surface_position
 
-    def _randomize_position(self, position):
-        """Randomize a position provided as a tuple or list."""
+    def set_random_number_generator(self, seed):
+        """Sets the random number generator from which the random input
+        arguments of the rocket and of all of its stochastic components are
+        drawn. The rocket and its components share the same generator.
+
+        Parameters
+        ----------
+        seed : int, numpy.random.SeedSequence, numpy.random.Generator, None
+            Seed of the generator, in any form accepted by
+            ``numpy.random.default_rng``. If None, the global random state is
+            used. See ``StochasticModel.set_random_number_generator``.
+
+        Returns
+        -------
+        None
+        """
+        super().set_random_number_generator(seed)
+        generator = self._random_number_generator
+        for component in (*self.motors, *self.aerodynamic_surfaces, *self.rail_buttons):
+            component.component.set_random_number_generator(generator)
+        for parachute in self.parachutes:
+            parachute.set_random_number_generator(generator)
+
+    def _randomize_position(self, position, size=None):
+        """Randomize a position provided as a tuple or list. When replaying
+        samples, the next sampled position is returned instead."""
+        if size is None and self._sample_columns is not None:
+            return next(self._sampled_positions)
         if isinstance(position, tuple):
-            return position[-1](position[0], position[1])
+            return self._randomize_tuple(position, size)
         elif isinstance(position, list):
-            return choice(position) if position else position
+            return self._randomize_list(position, size)
+
+    def _sample(self, n):
+        """Draws ``n`` random values of each input argument of the rocket and
+        of its components at once. See ``StochasticModel.sample``.
+
+        Parameters
+        ----------
+        n : int
+            Number of values to be drawn for each input argument.
+
+        Returns
+        -------
+        dict
+            Dictionary with the arrays of random values of the rocket input
+            arguments. The samples of the motors, aerodynamic surfaces, rail
+            buttons and parachutes are stored in lists under the keys with the
+            same names, in the same format of ``last_rnd_dict``.
+        """
+        samples = super()._sample(n)
+        for key in ("motors", "aerodynamic_surfaces", "rail_buttons"):
+            position_key = (
+                "lower_button_position" if key == "rail_buttons" else "position"
+            )
+            samples[key] = []
+            for component in getattr(self, key):
+                component_samples = component.component._sample(n)
+                component_samples[position_key] = np.asarray(
+                    self._randomize_position(component.position, n)
+                )
+                samples[key].append(component_samples)
+        samples["parachutes"] = [parachute._sample(n) for parachute in self.parachutes]
+        return samples
+
+    def _use_sample(self, samples, index=None):
+        """Makes the rocket and its components replay the input arguments of
+        the given index of the samples, as returned by ``sample``. If
+        ``samples`` is None, random values are drawn again."""
+        nested_keys = ("motors", "aerodynamic_surfaces", "rail_buttons", "parachutes")
+        if samples is None:
+            super()._use_sample(None)
+            for key in nested_keys[:-1]:
+                for component in getattr(self, key):
+                    component.component._use_sample(None)
+            for parachute in self.parachutes:
+                parachute._use_sample(None)
+            return
+
+        super()._use_sample(
+            {key: value for key, value in samples.items() if key not in nested_keys},
+            index,
+        )
+        positions = []
+        for key in nested_keys[:-1]:
+            for component, component_samples in zip(getattr(self, key), samples[key]):
+                component_samples = component_samples.copy()
+                position_key = (
+                    "lower_button_position" if key == "rail_buttons" else "position"
+                )
+                positions.append(component_samples.pop(position_key)[index].item())
+                component.component._use_sample(component_samples, index)
+        for parachute, parachute_samples in zip(self.parachutes, samples["parachutes"]):
+            parachute._use_sample(parachute_samples, index)
+        # Stored as an array since list attributes are randomized
+        self._positions_sample = np.array(positions)
 
     def dict_generator(self):
         """Special generator for the rocket class that yields a dictionary with
@@ -473,6 +647,8 @@ class StochasticRocket(StochasticModel):
             Dictionary with the randomly generated input arguments.
         """
         generated_dict = next(super().dict_generator())
+        if self._sample_columns is not None:
+            self._sampled_positions = iter(self._positions_sample.tolist())
         generated_dict["motors"] = []
         generated_dict["aerodynamic_surfaces"] = []
         generated_dict["rail_buttons"] = []
@@ -480,17 +656,17 @@ class StochasticRocket(StochasticModel):
         self.last_rnd_dict = generated_dict
         yield generated_dict
 
-    def _create_motor(self, component_stochastic_motor):
+    def _create_motor(self, component_stochastic_motor, template=None):
         stochastic_motor = component_stochastic_motor.component
-        motor = stochastic_motor.create_object()
+        motor = _create_component(stochastic_motor, template)
         position_rnd = self._randomize_position(component_stochastic_motor.position)
         self.last_rnd_dict["motors"].append(stochastic_motor.last_rnd_dict)
         self.last_rnd_dict["motors"][-1]["position"] = position_rnd
         return motor, position_rnd
 
-    def _create_surface(self, component_stochastic_surface):
+    def _create_surface(self, component_stochastic_surface, template=None):
         stochastic_surface = component_stochastic_surface.component
-        surface = stochastic_surface.create_object()
+        surface = _create_component(stochastic_surface, template)
         position_rnd = self._randomize_position(component_stochastic_surface.position)
         self.last_rnd_dict["aerodynamic_surfaces"].append(
             stochastic_surface.last_rnd_dict
@@ -525,40 +701,55 @@ class StochasticRocket(StochasticModel):
         """Creates and returns a Rocket object from the randomly generated input
         arguments.
 
+        The first rocket created is kept as a template. The following rockets
+        are copies of the template in which only the input arguments that
+        differ from the ones of the template are replaced, and only the
+        quantities that depend on them are evaluated again. Motors and
+        aerodynamic surfaces whose input arguments are the same as the ones of
+        the template are reused instead of being created again.
+
         Returns
         -------
         rocket : Rocket
             Rocket object with the randomly generated input arguments.
         """
         generated_dict = next(self.dict_generator())
-        rocket = Rocket(
-            radius=generated_dict["radius"],
-            mass=generated_dict["mass"],
-            inertia=(
-                generated_dict["I_11_without_motor"],
-                generated_dict["I_22_without_motor"],
-                generated_dict["I_33_without_motor"],
-                generated_dict["I_12_without_motor"],
-                generated_dict["I_13_without_motor"],
-                generated_dict["I_23_without_motor"],
-            ),
-            power_off_drag=generated_dict["power_off_drag"],
-            power_on_drag=generated_dict["power_on_drag"],
-            center_of_mass_without_motor=generated_dict["center_of_mass_without_motor"],
-            coordinate_system_orientation=generated_dict[
-                "coordinate_system_orientation"
-            ],
-        )
-        rocket.power_off_drag *= generated_dict["power_off_drag_factor"]
-        rocket.power_on_drag *= generated_dict["power_on_drag_factor"]
-
-        for component_motor in self.motors:
-            motor, position_rnd = self._create_motor(component_motor)
-            rocket.add_motor(motor, position_rnd)
-
-        for component_surface in self.aerodynamic_surfaces:
-            surface, position_rnd = self._create_surface(component_surface)
-            rocket.add_surfaces(surface, position_rnd)
+        template = self._template or {"motors": [], "aerodynamic_surfaces": []}
+        components = {}
+        for key, create in (
+            ("motors", self._create_motor),
+            ("aerodynamic_surfaces", self._create_surface),
+        ):
+            cached = [(arguments, obj) for arguments, obj, _ in template[key]]
+            components[key] = [
+                create(component, cached[i] if i < len(cached) else None)
+                for i, component in enumerate(getattr(self, key))
+            ]
+
+        arguments = {key: generated_dict[key] for key in _ROCKET_ARGUMENTS}
+        if self._template is None or (
+            arguments["coordinate_system_orientation"]
+            != self._template["arguments"]["coordinate_system_orientation"]
+        ):
+            self._template = {
+                "arguments": arguments,
+                "rocket": self._build_rocket(arguments, components),
+            }
+            for key in components:
+                self._template[key] = [
+                    (
+                        {
+                            arg: value
+                            for arg, value in rnd_dict.items()
+                            if arg != "position"
+                        },
+                        *component,
+                    )
+                    for rnd_dict, component in zip(
+                        self.last_rnd_dict[key], components[key]
+                    )
+                ]
+        rocket = self._clone_template(arguments, components)
 
         for component_rail_buttons in self.rail_buttons:
             (
@@ -584,3 +775,80 @@ class StochasticRocket(StochasticModel):
             )
 
         return rocket
+
+    @staticmethod
+    def _build_rocket(arguments, components):
+        """Builds a Rocket with the given input arguments, motors and
+        aerodynamic surfaces, evaluating all of its derived quantities."""
+        rocket = Rocket(
+            radius=arguments["radius"],
+            mass=arguments["mass"],
+            inertia=(
+                arguments["I_11_without_motor"],
+                arguments["I_22_without_motor"],
+                arguments["I_33_without_motor"],
+                arguments["I_12_without_motor"],
+                arguments["I_13_without_motor"],
+                arguments["I_23_without_motor"],
+            ),
+            power_off_drag=arguments["power_off_drag"],
+            power_on_drag=arguments["power_on_drag"],
+            center_of_mass_without_motor=arguments["center_of_mass_without_motor"],
+            coordinate_system_orientation=arguments["coordinate_system_orientation"],
+        )
+        rocket.power_off_drag *= arguments["power_off_drag_factor"]
+        rocket.power_on_drag *= arguments["power_on_drag_factor"]
+
+        for motor, position in components["motors"]:
+            rocket.add_motor(motor, position)
+
+        if components["aerodynamic_surfaces"]:
+            surfaces, positions = zip(*components["aerodynamic_surfaces"])
+            rocket.add_surfaces(surfaces, positions)
+
+        rocket._evaluate_all()
+        return rocket
+
+    def _clone_template(self, arguments, components):
+        """Copies the template rocket, replacing the input arguments, motors
+        and aerodynamic surfaces that differ from the ones of the template."""
+        template = self._template["rocket"]
+        changed = {
+            arg
+            for arg, value in arguments.items()
+            if not _same_value(value, self._template["arguments"][arg])
+        }
+        for key in components:
+            if any(
+                obj is not template_obj or not _same_value(position, template_position)
+                for (obj, position), (_, template_obj, template_position) in zip(
+                    components[key], self._template[key]
+                )
+            ):
+                changed.add(key)
+
+        # Setting the inputs of the copy discards the quantities that depend
+        # on them, which are evaluated again when accessed
+        rocket = copy(template)
+        for arg in changed.intersection(_ROCKET_ATTRIBUTES):
+            setattr(rocket, arg, arguments[arg])
+        for drag in ("power_off_drag", "power_on_drag"):
+            if {drag, drag + "_factor"} & changed:
+                rocket_drag = Function(
+                    arguments[drag],
+                    "Mach Number",
+                    _DRAG_OUTPUTS[drag],
+                    "linear",
+                    "constant",
+                )
+                setattr(rocket, drag, rocket_drag * arguments[drag + "_factor"])
+
+        if "motors" in changed:
+            for motor, position in components["motors"]:
+                rocket._set_motor(motor, position)
+        if "aerodynamic_surfaces" in changed:
+            rocket.aerodynamic_surfaces = Components()
+            for surface, position in components["aerodynamic_surfaces"]:
+                rocket.aerodynamic_surfaces.add(surface, position)
+
+        return rocket
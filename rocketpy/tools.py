@@ -9,7 +9,6 @@ between minor versions if necessary, although this will be always avoided.
 import functools
 import importlib
 import importlib.metadata
-import math
 import re
 import time
 from bisect import bisect_left
@@ -283,36 +282,39 @@ def get_distribution(distribution_function_name):
 def haversine(lat0, lon0, lat1, lon1, earth_radius=6.3781e6):
     """Returns the distance between two points in meters.
     The points are defined by their latitude and longitude coordinates.
+    The coordinates may also be arrays, in which case the distances between
+    all the pairs of points are computed at once.
 
     Parameters
     ----------
-    lat0 : float
+    lat0 : float, array_like
         Latitude of the first point, in degrees.
-    lon0 : float
+    lon0 : float, array_like
         Longitude of the first point, in degrees.
-    lat1 : float
+    lat1 : float, array_like
         Latitude of the second point, in degrees.
-    lon1 : float
+    lon1 : float, array_like
         Longitude of the second point, in degrees.
     earth_radius : float, optional
         Earth's radius in meters. Default value is 6.3781e6.
 
     Returns
     -------
-    float
-        Distance between the two points in meters.
+    float, numpy.ndarray
+        Distance between the two points in meters. An array with the broadcast
+        shape of the coordinates is returned if any of them is an array.
 
     """
-    lat0_rad = math.radians(lat0)
-    lat1_rad = math.radians(lat1)
-    delta_lat_rad = math.radians(lat1 - lat0)
-    delta_lon_rad = math.radians(lon1 - lon0)
+    lat0_rad = np.deg2rad(lat0)
+    lat1_rad = np.deg2rad(lat1)
+    delta_lat_rad = np.deg2rad(np.subtract(lat1, lat0))
+    delta_lon_rad = np.deg2rad(np.subtract(lon1, lon0))
 
     a = (
-        math.sin(delta_lat_rad / 2) ** 2
-        + math.cos(lat0_rad) * math.cos(lat1_rad) * math.sin(delta_lon_rad / 2) ** 2
+        np.sin(delta_lat_rad / 2) ** 2
+        + np.cos(lat0_rad) * np.cos(lat1_rad) * np.sin(delta_lon_rad / 2) ** 2
     )
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
 
     return earth_radius * c
 
@@ -321,7 +323,8 @@ def inverted_haversine(lat0, lon0, distance, bearing, earth_radius=6.3781e6):
     """Returns a tuple with new latitude and longitude coordinates considering
     a displacement of a given distance in a given direction (bearing compass)
     starting from a point defined by (lat0, lon0). This is the opposite of
-    Haversine function.
+    Haversine function. The distances and bearings may also be arrays, in
+    which case the coordinates of all the points are computed at once.
 
     Parameters
     ----------
@@ -329,19 +332,19 @@ def inverted_haversine(lat0, lon0, distance, bearing, earth_radius=6.3781e6):
         Origin latitude coordinate, in degrees.
     lon0 : float
         Origin longitude coordinate, in degrees.
-    distance : float
+    distance : float, array_like
         Distance from the origin point, in meters.
-    bearing : float
-        Azimuth (or bearing compass) from the origin point, in degrees.
+    bearing : float, array_like
+        Azimuth (or bearing compass) from the origin point, in radians.
     earth_radius : float, optional
         Earth radius, in meters. Default value is 6.3781e6.
         See the Environment.calculateEarthRadius() function for more accuracy.
 
     Returns
     -------
-    lat1 : float
+    lat1 : float, numpy.ndarray
         New latitude coordinate, in degrees.
-    lon1 : float
+    lon1 : float, numpy.ndarray
         New longitude coordinate, in degrees.
 
     """
@@ -349,16 +352,17 @@ def inverted_haversine(lat0, lon0, distance, bearing, earth_radius=6.3781e6):
     # Convert coordinates to radians
     lat0_rad = np.deg2rad(lat0)
     lon0_rad = np.deg2rad(lon0)
+    angular_distance = np.divide(distance, earth_radius)
 
     # Apply inverted Haversine formula
-    lat1_rad = math.asin(
-        math.sin(lat0_rad) * math.cos(distance / earth_radius)
-        + math.cos(lat0_rad) * math.sin(distance / earth_radius) * math.cos(bearing)
+    lat1_rad = np.arcsin(
+        np.sin(lat0_rad) * np.cos(angular_distance)
+        + np.cos(lat0_rad) * np.sin(angular_distance) * np.cos(bearing)
     )
 
-    lon1_rad = lon0_rad + math.atan2(
-        math.sin(bearing) * math.sin(distance / earth_radius) * math.cos(lat0_rad),
-        math.cos(distance / earth_radius) - math.sin(lat0_rad) * math.sin(lat1_rad),
+    lon1_rad = lon0_rad + np.arctan2(
+        np.sin(bearing) * np.sin(angular_distance) * np.cos(lat0_rad),
+        np.cos(angular_distance) - np.sin(lat0_rad) * np.sin(lat1_rad),
     )
 
     # Convert back to degrees and then return
@@ -368,6 +372,45 @@ def inverted_haversine(lat0, lon0, distance, bearing, earth_radius=6.3781e6):
     return lat1_deg, lon1_deg
 
 
+def cartesian_to_geodesic(x, y, lat0, lon0, earth_radius=6.3781e6):
+    """Converts positions given in meters relative to an origin point, with x
+    pointing East and y pointing North, to latitude and longitude coordinates
+    by the inverted Haversine formula. The positions may be arrays, such as
+    whole trajectories or all the impact points of a Monte Carlo simulation,
+    in which case all of them are converted at once.
+
+    Parameters
+    ----------
+    x : float, array_like
+        Position in the East direction, in meters.
+    y : float, array_like
+        Position in the North direction, in meters.
+    lat0 : float
+        Origin latitude coordinate, in degrees.
+    lon0 : float
+        Origin longitude coordinate, in degrees.
+    earth_radius : float, optional
+        Earth radius, in meters. Default value is 6.3781e6.
+
+    Returns
+    -------
+    lat : float, numpy.ndarray
+        Latitude coordinates, in degrees.
+    lon : float, numpy.ndarray
+        Longitude coordinates, in degrees.
+
+    Examples
+    --------
+    >>> from rocketpy.tools import cartesian_to_geodesic
+    >>> lat, lon = cartesian_to_geodesic([0, 0], [0, 111318], 0, 0)
+    >>> lat.round(3).tolist(), lon.round(3).tolist()
+    ([0.0, 1.0], [0.0, 0.0])
+    """
+    distance = np.hypot(x, y)
+    bearing = np.arctan2(x, y)
+    return inverted_haversine(lat0, lon0, distance, bearing, earth_radius)
+
+
 # Functions for monte carlo analysis
 def generate_monte_carlo_ellipses(results):
     """A function to create apogee and impact ellipses from the monte carlo
@@ -514,6 +557,7 @@ def generate_monte_carlo_ellipses_coordinates(
         point in each ellipse.
     """
     outputs = [None] * len(ellipses)
+    theta = 2 * np.pi * np.arange(resolution) / resolution
 
     for index, ell in enumerate(ellipses):
         # Get ellipse path points
@@ -521,31 +565,19 @@ def generate_monte_carlo_ellipses_coordinates(
         width = ell.get_width()
         height = ell.get_height()
         angle = np.deg2rad(ell.get_angle())
-        points = lat_lon_points = [None] * resolution
 
         # Generate ellipse path points (in a Cartesian coordinate system)
-        for i in range(resolution):
-            x = width / 2 * math.cos(2 * np.pi * i / resolution)
-            y = height / 2 * math.sin(2 * np.pi * i / resolution)
-            x_rot = center[0] + x * math.cos(angle) - y * math.sin(angle)
-            y_rot = center[1] + x * math.sin(angle) + y * math.cos(angle)
-            points[i] = (x_rot, y_rot)
-        points = np.array(points)
+        x = width / 2 * np.cos(theta)
+        y = height / 2 * np.sin(theta)
+        x_rot = center[0] + x * np.cos(angle) - y * np.sin(angle)
+        y_rot = center[1] + x * np.sin(angle) + y * np.cos(angle)
 
         # Convert path points to lat/lon
-        for point in points:
-            x, y = point
-            # Convert to distance and bearing
-            d = math.sqrt((x**2 + y**2))
-            bearing = math.atan2(
-                x, y
-            )  # math.atan2 returns the angle in the range [-pi, pi]
-
-            lat_lon_points[i] = inverted_haversine(
-                origin_lat, origin_lon, d, bearing, earth_radius=6.3781e6
-            )
+        lat, lon = cartesian_to_geodesic(
+            x_rot, y_rot, origin_lat, origin_lon, earth_radius=6.3781e6
+        )
 
-        outputs[index] = lat_lon_points
+        outputs[index] = list(zip(lat.tolist(), lon.tolist()))
     return outputs
 
 
@@ -536,14 +536,8 @@ def apogee_by_mass(flight, min_mass, max_mass, points=10, plot=True):
     rocket = flight.rocket
 
     def apogee(mass):
-        # First we need to modify the rocket's mass and update values
+        # Changing the mass updates the quantities that depend on it
         rocket.mass = float(mass)
-        rocket.evaluate_total_mass()
-        rocket.evaluate_center_of_mass()
-        rocket.evaluate_reduced_mass()
-        rocket.evaluate_thrust_to_weight()
-        rocket.evaluate_center_of_pressure()
-        rocket.evaluate_static_margin()
         # Then we can run the flight simulation
         test_flight = Flight(
             rocket=rocket,
@@ -606,14 +600,8 @@ def liftoff_speed_by_mass(flight, min_mass, max_mass, points=10, plot=True):
     rocket = flight.rocket
 
     def liftoff_speed(mass):
-        # First we need to modify the rocket's mass and update values
+        # Changing the mass updates the quantities that depend on it
         rocket.mass = float(mass)
-        rocket.evaluate_total_mass()
-        rocket.evaluate_center_of_mass()
-        rocket.evaluate_reduced_mass()
-        rocket.evaluate_thrust_to_weight()
-        rocket.evaluate_center_of_pressure()
-        rocket.evaluate_static_margin()
         # Then we can run the flight simulation
         test_flight = Flight(
             rocket=rocket,
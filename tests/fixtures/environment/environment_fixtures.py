@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
 
+import netCDF4
+import numpy as np
 import pytest
 
 from rocketpy import Environment, EnvironmentAnalysis
@@ -73,6 +75,85 @@ def env_analysis():
     return env_analysis
 
 
+@pytest.fixture
+def era5_files(tmp_path):
+    """Factory of small ERA5-like surface and pressure level reanalysis files,
+    with random data on a 5 x 5 grid around 39.4° N, 8.3° W, every 3 hours.
+
+    Returns
+    -------
+    callable
+        Function that receives the name of the files, the first time, in
+        hours since 1900-01-01, the number of times and a random seed, and
+        returns the paths of the surface and pressure level files.
+    """
+
+    def make_files(name, first_time, times, seed=0):
+        rng = np.random.default_rng(seed)
+        time = first_time + 3 * np.arange(times)
+        levels = np.array([100, 200, 300, 500, 700, 850, 925, 1000])
+        heights = 44330 * (1 - (levels / 1013.25) ** 0.19)
+        grid = {
+            "latitude": [40.0, 39.75, 39.5, 39.25, 39.0],
+            "longitude": [-8.75, -8.5, -8.25, -8.0, -7.75],
+        }
+        surface = {
+            "u100": (0, 5),
+            "v100": (0, 5),
+            "u10": (0, 3),
+            "v10": (0, 3),
+            "t2m": (290, 5),
+            "cbh": (1500, 500),
+            "i10fg": (8, 3),
+            "sp": (95000, 500),
+            "tp": (0, 0.0005),
+            "z": (2000, 100),
+        }
+        files = []
+        for kind in ["surface", "pressure"]:
+            path = str(tmp_path / f"{name}_{kind}.nc")
+            with netCDF4.Dataset(path, "w") as dataset:
+                dataset.createDimension("time", None)
+                variable = dataset.createVariable("time", "i4", ("time",))
+                variable.units = "hours since 1900-01-01 00:00:00.0"
+                variable[:] = time
+                if kind == "pressure":
+                    dataset.createDimension("level", len(levels))
+                    dataset.createVariable("level", "i4", ("level",))[:] = levels
+                for axis, values in grid.items():
+                    dataset.createDimension(axis, len(values))
+                    dataset.createVariable(axis, "f4", (axis,))[:] = values
+                if kind == "surface":
+                    dimensions = ("time", "latitude", "longitude")
+                    for variable, (mean, std) in surface.items():
+                        data = mean + std * rng.standard_normal((times, 5, 5))
+                        if variable == "cbh":
+                            data = np.ma.masked_where(
+                                rng.random(data.shape) < 0.3, data
+                            )
+                        dataset.createVariable(
+                            variable, "f8", dimensions, fill_value=-32767.0
+                        )[:] = (np.abs(data) if variable == "tp" else data)
+                else:
+                    dimensions = ("time", "level", "latitude", "longitude")
+                    shape = (times, len(levels), 5, 5)
+                    profile = heights[None, :, None, None]
+                    fields = {
+                        "z": 9.80665 * (profile + 20 * rng.standard_normal(shape)),
+                        "t": 288
+                        - 0.0065 * np.minimum(profile, 11000)
+                        + 2 * rng.standard_normal(shape),
+                        "u": 5 + 5 * rng.standard_normal(shape),
+                        "v": 5 * rng.standard_normal(shape),
+                    }
+                    for variable, data in fields.items():
+                        dataset.createVariable(variable, "f8", dimensions)[:] = data
+            files.append(path)
+        return tuple(files)
+
+    return make_files
+
+
 @pytest.fixture
 def environment_spaceport_america_2023():
     """Creates an Environment object for Spaceport America with a 2023 launch
@@ -31,6 +31,7 @@ def monte_carlo_calisto(stochastic_environment, stochastic_calisto, stochastic_f
         environment=stochastic_environment,
         rocket=stochastic_calisto,
         flight=stochastic_flight,
+        seed=42,
     )
 
 
@@ -1,10 +1,11 @@
-import copy
 import os
+import shutil
 from unittest.mock import patch
 
 import matplotlib as plt
 import pytest
 
+from rocketpy import EnvironmentAnalysis
 from rocketpy.tools import import_optional_dependency
 
 plt.rcParams.update({"figure.max_open_warning": 0})
@@ -49,11 +50,10 @@ def test_exports(mock_show, env_analysis):
     assert env_analysis.export_mean_profiles() == None
     assert env_analysis.save("env_analysis_dict") == None
 
-    env2 = copy.deepcopy(env_analysis)
-    env2.load("env_analysis_dict")
+    env2 = EnvironmentAnalysis.load("env_analysis_dict")
     assert env2.all_info() == None
 
     # Delete file created by save method
-    os.remove("env_analysis_dict")
+    shutil.rmtree("env_analysis_dict")
     os.remove("wind_rose.gif")
     os.remove("export_env_analysis.json")
@@ -72,6 +72,40 @@ def test_savetxt(request, func):
     os.remove("test_func.csv")
 
 
+@pytest.mark.parametrize(
+    "func",
+    [
+        "linearly_interpolated_func",
+        "spline_interpolated_func",
+        "func_2d_from_csv",
+        "lambda_quad_func",
+    ],
+)
+def test_savenpy(request, func, tmp_path):
+    """Test the savenpy method of various Function objects, checking that the
+    Function memory mapped from the saved file has the same data, inputs and
+    outputs as the original one.
+    """
+    func = request.getfixturevalue(func)
+    filename = tmp_path / "test_func.npy"
+    func.savenpy(filename, lower=0, upper=9, samples=10)
+
+    read_func = Function(
+        filename,
+        interpolation="linear" if func.get_domain_dim() == 1 else "shepard",
+        extrapolation="natural",
+    )
+    if callable(func.source):
+        source = np.column_stack(
+            (np.linspace(0, 9, 10), func.source(np.linspace(0, 9, 10)))
+        )
+        assert np.allclose(source, read_func.source)
+    else:
+        assert np.array_equal(func.source, read_func.source)
+        assert read_func.__inputs__ == func.__inputs__
+        assert read_func.__outputs__ == func.__outputs__
+
+
 # Test Function creation from .csv file
 def test_function_from_csv(func_from_csv, func_2d_from_csv):
     """Test the Function class creation from a .csv file.
@@ -1,10 +1,15 @@
 import os
+import shutil
 from unittest.mock import patch
 
 import matplotlib as plt
 import numpy as np
 import pytest
 
+from rocketpy import MonteCarlo
+from rocketpy.simulation import monte_carlo as monte_carlo_module
+from rocketpy.simulation.columnar_store import ColumnarStore
+
 plt.rcParams.update({"figure.max_open_warning": 0})
 
 
@@ -18,8 +23,13 @@ def test_monte_carlo_simulate(monte_carlo_calisto):
         The MonteCarlo object, this is a pytest fixture.
     """
     # NOTE: this is really slow, it runs 10 flight simulations
+    np.random.seed(42)
+    expected_random_number = np.random.random()
+    np.random.seed(42)
     monte_carlo_calisto.simulate(number_of_simulations=10, append=False)
 
+    # The global random state of the caller is kept
+    assert np.random.random() == expected_random_number
     assert monte_carlo_calisto.num_of_loaded_sims == 10
     assert monte_carlo_calisto.number_of_simulations == 10
     assert monte_carlo_calisto.filename == "monte_carlo_test"
@@ -38,6 +48,197 @@ def test_monte_carlo_simulate(monte_carlo_calisto):
     os.remove("monte_carlo_test.inputs.txt")
 
 
+@pytest.mark.slow
+def test_monte_carlo_simulate_in_parallel(monte_carlo_calisto):
+    """Tests the simulate method of the MonteCarlo class running the
+    simulations in more than one process.
+
+    Parameters
+    ----------
+    monte_carlo_calisto : MonteCarlo
+        The MonteCarlo object, this is a pytest fixture.
+    """
+    monte_carlo_calisto.simulate(number_of_simulations=4, append=False, n_workers=2)
+
+    assert monte_carlo_calisto.num_of_loaded_sims == 4
+    assert len(monte_carlo_calisto.inputs_log) == 4
+    # Different workers must not draw the same samples
+    assert len({str(inputs) for inputs in monte_carlo_calisto.inputs_log}) == 4
+    parallel_outputs = monte_carlo_calisto.outputs_log
+
+    # Parallel and sequential runs with the same seed must match exactly
+    monte_carlo_calisto.simulate(number_of_simulations=4, append=False)
+    assert monte_carlo_calisto.outputs_log == parallel_outputs
+    assert np.isclose(
+        monte_carlo_calisto.processed_results["apogee"][0], 4711, rtol=0.15
+    )
+    os.remove("monte_carlo_test.errors.txt")
+    os.remove("monte_carlo_test.outputs.txt")
+    os.remove("monte_carlo_test.inputs.txt")
+
+
+@pytest.mark.slow
+def test_monte_carlo_simulate_with_sampler(monte_carlo_calisto):
+    """Tests the simulate method of the MonteCarlo class drawing the inputs
+    from a quasi-Monte Carlo sampling design.
+
+    Parameters
+    ----------
+    monte_carlo_calisto : MonteCarlo
+        The MonteCarlo object, this is a pytest fixture.
+    """
+    monte_carlo_calisto.sampler = "sobol"
+    monte_carlo_calisto.simulate(number_of_simulations=4, append=False)
+
+    assert monte_carlo_calisto.num_of_loaded_sims == 4
+    assert len({str(inputs) for inputs in monte_carlo_calisto.inputs_log}) == 4
+    assert np.isclose(
+        monte_carlo_calisto.processed_results["apogee"][0], 4711, rtol=0.15
+    )
+    os.remove("monte_carlo_test.errors.txt")
+    os.remove("monte_carlo_test.outputs.txt")
+    os.remove("monte_carlo_test.inputs.txt")
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("n_workers", [None, 2])
+def test_monte_carlo_simulate_with_stop_condition(monte_carlo_calisto, n_workers):
+    """Tests that the simulate method of the MonteCarlo class stops once the
+    stop condition is met, with the statistics of the completed simulations.
+
+    Parameters
+    ----------
+    monte_carlo_calisto : MonteCarlo
+        The MonteCarlo object, this is a pytest fixture.
+    n_workers : int
+        Number of worker processes.
+    """
+    updated_statistics = []
+
+    def stop_condition(statistics):
+        updated_statistics.append(statistics)
+        return statistics.count >= 3
+
+    monte_carlo_calisto.simulate(
+        number_of_simulations=10, n_workers=n_workers, stop_condition=stop_condition
+    )
+
+    assert monte_carlo_calisto.num_of_loaded_sims == 3
+    # The statistics updated during the simulation are kept
+    assert monte_carlo_calisto.statistics is updated_statistics[-1]
+    assert monte_carlo_calisto.statistics.count == 3
+    assert np.isclose(
+        monte_carlo_calisto.statistics.mean("apogee"),
+        np.mean(monte_carlo_calisto.results["apogee"]),
+    )
+    os.remove("monte_carlo_test.errors.txt")
+    os.remove("monte_carlo_test.outputs.txt")
+    os.remove("monte_carlo_test.inputs.txt")
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("n_workers", [None, 2])
+def test_monte_carlo_simulate_with_failures(monte_carlo_calisto, n_workers):
+    """Tests that iterations exceeding their budget of function evaluations
+    are retried, saved as error records and counted, without stopping the
+    simulation.
+
+    Parameters
+    ----------
+    monte_carlo_calisto : MonteCarlo
+        The MonteCarlo object, this is a pytest fixture.
+    n_workers : int
+        Number of worker processes.
+    """
+    monte_carlo_calisto.simulate(
+        number_of_simulations=3,
+        n_workers=n_workers,
+        max_function_evaluations=10,
+        retries=1,
+    )
+
+    assert monte_carlo_calisto.number_of_failures == 3
+    errors = monte_carlo_calisto.errors_log
+    assert [error["iteration"] for error in errors] == [0, 1, 2]
+    for error in errors:
+        assert error["seed"] == monte_carlo_calisto.seed
+        assert error["attempts"] == 2
+        assert error["error"].startswith("RuntimeError")
+        assert error["inputs"]
+
+    with pytest.raises(RuntimeError) as error:
+        monte_carlo_calisto.simulate(
+            number_of_simulations=3,
+            n_workers=n_workers,
+            max_function_evaluations=10,
+            on_error="raise",
+        )
+    # The error raised by the flight is kept as the cause
+    assert isinstance(error.value.__cause__, RuntimeError)
+    assert monte_carlo_calisto.number_of_failures == 1
+    os.remove("monte_carlo_test.errors.txt")
+    os.remove("monte_carlo_test.outputs.txt")
+    os.remove("monte_carlo_test.inputs.txt")
+
+
+@pytest.mark.slow
+def test_monte_carlo_simulate_append(monte_carlo_calisto):
+    """Tests that resuming a simulation with append=True runs the same
+    iterations as a single run with the same seed.
+
+    Parameters
+    ----------
+    monte_carlo_calisto : MonteCarlo
+        The MonteCarlo object, this is a pytest fixture.
+    """
+    monte_carlo_calisto.simulate(number_of_simulations=5, append=False)
+    inputs_log = monte_carlo_calisto.inputs_log
+    outputs_log = monte_carlo_calisto.outputs_log
+
+    monte_carlo_calisto.simulate(number_of_simulations=3, append=False)
+    monte_carlo_calisto.simulate(number_of_simulations=5, append=True)
+
+    assert monte_carlo_calisto.num_of_loaded_sims == 5
+    assert monte_carlo_calisto.inputs_log == inputs_log
+    assert monte_carlo_calisto.outputs_log == outputs_log
+    os.remove("monte_carlo_test.errors.txt")
+    os.remove("monte_carlo_test.outputs.txt")
+    os.remove("monte_carlo_test.inputs.txt")
+
+
+@pytest.mark.slow
+def test_monte_carlo_simulate_interrupted(monte_carlo_calisto):
+    """Tests that interrupting a simulation keeps the completed iterations and
+    saves the interrupted one to the error file.
+
+    Parameters
+    ----------
+    monte_carlo_calisto : MonteCarlo
+        The MonteCarlo object, this is a pytest fixture.
+    """
+    create_flight = monte_carlo_module._create_flight
+
+    def interrupt_second_iteration(*args, **kwargs):
+        if args[4] == 1:
+            raise KeyboardInterrupt
+        return create_flight(*args, **kwargs)
+
+    with patch.object(monte_carlo_module, "_create_flight", interrupt_second_iteration):
+        monte_carlo_calisto.simulate(number_of_simulations=3)
+
+    assert monte_carlo_calisto.num_of_loaded_sims == 1
+    assert monte_carlo_calisto.number_of_failures == 1
+    (error,) = monte_carlo_calisto.errors_log
+    assert error["iteration"] == 1
+    assert error["seed"] == monte_carlo_calisto.seed
+    assert error["error"] == "KeyboardInterrupt"
+    assert error["inputs"]
+    assert error["inputs"] != monte_carlo_calisto.inputs_log[0]
+    os.remove("monte_carlo_test.errors.txt")
+    os.remove("monte_carlo_test.outputs.txt")
+    os.remove("monte_carlo_test.inputs.txt")
+
+
 def test_monte_carlo_set_inputs_log(monte_carlo_calisto):
     """Tests the set_inputs_log method of the MonteCarlo class.
 
@@ -74,6 +275,71 @@ def test_monte_carlo_set_outputs_log(monte_carlo_calisto):
     )
 
 
+@pytest.mark.slow
+def test_monte_carlo_simulate_columnar_logs(
+    stochastic_environment, stochastic_calisto, stochastic_flight
+):
+    """Tests the simulate method of the MonteCarlo class saving the inputs
+    and outputs in the columnar format.
+
+    Parameters
+    ----------
+    stochastic_environment : StochasticEnvironment
+        The stochastic environment object, this is a pytest fixture.
+    stochastic_calisto : StochasticRocket
+        The stochastic rocket object, this is a pytest fixture.
+    stochastic_flight : StochasticFlight
+        The stochastic flight object, this is a pytest fixture.
+    """
+    monte_carlo_calisto = MonteCarlo(
+        filename="monte_carlo_test",
+        environment=stochastic_environment,
+        rocket=stochastic_calisto,
+        flight=stochastic_flight,
+        log_format="columnar",
+    )
+    monte_carlo_calisto.simulate(number_of_simulations=2, append=False)
+    monte_carlo_calisto.simulate(number_of_simulations=3, append=True)
+
+    assert monte_carlo_calisto.output_file == "monte_carlo_test.outputs"
+    assert monte_carlo_calisto.num_of_loaded_sims == 3
+    assert len(monte_carlo_calisto.inputs_log) == 3
+    assert len(monte_carlo_calisto.results["apogee"]) == 3
+    assert np.isclose(
+        monte_carlo_calisto.processed_results["apogee"][0], 4711, rtol=0.15
+    )
+
+    # The logs mapped from the previous simulation are released and replaced
+    monte_carlo_calisto.simulate(number_of_simulations=1, append=False)
+    assert monte_carlo_calisto.num_of_loaded_sims == 1
+    assert len(monte_carlo_calisto.inputs_log) == 1
+    assert len(monte_carlo_calisto.results["apogee"]) == 1
+    for log_name in ("inputs", "outputs", "errors"):
+        shutil.rmtree(f"monte_carlo_test.{log_name}", ignore_errors=True)
+
+
+def test_monte_carlo_import_columnar_results(monte_carlo_calisto, tmp_path):
+    """Tests that text logs converted to the columnar format are imported
+    with the same results.
+
+    Parameters
+    ----------
+    monte_carlo_calisto : MonteCarlo
+        The MonteCarlo object, this is a pytest fixture.
+    """
+    monte_carlo_calisto.import_outputs("tests/fixtures/monte_carlo/example.outputs.txt")
+    text_outputs_log = monte_carlo_calisto.outputs_log
+    text_apogee = monte_carlo_calisto.processed_results["apogee"]
+
+    ColumnarStore.from_text(
+        "tests/fixtures/monte_carlo/example.outputs.txt", tmp_path / "example.outputs"
+    )
+    monte_carlo_calisto.import_outputs(str(tmp_path / "example"))
+    assert monte_carlo_calisto.num_of_loaded_sims == 100
+    assert monte_carlo_calisto.outputs_log == text_outputs_log
+    assert np.allclose(monte_carlo_calisto.processed_results["apogee"], text_apogee)
+
+
 # def test_monte_carlo_set_errors_log(monte_carlo_calisto):
 #     monte_carlo_calisto.error_file = "tests/fixtures/monte_carlo/example.errors.txt"
 #     monte_carlo_calisto.set_errors_log()
@@ -1,3 +1,5 @@
+import pytest
+
 from rocketpy.rocket.rocket import Rocket
 
 
@@ -23,3 +25,78 @@ def test_create_object(stochastic_calisto):
     """
     obj = stochastic_calisto.create_object()
     assert isinstance(obj, Rocket)
+
+
+def test_set_random_number_generator(stochastic_calisto):
+    """Test that seeding the random number generator of the StochasticRocket
+    reproduces the random inputs of the rocket and of its components.
+
+    Parameters
+    ----------
+    stochastic_calisto : StochasticCalisto
+        StochasticCalisto object to be tested.
+    """
+    stochastic_calisto.set_random_number_generator(42)
+    stochastic_calisto.create_object()
+    first_inputs = str(stochastic_calisto.last_rnd_dict)
+
+    stochastic_calisto.set_random_number_generator(42)
+    stochastic_calisto.create_object()
+    assert str(stochastic_calisto.last_rnd_dict) == first_inputs
+
+    stochastic_calisto.set_random_number_generator(43)
+    stochastic_calisto.create_object()
+    assert str(stochastic_calisto.last_rnd_dict) != first_inputs
+
+
+def _rocket_values(rocket):
+    return [
+        rocket.area,
+        rocket.dry_mass,
+        rocket.total_mass(1),
+        rocket.center_of_mass(1),
+        rocket.I_11(1),
+        rocket.I_33(1),
+        rocket.cp_position(0.3),
+        rocket.static_margin(0),
+        rocket.stability_margin(0.5, 1),
+        rocket.power_off_drag(0.5),
+        rocket.power_on_drag(0.5),
+        rocket.com_to_cdm_function(1),
+        rocket.nozzle_gyration_tensor[0][0],
+        len(rocket.aerodynamic_surfaces),
+        len(rocket.rail_buttons),
+        len(rocket.parachutes),
+    ]
+
+
+def test_create_object_from_template(stochastic_calisto):
+    """Test that the rockets copied from the template of the StochasticRocket
+    are equal to rockets built from scratch with the same input arguments, and
+    that creating them does not modify the rockets created before.
+
+    Parameters
+    ----------
+    stochastic_calisto : StochasticCalisto
+        StochasticCalisto object to be tested.
+    """
+    stochastic_calisto.set_random_number_generator(42)
+    first_rocket = stochastic_calisto.create_object()
+    first_values = _rocket_values(first_rocket)
+
+    for _ in range(3):
+        rocket = stochastic_calisto.create_object()
+        arguments = stochastic_calisto.last_rnd_dict
+        reference = stochastic_calisto._build_rocket(
+            arguments,
+            {
+                "motors": [(rocket.motor, rocket.motor_position)],
+                "aerodynamic_surfaces": list(rocket.aerodynamic_surfaces),
+            },
+        )
+        for component in rocket.rail_buttons:
+            reference.rail_buttons.add(component.component, component.position)
+        reference.parachutes = rocket.parachutes
+        assert _rocket_values(rocket) == pytest.approx(_rocket_values(reference))
+
+    assert _rocket_values(first_rocket) == first_values
@@ -0,0 +1,133 @@
+import json
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from rocketpy.mathutils.shared_array import SharedArray
+from rocketpy.simulation.columnar_store import ColumnarStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Creates a ColumnarStore with 5 rows split into chunks of 2 rows."""
+    store = ColumnarStore(tmp_path / "example.outputs", chunk_size=2)
+    for i in range(5):
+        store.append(
+            {
+                "apogee": 1000.0 + i,
+                "index": i,
+                "success": i % 2 == 0,
+                "events": [[i, "drogue"]],
+            }
+        )
+    store.close()
+    return store
+
+
+def test_columnar_store_rows(store):
+    """Tests that the rows of a ColumnarStore are read back with the same
+    values and types, and that the rows are split into chunks."""
+    assert len(store.chunks) == 3
+    assert len(store) == 5
+    assert store.columns == ["apogee", "index", "success", "events"]
+    assert store.rows()[3] == {
+        "apogee": 1003.0,
+        "index": 3,
+        "success": False,
+        "events": [[3, "drogue"]],
+    }
+
+
+def test_columnar_store_column(store):
+    """Tests that the numeric columns of a ColumnarStore are read as arrays,
+    memory mapped when the store has a single chunk."""
+    assert np.array_equal(store.column("apogee"), 1000.0 + np.arange(5))
+    assert store.column("index").dtype == np.int64
+    assert store.column("events")[4] == [[4, "drogue"]]
+
+    store.compact()
+    assert len(store.chunks) == 1
+    apogee = store.column("apogee")
+    assert isinstance(apogee, SharedArray)
+    assert np.array_equal(apogee, 1000.0 + np.arange(5))
+    assert store.rows()[4]["events"] == [[4, "drogue"]]
+
+
+def test_columnar_store_missing_values(tmp_path):
+    """Tests that missing and null values are read back as NaN in numeric
+    columns and as None in the rows."""
+    store = ColumnarStore(tmp_path / "store", chunk_size=2)
+    store.append({"apogee": 1000.0, "x_impact": None})
+    store.append({"apogee": 1001.0})
+    store.append({"apogee": 1002.0, "x_impact": 5.0, "y_impact": 1.0})
+    store.close()
+
+    x_impact = store.column("x_impact")
+    assert np.isnan(x_impact[:2]).all() and x_impact[2] == 5.0
+    assert np.isnan(store.column("y_impact")[:2]).all()
+    assert store.rows()[1] == {"apogee": 1001.0, "x_impact": None}
+
+
+def test_columnar_store_write_and_append(tmp_path):
+    """Tests that JSON lines written to a ColumnarStore are committed when it
+    is closed, that partially written chunks are ignored and that rows can be
+    appended by reopening the store."""
+    path = tmp_path / "store"
+    store = ColumnarStore(path)
+    store.write(json.dumps({"apogee": 1.0}) + "\n" + '{"apogee": ')
+    store.write("2.0}\n")
+    assert len(store) == 0
+    store.close()
+    assert len(store) == 2
+
+    os.makedirs(path / "chunk_00000001.tmp")
+    with ColumnarStore(path) as reopened:
+        reopened.append({"apogee": 3.0})
+    assert ColumnarStore(path).column("apogee").tolist() == [1.0, 2.0, 3.0]
+
+
+def test_columnar_store_text_conversion(store, tmp_path):
+    """Tests the conversion of a ColumnarStore to and from text files with one
+    JSON object per line."""
+    text_file = tmp_path / "example.outputs.txt"
+    store.to_text(text_file)
+    with open(text_file, encoding="utf-8") as file:
+        assert json.loads(file.readlines()[1])["events"] == [[1, "drogue"]]
+
+    converted = ColumnarStore.from_text(text_file, tmp_path / "converted")
+    assert converted.rows() == store.rows()
+
+
+def test_columnar_store_lazy_rows(store):
+    """Tests that the lazy rows of a ColumnarStore are decoded on access with
+    the same values as the list of rows, and that JSON values are stored as
+    variable length bytes."""
+    rows = store.rows(lazy=True)
+    assert len(rows) == 5
+    assert rows[-2] == store.rows()[3]
+    assert rows[1:3] == store.rows()[1:3]
+    assert rows == store.rows()
+    with pytest.raises(IndexError):
+        rows[5]
+
+    events = np.load(os.path.join(store.chunks[0], "3.npy"))
+    offsets = np.load(os.path.join(store.chunks[0], "3.offsets.npy"))
+    assert events.dtype == np.uint8
+    assert events[offsets[1] : offsets[2]].tobytes() == b'[[1, "drogue"]]'
+
+
+def test_columnar_store_clear(store):
+    """Tests that clearing a store deletes its rows, and that a failure to
+    delete its files is raised instead of leaving old chunks behind."""
+    with patch("shutil.rmtree", side_effect=PermissionError):
+        with pytest.raises(PermissionError):
+            store.clear()
+    assert len(store) == 5
+
+    store.clear()
+    assert len(store) == 0
+    assert not os.path.exists(store.path)
+    # Clearing a store that does not exist does nothing
+    store.clear()
@@ -7,7 +7,9 @@ import numpy.ma as ma
 import pytest
 import pytz
 
-from rocketpy import Environment
+from rocketpy import Environment, Flight
+from rocketpy.environment import WeatherCache
+from rocketpy.environment.weather_slab import read_slab
 
 
 @pytest.mark.parametrize(
@@ -105,6 +107,24 @@ def test_utm_to_geodesic_converts_coordinates():
     assert np.isclose(lon, -106.9750, atol=1e-5) == True
 
 
+def test_geodesic_utm_conversions_accept_arrays():
+    """Tests that arrays of coordinates are converted between geodesic and
+    UTM coordinates at once, with the same results as point by point."""
+    lat = np.array([32.990254, -21.96, 45.0, -10.0, 10.0])
+    lon = np.array([-106.974998, -47.33, 3.0, -3.0, 0.0])
+    converted = Environment.geodesic_to_utm(lat, lon)
+    for i in range(len(lat)):
+        expected = Environment.geodesic_to_utm(lat[i], lon[i])
+        assert [value[i] for value in converted] == list(expected)
+
+    x, y, utm_zone, _, hemis, _ = converted
+    lat_back, lon_back = Environment.utm_to_geodesic(x, y, utm_zone, hemis)
+    for i in range(len(lat)):
+        expected = Environment.utm_to_geodesic(x[i], y[i], utm_zone[i], hemis[i])
+        assert (lat_back[i], lon_back[i]) == expected
+    assert np.allclose(lat_back, lat) and np.allclose(lon_back, lon)
+
+
 @pytest.mark.parametrize(
     "latitude, theoretical_radius",
     [(0, 6378137.0), (90, 6356752.31424518), (-90, 6356752.31424518)],
@@ -277,10 +297,10 @@ def test_environment_export_environment_exports_valid_environment_json(
             example_spaceport_env.pressure.get_source()(example_spaceport_env.height)
         ).tolist()
     )
-    assert (
+    heights, temperatures = np.array(
         exported_env["atmospheric_model_temperature_profile"]
-        == ma.getdata(example_spaceport_env.temperature.get_source()).tolist()
-    )
+    ).T
+    assert np.allclose(temperatures, example_spaceport_env.temperature(heights))
     assert (
         exported_env["atmospheric_model_wind_velocity_x_profile"]
         == ma.getdata(
@@ -299,3 +319,420 @@ def test_environment_export_environment_exports_valid_environment_json(
     )
 
     os.remove("environment.json")
+
+
+def test_select_ensemble_member_uses_cached_atmospheres():
+    """Tests that activating an ensemble member again reuses its cached
+    atmosphere, which matches the one built from scratch, and that the cache
+    keeps at most ``ensemble_cache_size`` members."""
+    env = Environment(date=(2019, 8, 10, 21), latitude=-23.36, longitude=-48.01)
+    env.set_atmospheric_model(
+        type="Ensemble",
+        file="data/weather/LASC2019_TATUI_reanalysis_ensemble.nc",
+        dictionary="ECMWF",
+    )
+    env.ensemble_cache_size = 3
+
+    for member in range(4):
+        env.select_ensemble_member(member)
+    assert list(env._ensemble_atmospheres) == [1, 2, 3]
+
+    cached_temperature = env.temperature
+    env.select_ensemble_member(1)
+    env.select_ensemble_member(3)
+    assert env.temperature is cached_temperature
+    assert env.ensemble_member == 3
+    assert list(env._ensemble_atmospheres) == [2, 1, 3]
+
+    cached_values = [env.density(1000), env.speed_of_sound(1000), env.wind_speed(2000)]
+    env._ensemble_atmospheres.clear()
+    env.select_ensemble_member(3)
+    assert env.temperature is not cached_temperature
+    assert [
+        env.density(1000),
+        env.speed_of_sound(1000),
+        env.wind_speed(2000),
+    ] == pytest.approx(cached_values)
+
+
+def test_atmosphere_table_matches_atmospheric_functions(example_plain_env):
+    """Tests that the atmosphere table gives the same values as the
+    Functions of the atmospheric quantities, and that it is rebuilt once any
+    of them is replaced.
+
+    Parameters
+    ----------
+    example_plain_env : rocketpy.Environment
+        Example environment object to be tested.
+    """
+    env = example_plain_env
+    env.set_atmospheric_model(
+        type="custom_atmosphere",
+        pressure=[(0, 101325), (3000, 70000), (20000, 5000)],
+        temperature=[(0, 300), (5000, 260), (11000, 216), (30000, 230)],
+        wind_u=[(0, 5), (1000, 10), (5000, 20), (10000, 15)],
+        wind_v=[(0, -3), (3000, 2), (10000, 8)],
+    )
+    altitudes = np.concatenate(
+        [np.linspace(-3000, 90000, 2001), env.atmosphere_table.grid]
+    )
+
+    states = env.atmosphere_table.get_states(altitudes)
+    for column, name in enumerate(env.atmosphere_table.columns):
+        function = getattr(env, name)
+        expected = [function.get_value_opt(z) for z in altitudes]
+        assert np.allclose(states[:, column], expected, rtol=1e-12, atol=1e-12)
+        assert np.allclose(
+            [env.atmosphere_table.get_state(z)[column] for z in altitudes[::50]],
+            expected[::50],
+            rtol=1e-12,
+            atol=1e-12,
+        )
+
+    table = env.atmosphere_table
+    env.add_wind_gust(2, 0)
+    assert env.atmosphere_table is not table
+    assert env.atmosphere_table.get_wind_velocity(1000) == pytest.approx([12, -4 / 3])
+
+
+def test_standard_atmosphere_closed_form(example_plain_env):
+    """Tests that the International Standard Atmosphere is evaluated in
+    closed form, with the same values for single altitudes and for arrays of
+    them, and that the atmosphere table uses its closed-form model.
+
+    Parameters
+    ----------
+    example_plain_env : rocketpy.Environment
+        Example environment object to be tested.
+    """
+    env = example_plain_env
+    isa = env.standard_atmosphere
+    # Values of the ISO 2533 tables, at geometric heights, which differ
+    # slightly due to the Earth radius used in the conversion of heights
+    heights = np.array([0, 5000, 11000, 25000, 50000])
+    assert isa.temperature(heights) == pytest.approx(
+        [288.15, 255.676, 216.774, 221.552, 270.65], rel=1e-5
+    )
+    assert isa.pressure(heights) == pytest.approx(
+        [101325, 54048.3, 22699.9, 2549.22, 79.7787], rel=2e-4
+    )
+    assert isa.barometric_height(isa.pressure(heights)) == pytest.approx(heights)
+
+    altitudes = np.linspace(-3000, 90000, 501)
+    states = isa.get_states(altitudes)
+    assert states.shape == (501, 5)
+    for z, state in zip(altitudes[::25], states[::25]):
+        assert isa.get_state(z) == pytest.approx(state, rel=1e-13)
+    for column, name in enumerate(isa.columns):
+        assert getattr(isa, name)(altitudes) == pytest.approx(states[:, column])
+        assert getattr(env, name).get_value_opt(1000.0) == getattr(isa, name)(1000.0)
+
+    table_states = env.atmosphere_table.get_states(altitudes)
+    positions = [env.atmosphere_table.columns.index(name) for name in isa.columns]
+    assert np.allclose(table_states[:, positions], states, rtol=1e-13, atol=0)
+
+
+def test_time_varying_forecast_atmosphere(tmp_path, calisto_robust):
+    """Tests that a Forecast set with ``time_varying=True`` loads the fields
+    around the launch as a ForecastCube, which matches the profiles at the
+    launch site and time, varies in time and space, and is used by Flight.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory where the forecast file is written.
+    calisto_robust : rocketpy.Rocket
+        Example rocket to be flown.
+    """
+    netCDF4 = pytest.importorskip("netCDF4")
+    file = str(tmp_path / "forecast.nc")
+    hours, latitudes = [0, 1, 2, 3], [-22, -23, -24, -25]
+    longitudes, levels = [-49, -48, -47, -46], [1000, 850, 500, 200]
+    shape = (len(hours), len(levels), len(latitudes), len(longitudes))
+    geopotential_heights = np.array([100, 1500, 5800, 11800])[None, :, None, None]
+    with netCDF4.Dataset(file, "w") as dataset:
+        for name, values in [
+            ("time", hours),
+            ("level", levels),
+            ("latitude", latitudes),
+            ("longitude", longitudes),
+        ]:
+            dataset.createDimension(name, len(values))
+            dataset.createVariable(name, "f8", (name,))[:] = values
+        dataset["time"].units = "hours since 2000-01-01 00:00:00"
+        dimensions = ("time", "level", "latitude", "longitude")
+        for name, values in [
+            ("z", 9.80665 * np.broadcast_to(geopotential_heights, shape)),
+            ("t", np.broadcast_to([290, 280, 255, 220], shape[::-1]).T),
+            ("u", np.broadcast_to(np.arange(4)[:, None, None, None] * 5.0, shape)),
+            ("v", np.broadcast_to(np.array(latitudes)[:, None], shape)),
+        ]:
+            dataset.createVariable(name, "f8", dimensions)[:] = values
+
+    env = Environment(date=(2000, 1, 1, 0), latitude=-23.5, longitude=-47.5)
+    with pytest.raises(ValueError):
+        env.set_atmospheric_model(type="standard_atmosphere", time_varying=True)
+    env.set_atmospheric_model(
+        type="Reanalysis", file=file, dictionary="ECMWF", time_varying=True
+    )
+    cube = env.forecast_cube
+    assert cube.time.tolist() == [0, 3600]
+    assert cube.fields.flags["C_CONTIGUOUS"]
+
+    # At the launch site and time, the cube matches the profiles
+    for z in [500, 3000, 9000]:
+        state = cube.get_state(0, 0, 0, z)
+        expected = [getattr(env, name)(z) for name in env.atmosphere_table.columns]
+        assert state == pytest.approx(expected, rel=1e-9)
+    # Wind velocities vary in time and with the northing
+    assert cube.get_wind_velocity(1800, 0, 0, 3000) == pytest.approx([2.5, -23.5])
+    assert cube.get_wind_velocity(3600, 0, 55000, 3000) == pytest.approx(
+        [5, -23.5 + 55000 / np.radians(env.earth_radius)]
+    )
+    points = ([0, 1800, 5000], [0, 1000, -2000], [0, 50000, 3000], [500, 3000, 9000])
+    states = cube.get_states(*points)
+    assert states.shape == (3, 8)
+    for state, point in zip(states, zip(*points)):
+        assert state == pytest.approx(cube.get_state(*point))
+
+    # Later changes of the gravity and wind gusts reach the cube
+    env.gravity = env.set_gravity_model(9.7)
+    env.add_wind_gust(2, lambda h: h / 1000)
+    assert cube.get_state(0, 0, 0, 3000)[4] == 9.7
+    assert cube.get_wind_velocity(1800, 0, 0, 3000) == pytest.approx([4.5, -20.5])
+    for z in [500, 3000, 9000]:
+        state = cube.get_state(0, 0, 0, z)
+        expected = [getattr(env, name)(z) for name in env.atmosphere_table.columns]
+        assert state == pytest.approx(expected, rel=1e-9)
+    states = cube.get_states(*points)
+    for state, point in zip(states, zip(*points)):
+        assert state == pytest.approx(cube.get_state(*point))
+
+    flight = Flight(
+        rocket=calisto_robust, environment=env, rail_length=5.2, inclination=85
+    )
+    for t in [10, 100, flight.t_final]:
+        assert flight.wind_velocity_y(t) == pytest.approx(
+            cube.get_wind_velocity(t, flight.x(t), flight.y(t), flight.z(t))[1],
+            rel=1e-3,
+        )
+
+
+def test_terrain_grid_and_terrain_aware_impact(
+    tmp_path, calisto_robust, monte_carlo_calisto_pre_loaded
+):
+    """Tests that the topographic profile is stored as a TerrainGrid, which
+    interpolates the elevation bilinearly for single points and arrays of
+    points, and that Flight detects the impact against the terrain.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory where the topographic file is written.
+    calisto_robust : rocketpy.Rocket
+        Example rocket to be flown.
+    monte_carlo_calisto_pre_loaded : rocketpy.MonteCarlo
+        Example Monte Carlo simulation with imported results.
+    """
+    netCDF4 = pytest.importorskip("netCDF4")
+    file = str(tmp_path / "terrain.nc")
+    # Terrain rising 2000 m per degree of longitude, in descending latitudes
+    latitudes = np.linspace(-32.8, -33.2, 41)
+    longitudes = np.linspace(-107.2, -106.8, 41)
+    elevations = np.broadcast_to(1400 + 2000 * (longitudes + 107), (41, 41))
+    with netCDF4.Dataset(file, "w") as dataset:
+        for name, values in [("lat", latitudes), ("lon", longitudes)]:
+            dataset.createDimension(name, len(values))
+            dataset.createVariable(name, "f8", (name,))[:] = values
+        dataset.createVariable("NASADEM_HGT", "f8", ("lat", "lon"))[:] = elevations
+
+    env = Environment(latitude=-33, longitude=-107, elevation=1400)
+    env.set_topographic_profile(type="NASADEM_HGT", file=file)
+    terrain = env.terrain
+    assert terrain.latitude[0] < terrain.latitude[-1]
+    assert terrain.get_elevation(-32.9, -106.95) == pytest.approx(1500)
+    assert terrain.get_elevations(
+        [-32.9, -33.1], [-107.05, -106.8]
+    ).tolist() == pytest.approx([1300, 1800])
+    with pytest.raises(ValueError):
+        terrain.get_elevation(-32, -107)
+    with pytest.raises(ValueError):
+        terrain.get_elevations([-33, -33], [-107, -100])
+
+    # Positions relative to the launch site, one at a time or at once
+    x, y = np.array([0, 1000, -3000]), np.array([0, 2000, 500])
+    elevations = env.get_terrain_elevation(x, y)
+    assert elevations[0] == pytest.approx(1400)
+    assert elevations[1] > 1400 > elevations[2]
+    for i in range(3):
+        assert env.get_terrain_elevation(x[i], y[i]) == pytest.approx(elevations[i])
+
+    # The impact is found against the terrain, not the launch site elevation
+    flight = Flight(
+        rocket=calisto_robust,
+        environment=env,
+        rail_length=5.2,
+        inclination=85,
+        heading=90,
+    )
+    assert flight.x_impact > 0
+    assert flight.z_impact == pytest.approx(
+        env.get_terrain_elevation(flight.x_impact, flight.y_impact), abs=1e-3
+    )
+    assert flight.z_impact > env.elevation
+
+    # Without topographic profile, all impact points are at the launch site
+    # elevation
+    monte_carlo = monte_carlo_calisto_pre_loaded
+    elevations = monte_carlo.get_impact_terrain_elevation()
+    assert elevations.shape == (len(monte_carlo.results["x_impact"]),)
+    assert np.all(elevations == monte_carlo.environment.object.elevation)
+
+
+def test_terrain_aware_impact_outside_of_the_terrain(tmp_path, calisto_robust):
+    """Tests that a flight leaving the topographic profile finds the impact
+    against a flat ground at the elevation of the launch site.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory where the topographic file is written.
+    calisto_robust : rocketpy.Rocket
+        Example rocket to be flown.
+    """
+    netCDF4 = pytest.importorskip("netCDF4")
+    file = str(tmp_path / "terrain.nc")
+    # Terrain of about 200 m by 200 m around the launch site
+    latitudes = np.linspace(-33.001, -32.999, 3)
+    longitudes = np.linspace(-107.001, -106.999, 3)
+    with netCDF4.Dataset(file, "w") as dataset:
+        for name, values in [("lat", latitudes), ("lon", longitudes)]:
+            dataset.createDimension(name, len(values))
+            dataset.createVariable(name, "f8", (name,))[:] = values
+        dataset.createVariable("NASADEM_HGT", "f8", ("lat", "lon"))[:] = np.full(
+            (3, 3), 1500.0
+        )
+
+    env = Environment(latitude=-33, longitude=-107, elevation=1400)
+    env.set_topographic_profile(type="NASADEM_HGT", file=file)
+    flight = Flight(
+        rocket=calisto_robust,
+        environment=env,
+        rail_length=5.2,
+        inclination=85,
+        heading=90,
+    )
+    with pytest.raises(ValueError):
+        env.get_terrain_elevation(flight.x_impact, flight.y_impact)
+    assert flight.z_impact == pytest.approx(env.elevation, abs=1e-3)
+
+
+def test_weather_cache_stores_parsed_atmospheres(tmp_path):
+    """Tests that an Environment with a weather cache loads a previously
+    parsed atmosphere without reading its file, parses the file again once it
+    changes, and that the cache evicts its least recently used entries.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory of the cache and of a copy of the weather file.
+    """
+    file = str(tmp_path / "ensemble.nc")
+    with open("data/weather/LASC2019_TATUI_reanalysis_ensemble.nc", "rb") as source:
+        with open(file, "wb") as copy:
+            copy.write(source.read())
+    cache = WeatherCache(tmp_path / "cache")
+
+    def configured_environment():
+        env = Environment(date=(2019, 8, 10, 21), latitude=-23.36, longitude=-48.01)
+        env.weather_cache = cache
+        env.set_atmospheric_model(type="Ensemble", file=file, dictionary="ECMWF")
+        return env
+
+    parsed = configured_environment()
+    assert len(cache) == 1
+    with patch("netCDF4.Dataset", side_effect=AssertionError):
+        cached = configured_environment()
+    assert cached.num_ensemble_members == parsed.num_ensemble_members
+    assert cached.elevation == parsed.elevation
+    cached.select_ensemble_member(4)
+    parsed.select_ensemble_member(4)
+    for name in ["pressure", "temperature", "wind_speed", "density"]:
+        assert getattr(cached, name)(2000) == getattr(parsed, name)(2000)
+
+    os.utime(file, ns=(0, 0))
+    configured_environment()
+    assert len(cache) == 2
+
+    entries = [os.path.join(cache.path, name) for name in os.listdir(cache.path)]
+    cache.max_size = sum(os.path.getsize(entry) for entry in entries) - 1
+    cache.evict()
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_export_weather_slab_reproduces_atmosphere(tmp_path):
+    """Tests that the slab of an ensemble file exported by an Environment
+    holds only the neighborhood of the launch, and that it gives the same
+    atmosphere as the whole file.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory where the slab is written.
+    """
+    netCDF4 = pytest.importorskip("netCDF4")
+    slab_file = str(tmp_path / "slab.nc")
+    environments = []
+    for file in ["data/weather/LASC2019_TATUI_reanalysis_ensemble.nc", slab_file]:
+        env = Environment(date=(2019, 8, 10, 21), latitude=-23.36, longitude=-48.01)
+        env.set_atmospheric_model(type="Ensemble", file=file, dictionary="ECMWF")
+        if file != slab_file:
+            env.export_weather_slab(slab_file)
+        environments.append(env)
+
+    with netCDF4.Dataset(slab_file) as slab:
+        assert slab["t"].shape == (2, 10, 6, 2, 2)
+        assert slab["latitude"][:].tolist() == [-23, -23.5]
+
+    original, exported = environments
+    assert exported.num_ensemble_members == original.num_ensemble_members
+    for member in [0, 7]:
+        original.select_ensemble_member(member)
+        exported.select_ensemble_member(member)
+        for name in ["pressure", "temperature", "wind_velocity_x", "wind_velocity_y"]:
+            assert getattr(exported, name)(2500) == getattr(original, name)(2500)
+
+
+def test_read_slab_by_dimension_position(tmp_path):
+    """Tests that read_slab selects the dimensions of a variable by their
+    position when they are not named after the dictionary.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory where the dataset is written.
+    """
+    netCDF4 = pytest.importorskip("netCDF4")
+    dictionary = {
+        "time": "time",
+        "level": "level",
+        "latitude": "lat",
+        "longitude": "lon",
+    }
+    values = np.arange(2 * 3 * 4 * 5, dtype=float).reshape(2, 3, 4, 5)
+    indices = {"time": 1, "latitude": slice(1, 3), "longitude": slice(2, 4)}
+    with netCDF4.Dataset(str(tmp_path / "slab.nc"), "w") as dataset:
+        for name, size in zip(["t", "z", "y", "x"], values.shape):
+            dataset.createDimension(name, size)
+        variable = dataset.createVariable("temperature", "f8", ("t", "z", "y", "x"))
+        variable[:] = values
+
+        assert read_slab(variable, dictionary, indices).tolist() == (
+            values[1, :, 1:3, 2:4].tolist()
+        )
+        dataset.createDimension("w", 2)
+        variable = dataset.createVariable("other", "f8", ("w", "z"))
+        with pytest.raises(ValueError):
+            read_slab(variable, dictionary, indices)
@@ -1,10 +1,13 @@
 import copy
 import os
+from datetime import datetime
 from unittest.mock import patch
 
 import matplotlib as plt
+import numpy as np
 import pytest
 
+from rocketpy import EnvironmentAnalysis
 from rocketpy.tools import import_optional_dependency
 
 plt.rcParams.update({"figure.max_open_warning": 0})
@@ -166,3 +169,178 @@ def test_animation_plots(mock_show, env_analysis):
         HTML,
     )
     os.remove("wind_rose.gif")  # remove the files created by the method
+
+
+def test_pressure_level_data_parsed_into_profile_cube(era5_files):
+    """Tests that the pressure level data is parsed into (time, level) arrays,
+    whose Functions are only created when requested, and that the surface
+    data keeps the values missing in the file masked.
+
+    Parameters
+    ----------
+    era5_files : callable
+        Factory of ERA5-like reanalysis files.
+    """
+    surface_file, pressure_level_file = era5_files("era5", 1060680, 40)
+    env_analysis = EnvironmentAnalysis(
+        start_date=datetime(2021, 1, 1),
+        end_date=datetime(2021, 1, 5),
+        latitude=39.3897,
+        longitude=-8.28896388889,
+        start_hour=6,
+        end_hour=18,
+        surface_data_file=surface_file,
+        pressure_level_data_file=pressure_level_file,
+        timezone="UTC",
+    )
+
+    cube = env_analysis.pressure_level_cube
+    assert cube.height.shape == (16, 8)
+    assert set(cube.fields) == set(
+        env_analysis.original_pressure_level_data["2021.1.1"]["6"]
+    )
+    assert list(env_analysis.original_pressure_level_data) == [
+        "2021.1.1",
+        "2021.1.2",
+        "2021.1.3",
+        "2021.1.4",
+    ]
+    assert env_analysis.hours == [6, 9, 12, 15]
+
+    # Profiles are created once, from the row of their date and hour
+    profiles = env_analysis.original_pressure_level_data["2021.1.2"]["9"]
+    temperature = profiles["temperature"]
+    assert profiles["temperature"] is temperature
+    assert np.allclose(temperature(cube.height[5]), cube.fields["temperature"][5])
+    converted = env_analysis.converted_pressure_level_data["2021.1.2"]["9"]
+    assert np.allclose(
+        converted["temperature"](cube.height[5]),
+        cube.fields["temperature"][5] - 273.15,
+    )
+    assert np.allclose(
+        profiles["wind_speed"].y_array,
+        np.hypot(
+            profiles["wind_velocity_x"].y_array, profiles["wind_velocity_y"].y_array
+        ),
+    )
+    assert env_analysis.altitude_AGL_range[1] == pytest.approx(
+        np.min(np.max(cube.height, axis=1))
+    )
+
+    cloud_base_height = env_analysis.cloud_base_height
+    assert len(cloud_base_height) == 16
+    assert 0 < np.ma.count(cloud_base_height) < 16
+
+
+def test_save_and_load_binary_files(era5_files, tmp_path):
+    """Tests that an analysis saved to binary files is loaded with the same
+    data, memory mapped, without reading the weather files.
+
+    Parameters
+    ----------
+    era5_files : callable
+        Factory of ERA5-like reanalysis files.
+    tmp_path : pathlib.Path
+        Temporary directory where the analysis is saved.
+    """
+    surface_file, pressure_level_file = era5_files("era5", 1060680, 40)
+    env_analysis = EnvironmentAnalysis(
+        start_date=datetime(2021, 1, 1),
+        end_date=datetime(2021, 1, 5),
+        latitude=39.3897,
+        longitude=-8.28896388889,
+        surface_data_file=surface_file,
+        pressure_level_data_file=pressure_level_file,
+        timezone="America/Sao_Paulo",
+        unit_system="imperial",
+    )
+    filename = str(tmp_path / "env_analysis")
+    env_analysis.save(filename)
+    os.remove(surface_file)
+    os.remove(pressure_level_file)
+
+    loaded = EnvironmentAnalysis.load(filename)
+    assert isinstance(loaded.pressure_level_cube.height.base, np.memmap)
+    assert loaded.start_date == env_analysis.start_date
+    assert str(loaded.preferred_timezone) == "America/Sao_Paulo"
+    assert loaded.unit_system == env_analysis.unit_system
+    assert loaded.converted_elevation == env_analysis.converted_elevation
+    assert loaded.days == env_analysis.days
+    assert loaded.hours == env_analysis.hours
+    assert np.array_equal(
+        loaded.cloud_base_height.mask, env_analysis.cloud_base_height.mask
+    )
+    assert (
+        loaded.average_temperature_by_hour == env_analysis.average_temperature_by_hour
+    )
+    assert loaded.altitude_AGL_range == env_analysis.altitude_AGL_range
+    assert np.allclose(
+        loaded.average_wind_speed_profile, env_analysis.average_wind_speed_profile
+    )
+    assert loaded.std_pressure_at_10000ft == env_analysis.std_pressure_at_10000ft
+
+
+def test_append_new_weather_files(era5_files):
+    """Tests that appending the new times of the weather files to an analysis
+    gives the same results as analysing the whole period at once.
+
+    Parameters
+    ----------
+    era5_files : callable
+        Factory of ERA5-like reanalysis files.
+    """
+    surface_file, pressure_level_file = era5_files("era5", 1060680, 80)
+    arguments = {
+        "start_date": datetime(2021, 1, 1),
+        "latitude": 39.3897,
+        "longitude": -8.28896388889,
+        "timezone": "America/Sao_Paulo",
+        "surface_data_file": surface_file,
+        "pressure_level_data_file": pressure_level_file,
+    }
+    env_analysis = EnvironmentAnalysis(end_date=datetime(2021, 1, 5), **arguments)
+    average_temperature_by_hour = env_analysis.average_temperature_by_hour
+    env_analysis.surface_wind_speed_by_hour
+    env_analysis.surface_wind_gust_by_hour
+
+    # Only the times that are not in the analysis yet are read
+    env_analysis.append(
+        surface_data_file=surface_file,
+        pressure_level_data_file=pressure_level_file,
+        end_date=datetime(2021, 1, 10),
+    )
+    whole_analysis = EnvironmentAnalysis(end_date=datetime(2021, 1, 10), **arguments)
+
+    assert env_analysis.average_temperature_by_hour != average_temperature_by_hour
+    assert env_analysis.days == whole_analysis.days
+    assert env_analysis.hours == whole_analysis.hours
+    for name in [
+        "temperature_by_hour",
+        "surface_10m_wind_speed_by_hour",
+        "surface_wind_speed_by_hour",
+        "surface_wind_direction_by_hour",
+        "surface_wind_gust_by_hour",
+    ]:
+        assert getattr(env_analysis, name) == getattr(whole_analysis, name)
+    for name in [
+        "average_temperature_by_hour",
+        "std_temperature_by_hour",
+        "average_surface_100m_wind_speed_by_hour",
+        "std_surface_100m_wind_speed_by_hour",
+    ]:
+        assert getattr(env_analysis, name) == pytest.approx(
+            getattr(whole_analysis, name)
+        )
+    assert env_analysis.record_max_temperature == whole_analysis.record_max_temperature
+    assert env_analysis.record_max_wind_gust == whole_analysis.record_max_wind_gust
+    assert (
+        env_analysis.record_min_surface_10m_wind_speed
+        == whole_analysis.record_min_surface_10m_wind_speed
+    )
+    cube, whole_cube = (
+        env_analysis.pressure_level_cube,
+        whole_analysis.pressure_level_cube,
+    )
+    assert cube.hours == whole_cube.hours
+    assert np.array_equal(cube.fields["temperature"], whole_cube.fields["temperature"])
+    assert len(env_analysis.converted_pressure_level_data) == len(whole_analysis.days)
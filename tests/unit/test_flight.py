@@ -599,3 +599,24 @@ def test_stability_static_margins(wind_u, wind_v, static_margin, max_time):
         or (static_margin < 0 and np.all(moments / wind_sign <= 0))
         or (static_margin == 0 and np.all(np.abs(moments) <= 1e-10))
     )
+
+
+@pytest.mark.parametrize(
+    "budget, error",
+    [
+        ({"max_function_evaluations": 10}, RuntimeError),
+        ({"max_wall_time": 0}, TimeoutError),
+    ],
+)
+def test_flight_budget(example_plain_env, calisto_robust, budget, error):
+    """Tests that a flight simulation stops with an error once it exceeds its
+    budget of function evaluations or wall clock time."""
+    with pytest.raises(error):
+        Flight(
+            rocket=calisto_robust,
+            environment=example_plain_env,
+            rail_length=5.2,
+            inclination=85,
+            heading=0,
+            **budget,
+        )
@@ -2,13 +2,17 @@
 individual method of the Function class. The tests are made on both the
 expected behaviour and the return instances."""
 
+import pickle
+from copy import deepcopy
 from unittest.mock import patch
 
 import matplotlib as plt
 import numpy as np
 import pytest
+from scipy import integrate
 
 from rocketpy import Function
+from rocketpy.mathutils.shared_array import SharedArray
 
 plt.rcParams.update({"figure.max_open_warning": 0})
 
@@ -165,6 +169,147 @@ def test_integral_function():
     assert isinstance(zero_func, Function)
 
 
+@pytest.mark.parametrize("interpolation", ["linear", "akima", "spline"])
+@pytest.mark.parametrize("extrapolation", ["natural", "constant", "zero"])
+def test_piecewise_polynomial_derivative_function(interpolation, extrapolation):
+    """Tests that the derivative_function and differentiate methods of list
+    based Functions are exact derivatives of the interpolating polynomials.
+    """
+    x = np.linspace(0, 3, 7)
+    func = Function(
+        np.column_stack((x, x**2 * np.sin(x))),
+        interpolation=interpolation,
+        extrapolation=extrapolation,
+    )
+    derivative = func.derivative_function()
+    # Points between the data points, where finite differences are accurate
+    points = np.concatenate((x[:-1] + 0.1, x[:-1] + 0.3))
+    finite_differences = (func(points + 1e-6) - func(points - 1e-6)) / 2e-6
+
+    assert np.allclose(derivative(points), finite_differences, atol=1e-5)
+    for point in points:
+        assert isinstance(func.differentiate(point), float)
+        assert np.isclose(func.differentiate(point), derivative(point))
+        assert np.isclose(func.differentiate_complex_step(point), derivative(point))
+    assert np.allclose(
+        [func.differentiate(point, order=2) for point in points],
+        derivative.derivative_function()(points),
+    )
+
+
+@pytest.mark.parametrize("interpolation", ["linear", "akima", "spline"])
+@pytest.mark.parametrize("extrapolation", ["natural", "constant", "zero"])
+@pytest.mark.parametrize("lower, upper", [(None, None), (-0.5, 3.5), (0.7, 2.2)])
+def test_piecewise_polynomial_integral_function(
+    interpolation, extrapolation, lower, upper
+):
+    """Tests that the integral_function method of list based Functions is the
+    exact antiderivative of the interpolating polynomials, including the
+    extrapolation regions.
+    """
+    x = np.linspace(0, 3, 7)
+    func = Function(
+        np.column_stack((x, x**2 * np.sin(x))),
+        interpolation=interpolation,
+        extrapolation=extrapolation,
+    )
+    integral = func.integral_function(lower, upper)
+    lower = 0 if lower is None else lower
+    upper = 3 if upper is None else upper
+
+    for point in np.linspace(lower, upper, 13):
+        expected = integrate.quad(
+            func, lower, point, points=x, epsabs=1e-12, limit=200
+        )[0]
+        assert np.isclose(integral(point), expected, atol=1e-9)
+        assert np.isclose(func.integral(lower, point), expected, atol=1e-9)
+    # The derivative of the integral recovers the original Function
+    points = np.linspace(lower, upper, 13)[1:-1]
+    assert np.allclose(integral.derivative_function()(points), func(points))
+
+
+@pytest.mark.parametrize("interpolation", ["akima", "spline"])
+def test_interpolation_coefficients_continuity(interpolation):
+    """Tests that the vectorized akima and spline coefficients interpolate the
+    data points and have continuous first derivatives at the inner points.
+    """
+    x = np.sort(np.random.default_rng(42).uniform(0, 10, 50))
+    y = np.cos(x)
+    func = Function(np.column_stack((x, y)), interpolation=interpolation)
+    derivative = func.derivative_function()
+
+    assert np.allclose(func(x), y)
+    assert np.allclose(derivative(x[1:-1] - 1e-9), derivative(x[1:-1] + 1e-9))
+
+
+@pytest.mark.parametrize("interpolation", ["akima", "spline"])
+def test_lazy_interpolation_coefficients(interpolation):
+    """Tests that spline and akima coefficients are only computed when the
+    Function is first evaluated, and recomputed when the interpolation changes.
+    """
+    x = np.linspace(0, 10, 21)
+    func = Function(np.column_stack((x, x**2)), interpolation=interpolation)
+    assert "_coeffs" not in func.__dict__
+
+    assert np.isclose(func(2.5), 6.25, atol=1e-2)
+    assert "_coeffs" in func.__dict__
+
+    func.set_interpolation("linear")
+    assert np.isclose(func(2.25), 5.125)
+    func.set_interpolation(interpolation)
+    assert "_coeffs" not in func.__dict__
+    assert np.isclose(func.integral(0, 10), 1000 / 3, rtol=1e-3)
+
+
+@pytest.mark.parametrize("interpolation", ["linear", "akima", "spline"])
+@pytest.mark.parametrize("extrapolation", ["natural", "constant", "zero"])
+def test_from_trusted_array(interpolation, extrapolation):
+    """Tests that Functions created by Function.from_trusted_array behave as the
+    ones created by Function.__init__ from the same sorted array.
+    """
+    x = np.linspace(0, 10, 21)
+    source = np.column_stack((x, np.sin(x)))
+    func = Function(source, "t", "y", interpolation, extrapolation)
+    trusted_func = Function.from_trusted_array(
+        source, "t", "y", interpolation, extrapolation
+    )
+    points = np.linspace(-1, 11, 50)
+
+    assert trusted_func.source is source
+    assert trusted_func.get_inputs() == func.get_inputs()
+    assert trusted_func.get_outputs() == func.get_outputs()
+    assert trusted_func.title == func.title
+    assert np.allclose(trusted_func(points), func(points))
+
+
+@pytest.mark.parametrize("interpolation", ["linear", "akima", "spline"])
+@pytest.mark.parametrize("sign", [1, -1])
+def test_monotonic_inverse_function(interpolation, sign):
+    """Tests the inverse_function and the vectorized find_input methods of
+    strictly monotonic list based Functions, both increasing and decreasing.
+    """
+    x = np.linspace(0, 3, 30)
+    func = Function(
+        np.column_stack((x, sign * (np.exp(x) + x))), interpolation=interpolation
+    )
+    points = np.linspace(0.01, 2.99, 50)
+    values = func(points)
+    inverse = func.inverse_function()
+
+    assert isinstance(inverse.source, np.ndarray)
+    assert np.allclose(inverse(values), points, atol=1e-4)
+    assert np.allclose(func.find_input(values, start=0), points, atol=1e-10)
+    assert np.isclose(func.find_input(values[10], start=0), points[10], atol=1e-10)
+    assert func.is_strictly_bijective()
+
+
+def test_inverse_function_not_bijective():
+    """Tests that the inverse of a non monotonic list based Function raises."""
+    func = Function([[-1, 1], [0, 0], [1, 1], [2, 4]])
+    with pytest.raises(ValueError):
+        func.inverse_function()
+
+
 @pytest.mark.parametrize(
     "x, y, z",
     [
@@ -714,3 +859,27 @@ def test_low_pass_filter(alpha):
             f"The filtered value at index {i} is not the expected value. "
             f"Expected: {expected}, Actual: {filtered_func.source[i][1]}"
         )
+
+
+@pytest.mark.parametrize("interpolation", ["linear", "polynomial", "akima", "spline"])
+@pytest.mark.parametrize("extrapolation", ["zero", "natural", "constant"])
+def test_pickle_and_shared_memory(interpolation, extrapolation):
+    """Test that array based Functions can be pickled and that Functions moved
+    to shared memory are pickled as a handle to their data."""
+    x = np.linspace(0, 10, 1000 if interpolation != "polynomial" else 5)
+    func = Function(
+        np.column_stack((x, np.sin(x))),
+        interpolation=interpolation,
+        extrapolation=extrapolation,
+    )
+    points = [-1, 0, 3.3, 10, 11]
+    expected = func(points)
+
+    assert np.array_equal(pickle.loads(pickle.dumps(func))(points), expected)
+
+    shared = deepcopy(func).to_shared_memory()
+    data = pickle.dumps(shared)
+    assert len(data) < len(pickle.dumps(func))
+    assert isinstance(shared.source, SharedArray)
+    assert np.allclose(shared(points), expected)
+    assert np.allclose(pickle.loads(data)(points), expected)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from rocketpy.simulation.monte_carlo_statistics import (
+    MonteCarloStatistics,
+    quantile_convergence,
+)
+
+
+def test_monte_carlo_statistics():
+    """Tests the statistics of Monte Carlo outputs, updated one iteration at
+    a time and in batches, ignoring values that are not numbers."""
+    statistics = MonteCarloStatistics()
+    statistics.update(
+        {"apogee": 3000.0, "x_impact": 30.0, "y_impact": 40.0, "events": [[1, "a"]]}
+    )
+    statistics.update_batch(
+        {"apogee": [3100.0, 3200.0], "x_impact": [0.0, None], "y_impact": [5.0, 1.0]}
+    )
+
+    assert statistics.count == 3
+    assert "events" not in statistics.moments
+    assert np.isclose(statistics.mean("apogee"), 3100.0)
+    assert np.isclose(statistics.mean("impact_radius"), 27.5)
+    assert statistics.covariance().shape == (2, 2)
+    assert np.isclose(statistics.quantile("apogee", 0.5), 3100.0)
+
+
+@pytest.mark.parametrize("max_width, expected", [(1e-6, False), (1e6, True)])
+def test_quantile_convergence(max_width, expected):
+    """Tests the stop condition based on the width of the confidence interval
+    of a quantile."""
+    statistics = MonteCarloStatistics()
+    stop_condition = quantile_convergence("apogee", 0.99, max_width, min_simulations=50)
+    statistics.update_batch({"apogee": np.arange(49.0)})
+    assert not stop_condition(statistics)
+    statistics.update({"apogee": 49.0})
+    assert stop_condition(statistics) is expected
@@ -1,3 +1,4 @@
+from copy import copy
 from unittest.mock import patch
 
 import numpy as np
@@ -404,6 +405,78 @@ def test_evaluate_total_mass(calisto_motorless):
     assert isinstance(calisto_motorless.evaluate_total_mass(), Function)
 
 
+def test_derived_quantities_follow_inputs(calisto, cesaroni_m1670):
+    """Tests that changing an input of the rocket updates the quantities that
+    depend on it, which become equal to the ones of a rocket created with the
+    new input, while the quantities that do not depend on it are kept.
+
+    Parameters
+    ----------
+    calisto : Rocket instance
+        A predefined instance of the calisto Rocket with a motor, used as a
+        base for testing.
+    cesaroni_m1670 : SolidMotor instance
+        The motor of the calisto Rocket.
+    """
+    cp_position = calisto.cp_position
+    static_margin = calisto.static_margin
+    original_static_margin = calisto.static_margin(0)
+    copied = copy(calisto)
+
+    calisto.mass = 16.0
+    calisto.I_11_without_motor = 7.0
+    assert calisto.cp_position is cp_position
+
+    reference = Rocket(
+        radius=0.0635,
+        mass=16.0,
+        inertia=(7.0, 6.321, 0.034),
+        power_off_drag="data/calisto/powerOffDragCurve.csv",
+        power_on_drag="data/calisto/powerOnDragCurve.csv",
+        center_of_mass_without_motor=0,
+        coordinate_system_orientation="tail_to_nose",
+    )
+    reference.add_motor(cesaroni_m1670, position=-1.373)
+    for name in ("total_mass", "center_of_mass", "reduced_mass", "I_11", "I_33"):
+        assert getattr(calisto, name)(2) == pytest.approx(getattr(reference, name)(2))
+    assert calisto.dry_mass == pytest.approx(reference.dry_mass)
+    assert calisto.static_margin(0) == pytest.approx(reference.static_margin(0))
+    assert calisto.static_margin(0) != pytest.approx(original_static_margin)
+    # Derived Functions are updated in place
+    assert calisto.static_margin is static_margin
+
+    # Copies of the rocket are not affected by changes to the original
+    assert copied.mass == 14.426
+    assert copied.static_margin(0) == pytest.approx(original_static_margin)
+
+
+def test_derived_functions_are_updated_in_place(calisto, calisto_nose_cone):
+    """Tests that the center of pressure position and the margins taken from
+    the rocket are updated when aerodynamic surfaces are added to it.
+
+    Parameters
+    ----------
+    calisto : Rocket instance
+        A predefined instance of the calisto Rocket with a motor, used as a
+        base for testing.
+    calisto_nose_cone : NoseCone instance
+        The nose cone of the calisto Rocket.
+    """
+    cp_position = calisto.cp_position
+    static_margin = calisto.static_margin
+    stability_margin = calisto.stability_margin
+    assert cp_position(0) == 0
+
+    calisto.add_surfaces(calisto_nose_cone, 1.160)
+
+    # The references are updated even before the rocket is accessed again
+    assert cp_position(0) == pytest.approx(1.160 - calisto_nose_cone.cpz, rel=1e-6)
+    assert stability_margin(0, 0) == pytest.approx(static_margin(0))
+    assert calisto.cp_position is cp_position
+    assert calisto.static_margin is static_margin
+    assert calisto.stability_margin is stability_margin
+
+
 def test_evaluate_center_of_mass(calisto):
     """Tests the evaluate_center_of_mass method of the Rocket class.
     Both with respect to return instances and expected behaviour.
@@ -0,0 +1,64 @@
+import numpy as np
+
+from rocketpy.mathutils.running_statistics import (
+    QuantileSketch,
+    RunningCovariance,
+    RunningMoments,
+)
+
+
+def test_running_moments():
+    """Tests that the running moments updated one value at a time, in
+    batches and merged match the statistics computed by numpy."""
+    values = np.random.default_rng(1).normal(5, 2, 1000)
+    moments = RunningMoments()
+    for value in values[:300]:
+        moments.update(value)
+    moments.update(values[300:600])
+    other = RunningMoments()
+    other.update(values[600:])
+    moments.merge(other)
+
+    assert moments.count == 1000
+    assert np.isclose(moments.mean, np.mean(values))
+    assert np.isclose(moments.std, np.std(values))
+    assert moments.minimum == np.min(values)
+    assert moments.maximum == np.max(values)
+
+
+def test_running_covariance():
+    """Tests that the running covariance matches the one computed by numpy."""
+    points = np.random.default_rng(2).multivariate_normal(
+        [100, -50], [[400, 120], [120, 900]], 500
+    )
+    covariance = RunningCovariance()
+    for point in points[:100]:
+        covariance.update(point)
+    other = RunningCovariance()
+    other.update(points[100:])
+    covariance.merge(other)
+
+    assert np.allclose(covariance.mean, points.mean(axis=0))
+    assert np.allclose(covariance.covariance, np.cov(points.T, bias=True))
+
+
+def test_quantile_sketch():
+    """Tests that the quantile sketch is exact while it holds all the values,
+    and that merged sketches of many values keep the rank error small."""
+    values = np.random.default_rng(3).normal(size=100000)
+    sketch = QuantileSketch(seed=1)
+    sketch.update(values[:500])
+    assert np.isclose(
+        sketch.quantile(0.9), np.quantile(values[:500], 0.9, method="hazen")
+    )
+
+    other = QuantileSketch(seed=2)
+    other.update(values[500:])
+    sketch.merge(other)
+    assert sketch.count == 100000
+    assert sum(map(len, sketch.levels)) < 5000
+    for q in (0.01, 0.5, 0.99):
+        rank = np.mean(values <= sketch.quantile(q))
+        assert abs(rank - q) < 0.005
+    lower, upper = sketch.quantile_confidence_interval(0.99)
+    assert lower < np.quantile(values, 0.99) < upper
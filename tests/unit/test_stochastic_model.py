@@ -1,4 +1,9 @@
+import numpy as np
 import pytest
+from scipy import stats
+
+from rocketpy import StochasticParachute
+from rocketpy.stochastic.sampling import _DesignGenerator, sample_models
 
 
 @pytest.mark.parametrize(
@@ -18,3 +23,164 @@ def test_visualize_attributes(request, fixture_name):
     """
     fixture = request.getfixturevalue(fixture_name)
     assert fixture.visualize_attributes() is None
+
+
+@pytest.mark.parametrize(
+    "fixture_name",
+    [
+        "stochastic_rail_buttons",
+        "stochastic_main_parachute",
+        "stochastic_environment",
+        "stochastic_tail",
+        "stochastic_calisto",
+    ],
+)
+def test_sample(request, fixture_name):
+    """Tests the sample method of the StochasticModel class. The samples must
+    be reproducible from the seed and the objects created from each row must
+    use the sampled values.
+    """
+    fixture = request.getfixturevalue(fixture_name)
+    fixture.set_random_number_generator(42)
+    samples = fixture.sample(5)
+    fixture.set_random_number_generator(42)
+    assert str(fixture.sample(5)) == str(samples)
+
+    try:
+        for index in (0, 4):
+            fixture._use_sample(samples, index)
+            first_inputs = next(fixture.dict_generator())
+            fixture._use_sample(samples, index)
+            assert next(fixture.dict_generator()) == first_inputs
+        fixture._use_sample(samples, 0)
+        inputs = next(fixture.dict_generator())
+        fixture._use_sample(samples, 1)
+        assert next(fixture.dict_generator()) != inputs
+    finally:
+        fixture._use_sample(None)
+
+
+def test_sample_columns(stochastic_main_parachute):
+    """Tests that the sample method draws one value of each attribute per
+    simulation, picking list values from the given options.
+    """
+    stochastic_main_parachute.set_random_number_generator(42)
+    samples = stochastic_main_parachute.sample(20)
+    for name, column in samples.items():
+        assert len(column) == 20
+        options = getattr(stochastic_main_parachute, name)
+        if isinstance(options, list):
+            assert all(value in options for value in column)
+
+
+@pytest.mark.parametrize(
+    "sampler", ["sobol", "halton", "latin_hypercube", "stratified"]
+)
+def test_sample_with_sampling_design(stochastic_calisto, sampler):
+    """Tests the sampling designs of the sample method. The samples must be
+    reproducible from the seed and must keep the values of list arguments
+    among the given options.
+    """
+    stochastic_calisto.set_random_number_generator(42)
+    samples = stochastic_calisto.sample(16, sampler=sampler)
+    stochastic_calisto.set_random_number_generator(42)
+    assert str(stochastic_calisto.sample(16, sampler=sampler)) == str(samples)
+
+    assert len(samples["mass"]) == 16
+    for parachute, parachute_samples in zip(
+        stochastic_calisto.parachutes, samples["parachutes"]
+    ):
+        for name, column in parachute_samples.items():
+            options = getattr(parachute, name)
+            if isinstance(options, list):
+                assert all(value in options for value in column)
+
+
+@pytest.mark.parametrize("sampler", ["latin_hypercube", "stratified"])
+def test_sample_stratification(stochastic_calisto, sampler):
+    """Tests that the Latin hypercube and stratified designs draw exactly one
+    value in each of the equally probable intervals of a normal argument.
+    """
+    stochastic_calisto.set_random_number_generator(42)
+    samples = stochastic_calisto.sample(10, sampler=sampler)
+    nominal, std, _ = stochastic_calisto.mass
+    probabilities = stats.norm.cdf(samples["mass"], nominal, std)
+    assert sorted(np.floor(probabilities * 10).astype(int)) == list(range(10))
+
+
+def _first_iterations(samples, n):
+    """Returns the samples of the first ``n`` iterations."""
+    if isinstance(samples, dict):
+        return {key: _first_iterations(value, n) for key, value in samples.items()}
+    if isinstance(samples, list):
+        return [_first_iterations(item, n) for item in samples]
+    return samples[:n]
+
+
+@pytest.mark.parametrize("sampler", ["random", "sobol", "halton"])
+def test_sample_models_iterations(
+    stochastic_environment, stochastic_calisto, stochastic_flight, sampler
+):
+    """Tests that the values drawn for an iteration from a seed do not depend
+    on the number of iterations drawn, so that a simulation can be resumed
+    and any iteration can be reproduced.
+    """
+    models = [stochastic_environment, stochastic_calisto, stochastic_flight]
+    samples = sample_models(models, 3, sampler, seed=42)
+    more_samples = sample_models(models, 5, sampler, seed=42)
+    assert str(_first_iterations(more_samples, 3)) == str(samples)
+    assert len(more_samples[1]["mass"]) == 5
+
+
+def test_sample_invalid_sampler(stochastic_calisto):
+    """Tests that unknown samplers raise a ValueError."""
+    with pytest.raises(ValueError):
+        stochastic_calisto.sample(10, sampler="unknown")
+
+
+@pytest.mark.parametrize(
+    "distribution, arguments",
+    [
+        ("normal", (1, 2)),
+        ("binomial", (10, 0.3)),
+        ("chisquare", (3,)),
+        ("exponential", (2,)),
+        ("gamma", (2, 3)),
+        ("gumbel", (1, 2)),
+        ("laplace", (1, 2)),
+        ("logistic", (1, 2)),
+        ("poisson", (4,)),
+        ("uniform", (1, 2)),
+        ("wald", (1, 2)),
+    ],
+)
+def test_design_generator_distributions(distribution, arguments):
+    """Tests that every distribution of get_distribution draws its values
+    from a column of the sampling design, through its inverse cumulative
+    distribution function, instead of from the pseudo-random generator.
+    """
+    design = ((np.arange(10) + 0.5) / 10)[:, np.newaxis]
+    generator = _DesignGenerator(np.random.PCG64(0), design)
+    values = getattr(generator, distribution)(*arguments, size=10)
+
+    assert generator.dimensions == 1
+    # The inverse of a distribution function is nondecreasing
+    assert np.all(np.diff(values) >= 0)
+
+
+@pytest.mark.parametrize("distribution", ["chisquare", "exponential", "poisson"])
+@pytest.mark.parametrize("sampler", ["random", "sobol"])
+def test_sample_one_parameter_distributions(calisto_main_chute, distribution, sampler):
+    """Tests that the distributions with a single parameter take the nominal
+    value as their mean, both when sampled and when drawn one at a time.
+    """
+    stochastic_parachute = StochasticParachute(
+        parachute=calisto_main_chute, lag=(4, 1, distribution)
+    )
+    stochastic_parachute.set_random_number_generator(42)
+    samples = stochastic_parachute.sample(256, sampler=sampler)
+
+    assert len(samples["lag"]) == 256
+    assert np.all(samples["lag"] >= 0)
+    assert np.isclose(np.mean(samples["lag"]), 4, rtol=0.2)
+    assert next(stochastic_parachute.dict_generator())["lag"] >= 0
@@ -1,8 +1,13 @@
 import numpy as np
+from matplotlib.patches import Ellipse
 
 from rocketpy.tools import (
     calculate_cubic_hermite_coefficients,
+    cartesian_to_geodesic,
     find_roots_cubic_function,
+    generate_monte_carlo_ellipses_coordinates,
+    haversine,
+    inverted_haversine,
 )
 
 
@@ -44,3 +49,50 @@ def test_cardanos_root_finding():
     assert np.isclose(roots[0].imag, 0)
     assert np.isclose(roots[1].imag, 0)
     assert np.isclose(roots[2].imag, 0)
+
+
+def test_haversine_functions_accept_arrays():
+    """Tests that haversine, inverted_haversine and cartesian_to_geodesic
+    give, for arrays of points, the same results as point by point, and that
+    cartesian_to_geodesic is inverted by haversine."""
+    x = np.array([0.0, 1500.0, -3200.0, 250.0])
+    y = np.array([0.0, -800.0, 4100.0, 12000.0])
+    lat, lon = cartesian_to_geodesic(x, y, -21.96, -47.33)
+    assert lat.shape == lon.shape == (4,)
+    for i in range(4):
+        lat_i, lon_i = cartesian_to_geodesic(x[i], y[i], -21.96, -47.33)
+        assert lat_i == lat[i] and lon_i == lon[i]
+        assert (lat_i, lon_i) == inverted_haversine(
+            -21.96, -47.33, np.hypot(x[i], y[i]), np.arctan2(x[i], y[i])
+        )
+
+    distances = haversine(-21.96, -47.33, lat, lon)
+    assert np.allclose(distances, np.hypot(x, y), atol=1e-6)
+    assert haversine(-21.96, -47.33, lat[2], lon[2]) == distances[2]
+
+
+def test_generate_monte_carlo_ellipses_coordinates():
+    """Tests that every point of the ellipses is converted to latitude and
+    longitude, matching the conversion of each point on its own."""
+    ellipses = [
+        Ellipse(xy=(1000, 2000), width=400, height=200, angle=30),
+        Ellipse(xy=(-500, 0), width=100, height=300, angle=0),
+    ]
+    outputs = generate_monte_carlo_ellipses_coordinates(ellipses, -33, -107, 8)
+
+    assert [len(points) for points in outputs] == [8, 8]
+    for ellipse, points in zip(ellipses, outputs):
+        x_center, y_center = ellipse.get_center()
+        angle = np.radians(ellipse.get_angle())
+        for i, (latitude, longitude) in enumerate(points):
+            theta = 2 * np.pi * i / 8
+            x = ellipse.get_width() / 2 * np.cos(theta)
+            y = ellipse.get_height() / 2 * np.sin(theta)
+            x, y = (
+                x_center + x * np.cos(angle) - y * np.sin(angle),
+                y_center + x * np.sin(angle) + y * np.cos(angle),
+            )
+            expected = inverted_haversine(
+                -33, -107, np.hypot(x, y), np.arctan2(x, y), earth_radius=6.3781e6
+            )
+            assert np.allclose((latitude, longitude), expected, rtol=0, atol=1e-9)